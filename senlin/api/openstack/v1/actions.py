@@ -67,6 +67,7 @@ class ActionController(wsgi.Controller):
             consts.PARAM_MARKER: 'single',
             consts.PARAM_SORT: 'single',
             consts.PARAM_GLOBAL_PROJECT: 'single',
+            consts.PARAM_SUMMARY: 'single',
         }
         for key in req.params.keys():
             if (key not in param_whitelist.keys() and key not in
@@ -85,6 +86,11 @@ class ActionController(wsgi.Controller):
             params.pop(key)
             params['project_safe'] = not global_project
 
+        # Full records are listed unless only the summaries are requested
+        key = consts.PARAM_SUMMARY
+        if key in params:
+            params[key] = utils.parse_bool_param(key, params[key])
+
         if not filters:
             filters = None
 
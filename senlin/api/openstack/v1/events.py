@@ -43,6 +43,7 @@ class EventController(wsgi.Controller):
             consts.PARAM_MARKER: 'single',
             consts.PARAM_SORT: 'single',
             consts.PARAM_GLOBAL_PROJECT: 'single',
+            consts.PARAM_SUMMARY: 'single',
         }
         for key in req.params.keys():
             if (key not in param_whitelist.keys() and key not in
@@ -61,6 +62,11 @@ class EventController(wsgi.Controller):
         if key in params:
             params[key] = utils.parse_int_param(key, params[key])
 
+        # Full records are listed unless only the summaries are requested
+        key = consts.PARAM_SUMMARY
+        if key in params:
+            params[key] = utils.parse_bool_param(key, params[key])
+
         if not filters:
             filters = None
 
@@ -82,6 +82,7 @@ class NodeController(wsgi.Controller):
             consts.PARAM_MARKER: 'single',
             consts.PARAM_SORT: 'single',
             consts.PARAM_GLOBAL_PROJECT: 'single',
+            consts.PARAM_SUMMARY: 'single',
         }
         for key in req.params.keys():
             if (key not in param_whitelist.keys() and key not in
@@ -100,6 +101,11 @@ class NodeController(wsgi.Controller):
             del params[key]
             params['project_safe'] = project_safe
 
+        # Full records are listed unless only the summaries are requested
+        key = consts.PARAM_SUMMARY
+        if key in params:
+            params[key] = utils.parse_bool_param(key, params[key])
+
         if not filters:
             filters = None
 
@@ -22,7 +22,9 @@ from oslo_utils import timeutils
 
 from senlin.common import context
 from senlin.common.i18n import _
+from senlin.common import messaging
 from senlin.db import api
+from senlin.engine import health_manager
 from senlin import version
 
 CONF = cfg.CONF
@@ -106,6 +108,50 @@ class ServiceManageCommand(object):
         remove_parser.set_defaults(func=ServiceManageCommand().service_clean)
 
 
+class HealthManageCommand(object):
+    def __init__(self):
+        self.ctx = context.get_admin_context()
+
+    def health_schedule(self):
+        messaging.setup()
+
+        print_format = "%-36s %-36s %-10s %-10s %-8s %-24s"
+        print(print_format % (_('Engine ID'),
+                              _('Cluster ID'),
+                              _('Base'),
+                              _('Interval'),
+                              _('Healthy'),
+                              _('Next Check')))
+
+        for service in api.service_get_all(self.ctx):
+            seconds_since_update = (timeutils.utcnow() -
+                                    service.updated_at).total_seconds()
+            if seconds_since_update > 2 * CONF.periodic_interval:
+                continue
+
+            schedule = health_manager.get_schedule(service.id)
+            if schedule is None:
+                print(_('Engine %s did not respond.') % service.id)
+                continue
+
+            for item in schedule:
+                print(print_format % (service.id,
+                                      item['cluster_id'],
+                                      item['base_interval'],
+                                      item['interval'],
+                                      item['healthy_checks'],
+                                      item['next_check']))
+
+    @staticmethod
+    def add_health_parsers(subparsers):
+        health_parser = subparsers.add_parser('health')
+        health_parser.set_defaults(command_object=HealthManageCommand)
+        health_subparsers = health_parser.add_subparsers(dest='action')
+        schedule_parser = health_subparsers.add_parser('schedule')
+        schedule_parser.set_defaults(
+            func=HealthManageCommand().health_schedule)
+
+
 def add_command_parsers(subparsers):
     parser = subparsers.add_parser('db_version')
     parser.set_defaults(func=do_db_version)
@@ -113,6 +159,7 @@ def add_command_parsers(subparsers):
     parser = subparsers.add_parser('db_sync')
     parser.set_defaults(func=do_db_sync)
     ServiceManageCommand.add_service_parsers(subparsers)
+    HealthManageCommand.add_health_parsers(subparsers)
     parser.add_argument('version', nargs='?')
     parser.add_argument('current_version', nargs='?')
 
@@ -28,6 +28,12 @@ service_opts = [
                help=_('Seconds between running periodic tasks.')),
     cfg.StrOpt('default_region_name',
                help=_('Default region name used to get services endpoints.')),
+    cfg.IntOpt('sdk_connection_cache_size',
+               default=128,
+               help=_('Maximum number of authenticated OpenStack SDK '
+                      'connections kept for reuse. The least recently used '
+                      'connection is dropped when the cache is full. A value '
+                      'of 0 disables the cache.')),
     cfg.IntOpt('max_response_size',
                default=524288,
                help=_('Maximum raw byte size of data from web response.')),
@@ -53,6 +59,25 @@ engine_opts = [
                help=_('Maximum events per cluster. Older events will be '
                       'deleted when this is reached.  Set to 0 for unlimited '
                       'events per cluster.')),
+    cfg.IntOpt('max_events_per_project',
+               default=0,
+               help=_('Maximum events per project. Older events will be '
+                      'deleted by the event retention task when this is '
+                      'reached. Set to 0 for unlimited events per project.')),
+    cfg.IntOpt('max_event_age',
+               default=0,
+               help=_('Maximum number of days an event is kept. Older events '
+                      'will be deleted by the event retention task. Set to 0 '
+                      'to keep events regardless of their age.')),
+    cfg.IntOpt('event_retention_interval',
+               default=3600,
+               help=_('Number of seconds between two runs of the event '
+                      'retention task, which is run by only one of the '
+                      'engines. A value of 0 disables the task.')),
+    cfg.IntOpt('event_purge_batch_size',
+               default=200,
+               help=_('Maximum number of events deleted in one database '
+                      'transaction when pruning events.')),
     cfg.IntOpt('default_action_timeout',
                default=3600,
                help=_('Timeout in seconds for actions.')),
@@ -60,12 +85,93 @@ engine_opts = [
                default=10,
                help=_('Maximum number of actions per batch when operating a '
                       'cluster.')),
+    cfg.IntOpt('action_wait_interval',
+               default=10,
+               help=_('Maximum number of seconds an action waits for a '
+                      'completion notification from its depended actions '
+                      'before checking their status in the database.')),
+    cfg.IntOpt('max_concurrent_actions',
+               default=100,
+               help=_('Maximum number of actions an engine runs concurrently. '
+                      'Ready actions beyond this limit are queued locally or '
+                      'left in the database for other engines to claim.')),
+    cfg.IntOpt('action_aging_interval',
+               default=60,
+               help=_('Number of seconds a ready action waits before its '
+                      'scheduling priority is raised by one level, so that '
+                      'low priority actions are not starved. A value of 0 '
+                      'disables the aging.')),
     cfg.IntOpt('lock_retry_times',
                default=3,
                help=_('Number of times trying to grab a lock.')),
     cfg.IntOpt('lock_retry_interval',
                default=10,
                help=_('Number of seconds between lock retries.')),
+    cfg.StrOpt('lock_backend',
+               default='db',
+               choices=['db', 'lease'],
+               help=_('Backend for cluster and node locks. The "db" backend '
+                      'polls the database for locks; the "lease" backend '
+                      'wakes up waiters when a lock is released and expires '
+                      'locks that are not renewed by the engines holding '
+                      'them. All engines must use the same backend.')),
+    cfg.IntOpt('lock_lease_duration',
+               default=120,
+               help=_('Number of seconds a lock held with the "lease" backend '
+                      'stays valid without being renewed. Engines renew '
+                      'their leases on each periodic report, so this must '
+                      'be longer than periodic_interval.')),
+    cfg.IntOpt('max_container_ops_per_host',
+               default=10,
+               help=_('Maximum number of concurrent container operations on '
+                      'each Docker host. Operations beyond this limit wait '
+                      'for a running one to complete.')),
+    cfg.IntOpt('policy_binding_cache_ttl',
+               default=300,
+               help=_('Number of seconds the policy bindings of a cluster are '
+                      'cached by an engine for policy checking. Changes to '
+                      'the bindings are broadcast to all engines, this is '
+                      'the upper bound for an engine missing a change. A '
+                      'value of 0 disables the cache.')),
+    cfg.IntOpt('host_ip_cache_ttl',
+               default=600,
+               help=_('Number of seconds the IP address of a host node is '
+                      'cached in the node data for container placement. '
+                      'A value of 0 disables the cache.')),
+    cfg.StrOpt('event_sink',
+               default='buffered',
+               choices=['database', 'buffered'],
+               help=_('Sink for the events generated by the engine. The '
+                      '"database" sink stores each event when it is '
+                      'generated; the "buffered" sink queues the events in '
+                      'memory and stores them in batches from a background '
+                      'thread.')),
+    cfg.IntOpt('event_batch_size',
+               default=100,
+               help=_('Maximum number of events stored in one batch by the '
+                      '"buffered" event sink.')),
+    cfg.FloatOpt('event_flush_interval',
+                 default=1.0,
+                 help=_('Maximum number of seconds an event stays in the '
+                        'buffer of the "buffered" event sink before it is '
+                        'stored.')),
+    cfg.IntOpt('event_queue_size',
+               default=10000,
+               help=_('Maximum number of events queued by the "buffered" '
+                      'event sink. A value of 0 means unbounded.')),
+    cfg.StrOpt('event_queue_overflow',
+               default='block',
+               choices=['block', 'drop'],
+               help=_('What to do when the queue of the "buffered" event '
+                      'sink is full. "block" makes the caller wait until '
+                      'there is room in the queue; "drop" discards the new '
+                      'event and logs a warning.')),
+    cfg.IntOpt('object_cache_size',
+               default=1024,
+               help=_('Maximum number of profile objects and of policy '
+                      'objects each kept by an engine for reuse. The least '
+                      'recently used object is dropped when the cache is '
+                      'full. A value of 0 disables the cache.')),
     cfg.IntOpt('engine_life_check_timeout',
                default=2,
                help=_('RPC timeout for the engine liveness check that is used'
@@ -135,6 +241,26 @@ webhook_opts = [
 cfg.CONF.register_group(webhook_group)
 cfg.CONF.register_opts(webhook_opts, group=webhook_group)
 
+# Docker group
+docker_group = cfg.OptGroup('docker')
+docker_opts = [
+    cfg.IntOpt('client_pool_size',
+               default=64,
+               help=_('Maximum number of Docker API clients kept for reuse. '
+                      'The least recently used client is closed when the '
+                      'pool is full.')),
+    cfg.IntOpt('client_idle_timeout',
+               default=600,
+               help=_('Number of seconds after which an unused Docker API '
+                      'client is closed.')),
+    cfg.IntOpt('client_check_interval',
+               default=60,
+               help=_('Number of seconds a Docker API client can stay unused '
+                      'before its health is checked on the next use.')),
+]
+cfg.CONF.register_group(docker_group)
+cfg.CONF.register_opts(docker_opts, group=docker_group)
+
 
 def list_opts():
     yield None, cloud_backend_opts
@@ -144,3 +270,4 @@ def list_opts():
     yield authentication_group.name, authentication_opts
     yield revision_group.name, revision_opts
     yield webhook_group.name, webhook_opts
+    yield docker_group.name, docker_opts
@@ -27,10 +27,10 @@ RPC_ATTRS = (
 
 RPC_PARAMS = (
     PARAM_LIMIT, PARAM_MARKER, PARAM_GLOBAL_PROJECT,
-    PARAM_SHOW_DETAILS, PARAM_SORT,
+    PARAM_SHOW_DETAILS, PARAM_SORT, PARAM_SUMMARY,
 ) = (
     'limit', 'marker', 'global_project',
-    'show_details', 'sort',
+    'show_details', 'sort', 'summary',
 )
 
 ACTION_NAMES = (
@@ -55,6 +55,25 @@ ACTION_NAMES = (
     'NODE_CHECK', 'NODE_RECOVER'
 )
 
+# Default priorities of actions when they are scheduled to run, a smaller
+# value means a higher priority.
+ACTION_DEFAULT_PRIORITY = 50
+
+ACTION_PRIORITIES = {
+    NODE_RECOVER: 10,
+    CLUSTER_RECOVER: 10,
+    CLUSTER_SCALE_OUT: 20,
+    CLUSTER_SCALE_IN: 20,
+    CLUSTER_RESIZE: 20,
+    NODE_CREATE: 30,
+    NODE_DELETE: 30,
+    CLUSTER_DELETE: 40,
+    CLUSTER_CHECK: 60,
+    NODE_CHECK: 60,
+    CLUSTER_UPDATE: 80,
+    NODE_UPDATE: 80,
+}
+
 ADJUSTMENT_PARAMS = (
     ADJUSTMENT_TYPE, ADJUSTMENT_NUMBER, ADJUSTMENT_MIN_STEP,
     ADJUSTMENT_MIN_SIZE, ADJUSTMENT_MAX_SIZE, ADJUSTMENT_STRICT,
@@ -111,6 +130,13 @@ NODE_SORT_KEYS = [
     NODE_INIT_AT, NODE_CREATED_AT, NODE_UPDATED_AT,
 ]
 
+# Columns loaded for the node summaries returned by node listings
+NODE_SUMMARY_KEYS = [
+    'id', 'name', 'cluster_id', 'physical_id', 'profile_id',
+    'user', 'project', 'domain', 'index', 'role',
+    'init_at', 'created_at', 'updated_at', 'status', 'status_reason',
+]
+
 PROFILE_ATTRS = (
     PROFILE_ID, PROFILE_NAME, PROFILE_TYPE,
     PROFILE_CREATED_AT, PROFILE_UPDATED_AT,
@@ -163,6 +189,12 @@ EVENT_SORT_KEYS = [
     EVENT_USER, EVENT_ACTION, EVENT_STATUS,
 ]
 
+# Columns loaded for the event summaries returned by event listings
+EVENT_SUMMARY_KEYS = [
+    'id', 'timestamp', 'obj_id', 'obj_name', 'obj_type', 'cluster_id',
+    'level', 'user', 'project', 'action', 'status', 'status_reason',
+]
+
 ACTION_ATTRS = (
     ACTION_NAME, ACTION_TARGET, ACTION_ACTION, ACTION_CAUSE,
     ACTION_INTERVAL, ACTION_START_TIME, ACTION_END_TIME,
@@ -182,6 +214,13 @@ ACTION_SORT_KEYS = [
     ACTION_STATUS,
 ]
 
+# Columns loaded for the action summaries returned by action listings
+ACTION_SUMMARY_KEYS = [
+    'id', 'name', 'action', 'target', 'cause', 'owner', 'interval',
+    'start_time', 'end_time', 'timeout', 'status', 'status_reason',
+    'created_at', 'updated_at',
+]
+
 RECEIVER_TYPES = (
     RECEIVER_WEBHOOK,
 ) = (
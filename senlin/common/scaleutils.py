@@ -14,6 +14,7 @@
 Utilities for scaling actions and related policies.
 '''
 
+import heapq
 import math
 import random
 
@@ -232,16 +233,8 @@ def nodes_by_random(nodes, count):
     if count <= len(selected):
         return selected[:count]
 
-    count -= len(selected)
-    random.seed()
-
-    i = count
-    while i > 0:
-        rand = random.randrange(len(candidates))
-        selected.append(candidates[rand].id)
-        candidates.remove(candidates[rand])
-        i = i - 1
-
+    count = min(count - len(selected), len(candidates))
+    selected.extend(n.id for n in random.sample(candidates, count))
     return selected
 
 
@@ -257,16 +250,34 @@ def nodes_by_age(nodes, count, old_first):
     if count <= len(selected):
         return selected[:count]
 
+    # Nodes without a creation time are kept for last in either order
     count -= len(selected)
-    sorted_list = sorted(candidates, key=lambda r: r.created_at)
-    for i in range(count):
-        if old_first:
-            selected.append(sorted_list[i].id)
-        else:  # YOUNGEST_FIRST
-            selected.append(sorted_list[-1 - i].id)
+    if old_first:
+        chosen = heapq.nsmallest(
+            count, candidates,
+            key=lambda n: (n.created_at is None, n.created_at))
+    else:  # YOUNGEST_FIRST
+        chosen = heapq.nlargest(
+            count, candidates,
+            key=lambda n: (n.created_at is not None, n.created_at))
+    selected.extend(n.id for n in chosen)
     return selected
 
 
+def _profile_age_key(node):
+    """Get the sort key for the creation time of the profile of a node.
+
+    Rows returned by ``node_get_all_for_selection`` carry the time as the
+    ``profile_created_at`` column, node objects have to load the profile.
+    The result sorts nodes whose profile has no creation time last.
+    """
+    if hasattr(node, 'rt'):
+        created_at = node.rt['profile'].created_at
+    else:
+        created_at = node.profile_created_at
+    return created_at is None, created_at
+
+
 def nodes_by_profile_age(nodes, count):
     """Select nodes based on node profile creation time.
 
@@ -276,21 +287,11 @@ def nodes_by_profile_age(nodes, count):
     :param count: maximum number of nodes for selection.
     :return: a list of IDs for victim nodes.
     """
-    selected, nodes = filter_error_nodes(nodes)
+    selected, candidates = filter_error_nodes(nodes)
     if count <= len(selected):
         return selected[:count]
 
     count -= len(selected)
-    node_map = []
-    for node in nodes:
-        entry = {
-            'id': node.id,
-            'created_at': node.rt['profile'].created_at
-        }
-        node_map.append(entry)
-
-    sorted_map = sorted(node_map, key=lambda m: m['created_at'])
-    for i in range(count):
-        selected.append(sorted_map[i]['id'])
-
+    chosen = heapq.nsmallest(count, candidates, key=_profile_age_key)
+    selected.extend(n.id for n in chosen)
     return selected
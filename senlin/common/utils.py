@@ -14,8 +14,11 @@
 Utilities module.
 '''
 
+import collections
+import copy
 import random
 import string
+import threading
 
 import requests
 from requests import exceptions
@@ -173,3 +176,54 @@ def format_time(value):
         value = value.replace(microsecond=0)
         value = value.isoformat()
     return value
+
+
+class ObjectCache(object):
+    '''A bounded cache of objects keyed by ID and an update timestamp.
+
+    An entry is only returned for the timestamp it was stored with, so an
+    object updated in the database, e.g. by another engine, is loaded again
+    rather than served stale. The least recently used entry is dropped when
+    the cache is full.
+
+    The cached objects are never handed out, callers get shallow copies of
+    them in which dict and list attributes are copied too, so that changes
+    made to a copy do not leak into the cache.
+    '''
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _copy(obj):
+        new = copy.copy(obj)
+        for key, value in vars(obj).items():
+            if isinstance(value, (dict, list)):
+                setattr(new, key, copy.copy(value))
+        return new
+
+    def get(self, obj_id, timestamp, factory):
+        '''Get a copy of an object, creating it if needed.
+
+        :param obj_id: ID of the object.
+        :param timestamp: The time the object was last updated, or None.
+        :param factory: A callable creating the object when it is not
+                        cached or is cached for another timestamp.
+        '''
+        with self.lock:
+            entry = self.entries.pop(obj_id, None)
+        if entry is None or entry[0] != timestamp:
+            entry = (timestamp, factory())
+
+        with self.lock:
+            self.entries[obj_id] = entry
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return self._copy(entry[1])
+
+    def evict(self, obj_id):
+        '''Drop the object with the given ID from the cache, if any.'''
+        with self.lock:
+            self.entries.pop(obj_id, None)
@@ -60,8 +60,8 @@ def cluster_get_all(context, limit=None, marker=None, sort=None, filters=None,
                                 filters=filters, project_safe=project_safe)
 
 
-def cluster_next_index(context, cluster_id):
-    return IMPL.cluster_next_index(context, cluster_id)
+def cluster_next_index(context, cluster_id, count=1):
+    return IMPL.cluster_next_index(context, cluster_id, count=count)
 
 
 def cluster_count_all(context, filters=None, project_safe=True):
@@ -82,10 +82,18 @@ def node_create(context, values):
     return IMPL.node_create(context, values)
 
 
+def node_create_batch(context, values):
+    return IMPL.node_create_batch(context, values)
+
+
 def node_get(context, node_id, project_safe=True):
     return IMPL.node_get(context, node_id, project_safe=project_safe)
 
 
+def node_get_many(context, node_ids, project_safe=True):
+    return IMPL.node_get_many(context, node_ids, project_safe=project_safe)
+
+
 def node_get_by_name(context, name, project_safe=True):
     return IMPL.node_get_by_name(context, name, project_safe=project_safe)
 
@@ -96,10 +104,10 @@ def node_get_by_short_id(context, short_id, project_safe=True):
 
 
 def node_get_all(context, cluster_id=None, limit=None, marker=None, sort=None,
-                 filters=None, project_safe=True):
+                 filters=None, project_safe=True, columns=None):
     return IMPL.node_get_all(context, cluster_id=cluster_id, filters=filters,
                              limit=limit, marker=marker, sort=sort,
-                             project_safe=project_safe)
+                             project_safe=project_safe, columns=columns)
 
 
 def node_get_all_by_cluster(context, cluster_id, project_safe=True):
@@ -107,6 +115,11 @@ def node_get_all_by_cluster(context, cluster_id, project_safe=True):
                                         project_safe=project_safe)
 
 
+def node_get_all_for_selection(context, cluster_id, project_safe=True):
+    return IMPL.node_get_all_for_selection(context, cluster_id,
+                                           project_safe=project_safe)
+
+
 def node_count_by_cluster(context, cluster_id, project_safe=True):
     return IMPL.node_count_by_cluster(context, cluster_id,
                                       project_safe=project_safe)
@@ -116,6 +129,11 @@ def node_update(context, node_id, values):
     return IMPL.node_update(context, node_id, values)
 
 
+def node_data_update(context, node_id, values=None, removed=None):
+    return IMPL.node_data_update(context, node_id, values=values,
+                                 removed=removed)
+
+
 def node_migrate(context, node_id, to_cluster, timestamp, role=None):
     return IMPL.node_migrate(context, node_id, to_cluster, timestamp, role)
 
@@ -137,6 +155,15 @@ def cluster_lock_steal(node_id, action_id):
     return IMPL.cluster_lock_steal(node_id, action_id)
 
 
+def cluster_lock_acquire_lease(cluster_id, action_id, scope, expiry, now):
+    return IMPL.cluster_lock_acquire_lease(cluster_id, action_id, scope,
+                                           expiry, now)
+
+
+def cluster_lock_renew(cluster_ids, expiry):
+    return IMPL.cluster_lock_renew(cluster_ids, expiry)
+
+
 def node_lock_acquire(node_id, action_id):
     return IMPL.node_lock_acquire(node_id, action_id)
 
@@ -149,6 +176,14 @@ def node_lock_steal(node_id, action_id):
     return IMPL.node_lock_steal(node_id, action_id)
 
 
+def node_lock_acquire_lease(node_id, action_id, expiry, now):
+    return IMPL.node_lock_acquire_lease(node_id, action_id, expiry, now)
+
+
+def node_lock_renew(node_ids, expiry):
+    return IMPL.node_lock_renew(node_ids, expiry)
+
+
 # Policies
 def policy_create(context, values):
     return IMPL.policy_create(context, values)
@@ -208,6 +243,12 @@ def cluster_policy_update(context, cluster_id, policy_id, values):
     return IMPL.cluster_policy_update(context, cluster_id, policy_id, values)
 
 
+def cluster_policy_last_op_update(context, cluster_id, policy_ids,
+                                  timestamp):
+    return IMPL.cluster_policy_last_op_update(context, cluster_id, policy_ids,
+                                              timestamp)
+
+
 # Profiles
 def profile_create(context, values):
     return IMPL.profile_create(context, values)
@@ -263,10 +304,28 @@ def cred_create_update(context, values):
 
 
 # Events
+def event_purge(context, older_than, limit, cluster_id=None, project=None):
+    return IMPL.event_purge(context, older_than, limit,
+                            cluster_id=cluster_id, project=project)
+
+
+def event_count_over_limit(context, group_by, limit):
+    return IMPL.event_count_over_limit(context, group_by, limit)
+
+
+def event_timestamp_cutoff(context, keep, cluster_id=None, project=None):
+    return IMPL.event_timestamp_cutoff(context, keep, cluster_id=cluster_id,
+                                       project=project)
+
+
 def event_create(context, values):
     return IMPL.event_create(context, values)
 
 
+def event_create_batch(context, values):
+    return IMPL.event_create_batch(context, values)
+
+
 def event_get(context, event_id, project_safe=True):
     return IMPL.event_get(context, event_id, project_safe=project_safe)
 
@@ -277,9 +336,10 @@ def event_get_by_short_id(context, short_id, project_safe=True):
 
 
 def event_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                  project_safe=True):
+                  project_safe=True, columns=None):
     return IMPL.event_get_all(context, limit=limit, marker=marker, sort=sort,
-                              filters=filters, project_safe=project_safe)
+                              filters=filters, project_safe=project_safe,
+                              columns=columns)
 
 
 def event_count_by_cluster(context, cluster_id, project_safe=True):
@@ -299,6 +359,10 @@ def action_create(context, values):
     return IMPL.action_create(context, values)
 
 
+def action_create_batch(context, values):
+    return IMPL.action_create_batch(context, values)
+
+
 def action_update(context, action_id, values):
     return IMPL.action_update(context, action_id, values)
 
@@ -322,10 +386,10 @@ def action_get_all_by_owner(context, owner):
 
 
 def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
-                   project_safe=True):
+                   project_safe=True, columns=None):
     return IMPL.action_get_all(context, filters=filters, sort=sort,
                                limit=limit, marker=marker,
-                               project_safe=project_safe)
+                               project_safe=project_safe, columns=columns)
 
 
 def action_check_status(context, action_id, timestamp):
@@ -344,6 +408,14 @@ def dependency_get_dependents(context, action_id):
     return IMPL.dependency_get_dependents(context, action_id)
 
 
+def dependency_get_all(context, action_ids):
+    return IMPL.dependency_get_all(context, action_ids)
+
+
+def action_mark_ready(context, action_ids):
+    return IMPL.action_mark_ready(context, action_ids)
+
+
 def action_mark_succeeded(context, action_id, timestamp):
     return IMPL.action_mark_succeeded(context, action_id, timestamp)
 
@@ -364,6 +436,14 @@ def action_acquire_1st_ready(context, owner, timestamp):
     return IMPL.action_acquire_1st_ready(context, owner, timestamp)
 
 
+def action_acquire_ready(context, owner, timestamp, limit=1):
+    return IMPL.action_acquire_ready(context, owner, timestamp, limit=limit)
+
+
+def action_age_ready(context, older_than):
+    return IMPL.action_age_ready(context, older_than)
+
+
 def action_abandon(context, action_id):
     return IMPL.action_abandon(context, action_id)
 
@@ -450,8 +530,13 @@ def registry_delete(context, cluster_id):
     return IMPL.registry_delete(context, cluster_id)
 
 
-def registry_claim(context, engine_id):
-    return IMPL.registry_claim(context, engine_id=engine_id)
+def registry_claim(context, engine_id, cluster_ids=None):
+    return IMPL.registry_claim(context, engine_id=engine_id,
+                               cluster_ids=cluster_ids)
+
+
+def registry_get_all(context):
+    return IMPL.registry_get_all(context)
 
 
 def db_sync(engine, version=None):
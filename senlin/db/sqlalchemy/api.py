@@ -24,6 +24,8 @@ from oslo_db.sqlalchemy import enginefacade
 from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_log import log as logging
 from oslo_utils import timeutils
+import sqlalchemy
+from sqlalchemy import func
 from sqlalchemy.orm import joinedload_all
 
 from senlin.common import consts
@@ -31,6 +33,7 @@ from senlin.common import exception
 from senlin.common.i18n import _
 from senlin.db.sqlalchemy import migration
 from senlin.db.sqlalchemy import models
+from senlin.db.sqlalchemy import types
 from senlin.db.sqlalchemy import utils
 
 LOG = logging.getLogger(__name__)
@@ -38,6 +41,7 @@ LOG = logging.getLogger(__name__)
 
 CONF = cfg.CONF
 CONF.import_opt('max_events_per_cluster', 'senlin.common.config')
+CONF.import_opt('event_purge_batch_size', 'senlin.common.config')
 
 _main_context_manager = None
 _CONTEXT = threading.local()
@@ -92,6 +96,21 @@ def query_by_short_id(context, model, short_id, project_safe=True):
         raise exception.MultipleChoices(arg=short_id)
 
 
+def _projection_query(context, model, columns):
+    '''Query only the given columns of a model, without eager loading.'''
+    with session_for_read() as session:
+        return session.query(*[getattr(model, c) for c in columns])
+
+
+def _paginate_projection(context, model, query, limit, marker, keys, dirs):
+    # Only the sort keys of the marker are needed for keyset pagination
+    if marker:
+        marker = _projection_query(context, model, keys).filter(
+            model.id == marker).first()
+    return utils.paginate_query(query, model, limit, keys, marker=marker,
+                                sort_dirs=dirs).all()
+
+
 def query_by_name(context, model, name, project_safe=True):
     q = model_query(context, model)
     q = q.filter_by(name=name)
@@ -160,14 +179,20 @@ def cluster_get_all(context, limit=None, marker=None, sort=None, filters=None,
                                    marker=marker, sort_dirs=dirs).all()
 
 
-def cluster_next_index(context, cluster_id):
+def cluster_next_index(context, cluster_id, count=1):
+    '''Reserve a range of node indexes from a cluster.
+
+    :param cluster_id: ID of the cluster.
+    :param count: Number of consecutive indexes to reserve.
+    :return: The first index in the reserved range.
+    '''
     with session_for_write() as session:
         cluster = session.query(models.Cluster).get(cluster_id)
         if cluster is None:
             return 0
 
         next_index = cluster.next_index
-        cluster.next_index += 1
+        cluster.next_index += count
         cluster.save(session)
         return next_index
 
@@ -220,6 +245,16 @@ def node_create(context, values):
         return node
 
 
+def node_create_batch(context, values):
+    '''Create a batch of nodes using a single bulk insert.
+
+    :param values: A list of dictionaries, each containing the property
+                   values of a node. The node IDs must have been assigned.
+    '''
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Node, values)
+
+
 def node_get(context, node_id, project_safe=True):
     node = model_query(context, models.Node).get(node_id)
     if not node:
@@ -232,6 +267,24 @@ def node_get(context, node_id, project_safe=True):
     return node
 
 
+def node_get_many(context, node_ids, project_safe=True):
+    '''Get the nodes with the given IDs in a single query.
+
+    :param node_ids: A list of node IDs.
+    :returns: A list of the nodes found, in no particular order. IDs of
+              nodes that do not exist are ignored.
+    '''
+    if not node_ids:
+        return []
+
+    query = model_query(context, models.Node)
+    query = query.filter(models.Node.id.in_(node_ids))
+    if not context.is_admin and project_safe:
+        query = query.filter_by(project=context.project)
+
+    return query.all()
+
+
 def node_get_by_name(context, name, project_safe=True):
     return query_by_name(context, models.Node, name, project_safe=project_safe)
 
@@ -241,8 +294,12 @@ def node_get_by_short_id(context, short_id, project_safe=True):
                              project_safe=project_safe)
 
 
-def _query_node_get_all(context, project_safe=True, cluster_id=None):
-    query = model_query(context, models.Node)
+def _query_node_get_all(context, project_safe=True, cluster_id=None,
+                        columns=None):
+    if columns:
+        query = _projection_query(context, models.Node, columns)
+    else:
+        query = model_query(context, models.Node)
 
     if cluster_id is not None:
         query = query.filter_by(cluster_id=cluster_id)
@@ -254,14 +311,17 @@ def _query_node_get_all(context, project_safe=True, cluster_id=None):
 
 
 def node_get_all(context, cluster_id=None, limit=None, marker=None, sort=None,
-                 filters=None, project_safe=True):
+                 filters=None, project_safe=True, columns=None):
     query = _query_node_get_all(context, project_safe=project_safe,
-                                cluster_id=cluster_id)
+                                cluster_id=cluster_id, columns=columns)
 
     if filters:
         query = utils.exact_filter(query, models.Node, filters)
 
     keys, dirs = utils.get_sort_params(sort, consts.NODE_INIT_AT)
+    if columns:
+        return _paginate_projection(context, models.Node, query, limit,
+                                    marker, keys, dirs)
     if marker:
         marker = model_query(context, models.Node).get(marker)
     return sa_utils.paginate_query(query, models.Node, limit, keys,
@@ -273,6 +333,26 @@ def node_get_all_by_cluster(context, cluster_id, project_safe=True):
                                project_safe=project_safe).all()
 
 
+def node_get_all_for_selection(context, cluster_id, project_safe=True):
+    '''Get the properties used for choosing victim nodes of a cluster.
+
+    :param cluster_id: ID of the cluster.
+    :returns: A list of rows with the ``id``, ``status`` and ``created_at``
+              of each node, together with the ``created_at`` of its profile
+              as ``profile_created_at``, all fetched in a single query.
+    '''
+    with session_for_read() as session:
+        query = session.query(
+            models.Node.id, models.Node.status, models.Node.created_at,
+            models.Profile.created_at.label('profile_created_at'))
+        query = query.outerjoin(
+            models.Profile, models.Node.profile_id == models.Profile.id)
+        query = query.filter(models.Node.cluster_id == cluster_id)
+        if not context.is_admin and project_safe:
+            query = query.filter(models.Node.project == context.project)
+        return query.all()
+
+
 def node_count_by_cluster(context, cluster_id, project_safe=True):
     return _query_node_get_all(context, cluster_id=cluster_id,
                                project_safe=project_safe).count()
@@ -303,6 +383,72 @@ def node_update(context, node_id, values):
                 cluster.save(session)
 
 
+def _json_path(key):
+    return '$."%s"' % key.replace('"', '\\"')
+
+
+def _json_update_expr(dialect, column, values, removed):
+    '''Build an expression setting and removing keys of a JSON column.'''
+    if dialect.name == 'postgresql':
+        jsonb = types.PostgreSQLJSONB()
+        expr = func.coalesce(column,
+                             sqlalchemy.cast(sqlalchemy.literal('{}'), jsonb))
+        if values:
+            doc = sqlalchemy.literal(types.dumps(values))
+            expr = expr.op('||')(sqlalchemy.cast(doc, jsonb))
+        for key in removed:
+            expr = expr.op('-')(sqlalchemy.literal(key))
+        return expr
+
+    expr = func.coalesce(column, func.JSON_OBJECT())
+    if values:
+        args = []
+        for key, value in values.items():
+            args.extend([_json_path(key),
+                         func.JSON_EXTRACT(types.dumps(value), '$')])
+        expr = func.JSON_SET(expr, *args)
+    if removed:
+        expr = func.JSON_REMOVE(expr, *[_json_path(k) for k in removed])
+    return expr
+
+
+def node_data_update(context, node_id, values=None, removed=None):
+    '''Set or remove some keys in the data of a node.
+
+    Where the data is stored in a native JSON column, only the given keys
+    are written by the database. Otherwise the data is read and written
+    back in the same transaction.
+
+    :param node_id: ID of the node to be updated.
+    :param values: A dictionary of keys and values to be set in the data.
+    :param removed: A list of keys to be removed from the data.
+    :raises NodeNotFound: The specified node does not exist in database.
+    '''
+    values = values or {}
+    removed = removed or []
+    with session_for_write() as session:
+        dialect = session.get_bind().dialect
+        if types.native_json(dialect):
+            expr = _json_update_expr(dialect, models.Node.data, values,
+                                     removed)
+            count = session.query(models.Node).filter_by(id=node_id).update(
+                {models.Node.data: expr}, synchronize_session=False)
+            if not count:
+                raise exception.NodeNotFound(node=node_id)
+            return
+
+        node = session.query(models.Node).get(node_id)
+        if not node:
+            raise exception.NodeNotFound(node=node_id)
+
+        data = dict(node.data or {})
+        data.update(values)
+        for key in removed:
+            data.pop(key, None)
+        node.data = data
+        node.save(session)
+
+
 def node_migrate(context, node_id, to_cluster, timestamp, role=None):
     with session_for_write() as session:
         node = session.query(models.Node).get(node_id)
@@ -401,6 +547,59 @@ def cluster_lock_steal(cluster_id, action_id):
         return lock.action_ids
 
 
+def _lease_expired(lock, now):
+    return lock.lease_expiry is not None and lock.lease_expiry < now
+
+
+def cluster_lock_acquire_lease(cluster_id, action_id, scope, expiry, now):
+    '''Acquire lock on a cluster with a lease.
+
+    A lock whose lease has expired, i.e. no engine holding it has renewed
+    it in time, is taken over by the acquiring action.
+
+    :param cluster_id: ID of the cluster.
+    :param action_id: ID of the action that attempts to lock the cluster.
+    :param scope: +1 means a node-level operation lock; -1 indicates
+                  a cluster-level lock.
+    :param expiry: The time when the lease expires if not renewed.
+    :param now: The current time for checking expired leases.
+    :return: A tuple of the list of action IDs that currently work on the
+             cluster and the list of action IDs whose expired lock was
+             taken over.
+    '''
+    with session_for_write() as session:
+        stolen = []
+        lock = session.query(models.ClusterLock).get(cluster_id)
+        if lock is None:
+            lock = models.ClusterLock(cluster_id=cluster_id,
+                                      action_ids=[six.text_type(action_id)],
+                                      semaphore=scope, lease_expiry=expiry)
+            session.add(lock)
+        elif _lease_expired(lock, now):
+            stolen = [a for a in lock.action_ids if a != action_id]
+            lock.action_ids = [six.text_type(action_id)]
+            lock.semaphore = scope
+            lock.lease_expiry = expiry
+            lock.save(session)
+        elif scope == 1 and lock.semaphore > 0:
+            if action_id not in lock.action_ids:
+                lock.action_ids.append(six.text_type(action_id))
+                lock.semaphore += 1
+                lock.lease_expiry = expiry
+                lock.save(session)
+
+        return lock.action_ids, stolen
+
+
+def cluster_lock_renew(cluster_ids, expiry):
+    '''Extend the leases of the locks on the given clusters.'''
+    with session_for_write() as session:
+        query = session.query(models.ClusterLock).filter(
+            models.ClusterLock.cluster_id.in_(cluster_ids))
+        return query.update({'lease_expiry': expiry},
+                            synchronize_session=False)
+
+
 def node_lock_acquire(node_id, action_id):
     with session_for_write() as session:
         lock = session.query(models.NodeLock).get(node_id)
@@ -435,6 +634,38 @@ def node_lock_steal(node_id, action_id):
         return lock.action_id
 
 
+def node_lock_acquire_lease(node_id, action_id, expiry, now):
+    '''Acquire lock on a node with a lease.
+
+    :return: A tuple of the ID of the action that currently owns the node
+             and the ID of the action whose expired lock was taken over, or
+             None if no lock was taken over.
+    '''
+    with session_for_write() as session:
+        stolen = None
+        lock = session.query(models.NodeLock).get(node_id)
+        if lock is None:
+            lock = models.NodeLock(node_id=node_id, action_id=action_id,
+                                   lease_expiry=expiry)
+            session.add(lock)
+        elif lock.action_id != action_id and _lease_expired(lock, now):
+            stolen = lock.action_id
+            lock.action_id = action_id
+            lock.lease_expiry = expiry
+            lock.save(session)
+
+        return lock.action_id, stolen
+
+
+def node_lock_renew(node_ids, expiry):
+    '''Extend the leases of the locks on the given nodes.'''
+    with session_for_write() as session:
+        query = session.query(models.NodeLock).filter(
+            models.NodeLock.node_id.in_(node_ids))
+        return query.update({'lease_expiry': expiry},
+                            synchronize_session=False)
+
+
 # Policies
 def policy_create(context, values):
     with session_for_write() as session:
@@ -580,6 +811,16 @@ def cluster_policy_update(context, cluster_id, policy_id, values):
         return binding
 
 
+def cluster_policy_last_op_update(context, cluster_id, policy_ids,
+                                  timestamp):
+    '''Record the last operation time of some bindings in one update.'''
+    with session_for_write() as session:
+        query = session.query(models.ClusterPolicies).filter(
+            models.ClusterPolicies.cluster_id == cluster_id,
+            models.ClusterPolicies.policy_id.in_(policy_ids))
+        query.update({'last_op': timestamp}, synchronize_session=False)
+
+
 # Profiles
 def profile_create(context, values):
     with session_for_write() as session:
@@ -701,18 +942,18 @@ def cred_create_update(context, values):
 
 
 # Events
-def _delete_event_rows(context, cluster_id, limit):
+def _delete_event_rows(session, query, limit):
     # MySQL does not support LIMIT in subqueries,
     # sqlite does not support JOIN in DELETE.
-    # So we must manually supply the IN() values.
-    # pgsql SHOULD work with the pure DELETE/JOIN below but that must be
-    # confirmed via integration tests.
-    query = event_count_by_cluster(context, cluster_id)
-    with session_for_write() as session:
-        all_events = query.order_by(models.Event.timestamp).limit(limit).all()
-        ids = [r.id for r in all_events]
-        q = session.query(models.Event).filter(models.Event.id.in_(ids))
-        return q.delete(synchronize_session='fetch')
+    # So we must manually supply the IN() values. Only the IDs of a bounded
+    # chunk of the oldest events are selected, using the indexes on the
+    # filtered columns and the timestamp.
+    query = query.order_by(models.Event.timestamp).limit(limit)
+    ids = [r.id for r in query]
+    if not ids:
+        return 0
+    q = session.query(models.Event).filter(models.Event.id.in_(ids))
+    return q.delete(synchronize_session=False)
 
 
 def event_prune(context, cluster_id):
@@ -721,7 +962,67 @@ def event_prune(context, cluster_id):
         if (event_count >= cfg.CONF.max_events_per_cluster):
             # prune events
             batch_size = cfg.CONF.event_purge_batch_size
-            _delete_event_rows(context, cluster_id, batch_size)
+            with session_for_write() as session:
+                query = session.query(models.Event.id)
+                query = query.filter_by(cluster_id=cluster_id)
+                return _delete_event_rows(session, query, batch_size)
+
+
+def event_purge(context, older_than, limit, cluster_id=None, project=None):
+    '''Delete a chunk of the events older than the given time.
+
+    :param older_than: Only events with a timestamp before this are deleted.
+    :param limit: Maximum number of events deleted.
+    :param cluster_id: If specified, only the events of this cluster are
+                       deleted.
+    :param project: If specified, only the events of this project are
+                    deleted.
+    :returns: The number of events deleted.
+    '''
+    with session_for_write() as session:
+        query = session.query(models.Event.id)
+        if cluster_id is not None:
+            query = query.filter_by(cluster_id=cluster_id)
+        if project is not None:
+            query = query.filter_by(project=project)
+        query = query.filter(models.Event.timestamp < older_than)
+        return _delete_event_rows(session, query, limit)
+
+
+def event_count_over_limit(context, group_by, limit):
+    '''Find the clusters or the projects having too many events.
+
+    :param group_by: Either 'cluster_id' or 'project'.
+    :param limit: Number of events a cluster or a project may have.
+    :returns: A list of (cluster ID or project, event count) tuples.
+    '''
+    column = getattr(models.Event, group_by)
+    count = func.count(models.Event.id)
+    with session_for_read() as session:
+        query = session.query(column, count).filter(column.isnot(None))
+        return query.group_by(column).having(count > limit).all()
+
+
+def event_timestamp_cutoff(context, keep, cluster_id=None, project=None):
+    '''Get the timestamp of the oldest event among the newest ones.
+
+    :param keep: Number of the newest events to be kept.
+    :param cluster_id: If specified, only the events of this cluster are
+                       counted.
+    :param project: If specified, only the events of this project are
+                    counted.
+    :returns: The timestamp of the `keep`-th newest event, or None if there
+              are not so many events.
+    '''
+    with session_for_read() as session:
+        query = session.query(models.Event.timestamp)
+        if cluster_id is not None:
+            query = query.filter_by(cluster_id=cluster_id)
+        if project is not None:
+            query = query.filter_by(project=project)
+        query = query.order_by(models.Event.timestamp.desc())
+        row = query.offset(keep - 1).limit(1).first()
+        return row.timestamp if row else None
 
 
 def event_create(context, values):
@@ -732,6 +1033,17 @@ def event_create(context, values):
         return event
 
 
+def event_create_batch(context, values):
+    '''Create a batch of events using a single bulk insert.
+
+    :param values: A list of dictionaries, each containing the property
+                   values of an event. The event IDs must have been
+                   assigned.
+    '''
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Event, values)
+
+
 def event_get(context, event_id, project_safe=True):
     event = model_query(context, models.Event).get(event_id)
     if not context.is_admin and project_safe and event is not None:
@@ -747,11 +1059,15 @@ def event_get_by_short_id(context, short_id, project_safe=True):
 
 
 def _event_filter_paginate_query(context, query, filters=None,
-                                 limit=None, marker=None, sort=None):
+                                 limit=None, marker=None, sort=None,
+                                 columns=None):
     if filters:
         query = utils.exact_filter(query, models.Event, filters)
 
     keys, dirs = utils.get_sort_params(sort, consts.EVENT_TIMESTAMP)
+    if columns:
+        return _paginate_projection(context, models.Event, query, limit,
+                                    marker, keys, dirs)
     if marker:
         marker = model_query(context, models.Event).get(marker)
     return sa_utils.paginate_query(query, models.Event, limit, keys,
@@ -759,13 +1075,17 @@ def _event_filter_paginate_query(context, query, filters=None,
 
 
 def event_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                  project_safe=True):
-    query = model_query(context, models.Event)
+                  project_safe=True, columns=None):
+    if columns:
+        query = _projection_query(context, models.Event, columns)
+    else:
+        query = model_query(context, models.Event)
     if not context.is_admin and project_safe:
         query = query.filter_by(project=context.project)
 
     return _event_filter_paginate_query(context, query, filters=filters,
-                                        limit=limit, marker=marker, sort=sort)
+                                        limit=limit, marker=marker, sort=sort,
+                                        columns=columns)
 
 
 def event_count_by_cluster(context, cluster_id, project_safe=True):
@@ -799,6 +1119,17 @@ def action_create(context, values):
         return action
 
 
+def action_create_batch(context, values):
+    '''Create a batch of actions using a single bulk insert.
+
+    :param values: A list of dictionaries, each containing the property
+                   values of an action. The action IDs must have been
+                   assigned.
+    '''
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Action, values)
+
+
 def action_update(context, action_id, values):
     with session_for_write() as session:
         action = session.query(models.Action).get(action_id)
@@ -840,9 +1171,12 @@ def action_get_all_by_owner(context, owner_id):
 
 
 def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
-                   project_safe=True):
+                   project_safe=True, columns=None):
 
-    query = model_query(context, models.Action)
+    if columns:
+        query = _projection_query(context, models.Action, columns)
+    else:
+        query = model_query(context, models.Action)
     # TODO(Qiming): Enable multi-tenancy for actions
     # if project_safe:
     #    query = query.filter_by(project=context.project)
@@ -851,6 +1185,9 @@ def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
         query = utils.exact_filter(query, models.Action, filters)
 
     keys, dirs = utils.get_sort_params(sort, consts.ACTION_CREATED_AT)
+    if columns:
+        return _paginate_projection(context, models.Action, query, limit,
+                                    marker, keys, dirs)
     if marker:
         marker = model_query(context, models.Action).get(marker)
     return sa_utils.paginate_query(query, models.Action, limit, keys,
@@ -888,6 +1225,22 @@ def dependency_get_dependents(context, action_id):
         return [d.dependent for d in q.all()]
 
 
+def dependency_get_all(context, action_ids):
+    '''Get the dependencies of the given actions, in either direction.
+
+    :param action_ids: A list of action IDs.
+    :returns: A list of (depended, dependent) tuples.
+    '''
+    if not action_ids:
+        return []
+    dep = models.ActionDependency
+    with session_for_read() as session:
+        q = session.query(dep.depended, dep.dependent)
+        q = q.filter(dep.depended.in_(action_ids) |
+                     dep.dependent.in_(action_ids))
+        return [(d.depended, d.dependent) for d in q]
+
+
 def dependency_add(context, depended, dependent):
     if isinstance(depended, list) and isinstance(dependent, list):
         raise exception.NotSupport(
@@ -923,7 +1276,37 @@ def dependency_add(context, depended, dependent):
                  synchronize_session=False)
 
 
+def _get_dependent_owners(session, dependents):
+    '''Get the owners of the given dependent actions.
+
+    :param session: The DB session to use.
+    :param dependents: A list of action IDs.
+    :return: A dict mapping each action ID to the ID of the engine that is
+             currently executing it, or None if the action is not running.
+    '''
+    if not dependents:
+        return {}
+
+    query = session.query(models.Action.id, models.Action.owner)
+    query = query.filter(models.Action.id.in_(dependents))
+    return dict((r.id, r.owner) for r in query.all())
+
+
+def action_mark_ready(context, action_ids):
+    '''Mark a list of actions as READY using a single update.'''
+    with session_for_write() as session:
+        query = session.query(models.Action).filter(
+            models.Action.id.in_(action_ids))
+        query.update({'status': consts.ACTION_READY},
+                     synchronize_session=False)
+
+
 def action_mark_succeeded(context, action_id, timestamp):
+    '''Mark an action as succeeded and remove the dependencies on it.
+
+    :return: A dict mapping the ID of each dependent action that has no more
+             depended actions to the ID of its owner engine.
+    '''
     with session_for_write() as session:
 
         query = session.query(models.Action).filter_by(id=action_id)
@@ -937,7 +1320,19 @@ def action_mark_succeeded(context, action_id, timestamp):
 
         subquery = session.query(models.ActionDependency).filter_by(
             depended=action_id)
+        dependents = [d.dependent for d in subquery.all()]
         subquery.delete(synchronize_session=False)
+        if not dependents:
+            return {}
+
+        # Dependents still waiting for other actions cannot proceed yet
+        query = session.query(models.ActionDependency.dependent)
+        query = query.filter(
+            models.ActionDependency.dependent.in_(dependents))
+        waiting = set(r.dependent for r in query.all())
+        ready = [d for d in dependents if d not in waiting]
+
+        return _get_dependent_owners(session, ready)
 
 
 def _mark_failed(session, action_id, timestamp, reason=None):
@@ -957,13 +1352,22 @@ def _mark_failed(session, action_id, timestamp, reason=None):
     dependents = [d.dependent for d in query.all()]
     query.delete(synchronize_session=False)
 
+    # Owners are collected before the dependents are marked and unlocked
+    owners = _get_dependent_owners(session, dependents)
     for d in dependents:
         _mark_failed(session, d, timestamp)
 
+    return owners
+
 
 def action_mark_failed(context, action_id, timestamp, reason=None):
+    '''Mark an action and all actions depending on it as failed.
+
+    :return: A dict mapping the ID of each direct dependent action to the ID
+             of its owner engine.
+    '''
     with session_for_write() as session:
-        _mark_failed(session, action_id, timestamp, reason)
+        return _mark_failed(session, action_id, timestamp, reason)
 
 
 def _mark_cancelled(session, action_id, timestamp, reason=None):
@@ -982,13 +1386,21 @@ def _mark_cancelled(session, action_id, timestamp, reason=None):
     dependents = [d.dependent for d in query.all()]
     query.delete(synchronize_session=False)
 
+    owners = _get_dependent_owners(session, dependents)
     for d in dependents:
         _mark_cancelled(session, d, timestamp)
 
+    return owners
+
 
 def action_mark_cancelled(context, action_id, timestamp, reason=None):
+    '''Mark an action and all actions depending on it as cancelled.
+
+    :return: A dict mapping the ID of each direct dependent action to the ID
+             of its owner engine.
+    '''
     with session_for_write() as session:
-        _mark_cancelled(session, action_id, timestamp, reason)
+        return _mark_cancelled(session, action_id, timestamp, reason)
 
 
 def action_acquire(context, action_id, owner, timestamp):
@@ -1015,18 +1427,96 @@ def action_acquire(context, action_id, owner, timestamp):
 
 
 def action_acquire_1st_ready(context, owner, timestamp):
+    actions = action_acquire_ready(context, owner, timestamp, limit=1)
+    if actions:
+        return actions[0]
+
+
+def _supports_skip_locked(session):
+    dialect = session.bind.dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == 'postgresql':
+        return version >= (9, 5)
+    if dialect.name == 'mysql':
+        return version >= (8, 0, 1)
+    return False
+
+
+def action_acquire_ready(context, owner, timestamp, limit=1):
+    '''Acquire a batch of READY actions for a worker.
+
+    Actions are claimed in the order of their priority and then their
+    creation time. On backends that support it, the candidate rows are
+    locked using 'SELECT ... FOR UPDATE SKIP LOCKED' so that concurrent
+    engines claim disjoint sets of actions without blocking each other. On
+    other backends such as SQLite, each action is claimed with a conditional
+    UPDATE which only succeeds if no other worker has claimed the action in
+    between.
+
+    :param owner: ID of the worker acquiring the actions.
+    :param timestamp: The time when the actions are acquired.
+    :param limit: Maximum number of actions to acquire.
+    :return: A list of actions acquired, which can be empty.
+    '''
+    values = {
+        'owner': owner,
+        'start_time': timestamp,
+        'status': consts.ACTION_RUNNING,
+        'status_reason': _('The action is being processed.'),
+    }
     with session_for_write() as session:
-        action = session.query(models.Action).\
-            filter_by(status=consts.ACTION_READY).\
-            filter_by(owner=None).first()
-
-        if action:
-            action.owner = owner
-            action.start_time = timestamp
-            action.status = consts.ACTION_RUNNING
-            action.status_reason = _('The action is being processed.')
-            action.save(session)
-            return action
+        query = session.query(models.Action).filter_by(
+            status=consts.ACTION_READY, owner=None)
+        query = query.order_by(models.Action.priority,
+                               models.Action.created_at).limit(limit)
+
+        if _supports_skip_locked(session):
+            query = query.with_for_update().suffix_with('SKIP LOCKED')
+            actions = query.all()
+            for action in actions:
+                action.update(values)
+                action.save(session)
+            return actions
+
+        candidates = [a.id for a in query.with_entities(models.Action.id)]
+        acquired = []
+        for action_id in candidates:
+            query = session.query(models.Action).filter_by(
+                id=action_id, status=consts.ACTION_READY, owner=None)
+            if query.update(values, synchronize_session=False) == 1:
+                acquired.append(action_id)
+
+        if not acquired:
+            return []
+
+        query = session.query(models.Action).filter(
+            models.Action.id.in_(acquired))
+        query = query.order_by(models.Action.priority,
+                               models.Action.created_at)
+        return query.all()
+
+
+def action_age_ready(context, older_than):
+    '''Raise the priority of the READY actions waiting for too long.
+
+    An action is aged at most once per period no matter how many engines
+    are doing the aging, because the update refreshes its 'updated_at'.
+
+    :param older_than: A datetime; READY actions not updated since then get
+                       their priority raised by one level.
+    :return: The number of actions aged.
+    '''
+    last_updated = func.coalesce(models.Action.updated_at,
+                                 models.Action.created_at)
+    with session_for_write() as session:
+        query = session.query(models.Action).filter(
+            models.Action.status == consts.ACTION_READY,
+            models.Action.owner.is_(None),
+            models.Action.priority > 0,
+            last_updated < older_than)
+        return query.update({'priority': models.Action.priority - 1,
+                             'updated_at': timeutils.utcnow()},
+                            synchronize_session=False)
 
 
 def action_abandon(context, action_id):
@@ -1184,18 +1674,29 @@ def service_get_all(context):
 
 
 # HealthRegistry
-def registry_claim(context, engine_id):
+def registry_claim(context, engine_id, cluster_ids=None):
     with session_for_write() as session:
-        q_eng = session.query(models.Service)
-        svc_ids = [s.id for s in q_eng.all()]
-
         q_reg = session.query(models.HealthRegistry)
-        q_reg = q_reg.filter(models.HealthRegistry.engine_id.notin_(svc_ids))
+        if cluster_ids is None:
+            q_eng = session.query(models.Service)
+            svc_ids = [s.id for s in q_eng.all()]
+            q_reg = q_reg.filter(
+                models.HealthRegistry.engine_id.notin_(svc_ids))
+        else:
+            if not cluster_ids:
+                return []
+            q_reg = q_reg.filter(
+                models.HealthRegistry.cluster_id.in_(cluster_ids))
         q_reg.update({'engine_id': engine_id}, synchronize_session=False)
         result = q_reg.all()
         return result
 
 
+def registry_get_all(context):
+    with session_for_read() as session:
+        return session.query(models.HealthRegistry).all()
+
+
 def registry_delete(context, cluster_id):
     with session_for_write() as session:
         registry = session.query(models.HealthRegistry).filter_by(
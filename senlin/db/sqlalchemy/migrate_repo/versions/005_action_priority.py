@@ -0,0 +1,29 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from sqlalchemy import Column, Index, Integer, MetaData, Table
+
+from senlin.common import consts
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    action = Table('action', meta, autoload=True)
+    priority = Column('priority', Integer,
+                      default=consts.ACTION_DEFAULT_PRIORITY)
+    priority.create(action, populate_default=True)
+
+    # Ready actions are claimed by status and owner, in priority order
+    Index('ix_action_status_owner', action.c.status, action.c.owner,
+          action.c.priority, action.c.created_at).create(migrate_engine)
@@ -0,0 +1,34 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from sqlalchemy import Index, MetaData, Table
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    action = Table('action', meta, autoload=True)
+    dependency = Table('dependency', meta, autoload=True)
+    event = Table('event', meta, autoload=True)
+
+    indexes = [
+        Index('ix_action_owner', action.c.owner),
+        Index('ix_dependency_depended', dependency.c.depended,
+              dependency.c.dependent),
+        Index('ix_dependency_dependent', dependency.c.dependent,
+              dependency.c.depended),
+        Index('ix_event_cluster_id_timestamp', event.c.cluster_id,
+              event.c.timestamp),
+    ]
+    for index in indexes:
+        index.create(migrate_engine)
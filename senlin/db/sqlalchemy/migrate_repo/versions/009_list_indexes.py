@@ -0,0 +1,32 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from sqlalchemy import Index, MetaData, Table
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    node = Table('node', meta, autoload=True)
+    action = Table('action', meta, autoload=True)
+
+    # Used by the keyset pagination of node and action listings on their
+    # default sort keys
+    indexes = [
+        Index('ix_node_init_at', node.c.init_at, node.c.id),
+        Index('ix_node_cluster_id_init_at', node.c.cluster_id,
+              node.c.init_at, node.c.id),
+        Index('ix_action_created_at', action.c.created_at, action.c.id),
+    ]
+    for index in indexes:
+        index.create(migrate_engine)
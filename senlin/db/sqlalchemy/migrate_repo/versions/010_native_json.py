@@ -0,0 +1,46 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from senlin.db.sqlalchemy import types
+
+JSON_COLUMNS = {
+    'profile': ['context', 'spec', 'meta_data'],
+    'policy': ['spec', 'data'],
+    'cluster': ['meta_data', 'data'],
+    'node': ['meta_data', 'data'],
+    'cluster_lock': ['action_ids'],
+    'cluster_policy': ['data'],
+    'health_registry': ['params'],
+    'receiver': ['actor', 'params', 'channel'],
+    'credential': ['cred', 'data'],
+    'action': ['context', 'inputs', 'outputs', 'data'],
+    'event': ['meta_data'],
+}
+
+
+def upgrade(migrate_engine):
+    # The server version is known only after a connection is made
+    migrate_engine.connect().close()
+    dialect = migrate_engine.dialect
+    if not types.native_json(dialect):
+        return
+
+    for table, columns in sorted(JSON_COLUMNS.items()):
+        for column in columns:
+            if dialect.name == 'postgresql':
+                stmt = ('ALTER TABLE %(t)s ALTER COLUMN %(c)s TYPE JSONB '
+                        'USING %(c)s::JSONB')
+            elif table == 'credential' and column == 'cred':
+                stmt = 'ALTER TABLE %(t)s MODIFY %(c)s JSON NOT NULL'
+            else:
+                stmt = 'ALTER TABLE %(t)s MODIFY %(c)s JSON'
+            migrate_engine.execute(stmt % {'t': table, 'c': column})
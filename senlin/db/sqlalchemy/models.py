@@ -17,11 +17,12 @@ SQLAlchemy models for Senlin data.
 from oslo_db.sqlalchemy import models
 from oslo_utils import uuidutils
 from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer
-from sqlalchemy import String, Text
+from sqlalchemy import Index, String, Text
 from sqlalchemy.ext import declarative
 from sqlalchemy.orm import backref
 from sqlalchemy.orm import relationship
 
+from senlin.common import consts
 from senlin.db.sqlalchemy import types
 
 BASE = declarative.declarative_base()
@@ -97,7 +98,11 @@ class Cluster(BASE, TimestampMixin, models.ModelBase):
 class Node(BASE, TimestampMixin, models.ModelBase):
     """Node objects."""
 
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_node_init_at', 'init_at', 'id'),
+        Index('ix_node_cluster_id_init_at', 'cluster_id', 'init_at', 'id'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'node'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -127,6 +132,7 @@ class ClusterLock(BASE, models.ModelBase):
     cluster_id = Column(String(36), primary_key=True, nullable=False)
     action_ids = Column(types.List)
     semaphore = Column(Integer)
+    lease_expiry = Column(DateTime)
 
 
 class NodeLock(BASE, models.ModelBase):
@@ -136,6 +142,7 @@ class NodeLock(BASE, models.ModelBase):
 
     node_id = Column(String(36), primary_key=True, nullable=False)
     action_id = Column(String(36))
+    lease_expiry = Column(DateTime)
 
 
 class ClusterPolicies(BASE, models.ModelBase):
@@ -200,7 +207,11 @@ class Credential(BASE, models.ModelBase):
 
 class ActionDependency(BASE, models.ModelBase):
     """Action dependencies."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_dependency_depended', 'depended', 'dependent'),
+        Index('ix_dependency_dependent', 'dependent', 'depended'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'dependency'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -212,7 +223,13 @@ class ActionDependency(BASE, models.ModelBase):
 
 class Action(BASE, TimestampMixin, models.ModelBase):
     """Action objects."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_action_status_owner', 'status', 'owner', 'priority',
+              'created_at'),
+        Index('ix_action_owner', 'owner'),
+        Index('ix_action_created_at', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'action'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -230,6 +247,7 @@ class Action(BASE, TimestampMixin, models.ModelBase):
     status = Column(String(255))
     status_reason = Column(Text)
     control = Column(String(255))
+    priority = Column(Integer, default=consts.ACTION_DEFAULT_PRIORITY)
     inputs = Column(types.Dict)
     outputs = Column(types.Dict)
     data = Column(types.Dict)
@@ -240,7 +258,12 @@ class Action(BASE, TimestampMixin, models.ModelBase):
 
 class Event(BASE, models.ModelBase):
     """Events generated by the Senin engine."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_event_cluster_id_timestamp', 'cluster_id', 'timestamp'),
+        Index('ix_event_timestamp', 'timestamp'),
+        Index('ix_event_project_timestamp', 'project', 'timestamp'),
+        {'mysql_engine': 'InnoDB'}
+    )
     __tablename__ = 'event'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
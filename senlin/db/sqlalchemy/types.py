@@ -10,12 +10,76 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+
 from oslo_serialization import jsonutils
+import six
 
 from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext import mutable
 from sqlalchemy import types
 
+# Built once, json.dumps builds a new encoder on each call given 'default'
+_encoder = json.JSONEncoder(default=jsonutils.to_primitive)
+_decoder = json.JSONDecoder()
+
+
+def native_json(dialect):
+    """Check whether JSON values are stored in a native JSON column.
+
+    MySQL has a JSON type since 5.7.8 and PostgreSQL has the JSONB type
+    since 9.4, though the operators used for updating a single key of a
+    JSONB value are only available since 9.5. Other databases, MariaDB
+    and unknown server versions use a text column.
+    """
+    version = dialect.server_version_info
+    if not version:
+        return False
+    if dialect.name == 'postgresql':
+        return tuple(version[:2]) >= (9, 5)
+    if dialect.name == 'mysql':
+        if 'MariaDB' in version:
+            return False
+        return tuple(version[:3]) >= (5, 7, 8)
+    return False
+
+
+def dumps(value):
+    return _encoder.encode(value)
+
+
+def loads(value):
+    if value is None:
+        return None
+    if isinstance(value, six.binary_type):
+        value = value.decode('utf-8')
+    if not isinstance(value, six.string_types):
+        # Already decoded by the database driver, e.g. JSONB on psycopg2
+        return value
+    return _decoder.decode(value)
+
+
+class MySQLJSON(types.UserDefinedType):
+    """The MySQL JSON type, values are sent and received as strings."""
+
+    def get_col_spec(self):
+        return 'JSON'
+
+
+class PostgreSQLJSONB(postgresql.JSONB):
+    """The PostgreSQL JSONB type, values are sent as serialized strings.
+
+    The values are serialized by the column types below, the driver may or
+    may not decode the values read.
+    """
+
+    def bind_processor(self, dialect):
+        return None
+
+    def result_processor(self, dialect, coltype):
+        return None
+
 
 class MutableList(mutable.Mutable, list):
     @classmethod
@@ -72,40 +136,34 @@ class MutableList(mutable.Mutable, list):
         self.changed()
 
 
-class Dict(types.TypeDecorator):
+class JSONEncodedType(types.TypeDecorator):
+    """A JSON document, stored natively where the database supports it."""
+
     impl = types.Text
 
     def load_dialect_impl(self, dialect):
+        if native_json(dialect):
+            if dialect.name == 'postgresql':
+                return dialect.type_descriptor(PostgreSQLJSONB())
+            return dialect.type_descriptor(MySQLJSON())
         if dialect.name == 'mysql':
             return dialect.type_descriptor(mysql.LONGTEXT())
         else:
             return self.impl
 
     def process_bind_param(self, value, dialect):
-        return jsonutils.dumps(value)
+        return dumps(value)
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        return jsonutils.loads(value)
-
+        return loads(value)
 
-class List(types.TypeDecorator):
-    impl = types.Text
 
-    def load_dialect_impl(self, dialect):
-        if dialect.name == 'mysql':
-            return dialect.type_descriptor(mysql.LONGTEXT())
-        else:
-            return self.impl
+class Dict(JSONEncodedType):
+    pass
 
-    def process_bind_param(self, value, dialect):
-        return jsonutils.dumps(value)
 
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        return jsonutils.loads(value)
+class List(JSONEncodedType):
+    pass
 
 
 mutable.MutableDict.associate_with(Dict)
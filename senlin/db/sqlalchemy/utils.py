@@ -11,6 +11,7 @@
 # under the License.
 
 import six
+import sqlalchemy
 
 
 def exact_filter(query, model, filters):
@@ -70,3 +71,56 @@ def get_sort_params(value, default_key=None):
         dirs.append('asc')
 
     return keys, dirs
+
+
+def paginate_query(query, model, limit, sort_keys, marker=None,
+                   sort_dirs=None):
+    """Returns a query with keyset pagination applied.
+
+    The rows are sorted on the sort keys and the page starts right after
+    the marker. Besides the exact keyset condition, a range condition on
+    the first sort key is added, so that the database can seek into an
+    index on the sort keys instead of scanning it from the beginning.
+
+    :param query: the query object to which pagination is applied; it may
+                  select only some columns of the model.
+    :param model: the ORM model class.
+    :param limit: maximum number of items to return.
+    :param sort_keys: a list of attributes by which results are sorted; the
+                      last one must be unique, e.g. 'id'.
+    :param marker: an object or a row having the sort keys as attributes,
+                   giving the position after which the page starts.
+    :param sort_dirs: a list of 'asc' or 'desc', one for each sort key.
+    :returns: The query with sorting, pagination and limit applied.
+    """
+    sort_dirs = sort_dirs or ['asc'] * len(sort_keys)
+    columns = [getattr(model, key) for key in sort_keys]
+
+    for column, sort_dir in zip(columns, sort_dirs):
+        if sort_dir == 'desc':
+            query = query.order_by(column.desc())
+        else:
+            query = query.order_by(column.asc())
+
+    if marker is not None:
+        values = [getattr(marker, key) for key in sort_keys]
+        criteria = []
+        for i, (column, sort_dir) in enumerate(zip(columns, sort_dirs)):
+            crit = [columns[j] == values[j] for j in range(i)]
+            if sort_dir == 'desc':
+                crit.append(column < values[i])
+            else:
+                crit.append(column > values[i])
+            criteria.append(sqlalchemy.and_(*crit))
+        query = query.filter(sqlalchemy.or_(*criteria))
+
+        if values[0] is not None:
+            if sort_dirs[0] == 'desc':
+                query = query.filter(columns[0] <= values[0])
+            else:
+                query = query.filter(columns[0] >= values[0])
+
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query
@@ -10,17 +10,129 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import contextlib
 import json
+import time
 
 from docker import Client
+from docker import errors as docker_errors
 from oslo_config import cfg
 from oslo_log import log
+from requests import exceptions as requests_exceptions
 
+from senlin.common import exception
 from senlin.common.i18n import _LW
 from senlin.drivers import base
 
 LOG = log.getLogger(__name__)
 
+cfg.CONF.import_group('docker', 'senlin.common.config')
+
+wallclock = time.time
+
+
+class ClientPool(object):
+    '''A pool of Docker API clients keyed by the endpoint URL.
+
+    Reusing the clients keeps the HTTP connections to the Docker daemons
+    alive across operations. The pool is bounded and evicts the least
+    recently used client when full, leaving it to the greenthreads still
+    using it. Clients left unused for longer than the idle timeout are
+    closed, and a client unused for longer than the check interval is
+    pinged before it is handed out again.
+    '''
+
+    def __init__(self, max_size, idle_timeout, check_interval):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        # Endpoint URL -> (client, last used time), least recently used first
+        self.clients = collections.OrderedDict()
+
+    def _close(self, client):
+        try:
+            client.close()
+        except Exception as ex:
+            LOG.debug('Failed closing docker client: %s', ex)
+
+    def _is_healthy(self, client):
+        try:
+            client.ping()
+        except Exception as ex:
+            LOG.warning(_LW('Docker endpoint %(url)s not healthy: %(ex)s'),
+                        {'url': client.base_url, 'ex': ex})
+            return False
+        return True
+
+    def _purge(self, now):
+        while self.clients:
+            url, (client, last_used) = next(iter(self.clients.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            self.clients.pop(url)
+            self._close(client)
+
+    def get(self, url):
+        '''Get a client for the given endpoint, creating it if needed.'''
+        now = wallclock()
+        self._purge(now)
+
+        client = None
+        entry = self.clients.get(url, None)
+        if entry is not None:
+            client, last_used = entry
+            if (now - last_used > self.check_interval and
+                    not self._is_healthy(client)):
+                # Pinging yields, the client may have been replaced
+                # meanwhile, in which case the replacement is kept
+                self.discard(url, client)
+                client = None
+
+        if client is None:
+            client = Client(base_url=url)
+            # Another greenthread may have pooled a client meanwhile
+            entry = self.clients.get(url, None)
+            if entry is not None:
+                self._close(client)
+                client = entry[0]
+
+        # Move the client to the end as the most recently used one
+        self.clients.pop(url, None)
+        self.clients[url] = (client, now)
+        while len(self.clients) > self.max_size:
+            # The client evicted may still be used by other greenthreads,
+            # it is not closed but released once they are done with it
+            self.clients.popitem(last=False)
+        return client
+
+    def discard(self, url, client=None):
+        '''Remove the client for the given endpoint, e.g. after an error.
+
+        :param url: The endpoint URL of the client.
+        :param client: The client that failed. If given, the client pooled
+                       for the endpoint is removed only if it is this one,
+                       so that a replacement is not dropped by mistake.
+        '''
+        entry = self.clients.get(url, None)
+        if entry is None or (client is not None and entry[0] is not client):
+            return
+        self.clients.pop(url)
+        self._close(entry[0])
+
+
+_pool = None
+
+
+def get_pool():
+    '''Get the Docker client pool shared by the process.'''
+    global _pool
+    if _pool is None:
+        conf = cfg.CONF.docker
+        _pool = ClientPool(conf.client_pool_size, conf.client_idle_timeout,
+                           conf.client_check_interval)
+    return _pool
+
 
 class DockerClient(object):
     '''Container driver.'''
@@ -29,17 +141,54 @@ class DockerClient(object):
         self.host_ip = params.get('host_ip', None)
         self.container_name = params.get('container_name', None)
         self.container_id = params.get('container_id', None)
-        url = 'tcp://' + self.host_ip + ':2375'
-        self.dockerclient = Client(base_url=url)
+        self.url = 'tcp://' + self.host_ip + ':2375'
+        self.dockerclient = get_pool().get(self.url)
+
+    def _discard(self):
+        LOG.warning(_LW('Lost connection to docker endpoint %s.'), self.url)
+        get_pool().discard(self.url, self.dockerclient)
+
+    @contextlib.contextmanager
+    def _connection(self):
+        '''Drop the pooled client if the connection to the daemon fails.'''
+        try:
+            yield
+        except requests_exceptions.ConnectionError:
+            self._discard()
+            raise
 
     def create_container(self, image, container_name):
-        container = self.dockerclient.create_container(image=image,
-                                                       name=container_name)
+        with self._connection():
+            container = self.dockerclient.create_container(
+                image=image, name=container_name)
         return container
 
+    def start_container(self, container):
+        with self._connection():
+            self.dockerclient.start(container)
+
+    def list_containers(self):
+        with self._connection():
+            return self.dockerclient.containers(all=True)
+
     def delete_container(self, container):
+        '''Remove a container.
+
+        :param container: ID of the container to remove.
+        :returns: True if the container is removed or is not found.
+        :raises: `ResourceDeletionFailure` if the container cannot be
+                 removed.
+        '''
         try:
-            res = self.dockerclient.remove_container(container)
-        except Exception:
-            return True
+            self.dockerclient.remove_container(container, force=True)
+        except docker_errors.NotFound:
+            LOG.warning(_LW('Container %s not found when deleting it.'),
+                        container)
+        except requests_exceptions.ConnectionError as ex:
+            LOG.error('Error: %s' % ex)
+            self._discard()
+            raise exception.ResourceDeletionFailure(resource=container)
+        except Exception as ex:
+            LOG.error('Error: %s' % ex)
+            raise exception.ResourceDeletionFailure(resource=container)
         return True
@@ -242,15 +242,12 @@ class LoadBalancerDriver(base.DriverBase):
 
         return True, _('LB deletion succeeded')
 
-    def member_add(self, node, lb_id, pool_id, port, subnet):
-        """Add a member to Neutron lbaas pool.
+    def _get_network(self, subnet):
+        """Get a subnet and the name of the network it belongs to.
 
-        :param node: A node object to be added to the specified pool.
-        :param lb_id: The ID of the loadbalancer.
-        :param pool_id: The ID of the pool for receiving the node.
-        :param port: The port for the new LB member to be created.
-        :param subnet: The subnet to be used by the new LB member.
-        :returns: The ID of the new LB member or None if errors occurred.
+        :param subnet: The name or ID of the subnet.
+        :returns: A tuple of the subnet object and the network name, or None
+                  if errors occurred.
         """
         try:
             subnet_obj = self.nc().subnet_get(subnet)
@@ -262,8 +259,10 @@ class LoadBalancerDriver(base.DriverBase):
                       ) % {'resource': resource, 'msg': six.text_type(ex)}
             LOG.exception(msg)
             return None
-        net_name = net.name
+        return subnet_obj, net.name
 
+    def _get_address(self, node, net_name, subnet):
+        """Get the address of a node in the given network."""
         node_detail = node.get_details(oslo_context.get_current())
         addresses = node_detail.get('addresses')
         if net_name not in addresses:
@@ -272,7 +271,27 @@ class LoadBalancerDriver(base.DriverBase):
             return None
 
         # Use the first IP address if more than one are found in target network
-        address = addresses[net_name][0]
+        return addresses[net_name][0]
+
+    def member_add(self, node, lb_id, pool_id, port, subnet):
+        """Add a member to Neutron lbaas pool.
+
+        :param node: A node object to be added to the specified pool.
+        :param lb_id: The ID of the loadbalancer.
+        :param pool_id: The ID of the pool for receiving the node.
+        :param port: The port for the new LB member to be created.
+        :param subnet: The subnet to be used by the new LB member.
+        :returns: The ID of the new LB member or None if errors occurred.
+        """
+        network = self._get_network(subnet)
+        if network is None:
+            return None
+        subnet_obj, net_name = network
+
+        address = self._get_address(node, net_name, subnet)
+        if address is None:
+            return None
+
         try:
             member = self.nc().pool_member_create(pool_id, address, port,
                                                   subnet_obj.id)
@@ -310,3 +329,103 @@ class LoadBalancerDriver(base.DriverBase):
             return None
 
         return True
+
+    def _call_when_ready(self, lb_id, func, *args):
+        """Call a Neutron API, retrying once if it is rejected.
+
+        Changes to a loadbalancer are rejected while its provisioning is
+        pending, so a failed call is retried once after the loadbalancer
+        becomes ready again.
+        """
+        try:
+            return func(*args)
+        except exception.InternalError as ex:
+            if not self._wait_for_lb_ready(lb_id):
+                raise ex
+        return func(*args)
+
+    def members_add(self, nodes, lb_id, pool_id, port, subnet):
+        """Add a batch of members to Neutron lbaas pool.
+
+        The subnet and its network are resolved once for all the nodes and
+        the loadbalancer is waited for once, after all members are created.
+        A member creation rejected because the loadbalancer is still busy
+        with the previous members is retried after the loadbalancer becomes
+        ready.
+
+        :param nodes: A list of node objects to be added to the pool.
+        :param lb_id: The ID of the loadbalancer.
+        :param pool_id: The ID of the pool for receiving the nodes.
+        :param port: The port for the new LB members to be created.
+        :param subnet: The subnet to be used by the new LB members.
+        :returns: A dict mapping the ID of each node to the ID of its new LB
+                  member, or to None if the node was not added.
+        """
+        result = dict((node.id, None) for node in nodes)
+        if not nodes:
+            return result
+
+        network = self._get_network(subnet)
+        if network is None:
+            return result
+        subnet_obj, net_name = network
+
+        for node in nodes:
+            address = self._get_address(node, net_name, subnet)
+            if address is None:
+                continue
+
+            try:
+                member = self._call_when_ready(
+                    lb_id, self.nc().pool_member_create, pool_id, address,
+                    port, subnet_obj.id)
+            except exception.InternalError as ex:
+                msg = _LE('Failed in creating lb pool member: %s.'
+                          ) % six.text_type(ex)
+                LOG.exception(msg)
+                continue
+            result[node.id] = member.id
+
+        res = self._wait_for_lb_ready(lb_id)
+        if res is False:
+            LOG.error(_LE('Failed in creating pool members (%s).'),
+                      ', '.join(m for m in result.values() if m))
+            return dict((node.id, None) for node in nodes)
+
+        return result
+
+    def members_remove(self, lb_id, pool_id, member_ids):
+        """Delete a batch of members from Neutron lbaas pool.
+
+        The loadbalancer is waited for once, after all members are deleted.
+        A member deletion rejected because the loadbalancer is still busy
+        with the previous members is retried after the loadbalancer becomes
+        ready.
+
+        :param lb_id: The ID of the loadbalancer the operation is targeted at;
+        :param pool_id: The ID of the pool from which the members are deleted;
+        :param member_ids: A list of IDs of the LB members.
+        :returns: True if all members were deleted or False otherwise.
+        """
+        if not member_ids:
+            return True
+
+        result = True
+        for member_id in member_ids:
+            try:
+                self._call_when_ready(lb_id, self.nc().pool_member_delete,
+                                      pool_id, member_id)
+            except exception.InternalError as ex:
+                msg = _LE('Failed in removing member %(m)s from pool %(p)s: '
+                          '%(ex)s') % {'m': member_id, 'p': pool_id,
+                                       'ex': six.text_type(ex)}
+                LOG.exception(msg)
+                result = False
+
+        res = self._wait_for_lb_ready(lb_id)
+        if res is False:
+            LOG.error(_LE('Failed in deleting pool members (%s).'),
+                      ', '.join(member_ids))
+            return False
+
+        return result
@@ -13,7 +13,11 @@
 '''
 SDK Client
 '''
+import collections
 import functools
+import hashlib
+import threading
+
 from oslo_config import cfg
 from oslo_log import log as logging
 import six
@@ -96,9 +100,75 @@ def translate_exception(func):
     return invoke_with_catch
 
 
+class ConnectionCache(object):
+    '''A bounded cache of SDK connections keyed by their credentials.
+
+    A connection keeps its authenticated session, so reusing it for the same
+    credential, trust, project and region avoids authenticating again until
+    the token is about to expire, at which point the session gets a new one.
+    The least recently used connection is dropped when the cache is full.
+    '''
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.connections = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(params):
+        '''Build the cache key of the given connection parameters.
+
+        The parameters are hashed so that no password or token is kept in
+        the keys.
+        '''
+        data = jsonutils.dumps(params, sort_keys=True)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get(self, params, factory):
+        '''Get a connection for the parameters, creating it if needed.
+
+        :param params: A dict of connection parameters.
+        :param factory: A callable creating a connection from the
+                        parameters when none is cached.
+        '''
+        key = self.key(params)
+        with self.lock:
+            conn = self.connections.pop(key, None)
+            if conn is None:
+                conn = factory(params)
+            self.connections[key] = conn
+            while len(self.connections) > self.max_size:
+                self.connections.popitem(last=False)
+        return conn
+
+
+_cache = None
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        _cache = ConnectionCache(cfg.CONF.sdk_connection_cache_size)
+    return _cache
+
+
 def create_connection(params=None):
-    if params is None:
-        params = {}
+    '''Get a connection to OpenStack services.
+
+    Connections are cached and shared for the same parameters unless
+    `sdk_connection_cache_size` is 0.
+    '''
+    params = dict(params or {})
+    if 'region_name' not in params and cfg.CONF.default_region_name:
+        params['region_name'] = cfg.CONF.default_region_name
+
+    if cfg.CONF.sdk_connection_cache_size <= 0:
+        return _create_connection(params)
+    return _get_cache().get(params, _create_connection)
+
+
+def _create_connection(params):
+    params = dict(params)
 
     if params.get('token', None):
         auth_plugin = 'token'
@@ -108,10 +178,7 @@ def create_connection(params=None):
     prof = profile.Profile()
     prof.set_version('identity', 'v3')
     if 'region_name' in params:
-        prof.set_region(prof.ALL, params['region_name'])
-        params.pop('region_name')
-    elif cfg.CONF.default_region_name:
-        prof.set_region(prof.ALL, cfg.CONF.default_region_name)
+        prof.set_region(prof.ALL, params.pop('region_name'))
     try:
         conn = connection.Connection(profile=prof, user_agent=USER_AGENT,
                                      auth_plugin=auth_plugin, **params)
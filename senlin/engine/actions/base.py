@@ -16,13 +16,16 @@ import time
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
+from oslo_utils import uuidutils
 
+from senlin.common import consts
 from senlin.common import context as req_context
 from senlin.common import exception
 from senlin.common.i18n import _
 from senlin.common.i18n import _LE
 from senlin.db import api as db_api
 from senlin.engine import cluster_policy as cp_mod
+from senlin.engine import dispatcher
 from senlin.engine import event as EVENT
 from senlin.policies import base as policy_mod
 
@@ -128,6 +131,11 @@ class Action(object):
         # Timeout is a placeholder in case some actions may linger too long
         self.timeout = kwargs.get('timeout', cfg.CONF.default_action_timeout)
 
+        # Scheduling priority, a smaller value means a higher priority
+        self.priority = kwargs.get(
+            'priority', consts.ACTION_PRIORITIES.get(
+                action, consts.ACTION_DEFAULT_PRIORITY))
+
         # Return code, useful when action is not automatically deleted
         # after execution
         self.status = kwargs.get('status', self.INIT)
@@ -144,16 +152,8 @@ class Action(object):
         self.data = kwargs.get('data', {})
         self.candidate_hosts = kwargs.get('candidate_hosts', [])
 
-    def store(self, context):
-        """Store the action record into database table.
-
-        :param context: An instance of the request context.
-        :return: The ID of the stored object.
-        """
-
-        timestamp = timeutils.utcnow()
-
-        values = {
+    def _get_values(self):
+        return {
             'name': self.name,
             'context': self.context.to_dict(),
             'target': self.target,
@@ -164,6 +164,7 @@ class Action(object):
             'start_time': self.start_time,
             'end_time': self.end_time,
             'timeout': self.timeout,
+            'priority': self.priority,
             'status': self.status,
             'status_reason': self.status_reason,
             'inputs': self.inputs,
@@ -176,6 +177,16 @@ class Action(object):
             'domain': self.domain,
         }
 
+    def store(self, context):
+        """Store the action record into database table.
+
+        :param context: An instance of the request context.
+        :return: The ID of the stored object.
+        """
+
+        timestamp = timeutils.utcnow()
+
+        values = self._get_values()
         if self.id:
             self.updated_at = timestamp
             values['updated_at'] = timestamp
@@ -206,6 +217,7 @@ class Action(object):
             'start_time': record.start_time,
             'end_time': record.end_time,
             'timeout': record.timeout,
+            'priority': record.priority,
             'status': record.status,
             'status_reason': record.status_reason,
             'inputs': record.inputs or {},
@@ -258,6 +270,18 @@ class Action(object):
         for record in records:
             yield cls._from_db_record(record)
 
+    @classmethod
+    def _derive_context(cls, context):
+        params = {
+            'user': context.user,
+            'project': context.project,
+            'domain': context.domain,
+            'is_admin': context.is_admin,
+            'request_id': context.request_id,
+            'trusts': context.trusts,
+        }
+        return req_context.RequestContext.from_dict(params)
+
     @classmethod
     def create(cls, context, target, action, **kwargs):
         """Create an action object.
@@ -268,18 +292,45 @@ class Action(object):
         :param dict kwargs: Other keyword arguments for the action.
         :return: ID of the action created.
         """
-        params = {
-            'user': context.user,
-            'project': context.project,
-            'domain': context.domain,
-            'is_admin': context.is_admin,
-            'request_id': context.request_id,
-            'trusts': context.trusts,
-        }
-        ctx = req_context.RequestContext.from_dict(params)
+        ctx = cls._derive_context(context)
         obj = cls(target, action, ctx, **kwargs)
         return obj.store(context)
 
+    @classmethod
+    def create_batch(cls, context, targets, action, **kwargs):
+        """Create actions of the same type on a list of targets.
+
+        All action records are inserted with a single DB API call. Each
+        action is named after the action type and the ID of its target, e.g.
+        'node_create_1234abcd'.
+
+        :param context: The requesting context.
+        :param targets: A list of IDs of the target clusters/nodes.
+        :param action: Name of the action.
+        :param dict kwargs: Other keyword arguments shared by the actions.
+        :return: A list of IDs of the actions created, in the order of the
+                 targets.
+        """
+        ctx = cls._derive_context(context)
+        timestamp = timeutils.utcnow()
+        values = []
+        ids = []
+        for target in targets:
+            # A plain action object is sufficient for serialization, there
+            # is no need to run the subclass constructors that load targets
+            obj = object.__new__(Action)
+            Action.__init__(obj, target, action, ctx,
+                            name='%s_%s' % (action.lower(), target[:8]),
+                            **kwargs)
+            obj_values = obj._get_values()
+            obj_values['id'] = uuidutils.generate_uuid()
+            obj_values['created_at'] = timestamp
+            values.append(obj_values)
+            ids.append(obj_values['id'])
+
+        db_api.action_create_batch(context, values)
+        return ids
+
     @classmethod
     def delete(cls, context, action_id):
         """Delete an action from database.
@@ -329,24 +380,29 @@ class Action(object):
         """Set action status based on return value from execute."""
 
         timestamp = wallclock()
+        dependents = None
 
         if result == self.RES_OK:
             status = self.SUCCEEDED
-            db_api.action_mark_succeeded(self.context, self.id, timestamp)
+            dependents = db_api.action_mark_succeeded(self.context, self.id,
+                                                      timestamp)
 
         elif result == self.RES_ERROR:
             status = self.FAILED
-            db_api.action_mark_failed(self.context, self.id, timestamp,
-                                      reason=reason or 'ERROR')
+            dependents = db_api.action_mark_failed(self.context, self.id,
+                                                   timestamp,
+                                                   reason=reason or 'ERROR')
 
         elif result == self.RES_TIMEOUT:
             status = self.FAILED
-            db_api.action_mark_failed(self.context, self.id, timestamp,
-                                      reason=reason or 'TIMEOUT')
+            dependents = db_api.action_mark_failed(self.context, self.id,
+                                                   timestamp,
+                                                   reason=reason or 'TIMEOUT')
 
         elif result == self.RES_CANCEL:
             status = self.CANCELLED
-            db_api.action_mark_cancelled(self.context, self.id, timestamp)
+            dependents = db_api.action_mark_cancelled(self.context, self.id,
+                                                      timestamp)
 
         else:  # result == self.RES_RETRY:
             status = self.READY
@@ -354,6 +410,10 @@ class Action(object):
             # We abandon it and then notify other dispatchers to execute it
             db_api.action_abandon(self.context, self.id)
 
+        # Wake up the actions waiting for this one, if any
+        if dependents:
+            dispatcher.wake_dependents(dependents)
+
         if status == self.SUCCEEDED:
             EVENT.info(self.context, self, self.action, status, reason)
         elif status == self.READY:
@@ -417,6 +477,18 @@ class Action(object):
         else:
             return False
 
+    def _cooldown_inprogress(self, binding, cooldown):
+        if binding.cooldown_inprogress(cooldown):
+            return True
+
+        # The binding may be cached, it could miss the operations recorded
+        # by other engines since it was loaded.
+        record = db_api.cluster_policy_get(self.context, binding.cluster_id,
+                                           binding.policy_id)
+        if record is not None:
+            binding.last_op = record.last_op
+        return binding.cooldown_inprogress(cooldown)
+
     def policy_check(self, cluster_id, target):
         """Check all policies attached to cluster and give result.
 
@@ -429,22 +501,19 @@ class Action(object):
         if target not in ['BEFORE', 'AFTER']:
             return
 
-        # TODO(Anyone): This could use the cluster's runtime data
-        bindings = cp_mod.ClusterPolicy.load_all(self.context, cluster_id,
-                                                 sort='priority',
-                                                 filters={'enabled': True})
+        bindings = cp_mod.get_bindings(self.context, cluster_id)
         # default values
         self.data['status'] = policy_mod.CHECK_OK
         self.data['reason'] = _('Completed policy checking.')
 
-        for pb in bindings:
-            policy = policy_mod.Policy.load(self.context, pb.policy_id)
-            # We record the last operation time for all policies bound to the
-            # cluster, no matter that policy is only interested in the
-            # "BEFORE" or "AFTER" or both.
-            if target == 'AFTER':
-                pb.record_last_op(self.context)
+        # We record the last operation time for all policies bound to the
+        # cluster, no matter that policy is only interested in the "BEFORE"
+        # or "AFTER" or both.
+        if target == 'AFTER':
+            cp_mod.record_last_op(self.context, cluster_id,
+                                  [pb for pb, policy in bindings])
 
+        for pb, policy in bindings:
             if not policy.need_check(target, self):
                 continue
 
@@ -454,7 +523,7 @@ class Action(object):
                 method = getattr(policy, 'post_op', None)
 
             if getattr(policy, 'cooldown', None):
-                if pb.cooldown_inprogress(policy.cooldown):
+                if self._cooldown_inprogress(pb, policy.cooldown):
                     self.data['status'] = policy_mod.CHECK_ERROR
                     self.data['reason'] = _('Policy %s cooldown is still '
                                             'in progress.') % policy.id
@@ -13,6 +13,7 @@
 import copy
 import eventlet
 
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import uuidutils
 
@@ -28,7 +29,6 @@ from senlin.engine import cluster as cluster_mod
 from senlin.engine import dispatcher
 from senlin.engine import event as EVENT
 from senlin.engine import node as node_mod
-from senlin.engine import scheduler
 from senlin.engine import senlin_lock
 from senlin.engine import service as sv
 from senlin.policies import base as policy_mod
@@ -72,8 +72,20 @@ class ClusterAction(base.Action):
     def _wait_for_dependents(self):
         """Wait for dependent actions to complete.
 
+        The action is woken up as soon as its last depended action completes.
+        The status is also checked every `action_wait_interval` seconds in
+        case the notification is lost or it is time to check for
+        cancellation and timeout.
+
         :returns: A tuple containing the result and the corresponding reason.
         """
+        dispatcher.register_waiter(self.id)
+        try:
+            return self._wait_for_wakeup()
+        finally:
+            dispatcher.unregister_waiter(self.id)
+
+    def _wait_for_wakeup(self):
         status = self.get_status()
         reason = ''
         while status != self.READY:
@@ -98,38 +110,51 @@ class ClusterAction(base.Action):
                 LOG.debug(reason)
                 return self.RES_TIMEOUT, reason
 
-            # Continue waiting (with reschedule)
-            scheduler.reschedule(self.id, 3)
+            # Continue waiting until notified or the interval expires
+            dispatcher.wait_for_wakeup(self.id,
+                                       cfg.CONF.action_wait_interval)
             status = self.get_status()
 
         return self.RES_OK, 'All dependents ended with success'
 
-    def _get_host_ip(self, context, host):
-        if uuidutils.is_uuid_like(host):
-            db_node = db_api.node_get(context, host, project_safe=True)
-            if not db_node:
+    def _get_host_ips(self, context, hosts):
+        """Get the IP addresses of the nodes hosting containers.
+
+        Hosts given as node IDs are loaded with a single query, other hosts
+        are looked up by name or by short ID.
+
+        :param context: The request context for DB operations.
+        :param hosts: A list of node IDs, names or short IDs.
+        :returns: A dictionary mapping each host to its IP address, or to
+                  None if the host node is not found.
+        """
+        hosts = set(hosts)
+        ids = [h for h in hosts if uuidutils.is_uuid_like(h)]
+        nodes = dict((n.id, n) for n in node_mod.Node.load_many(
+            context, ids, project_safe=True))
+
+        host_ips = {}
+        for host in hosts:
+            node = nodes.get(host, None)
+            if node is None:
                 db_node = db_api.node_get_by_name(context, host,
                                                   project_safe=True)
-        else:
-            db_node = db_api.node_get_by_name(context, host,
-                                              project_safe=True)
-            if not node:
-                db_node = db_api.node_get_short_id(context, host,
-                                                   project_safe=True)
-
-        physical_id = db_node.physical_id
-        if not physical_id:
-            return
-        node = node_mod.Node.load(context, node_id=db_node.id)
-        details = node.get_details(context)
-        for output in details.outputs:
-           if output['output_key'] == 'floating_ip':
-               server_ip = output['output_value']
-        return server_ip
+                if not db_node and not uuidutils.is_uuid_like(host):
+                    db_node = db_api.node_get_by_short_id(context, host,
+                                                          project_safe=True)
+                if db_node:
+                    node = node_mod.Node.load(context, node=db_node)
+
+            host_ips[host] = node.get_host_ip(context) if node else None
+        return host_ips
 
     def _create_nodes(self, count, candidate_nodes=[]):
         """Utility method for node creation.
 
+        The node records and the NODE_CREATE actions are created in batches
+        so that the number of DB transactions and RPC calls does not grow
+        with the number of nodes.
+
         :param count: Number of nodes to create.
         :returns: A tuple comprised of the result and reason.
         """
@@ -139,19 +164,24 @@ class ClusterAction(base.Action):
 
         placement = self.data.get('placement', None)
 
+        # Reserve a range of indexes for all new nodes
+        first_index = db_api.cluster_next_index(self.context, self.cluster.id,
+                                                count)
         nodes = []
-        child = []
-        node_metadata = {}
-        cluster_metadata = self.cluster.metadata
         candidates = []
+        host_ips = {}
+        if candidate_nodes:
+            host_ips = self._get_host_ips(self.context,
+                                          candidate_nodes[:count])
         for m in range(count):
+            node_metadata = {}
             if candidate_nodes:
-                host_ip = self._get_host_ip(self.context, candidate_nodes[m])
-                node_metadata.update(host_ip=host_ip)
-                node_metadata.update(host_node=candidate_nodes[m])
+                host = candidate_nodes[m]
+                node_metadata.update(host_ip=host_ips[host])
+                node_metadata.update(host_node=host)
                 candidate_nodes[m] = ''
 
-            index = db_api.cluster_next_index(self.context, self.cluster.id)
+            index = first_index + m
             kwargs = {
                 'index': index,
                 'metadata': node_metadata,
@@ -165,50 +195,41 @@ class ClusterAction(base.Action):
 
             name = 'node-%s-%003d' % (self.cluster.id[:8], index)
             node = node_mod.Node(name, self.cluster.profile_id,
-                                 self.cluster.id, context=self.context,
-                                 **kwargs)
-
-            node.store(self.context)
+                                 self.cluster.id, **kwargs)
+            # All nodes share the profile of the cluster
+            node.rt = {'profile': self.cluster.rt['profile']}
             nodes.append(node)
 
-            kwargs = {
-                'name': 'node_create_%s' % node.id[:8],
-                'cause': base.CAUSE_DERIVED,
-            }
-
-            action_id = base.Action.create(self.context, node.id,
-                                           consts.NODE_CREATE, **kwargs)
-            child.append(action_id)
+        node_ids = node_mod.Node.store_batch(self.context, nodes)
+        child = base.Action.create_batch(self.context, node_ids,
+                                         consts.NODE_CREATE,
+                                         cause=base.CAUSE_DERIVED)
 
         for candidate in candidate_nodes:
             if candidate:
                 candidates.append(candidate)
         self.cluster.metadata.update(candidate_nodes=candidates)
         self.cluster.store(self.context)
-        if child:
-            # Build dependency and make the new action ready
-            db_api.dependency_add(self.context, [a for a in child], self.id)
-            for cid in child:
-                db_api.action_update(self.context, cid,
-                                     {'status': base.Action.READY})
-                dispatcher.start_action(action_id=cid)
 
-            # Wait for cluster creation to complete
-            res, reason = self._wait_for_dependents()
-            if res == self.RES_OK:
-                nodes_added = [n.id for n in nodes]
-                self.outputs['nodes_added'] = nodes_added
-                creation = self.data.get('creation', {})
-                creation['nodes'] = nodes_added
-                self.data['creation'] = creation
-                for node in nodes:
-                    self.cluster.add_node(node)
-            else:
-                reason = _('Failed in creating nodes.')
+        # Build dependency and make the new actions ready
+        db_api.dependency_add(self.context, child, self.id)
+        db_api.action_mark_ready(self.context, child)
+        dispatcher.start_actions(action_ids=child,
+                                 cluster_id=self.cluster.id)
 
-            return res, reason
+        # Wait for cluster creation to complete
+        res, reason = self._wait_for_dependents()
+        if res == self.RES_OK:
+            self.outputs['nodes_added'] = node_ids
+            creation = self.data.get('creation', {})
+            creation['nodes'] = node_ids
+            self.data['creation'] = creation
+            for node in nodes:
+                self.cluster.add_node(node)
+        else:
+            reason = _('Failed in creating nodes.')
 
-        return self.RES_OK, ''
+        return res, reason
 
     def do_create(self):
         """Handler for CLUSTER_CREATE action.
@@ -292,6 +313,8 @@ class ClusterAction(base.Action):
                 dispatcher.start_action(action_id=cid)
 
             result, new_reason = self._wait_for_dependents()
+            # The node actions have changed the nodes in the database
+            self.cluster.invalidate('nodes')
             if result != self.RES_OK:
                 new_reason = _('Failed in updating nodes.')
                 self.cluster.set_status(self.context, self.cluster.WARNING,
@@ -389,10 +412,11 @@ class ClusterAction(base.Action):
 
         errors = []
         nodes = []
+        found = dict((n.id, n) for n in node_mod.Node.load_many(self.context,
+                                                                node_ids))
         for node_id in node_ids:
-            try:
-                node = node_mod.Node.load(self.context, node_id)
-            except exception.NodeNotFound:
+            node = found.get(node_id, None)
+            if node is None:
                 errors.append(_('Node [%s] is not found.') % node_id)
                 continue
             if node.cluster_id:
@@ -468,10 +492,11 @@ class ClusterAction(base.Action):
 
         node_ids = copy.deepcopy(nodes)
         errors = []
+        found = dict((n.id, n) for n in db_api.node_get_many(self.context,
+                                                             node_ids))
         for node_id in node_ids:
-            try:
-                node = db_api.node_get(self.context, node_id)
-            except exception.NodeNotFound:
+            node = found.get(node_id, None)
+            if node is None:
                 errors.append(_('Node [%s] is not found.') % node_id)
                 continue
             if ((not node.cluster_id) or
@@ -540,6 +565,8 @@ class ClusterAction(base.Action):
 
             # Wait for dependent action if any
             res, new_reason = self._wait_for_dependents()
+            # The node actions have changed the nodes in the database
+            self.cluster.invalidate('nodes')
             if res != self.RES_OK:
                 reason = new_reason
 
@@ -592,6 +619,8 @@ class ClusterAction(base.Action):
 
             # Wait for dependent action if any
             res, reason = self._wait_for_dependents()
+            # The node actions have changed the nodes in the database
+            self.cluster.invalidate('nodes')
 
             if res != self.RES_OK:
                 self.cluster.set_status(self.context, self.cluster.ERROR,
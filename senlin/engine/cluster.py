@@ -10,6 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import functools
+
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
@@ -21,6 +24,7 @@ from senlin.common.i18n import _LE
 from senlin.common import utils
 from senlin.db import api as db_api
 from senlin.engine import cluster_policy as cp_mod
+from senlin.engine import dispatcher
 from senlin.engine import node as node_mod
 from senlin.policies import base as policy_base
 from senlin.profiles import base as profile_base
@@ -30,6 +34,30 @@ LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
 
+class RuntimeData(dict):
+    """Runtime data loaded from database when first accessed.
+
+    :param loaders: A dict mapping each key to a function that takes no
+                    argument and returns the value for the key.
+    """
+
+    def __init__(self, loaders):
+        super(RuntimeData, self).__init__()
+        self.loaders = loaders
+
+    def __missing__(self, key):
+        value = self[key] = self.loaders[key]()
+        return value
+
+    def invalidate(self, *keys):
+        """Drop the loaded values so that they are reloaded when accessed.
+
+        :param keys: The keys to invalidate, all keys if none is given.
+        """
+        for key in keys or list(self.loaders):
+            self.pop(key, None)
+
+
 class Cluster(object):
     """A cluster is a collection of objects of the same profile type.
 
@@ -91,28 +119,49 @@ class Cluster(object):
             self._load_runtime_data(context)
 
     def _load_runtime_data(self, context):
+        """Set up runtime data to be loaded from database when accessed."""
         if self.id is None:
             return
 
+        self.rt = RuntimeData({
+            'profile': functools.partial(self._load_profile, context),
+            'nodes': functools.partial(self._load_nodes, context),
+            'policies': functools.partial(self._load_policies, context),
+        })
+
+    def _load_profile(self, context):
+        return profile_base.Profile.load(context, profile_id=self.profile_id,
+                                         project_safe=False)
+
+    def _load_nodes(self, context):
+        return node_mod.Node.load_all(context, cluster_id=self.id)
+
+    def _load_policies(self, context):
         policies = []
         bindings = db_api.cluster_policy_get_all(context, self.id)
         for b in bindings:
-            # Detect policy type conflicts
             policy = policy_base.Policy.load(context, b.policy_id)
             policies.append(policy)
+        return policies
 
-        self.rt = {
-            'profile': profile_base.Profile.load(context,
-                                                 profile_id=self.profile_id,
-                                                 project_safe=False),
-            'nodes': node_mod.Node.load_all(context, cluster_id=self.id),
-            'policies': policies
-        }
+    def invalidate(self, *keys):
+        """Drop cached runtime data so that it is reloaded when accessed.
+
+        :param keys: Keys of the runtime data, i.e. 'profile', 'nodes' or
+                     'policies'. All of them are invalidated if none is
+                     given.
+        """
+        if isinstance(self.rt, RuntimeData):
+            self.rt.invalidate(*keys)
+        # The placement index is built from the nodes
+        if not keys or 'nodes' in keys:
+            self.rt.pop('placement', None)
 
     def store(self, context):
         '''Store the cluster in database and return its ID.
 
-        If the ID already exists, we do an update.
+        If the ID already exists, we do an update. The runtime data is not
+        reloaded, call `invalidate` if it may have been changed.
         '''
 
         values = {
@@ -144,8 +193,8 @@ class Cluster(object):
             values['init_at'] = timestamp
             cluster = db_api.cluster_create(context, values)
             self.id = cluster.id
+            self._load_runtime_data(context)
 
-        self._load_runtime_data(context)
         return self.id
 
     @classmethod
@@ -355,6 +404,7 @@ class Cluster(object):
 
         cp = cp_mod.ClusterPolicy(self.id, policy_id, **kwargs)
         cp.store(ctx)
+        dispatcher.invalidate_bindings(self.id)
 
         # refresh cached runtime
         self.rt['policies'].append(policy)
@@ -387,6 +437,7 @@ class Cluster(object):
         params = {'enabled': bool(enabled)}
 
         db_api.cluster_policy_update(ctx, self.id, policy_id, params)
+        dispatcher.invalidate_bindings(self.id)
         return True, _('Policy updated.')
 
     def detach_policy(self, ctx, policy_id):
@@ -414,6 +465,7 @@ class Cluster(object):
             return res, reason
 
         db_api.cluster_policy_detach(ctx, self.id, policy_id)
+        dispatcher.invalidate_bindings(self.id)
         self.rt['policies'].remove(found)
 
         return True, _('Policy detached.')
@@ -427,61 +479,85 @@ class Cluster(object):
 
         :param node: The node to become a new member of the cluster.
         """
-        self.rt['nodes'].append(node)
+        # Nodes not loaded yet are read from database with the new member
+        if 'nodes' in self.rt:
+            self.rt['nodes'].append(node)
+        if 'placement' in self.rt:
+            self._index_node(self.rt['placement'], node)
 
     def remove_node(self, node_id):
         """Remove node with specified ID from cache.
 
         :param node_id: ID of the node to be removed from cache.
         """
+        if 'nodes' not in self.rt:
+            return
         for node in self.rt['nodes']:
             if node.id == node_id:
                 self.rt['nodes'].remove(node)
+        if 'placement' in self.rt:
+            for names in self.rt['placement'].values():
+                for nodes in names.values():
+                    nodes.pop(node_id, None)
 
     @property
     def policies(self):
         return self.rt['policies']
 
+    PLACEMENT_KEYS = (
+        PLACEMENT_REGION, PLACEMENT_ZONE,
+    ) = (
+        'region_name', 'zone',
+    )
+
+    @classmethod
+    def _index_node(cls, index, node):
+        placement = node.data.get('placement', None) or {}
+        for key in cls.PLACEMENT_KEYS:
+            name = placement.get(key, None)
+            if name:
+                nodes = index[key].setdefault(name, collections.OrderedDict())
+                nodes[node.id] = node
+
+    def _placement_index(self):
+        """Get the index of the nodes by their regions and zones.
+
+        The index is built from the placement data of the nodes when first
+        used and then kept up to date by `add_node` and `remove_node`.
+
+        :returns: A dict mapping 'region_name' and 'zone' each to a dict
+                  which maps a region or zone name to an ordered dict of
+                  the nodes placed there, keyed by node ID.
+        """
+        if 'placement' not in self.rt:
+            index = dict((key, {}) for key in self.PLACEMENT_KEYS)
+            for node in self.nodes:
+                self._index_node(index, node)
+            self.rt['placement'] = index
+        return self.rt['placement']
+
     def get_region_distribution(self, regions):
         """Get node distribution regarding given regions.
 
         :param regions: list of region names to check.
         :return: a dict containing region and number as key value pairs.
         """
-        dist = dict.fromkeys(regions, 0)
-
-        for node in self.nodes:
-            placement = node.data.get('placement', {})
-            if placement:
-                region = placement.get('region_name', None)
-                if region and region in regions:
-                    dist[region] += 1
-
-        return dist
+        index = self._placement_index()[self.PLACEMENT_REGION]
+        return dict((region, len(index.get(region, {})))
+                    for region in regions)
 
     def get_zone_distribution(self, ctx, zones):
         """Get node distribution regarding the given the availability zones.
 
-        The availability zone information is only available for some profiles.
+        The availability zone of a node is the one recorded in its placement
+        data when it was created, nodes without one are not counted.
 
-        :param ctx: context used to access node details.
+        :param ctx: context used to access node details, not used anymore.
         :param zones: list of zone names to check.
         :returns: a dict containing zone and number as key-value pairs.
         """
-        dist = dict.fromkeys(zones, 0)
-
-        for node in self.nodes:
-            placement = node.data.get('placement', {})
-            if placement and 'zone' in placement:
-                zone = placement['zone']
-                dist[zone] += 1
-            else:
-                details = node.get_details(ctx)
-                zname = details.get('OS-EXT-AZ:availability_zone', None)
-                if zname and zname in dist:
-                    dist[zname] += 1
-
-        return dist
+        index = self._placement_index()[self.PLACEMENT_ZONE]
+        return dict((zone, len(index.get(zone, {}))) for zone in zones)
 
     def nodes_by_region(self, region):
         """Get list of nodes that belong to the specified region.
@@ -489,13 +565,8 @@ class Cluster(object):
         :param region: Name of region for filtering.
         :return: A list of nodes that are from the specified region.
         """
-        result = []
-        for node in self.nodes:
-            placement = node.data.get('placement', {})
-            if placement and 'region_name' in placement:
-                if region == placement['region_name']:
-                    result.append(node)
-        return result
+        index = self._placement_index()[self.PLACEMENT_REGION]
+        return list(index.get(region, {}).values())
 
     def nodes_by_zone(self, zone):
         """Get list of nodes that reside in the specified availability zone.
@@ -503,11 +574,5 @@ class Cluster(object):
         :param zone: Name of availability zone for filtering.
         :return: A list of nodes that reside in the specified AZ.
         """
-        # TODO(anyone): Improve this to do a forced refresh via get_details?
-        result = []
-        for node in self.nodes:
-            placement = node.data.get('placement', {})
-            if placement and 'zone' in placement:
-                if zone == placement['zone']:
-                    result.append(node)
-        return result
+        index = self._placement_index()[self.PLACEMENT_ZONE]
+        return list(index.get(zone, {}).values())
@@ -10,10 +10,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_config import cfg
 from oslo_utils import timeutils
 
 from senlin.common import exception
 from senlin.db import api as db_api
+from senlin.policies import base as policy_base
+
+# Enabled bindings cached per cluster ID. Each entry is a tuple of the
+# loading time and a list of (binding, policy) tuples sorted by priority.
+_bindings = {}
+
+# Bumped each time the cache is invalidated, so that bindings loaded
+# before an invalidation are not put into the cache.
+_version = 0
 
 
 class ClusterPolicy(object):
@@ -126,3 +136,56 @@ class ClusterPolicy(object):
             'policy_type': self.policy_type,
         }
         return binding_dict
+
+
+def get_bindings(context, cluster_id):
+    '''Get the enabled policy bindings of a cluster.
+
+    The bindings and their policies are cached for policy checking until
+    they are changed or `policy_binding_cache_ttl` seconds have passed.
+
+    :param context: The request context used for loading the bindings.
+    :param cluster_id: ID of the cluster.
+    :returns: A list of (binding, policy) tuples sorted by priority.
+    '''
+    ttl = cfg.CONF.policy_binding_cache_ttl
+    now = timeutils.utcnow_ts()
+    entry = _bindings.get(cluster_id, None)
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+
+    version = _version
+    records = ClusterPolicy.load_all(context, cluster_id, sort='priority',
+                                     filters={'enabled': True})
+    bindings = [(pb, policy_base.Policy.load(context, pb.policy_id))
+                for pb in records]
+
+    if ttl > 0 and version == _version:
+        for key in [k for k, v in _bindings.items() if now - v[0] >= ttl]:
+            _bindings.pop(key)
+        _bindings[cluster_id] = (now, bindings)
+    return bindings
+
+
+def invalidate_bindings(cluster_id):
+    '''Drop the cached policy bindings of a cluster.'''
+    global _version
+    _version += 1
+    _bindings.pop(cluster_id, None)
+
+
+def record_last_op(context, cluster_id, bindings):
+    '''Record the last operation time of bindings with a single update.
+
+    :param context: The request context used for the DB operation.
+    :param cluster_id: ID of the cluster the bindings belong to.
+    :param bindings: A list of `ClusterPolicy` objects.
+    '''
+    if not bindings:
+        return
+
+    timestamp = timeutils.utcnow()
+    db_api.cluster_policy_last_op_update(
+        context, cluster_id, [pb.policy_id for pb in bindings], timestamp)
+    for pb in bindings:
+        pb.last_op = timestamp
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from eventlet import queue
 from oslo_context import context as oslo_context
 from oslo_log import log as logging
 import oslo_messaging
@@ -17,16 +18,24 @@ from oslo_service import service
 
 from senlin.common import consts
 from senlin.common.i18n import _LI
+from senlin.common.i18n import _LW
 from senlin.common import messaging as rpc_messaging
+from senlin.engine import cluster_policy as cp_mod
 
 LOG = logging.getLogger(__name__)
 
 OPERATIONS = (
-    START_ACTION, CANCEL_ACTION, STOP
+    START_ACTION, START_ACTIONS, CANCEL_ACTION, WAKE_ACTION,
+    INVALIDATE_BINDINGS, STOP
 ) = (
-    'start_action', 'cancel_action', 'stop'
+    'start_action', 'start_actions', 'cancel_action', 'wake_action',
+    'invalidate_bindings', 'stop'
 )
 
+# Actions in this engine process that are waiting for their depended actions
+# to complete, keyed by action ID.
+_waiters = {}
+
 
 class Dispatcher(service.Service):
     '''Listen on an AMQP queue named for the engine.
@@ -52,8 +61,12 @@ class Dispatcher(service.Service):
         '''Respond affirmatively to confirm that engine is still alive.'''
         return True
 
-    def start_action(self, ctxt, action_id=None):
-        self.TG.start_action(self.engine_id, action_id)
+    def start_action(self, ctxt, action_id=None, cluster_id=None):
+        self.TG.start_action(self.engine_id, action_id, cluster_id)
+
+    def start_actions(self, ctxt, action_ids, cluster_id=None):
+        '''Start a batch of actions.'''
+        self.TG.start_actions(self.engine_id, action_ids, cluster_id)
 
     def cancel_action(self, ctxt, action_id):
         '''Cancel an action.'''
@@ -67,6 +80,14 @@ class Dispatcher(service.Service):
         '''Resume an action.'''
         self.TG.resume_action(action_id)
 
+    def wake_action(self, ctxt, action_id):
+        '''Wake up an action waiting for its depended actions.'''
+        wake_waiter(action_id)
+
+    def invalidate_bindings(self, ctxt, cluster_id):
+        '''Drop the cached policy bindings of a cluster.'''
+        cp_mod.invalidate_bindings(cluster_id)
+
     def stop(self):
         super(Dispatcher, self).stop()
         # Wait for all action threads to be finished
@@ -77,26 +98,37 @@ class Dispatcher(service.Service):
         LOG.info(_LI("All action threads have been finished"))
 
 
-def notify(method, engine_id=None, **kwargs):
-    '''Send notification to dispatcher
-
-    :param method: remote method to call
-    :param engine_id: dispatcher to notify; None implies broadcast
-    '''
-
+def _prepare(engine_id=None, fanout=False):
     client = rpc_messaging.get_rpc_client(version=consts.RPC_API_VERSION)
 
+    if fanout:
+        # Deliver to every dispatcher listening on the topic
+        return client.prepare(
+            version=consts.RPC_API_VERSION,
+            topic=consts.ENGINE_DISPATCHER_TOPIC,
+            fanout=True)
+
     if engine_id:
         # Notify specific dispatcher identified by engine_id
-        call_context = client.prepare(
+        return client.prepare(
             version=consts.RPC_API_VERSION,
             topic=consts.ENGINE_DISPATCHER_TOPIC,
             server=engine_id)
-    else:
-        # Broadcast to all disptachers
-        call_context = client.prepare(
-            version=consts.RPC_API_VERSION,
-            topic=consts.ENGINE_DISPATCHER_TOPIC)
+
+    # Broadcast to all disptachers
+    return client.prepare(
+        version=consts.RPC_API_VERSION,
+        topic=consts.ENGINE_DISPATCHER_TOPIC)
+
+
+def notify(method, engine_id=None, **kwargs):
+    '''Send notification to dispatcher
+
+    :param method: remote method to call
+    :param engine_id: dispatcher to notify; None implies broadcast
+    '''
+
+    call_context = _prepare(engine_id)
 
     try:
         # We don't use ctext parameter in action progress
@@ -110,3 +142,101 @@ def notify(method, engine_id=None, **kwargs):
 
 def start_action(engine_id=None, **kwargs):
     return notify(START_ACTION, engine_id, **kwargs)
+
+
+def start_actions(engine_id=None, **kwargs):
+    return notify(START_ACTIONS, engine_id, **kwargs)
+
+
+def register_waiter(action_id):
+    '''Register an action as waiting for its depended actions.
+
+    :param action_id: ID of the waiting action.
+    '''
+    _waiters[action_id] = queue.LightQueue()
+
+
+def unregister_waiter(action_id):
+    '''Remove the waiter registered for an action, if any.'''
+    _waiters.pop(action_id, None)
+
+
+def is_waiting(action_id):
+    '''Check whether an action is waiting for its depended actions.'''
+    return action_id in _waiters
+
+
+def wait_for_wakeup(action_id, timeout):
+    '''Block until the action is woken up or the timeout expires.
+
+    :param action_id: ID of the waiting action.
+    :param timeout: Maximum number of seconds to wait.
+    :return: True if the action was woken up, or False if the wait timed out
+             or no waiter has been registered for the action.
+    '''
+    waiter = _waiters.get(action_id)
+    if waiter is None:
+        return False
+
+    try:
+        waiter.get(timeout=timeout)
+    except queue.Empty:
+        return False
+
+    return True
+
+
+def wake_waiter(action_id):
+    '''Wake up an action waiting in this engine process.
+
+    :param action_id: ID of the action to wake up.
+    :return: True if a local waiter was found, False otherwise.
+    '''
+    waiter = _waiters.get(action_id)
+    if waiter is None:
+        return False
+
+    waiter.put_nowait(True)
+    return True
+
+
+def wake_dependents(dependents):
+    '''Wake up actions whose depended actions have completed.
+
+    Actions waiting in this engine process are woken up directly. Actions
+    owned by other engines are notified through an RPC cast. Waiters that
+    cannot be reached this way fall back to checking their status in DB
+    periodically.
+
+    :param dependents: A dict mapping the ID of each action to wake up to the
+                       ID of the engine that owns it.
+    '''
+    for action_id, engine_id in dependents.items():
+        if wake_waiter(action_id) or not engine_id:
+            continue
+
+        try:
+            _prepare(engine_id).cast(oslo_context.get_current(), WAKE_ACTION,
+                                     action_id=action_id)
+        except oslo_messaging.MessagingException as ex:
+            LOG.warning(_LW('Failed in waking up action %(action)s on '
+                            'engine %(engine)s: %(ex)s'),
+                        {'action': action_id, 'engine': engine_id, 'ex': ex})
+
+
+def invalidate_bindings(cluster_id):
+    '''Drop the cached policy bindings of a cluster in all engines.
+
+    The cache of this engine is invalidated directly, other engines are
+    notified through a fanout cast.
+
+    :param cluster_id: ID of the cluster whose policy bindings changed.
+    '''
+    cp_mod.invalidate_bindings(cluster_id)
+    try:
+        _prepare(fanout=True).cast(oslo_context.get_current(),
+                                   INVALIDATE_BINDINGS, cluster_id=cluster_id)
+    except oslo_messaging.MessagingException as ex:
+        LOG.warning(_LW('Failed in notifying engines of policy binding '
+                        'changes on cluster %(cluster)s: %(ex)s'),
+                    {'cluster': cluster_id, 'ex': ex})
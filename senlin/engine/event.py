@@ -10,12 +10,19 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import logging
+import time
 
+import eventlet
+from eventlet import queue
+from oslo_config import cfg
 from oslo_log import log
 from oslo_utils import reflection
 from oslo_utils import timeutils
+from oslo_utils import uuidutils
 
+from senlin.common import context as senlin_context
 from senlin.common import i18n
 from senlin.db import api as db_api
 
@@ -27,6 +34,142 @@ _ = i18n._
 
 LOG = log.getLogger(__name__)
 
+CONF = cfg.CONF
+CONF.import_opt('event_sink', 'senlin.common.config')
+CONF.import_opt('event_batch_size', 'senlin.common.config')
+CONF.import_opt('event_flush_interval', 'senlin.common.config')
+CONF.import_opt('event_queue_size', 'senlin.common.config')
+CONF.import_opt('event_queue_overflow', 'senlin.common.config')
+CONF.import_opt('max_events_per_cluster', 'senlin.common.config')
+CONF.import_opt('max_events_per_project', 'senlin.common.config')
+CONF.import_opt('max_event_age', 'senlin.common.config')
+CONF.import_opt('event_purge_batch_size', 'senlin.common.config')
+
+
+class DBEventSink(object):
+    '''Event sink storing each event into database when it is written.'''
+
+    def write(self, context, values):
+        db_api.event_create(context, values)
+
+    def flush(self):
+        pass
+
+
+class BufferedEventSink(object):
+    '''Event sink storing events into database in batches.
+
+    Events are queued in memory and stored by a background green thread
+    using bulk inserts, either when a batch is full or when the oldest
+    event in the batch has waited for ``event_flush_interval`` seconds.
+    The queue is bounded by ``event_queue_size``; when it is full, writers
+    either wait or have their events dropped, according to the value of
+    ``event_queue_overflow``.
+    '''
+
+    def __init__(self):
+        self.batch_size = max(cfg.CONF.event_batch_size, 1)
+        self.interval = cfg.CONF.event_flush_interval
+        self.overflow = cfg.CONF.event_queue_overflow
+        self.queue = queue.LightQueue(cfg.CONF.event_queue_size or None)
+        # Events taken from the queue by the writer but not yet stored
+        self.pending = []
+        self.dropped = 0
+        self.writer = None
+
+    def write(self, context, values):
+        # The events carry their own user and project, they are stored
+        # using an admin context when the batch is flushed.
+        if self.writer is None:
+            self.writer = eventlet.spawn(self._run)
+
+        if self.overflow == 'drop':
+            try:
+                self.queue.put_nowait(values)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self.queue.put(values)
+
+    def _collect(self):
+        self.pending.append(self.queue.get())
+        deadline = time.time() + self.interval
+        while len(self.pending) < self.batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                return
+            try:
+                self.pending.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                return
+
+    def _run(self):
+        while True:
+            try:
+                self._collect()
+                self.flush()
+            except Exception as ex:
+                LOG.exception(_LE('Failed storing events: %s'), ex)
+
+    def _store(self, context, events):
+        try:
+            db_api.event_create_batch(context, events)
+            return
+        except Exception as ex:
+            LOG.warning(_LW('Failed storing a batch of %(count)s events, '
+                            'storing them one by one: %(ex)s'),
+                        {'count': len(events), 'ex': ex})
+
+        for values in events:
+            try:
+                db_api.event_create(context, values)
+            except Exception as ex:
+                LOG.error(_LE('Failed storing event %(id)s: %(ex)s'),
+                          {'id': values['id'], 'ex': ex})
+
+    def flush(self):
+        '''Store all the events queued so far.'''
+        events, self.pending = self.pending, []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if self.dropped:
+            LOG.warning(_LW('%s events were dropped because the event queue '
+                            'was full.'), self.dropped)
+            self.dropped = 0
+
+        if not events:
+            return
+
+        ctx = senlin_context.get_admin_context()
+        for i in range(0, len(events), self.batch_size):
+            self._store(ctx, events[i:i + self.batch_size])
+
+
+SINKS = {
+    'database': DBEventSink,
+    'buffered': BufferedEventSink,
+}
+
+_sinks = {}
+
+
+def get_sink():
+    """Get the event sink configured for this engine."""
+    name = cfg.CONF.event_sink
+    if name not in _sinks:
+        _sinks[name] = SINKS[name]()
+    return _sinks[name]
+
+
+def flush():
+    """Store the events buffered by the event sinks."""
+    for sink in _sinks.values():
+        sink.flush()
+
 
 class Event(object):
     '''Class capturing an interesting happening in Senlin.'''
@@ -86,7 +229,7 @@ class Event(object):
             self.obj_type = 'NODE'
 
     def store(self, context):
-        '''Store the event into database and return its ID.'''
+        '''Write the event to the event sink and return its ID.'''
         values = {
             'level': self.level,
             'timestamp': self.timestamp,
@@ -100,14 +243,63 @@ class Event(object):
             'status': self.status,
             'status_reason': self.status_reason,
             'meta_data': self.metadata,
+            'id': uuidutils.generate_uuid(),
         }
 
-        event = db_api.event_create(context, values)
-        self.id = event.id
+        get_sink().write(context, values)
+        self.id = values['id']
 
         return self.id
 
 
+def _purge(context, older_than, cluster_id=None, project=None):
+    batch_size = max(cfg.CONF.event_purge_batch_size, 1)
+    total = 0
+    while True:
+        count = db_api.event_purge(context, older_than, batch_size,
+                                   cluster_id=cluster_id, project=project)
+        total += count
+        if count < batch_size:
+            return total
+        # Let other threads run between two chunks
+        eventlet.sleep(0)
+
+
+def _purge_over_limit(context, group_by, limit):
+    total = 0
+    for key, count in db_api.event_count_over_limit(context, group_by, limit):
+        filters = {group_by: key}
+        cutoff = db_api.event_timestamp_cutoff(context, limit, **filters)
+        if cutoff is not None:
+            total += _purge(context, cutoff, **filters)
+    return total
+
+
+def purge(context):
+    '''Delete the events beyond the retention policies.
+
+    Events older than `max_event_age` days are deleted first, then the
+    oldest events of the clusters and the projects having more than
+    `max_events_per_cluster` and `max_events_per_project` events. Events
+    are deleted in chunks of `event_purge_batch_size`.
+
+    :param context: An admin context for the database operations.
+    :returns: A dict with the number of events deleted by each policy.
+    '''
+    result = {'age': 0, 'cluster': 0, 'project': 0}
+    if cfg.CONF.max_event_age > 0:
+        older_than = timeutils.utcnow() - datetime.timedelta(
+            days=cfg.CONF.max_event_age)
+        result['age'] = _purge(context, older_than)
+    if cfg.CONF.max_events_per_cluster > 0:
+        result['cluster'] = _purge_over_limit(
+            context, 'cluster_id', cfg.CONF.max_events_per_cluster)
+    if cfg.CONF.max_events_per_project > 0:
+        result['project'] = _purge_over_limit(
+            context, 'project', cfg.CONF.max_events_per_project)
+    return result
+
+
 def critical(context, entity, action, status=None, status_reason=None,
              timestamp=None):
     timestamp = timestamp or timeutils.utcnow()
@@ -18,28 +18,88 @@ trigger corresponding actions to recover the clusters based on the pre-defined
 health policies.
 """
 
+import bisect
+import datetime
+import hashlib
+import random
+
 from oslo_config import cfg
+from oslo_log import log as logging
 import oslo_messaging
 from oslo_service import service
 from oslo_service import threadgroup
+from oslo_utils import timeutils
 
 from senlin.common import consts
 from senlin.common import context
+from senlin.common.i18n import _LE
+from senlin.common.i18n import _LI
 from senlin.common import messaging as rpc_messaging
+from senlin.common import utils
 from senlin.db import api as db_api
+from senlin.engine.actions import base as action_mod
+from senlin.engine import dispatcher
+from senlin.engine import node as node_mod
+from senlin.profiles import base as profile_base
 from senlin.rpc import client as rpc_client
 
+LOG = logging.getLogger(__name__)
+
 
 health_mgr_opts = [
     cfg.IntOpt('periodic_interval_max',
                default=60,
                help='Seconds between periodic tasks to be called'),
+    cfg.FloatOpt('health_check_jitter',
+                 default=0.1, min=0, max=1,
+                 help='Fraction of its interval by which each health check '
+                      'of a cluster is randomly advanced or delayed, so '
+                      'that the checks of different clusters do not run '
+                      'in lockstep.'),
+    cfg.IntOpt('health_check_backoff_after',
+               default=10,
+               help='Number of consecutive health checks finding a cluster '
+                    'healthy after which its check interval is doubled. '
+                    'The interval is reset when a check finds unhealthy '
+                    'nodes. A value of 0 disables the back-off.'),
+    cfg.IntOpt('health_check_backoff_max',
+               default=4,
+               help='Maximum factor by which the check interval of a '
+                    'stable cluster is backed off.'),
 ]
 
 CONF = cfg.CONF
 CONF.register_opts(health_mgr_opts)
 
 
+class HashRing(object):
+    """A consistent hash ring mapping keys to engines.
+
+    Each engine is placed on the ring several times so that the keys are
+    spread evenly, a key belongs to the first engine found clockwise from
+    the hash of the key.
+    """
+
+    REPLICAS = 64
+
+    def __init__(self, engines):
+        self.ring = sorted((self._hash('%s-%s' % (engine, i)), engine)
+                           for engine in engines
+                           for i in range(self.REPLICAS))
+        self.hashes = [h for h, engine in self.ring]
+
+    @staticmethod
+    def _hash(key):
+        return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:8], 16)
+
+    def get(self, key):
+        """Get the engine a key belongs to, None if the ring is empty."""
+        if not self.ring:
+            return None
+        index = bisect.bisect(self.hashes, self._hash(key)) % len(self.ring)
+        return self.ring[index][1]
+
+
 class HealthManager(service.Service):
 
     def __init__(self, engine_service, topic, version):
@@ -59,28 +119,105 @@ class HealthManager(service.Service):
     def _idle_task(self):
         pass
 
+    def _poll_cluster(self, cluster_id):
+        """Poll the physical resources of the active nodes of a cluster.
+
+        The nodes are checked in batches, one batch per profile, so that
+        the states of the resources are listed from the backends instead
+        of being retrieved one by one.
+
+        :param cluster_id: The ID of the cluster to poll.
+        :returns: A list of the IDs of the nodes found unhealthy.
+        """
+        nodes = node_mod.Node.load_all(self.ctx, cluster_id=cluster_id,
+                                       project_safe=False)
+        groups = {}
+        for node in nodes:
+            # Nodes not ACTIVE are either being operated or already known
+            # to be unhealthy, their states have nothing to change to.
+            if node.status == node.ACTIVE and node.physical_id:
+                groups.setdefault(node.profile_id, []).append(node)
+
+        unhealthy = []
+        for profile_id, group in groups.items():
+            try:
+                results = profile_base.Profile.check_objects(self.ctx, group)
+            except Exception as ex:
+                LOG.error(_LE('Failed in polling nodes of cluster %(c)s '
+                              'with profile %(p)s: %(ex)s'),
+                          {'c': cluster_id, 'p': profile_id, 'ex': ex})
+                continue
+            unhealthy.extend(node.id for node in group
+                             if results.get(node.id) is False)
+        return unhealthy
+
+    def _next_interval(self, schedule, healthy):
+        """Adapt the check interval of a cluster to the last result."""
+        if not healthy:
+            schedule['interval'] = schedule['base_interval']
+            schedule['healthy_checks'] = 0
+            return
+
+        schedule['healthy_checks'] += 1
+        backoff_after = CONF.health_check_backoff_after
+        if backoff_after > 0 and schedule['healthy_checks'] >= backoff_after:
+            schedule['healthy_checks'] = 0
+            schedule['interval'] = min(
+                schedule['interval'] * 2,
+                schedule['base_interval'] * CONF.health_check_backoff_max)
+
+    def _jitter(self, interval):
+        jitter = CONF.health_check_jitter
+        return interval * (1 + random.uniform(-jitter, jitter))
+
     def _periodic_check(self, cluster_id=None):
-        """Tasks to be run at a periodic interval."""
-        self.rpc_client.cluster_check(self.ctx, cluster_id)
+        """Check the nodes of a cluster and act on those changing state.
+
+        Only the nodes found unhealthy get a NODE_CHECK action, which
+        confirms the state of the node and marks it as ERROR.
+
+        :returns: The number of seconds before the next check.
+        """
+        healthy = True
+        try:
+            unhealthy = self._poll_cluster(cluster_id)
+            if unhealthy:
+                healthy = False
+                LOG.info(_LI('Nodes of cluster %(c)s found unhealthy: '
+                             '%(n)s'), {'c': cluster_id, 'n': unhealthy})
+                action_ids = action_mod.Action.create_batch(
+                    self.ctx, unhealthy, consts.NODE_CHECK,
+                    cause=action_mod.CAUSE_RPC)
+                db_api.action_mark_ready(self.ctx, action_ids)
+                dispatcher.start_actions(action_ids=action_ids)
+        except Exception as ex:
+            # An exception would stop the timer of the cluster
+            LOG.error(_LE('Failed in checking cluster %(c)s: %(ex)s'),
+                      {'c': cluster_id, 'ex': ex})
+            healthy = None
+
+        schedule = self._get_schedule(cluster_id)
+        if schedule is None:
+            return self.periodic_interval_max
+
+        if healthy is not None:
+            self._next_interval(schedule, healthy)
+        delay = self._jitter(schedule['interval'])
+        schedule['next_check'] = timeutils.utcnow() + datetime.timedelta(
+            seconds=delay)
+        return delay
+
+    def _get_schedule(self, cluster_id):
+        for registry in self.registries:
+            if registry['cluster_id'] == cluster_id:
+                return registry.get('schedule')
+        return None
 
     def start_periodic_tasks(self):
         """Tasks to be run at a periodic interval."""
-        # TODO(anyone): start timers to check clusters
-        # - get clusters that needs health management from DB
-        # - get their checking options
-        #   * if it is about node status polling, add a timer to trigger its
-        #     do_check logic
-        #   * if it is about listening to message queue, start a thread to
-        #     listen events targeted at that cluster
         self.TG.add_timer(cfg.CONF.periodic_interval, self._idle_task)
-
-        for registry in self.registries:
-            if registry.get('check_type') == 'NODE_STATUS_POLLING':
-                interval = min(registry.get('interval'),
-                               self.periodic_interval_max)
-                timer = self.TG.add_timer(interval, self._periodic_check, None,
-                                          registry.get('cluster_id'))
-                registry['timer'] = timer
+        # The first run loads the registries owned by this engine
+        self.TG.add_timer(cfg.CONF.periodic_interval, self._rebalance)
 
     def start(self):
         super(HealthManager, self).start()
@@ -89,21 +226,102 @@ class HealthManager(service.Service):
                                             version=self.version)
         server = rpc_messaging.get_rpc_server(self.target, self)
         server.start()
-        self._load_runtime_registry()
         self.start_periodic_tasks()
 
-    def _load_runtime_registry(self):
-        db_registries = db_api.registry_claim(self.ctx, self.engine_id)
-
-        for registry in db_registries:
-            reg_cap = {
-                'cluster_id': registry.cluster_id,
-                'check_type': registry.check_type,
-                'interval': registry.interval,
-                'params': registry.params,
-                'timer': None
+    def _add_registry(self, registry):
+        """Start health checking of a cluster with a registry record."""
+        timer = None
+        schedule = None
+        if registry.check_type == consts.NODE_STATUS_POLLING:
+            interval = min(registry.interval, self.periodic_interval_max)
+            # Clusters start at different phases of their intervals, the
+            # phase of a cluster is the same on every engine and restart.
+            phase = HashRing._hash(registry.cluster_id) % 1000 / 1000.0
+            delay = interval * phase
+            schedule = {
+                'base_interval': interval,
+                'interval': interval,
+                'healthy_checks': 0,
+                'next_check': timeutils.utcnow() + datetime.timedelta(
+                    seconds=delay),
             }
-            self.rt['registries'].append(reg_cap)
+            timer = self.TG.add_dynamic_timer(self._periodic_check, delay,
+                                              None, registry.cluster_id)
+
+        reg_cap = {
+            'cluster_id': registry.cluster_id,
+            'check_type': registry.check_type,
+            'interval': registry.interval,
+            'params': registry.params,
+            'timer': timer,
+            'schedule': schedule,
+        }
+        self.rt['registries'].append(reg_cap)
+
+    def _remove_registry(self, cluster_id):
+        """Stop health checking of a cluster."""
+        for i in range(len(self.rt['registries']) - 1, -1, -1):
+            registry = self.rt['registries'][i]
+            if registry.get('cluster_id') == cluster_id:
+                timer = registry.get('timer')
+                if timer is not None:
+                    timer.stop()
+                    self.TG.timer_done(timer)
+                self.rt['registries'].pop(i)
+
+    def _live_engines(self):
+        """Get the IDs of the engines that have reported recently."""
+        time_line = timeutils.utcnow() - datetime.timedelta(
+            seconds=2 * cfg.CONF.periodic_interval)
+        engines = set(svc.id for svc in db_api.service_get_all(self.ctx)
+                      if svc.updated_at >= time_line)
+        # This engine may not have reported yet
+        engines.add(self.engine_id)
+        return engines
+
+    def rebalance(self):
+        """Take over or hand off registries as engines come and go.
+
+        Registries are sharded across the live engines with a consistent
+        hash ring on the cluster ID, so that an engine joining or leaving
+        only moves the registries of its neighbours on the ring. An engine
+        claims the registries mapped to it in the database and starts
+        checking them. An engine keeps checking a registry mapped to
+        another engine until that engine has claimed it, so that there is
+        no gap in the checks during the hand-off.
+        """
+        ring = HashRing(self._live_engines())
+        records = db_api.registry_get_all(self.ctx)
+
+        owned = [r for r in records
+                 if ring.get(r.cluster_id) == self.engine_id]
+        claims = [r.cluster_id for r in owned
+                  if r.engine_id != self.engine_id]
+        if claims:
+            LOG.info(_LI('Engine %(e)s taking over health checks of '
+                         'clusters: %(c)s'),
+                     {'e': self.engine_id, 'c': claims})
+            db_api.registry_claim(self.ctx, self.engine_id, cluster_ids=claims)
+
+        local = set(r['cluster_id'] for r in self.registries)
+        for record in owned:
+            if record.cluster_id not in local:
+                self._add_registry(record)
+
+        owners = dict((r.cluster_id, r.engine_id) for r in records)
+        owned_ids = set(r.cluster_id for r in owned)
+        for cluster_id in local - owned_ids:
+            # Not in the database anymore, or claimed by the new owner
+            if owners.get(cluster_id, None) != self.engine_id:
+                self._remove_registry(cluster_id)
+
+    def _rebalance(self):
+        try:
+            self.rebalance()
+        except Exception as ex:
+            LOG.error(_LE('Engine %(e)s failed rebalancing health '
+                          'registries: %(ex)s'), {'e': self.engine_id,
+                                                  'ex': ex})
 
     @property
     def registries(self):
@@ -117,6 +335,29 @@ class HealthManager(service.Service):
         """Respond to confirm that the rpc service is still alive."""
         return True
 
+    def get_schedule(self, ctx):
+        """Get the health check schedule of the clusters of this engine.
+
+        :param ctx: The context of the request.
+        :return: A list of dicts each containing the ID of a cluster polled,
+                 its registered interval, its current interval after back
+                 off, the number of consecutive checks finding it healthy
+                 and the time of its next check.
+        """
+        result = []
+        for registry in self.registries:
+            schedule = registry.get('schedule')
+            if schedule is None:
+                continue
+            result.append({
+                'cluster_id': registry['cluster_id'],
+                'base_interval': schedule['base_interval'],
+                'interval': schedule['interval'],
+                'healthy_checks': schedule['healthy_checks'],
+                'next_check': utils.format_time(schedule['next_check']),
+            })
+        return result
+
     def register_cluster(self, ctx, cluster_id, check_type, interval=None,
                          params=None):
         """Register cluster for health checking.
@@ -132,22 +373,7 @@ class HealthManager(service.Service):
         params = params or {}
         registry = db_api.registry_create(ctx, cluster_id, check_type,
                                           interval, params, self.engine_id)
-
-        timer = None
-        if check_type == 'NODE_STATUS_POLLING':
-            real_interval = min(interval, self.periodic_interval_max)
-            timer = self.TG.add_timer(real_interval, self._periodic_check,
-                                      None, cluster_id)
-
-        reg_cap = {
-            'cluster_id': registry.cluster_id,
-            'check_type': registry.check_type,
-            'interval': registry.interval,
-            'params': registry.params,
-            'timer': timer
-
-        }
-        self.rt['registries'].append(reg_cap)
+        self._add_registry(registry)
 
     def unregister_cluster(self, ctx, cluster_id):
         """Unregister a cluster from health checking.
@@ -156,23 +382,11 @@ class HealthManager(service.Service):
         :param cluster_id: The ID of the cluste to be unregistered.
         :return: None
         """
-        for i in range(len(self.rt['registries']) - 1, -1, -1):
-            registry = self.rt['registries'][i]
-            if registry.get('cluster_id') == cluster_id:
-                timer = registry.get('timer')
-                timer.stop()
-                self.TG.timer_done(timer)
-                self.rt['registries'].pop(i)
+        self._remove_registry(cluster_id)
         db_api.registry_delete(ctx, cluster_id)
 
 
-def notify(engine_id, method, **kwargs):
-    """Send notification to health manager service.
-
-    :param engine_id: dispatcher to notify; broadcast if value is None
-    :param method: remote method to call
-    """
-
+def _prepare(engine_id):
     timeout = cfg.CONF.engine_life_check_timeout
     client = rpc_messaging.get_rpc_client(version=consts.RPC_API_VERSION)
 
@@ -189,7 +403,17 @@ def notify(engine_id, method, **kwargs):
             version=consts.RPC_API_VERSION,
             timeout=timeout,
             topic=consts.ENGINE_HEALTH_MGR_TOPIC)
+    return call_context
+
+
+def notify(engine_id, method, **kwargs):
+    """Send notification to health manager service.
+
+    :param engine_id: dispatcher to notify; broadcast if value is None
+    :param method: remote method to call
+    """
 
+    call_context = _prepare(engine_id)
     ctx = context.get_admin_context()
 
     try:
@@ -199,6 +423,22 @@ def notify(engine_id, method, **kwargs):
         return False
 
 
+def get_schedule(engine_id):
+    """Get the health check schedule of the clusters of an engine.
+
+    :param engine_id: ID of the engine to query.
+    :return: A list of dicts as returned by `HealthManager.get_schedule`,
+             or None if the engine did not respond in time.
+    """
+    call_context = _prepare(engine_id)
+    ctx = context.get_admin_context()
+
+    try:
+        return call_context.call(ctx, 'get_schedule')
+    except oslo_messaging.MessagingTimeout:
+        return None
+
+
 def register(cluster_id, engine_id=None, **kwargs):
     params = kwargs.pop('params', {})
     interval = kwargs.pop('interval', cfg.CONF.periodic_interval)
@@ -12,8 +12,10 @@
 
 import six
 
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
+from oslo_utils import uuidutils
 
 from senlin.common import exception
 from senlin.common.i18n import _
@@ -84,7 +86,18 @@ class Node(object):
                 self.domain = context.domain
             self._load_runtime_data(context)
 
-    def _load_runtime_data(self, context):
+    def _load_runtime_data(self, context, profiles=None):
+        '''Load the profile of the node.
+
+        :param context: The request context for DB operations.
+        :param profiles: An optional dictionary of the profiles already
+                         loaded, keyed by profile ID, which is shared by
+                         nodes loaded together and updated in place.
+        '''
+        if profiles is not None and self.profile_id in profiles:
+            self.rt = {'profile': profiles[self.profile_id]}
+            return
+
         profile = None
         try:
             profile = profile_base.Profile.load(context,
@@ -93,16 +106,12 @@ class Node(object):
         except exception.ProfileNotFound:
             LOG.debug(_('Profile not found: %s'), self.profile_id)
 
+        if profiles is not None:
+            profiles[self.profile_id] = profile
         self.rt = {'profile': profile}
 
-    def store(self, context):
-        '''Store the node record into database table.
-
-        The invocation of DB API could be a node_create or a node_update,
-        depending on whether node has an ID assigned.
-        '''
-
-        values = {
+    def _get_values(self):
+        return {
             'name': self.name,
             'physical_id': self.physical_id,
             'cluster_id': self.cluster_id,
@@ -121,6 +130,14 @@ class Node(object):
             'data': self.data,
         }
 
+    def store(self, context):
+        '''Store the node record into database table.
+
+        The invocation of DB API could be a node_create or a node_update,
+        depending on whether node has an ID assigned.
+        '''
+
+        values = self._get_values()
         if self.id:
             db_api.node_update(context, self.id, values)
         else:
@@ -134,11 +151,36 @@ class Node(object):
         return self.id
 
     @classmethod
-    def _from_db_record(cls, context, record):
+    def store_batch(cls, context, nodes):
+        '''Store a batch of new node objects into database table.
+
+        All node records are inserted with a single DB API call. The caller
+        is responsible for setting the runtime data of the nodes.
+
+        :param context: The request context for DB operations.
+        :param nodes: A list of node objects that have no ID assigned.
+        :returns: A list of IDs of the nodes stored.
+        '''
+        init_at = timeutils.utcnow()
+        values = []
+        for node in nodes:
+            node.id = uuidutils.generate_uuid()
+            node.init_at = init_at
+            node_values = node._get_values()
+            node_values['id'] = node.id
+            values.append(node_values)
+
+        db_api.node_create_batch(context, values)
+        return [node.id for node in nodes]
+
+    @classmethod
+    def _from_db_record(cls, context, record, profiles=None):
         '''Construct a node object from database record.
 
         :param context: the context used for DB operations;
         :param record: a DB node object that contains all fields;
+        :param profiles: an optional dictionary of profiles shared by the
+                         nodes constructed together, keyed by profile ID;
         '''
         kwargs = {
             'id': record.id,
@@ -157,8 +199,16 @@ class Node(object):
             'metadata': record.meta_data,
         }
 
-        return cls(record.name, record.profile_id, record.cluster_id,
-                   context=context, **kwargs)
+        if profiles is None:
+            return cls(record.name, record.profile_id, record.cluster_id,
+                       context=context, **kwargs)
+
+        # The user, project and domain are all in the record, the context is
+        # only needed for loading the profile
+        node = cls(record.name, record.profile_id, record.cluster_id,
+                   **kwargs)
+        node._load_runtime_data(context, profiles)
+        return node
 
     @classmethod
     def load(cls, context, node_id=None, node=None, project_safe=True):
@@ -179,7 +229,29 @@ class Node(object):
                                       limit=limit, marker=marker,
                                       project_safe=project_safe)
 
-        return [cls._from_db_record(context, record) for record in records]
+        profiles = {}
+        return [cls._from_db_record(context, record, profiles)
+                for record in records]
+
+    @classmethod
+    def load_many(cls, context, node_ids, project_safe=True):
+        '''Retrieve the nodes with the given IDs from database.
+
+        The nodes are retrieved with a single query and nodes using the same
+        profile share a single profile object.
+
+        :param context: The request context for DB operations.
+        :param node_ids: A list of node IDs.
+        :param project_safe: Whether nodes of other projects are ignored.
+        :returns: A list of the nodes found, in the order of `node_ids`.
+                  IDs of nodes that do not exist are skipped.
+        '''
+        records = db_api.node_get_many(context, node_ids,
+                                       project_safe=project_safe)
+        profiles = {}
+        nodes = dict((r.id, cls._from_db_record(context, r, profiles))
+                     for r in records)
+        return [nodes[node_id] for node_id in node_ids if node_id in nodes]
 
     def to_dict(self):
         if self.rt['profile']:
@@ -225,11 +297,61 @@ class Node(object):
             values['status_reason'] = reason
         db_api.node_update(context, self.id, values)
 
+    def update_data(self, context, values=None, removed=None):
+        '''Set or remove some keys in the data of the node.
+
+        Unlike `store`, only the given keys are written to the database
+        when it stores the data in a native JSON column.
+
+        :param context: An instance of the request context.
+        :param values: A dictionary of keys and values to be set.
+        :param removed: A list of keys to be removed.
+        '''
+        values = values or {}
+        removed = removed or []
+        self.data.update(values)
+        for key in removed:
+            self.data.pop(key, None)
+        db_api.node_data_update(context, self.id, values=values,
+                                removed=removed)
+
     def get_details(self, context):
         if not self.physical_id:
             return {}
         return profile_base.Profile.get_details(context, self)
 
+    def get_host_ip(self, context):
+        '''Get the floating IP address of the server backing this node.
+
+        The address is cached in the node data for `host_ip_cache_ttl`
+        seconds, so that placing containers onto the same host does not
+        query the backend service each time. The cached address is dropped
+        when the node is updated or recovered.
+
+        :param context: An instance of the request context.
+        :returns: The IP address, or None if the node has no physical
+                  resource or the resource has no floating IP output.
+        '''
+        if not self.physical_id:
+            return None
+
+        ttl = cfg.CONF.host_ip_cache_ttl
+        cached = self.data.get('host_ip', None)
+        now = timeutils.utcnow_ts()
+        if ttl > 0 and cached and now - cached['cached_at'] < ttl:
+            return cached['address']
+
+        server_ip = None
+        details = self.get_details(context)
+        for output in details.outputs:
+            if output['output_key'] == 'floating_ip':
+                server_ip = output['output_value']
+
+        if ttl > 0 and server_ip:
+            self.update_data(context, {
+                'host_ip': {'address': server_ip, 'cached_at': now}})
+        return server_ip
+
     def _handle_exception(self, context, action, status, exception):
         msg = six.text_type(exception)
         self.physical_id = exception.kwargs.get('resource_id', None)
@@ -323,6 +445,7 @@ class Node(object):
 
             if new_profile_id:
                 self.profile_id = new_profile_id
+                self.data.pop('host_ip', None)
             self.store(context)
 
             self.set_status(context, self.ACTIVE, reason='Update succeeded')
@@ -397,6 +520,7 @@ class Node(object):
         self.set_status(context, self.ACTIVE, reason=_('Recover succeeded'))
         if self.physical_id != physical_id:
             self.physical_id = physical_id
+            self.data.pop('host_ip', None)
             self.store(context)
 
         return True
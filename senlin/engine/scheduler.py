@@ -10,21 +10,33 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import datetime
 import time
 
 import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_service import threadgroup
+from oslo_utils import timeutils
+import six
 
 from senlin.common import context
+from senlin.common.i18n import _LW
 from senlin.db import api as db_api
 from senlin.engine.actions import base as action_mod
+from senlin.engine import dispatcher
 
 LOG = logging.getLogger(__name__)
 
 wallclock = time.time
 
+# Seconds between two checks of the local ready queues
+QUEUE_CHECK_INTERVAL = 1
+
+# Action threads allowed per worker, counting those waiting for dependents
+MAX_THREADS_PER_WORKER = 2
+
 
 class ThreadGroupManager(object):
     '''Thread group manager.'''
@@ -32,12 +44,31 @@ class ThreadGroupManager(object):
     def __init__(self):
         super(ThreadGroupManager, self).__init__()
         self.workers = {}
-        self.group = threadgroup.ThreadGroup()
+        self.max_workers = max(cfg.CONF.max_concurrent_actions, 1)
+        # Actions waiting for a free worker, grouped by cluster so that a
+        # big batch from one cluster cannot starve the others
+        self.ready_queues = collections.OrderedDict()
+        # Whether we have refused to claim ready actions from the database
+        self.refused = False
+        self.stopping = False
+        # ID of the engine the actions are run for, known after the first
+        # action is started
+        self.worker_id = None
+        # Actions waiting for their dependents don't hold a worker but do
+        # hold a thread, leave room for as many of them as there are
+        # workers, plus the timers and other non-action threads
+        self.group = threadgroup.ThreadGroup(
+            thread_pool_size=MAX_THREADS_PER_WORKER * self.max_workers + 10)
 
         # Create dummy service task, because when there is nothing queued
         # on self.tg the process exits
         self.add_timer(cfg.CONF.periodic_interval, self._service_task)
 
+        if cfg.CONF.action_aging_interval > 0:
+            self.add_timer(cfg.CONF.action_aging_interval, self._age_actions)
+
+        self.add_timer(QUEUE_CHECK_INTERVAL, self._check_ready_queues)
+
         # TODO(Yanyan Hu): Build a DB session with full privilege
         # for DB accessing in scheduler module
         self.db_session = context.RequestContext(is_admin=True)
@@ -52,15 +83,104 @@ class ThreadGroupManager(object):
 
         (Yanyan)Not sure this is still necessary, just keep it temporarily.
         '''
-        # TODO(Yanyan): have this task call dbapi purge events
+        # Events are purged by EngineService.event_retention
         pass
 
+    def _age_actions(self):
+        '''Raise the priority of ready actions that have waited too long.'''
+        older_than = timeutils.utcnow() - datetime.timedelta(
+            seconds=cfg.CONF.action_aging_interval)
+        try:
+            db_api.action_age_ready(self.db_session, older_than)
+        except Exception as ex:
+            LOG.warning(_LW('Failed aging ready actions: %s'),
+                        six.text_type(ex))
+
+    def _check_ready_queues(self):
+        '''Start queued actions if workers have been freed.
+
+        Workers are also freed when their actions start waiting for their
+        dependents, which doesn't end any thread, so the queues are checked
+        periodically as well as when an action thread exits.
+        '''
+        if self.stopping or self.worker_id is None:
+            return
+        if not self.ready_queues and not self.refused:
+            return
+
+        try:
+            self._schedule_next(self.worker_id)
+        except Exception as ex:
+            LOG.warning(_LW('Failed starting queued actions: %s'),
+                        six.text_type(ex))
+
     def start(self, func, *args, **kwargs):
         '''Run the given method in a thread.'''
 
         return self.group.add_thread(func, *args, **kwargs)
 
-    def start_action(self, worker_id, action_id=None):
+    def _free_workers(self):
+        # An action waiting for its dependents doesn't count, otherwise
+        # parents waiting in all the workers would block their children
+        waiting = sum(1 for a in self.workers if dispatcher.is_waiting(a))
+        free = self.max_workers - len(self.workers) + waiting
+        # But it still holds a thread, don't claim actions once the pool
+        # can't spawn them or they would be locked and never run
+        threads = MAX_THREADS_PER_WORKER * self.max_workers
+        return min(free, threads - len(self.workers))
+
+    def _start_action_thread(self, worker_id, action_id):
+        def release(thread, action_id):
+            '''Callback function that will be passed to GreenThread.link().'''
+            # Remove action thread from thread list
+            self.workers.pop(action_id)
+            # Hand the worker over to the next action waiting for it
+            if not self.stopping:
+                self._schedule_next(worker_id)
+
+        th = self.start(action_mod.ActionProc, self.db_session, action_id)
+        self.workers[action_id] = th
+        th.link(release, action_id)
+        return th
+
+    def _enqueue(self, action_id, cluster_id=None):
+        key = cluster_id or action_id
+        self.ready_queues.setdefault(key, collections.deque()).append(
+            action_id)
+
+    def _dequeue(self):
+        '''Pop the next queued action, serving clusters in round-robin.'''
+        if not self.ready_queues:
+            return None
+
+        key, queue = self.ready_queues.popitem(last=False)
+        action_id = queue.popleft()
+        if queue:
+            # Move the cluster to the end of the line
+            self.ready_queues[key] = queue
+        return action_id
+
+    def _schedule_next(self, worker_id):
+        '''Start queued actions, or claim ready ones, to fill free workers.'''
+        while self._free_workers() > 0:
+            action_id = self._dequeue()
+            if action_id is None:
+                break
+            # The action may have been claimed by another engine meanwhile
+            self._acquire_and_start(worker_id, action_id)
+
+        if self.refused and self._free_workers() > 0:
+            self.refused = False
+            self.start_action(worker_id)
+
+    def _acquire_and_start(self, worker_id, action_id):
+        action = db_api.action_acquire(self.db_session, action_id, worker_id,
+                                       wallclock())
+        if not action:
+            return None
+        return self._start_action_thread(worker_id, action.id)
+
+    def start_action(self, worker_id, action_id=None, cluster_id=None):
         '''Run the given action in a sub-thread.
 
         Release the action lock when the thread finishes?
@@ -68,28 +188,56 @@ class ThreadGroupManager(object):
         :param workder_id: ID of the worker thread; we fake workers using
                            senlin engines at the moment.
         :param action_id: ID of the action to be executed. None means the
-                          1st ready action will be scheduled to run.
+                          ready actions will be scheduled to run, as many as
+                          the number of free workers.
+        :param cluster_id: ID of the cluster the action belongs to, used for
+                           sharing workers fairly among clusters when the
+                           action has to be queued.
+        :returns: The thread started, or the first thread started if more
+                  than one action were acquired; None if no action has been
+                  started.
         '''
-        def release(thread, action_id):
-            '''Callback function that will be passed to GreenThread.link().'''
-            # Remove action thread from thread list
-            self.workers.pop(action_id)
-
-        timestamp = wallclock()
+        self.worker_id = worker_id
+        free = self._free_workers()
         if action_id is not None:
-            action = db_api.action_acquire(self.db_session, action_id,
-                                           worker_id, timestamp)
-        else:
-            action = db_api.action_acquire_1st_ready(self.db_session,
-                                                     worker_id,
-                                                     timestamp)
-        if not action:
-            return
-
-        th = self.start(action_mod.ActionProc, self.db_session, action.id)
-        self.workers[action.id] = th
-        th.link(release, action.id)
-        return th
+            if free <= 0:
+                # Saturated, queue the action without locking it so that
+                # other engines can still claim it
+                LOG.debug('Engine %(e)s saturated, action %(a)s queued.',
+                          {'e': worker_id, 'a': action_id})
+                self._enqueue(action_id, cluster_id)
+                return None
+            return self._acquire_and_start(worker_id, action_id)
+
+        if free <= 0:
+            # Refuse to claim ready actions, leave them to other engines
+            self.refused = True
+            return None
+
+        # Claim all the actions we can run in one round trip
+        actions = db_api.action_acquire_ready(self.db_session, worker_id,
+                                              wallclock(), limit=free)
+        if not actions:
+            return None
+
+        threads = [self._start_action_thread(worker_id, a.id)
+                   for a in actions]
+        return threads[0]
+
+    def start_actions(self, worker_id, action_ids, cluster_id=None):
+        '''Run a batch of actions, each in a sub-thread.
+
+        :param worker_id: ID of the worker thread.
+        :param action_ids: A list of IDs of the actions to be executed.
+        :param cluster_id: ID of the cluster the actions belong to.
+        :returns: A list of threads started for the actions acquired.
+        '''
+        threads = []
+        for action_id in action_ids:
+            th = self.start_action(worker_id, action_id, cluster_id)
+            if th is not None:
+                threads.append(th)
+        return threads
 
     def cancel_action(self, action_id):
         '''Cancel an action execution progress.'''
@@ -120,6 +268,9 @@ class ThreadGroupManager(object):
 
     def stop(self, graceful=False):
         '''Stop any active threads belong to this threadgroup.'''
+        self.stopping = True
+        self.ready_queues.clear()
+
         # Try to stop all threads gracefully
         self.group.stop(graceful)
         self.group.wait()
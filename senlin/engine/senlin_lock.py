@@ -10,6 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
+from eventlet import queue
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
@@ -25,6 +28,8 @@ CONF = cfg.CONF
 
 CONF.import_opt('lock_retry_times', 'senlin.common.config')
 CONF.import_opt('lock_retry_interval', 'senlin.common.config')
+CONF.import_opt('lock_backend', 'senlin.common.config')
+CONF.import_opt('lock_lease_duration', 'senlin.common.config')
 
 LOG = logging.getLogger(__name__)
 
@@ -48,6 +53,268 @@ def is_engine_dead(ctx, engine_id, period_time=None):
     return False
 
 
+class DBLockBackend(object):
+    """Lock backend that polls the database for locks.
+
+    A failed attempt is retried after sleeping for 'lock_retry_interval'
+    seconds. If the lock cannot be grabbed after 'lock_retry_times' retries,
+    the lock is stolen when its owner action is run by a dead engine.
+    """
+
+    def cluster_lock_acquire(self, context, cluster_id, action_id,
+                             engine=None, scope=CLUSTER_SCOPE, forced=False):
+        # Step 1: try lock the cluster - if the returned owner_id is the
+        #         action id, it was a success
+        owners = db_api.cluster_lock_acquire(cluster_id, action_id, scope)
+        if action_id in owners:
+            return True
+
+        # Step 2: retry using global configuration options
+        retries = cfg.CONF.lock_retry_times
+        retry_interval = cfg.CONF.lock_retry_interval
+
+        while retries > 0:
+            scheduler.sleep(retry_interval)
+            LOG.debug('Acquire lock for cluster %s again' % cluster_id)
+            owners = db_api.cluster_lock_acquire(cluster_id, action_id, scope)
+            if action_id in owners:
+                return True
+            retries = retries - 1
+
+        # Step 3: Last resort is 'forced locking', only needed when retry
+        #         failed
+        if forced:
+            owners = db_api.cluster_lock_steal(cluster_id, action_id)
+            return action_id in owners
+
+        # Will reach here only because scope == CLUSTER_SCOPE
+        action = db_api.action_get(context, owners[0])
+        if (action and action.owner and action.owner != engine and
+                is_engine_dead(context, action.owner)):
+            LOG.info(_LI('The cluster %(c)s is locked by dead action %(a)s, '
+                         'try to steal the lock.'), {
+                'c': cluster_id,
+                'a': owners[0]
+            })
+            reason = _('Engine died when executing this action.')
+            db_api.action_mark_failed(context, action.id, time.time(),
+                                      reason=reason)
+            owners = db_api.cluster_lock_steal(cluster_id, action_id)
+            return action_id in owners
+
+        LOG.error(_LE('Cluster is already locked by action %(old)s, '
+                      'action %(new)s failed grabbing the lock'),
+                  {'old': str(owners), 'new': action_id})
+
+        return False
+
+    def cluster_lock_release(self, cluster_id, action_id, scope):
+        return db_api.cluster_lock_release(cluster_id, action_id, scope)
+
+    def node_lock_acquire(self, context, node_id, action_id, engine=None,
+                          forced=False):
+        # Step 1: try lock the node - if the returned owner_id is the
+        #         action id, it was a success
+        owner = db_api.node_lock_acquire(node_id, action_id)
+        if action_id == owner:
+            return True
+
+        # Step 2: retry using global configuration options
+        retries = cfg.CONF.lock_retry_times
+        retry_interval = cfg.CONF.lock_retry_interval
+
+        while retries > 0:
+            scheduler.sleep(retry_interval)
+            LOG.debug('Acquire lock for node %s again' % node_id)
+            owner = db_api.node_lock_acquire(node_id, action_id)
+            if action_id == owner:
+                return True
+            retries = retries - 1
+
+        # Step 3: Last resort is 'forced locking', only needed when retry
+        #         failed
+        if forced:
+            owner = db_api.node_lock_steal(node_id, action_id)
+            return action_id == owner
+
+        # if this node lock by dead engine
+        action = db_api.action_get(context, owner)
+        if (action and action.owner and action.owner != engine and
+                is_engine_dead(context, action.owner)):
+            LOG.info(_LI('The node %(n)s is locked by dead action %(a)s, '
+                         'try to steal the lock.'), {
+                'n': node_id,
+                'a': owner
+            })
+            reason = _('Engine died when executing this action.')
+            db_api.action_mark_failed(context, action.id, time.time(),
+                                      reason=reason)
+            db_api.node_lock_steal(node_id, action_id)
+            return True
+
+        LOG.error(_LE('Node is already locked by action %(old)s, '
+                      'action %(new)s failed grabbing the lock'),
+                  {'old': owner, 'new': action_id})
+
+        return False
+
+    def node_lock_release(self, node_id, action_id):
+        return db_api.node_lock_release(node_id, action_id)
+
+    def renew(self):
+        pass
+
+
+class LeaseLockBackend(DBLockBackend):
+    """Lock backend using leases renewed by the engines holding the locks.
+
+    Locks are still recorded in the database, but each of them carries a
+    lease which the engine renews on its periodic report. A lock whose lease
+    has expired is taken over by the next action acquiring it, so there is
+    no need to check the liveness of the owner engine. Actions waiting for a
+    lock held by the same engine are woken up as soon as it is released,
+    instead of sleeping for a whole retry interval.
+    """
+
+    def __init__(self):
+        # Locks held by the actions run in this engine, keyed by the ID of
+        # the cluster or the node
+        self.clusters = {}
+        self.nodes = {}
+        # Queues of the actions waiting for a lock, keyed by the same IDs
+        self.waiters = {}
+
+    def _expiry(self):
+        now = timeutils.utcnow()
+        return now, now + datetime.timedelta(
+            seconds=cfg.CONF.lock_lease_duration)
+
+    def _wait(self, key):
+        waiter = queue.LightQueue()
+        self.waiters.setdefault(key, []).append(waiter)
+        try:
+            waiter.get(timeout=cfg.CONF.lock_retry_interval)
+        except queue.Empty:
+            pass
+        finally:
+            self.waiters[key].remove(waiter)
+            if not self.waiters[key]:
+                self.waiters.pop(key)
+
+    def _notify(self, key):
+        for waiter in self.waiters.get(key, []):
+            waiter.put_nowait(True)
+
+    def _fail_stolen(self, context, action_ids):
+        reason = _('Lock lease expired when executing this action.')
+        for action_id in action_ids:
+            LOG.info(_LI('The lock held by action %s has expired, taking '
+                         'it over.'), action_id)
+            db_api.action_mark_failed(context, action_id, time.time(),
+                                      reason=reason)
+
+    def cluster_lock_acquire(self, context, cluster_id, action_id,
+                             engine=None, scope=CLUSTER_SCOPE, forced=False):
+        retries = cfg.CONF.lock_retry_times
+        while True:
+            now, expiry = self._expiry()
+            owners, stolen = db_api.cluster_lock_acquire_lease(
+                cluster_id, action_id, scope, expiry, now)
+            if action_id in owners:
+                self._fail_stolen(context, stolen)
+                self.clusters.setdefault(cluster_id, set()).add(action_id)
+                return True
+
+            if retries <= 0:
+                break
+            retries -= 1
+            self._wait(cluster_id)
+
+        if forced:
+            owners = db_api.cluster_lock_steal(cluster_id, action_id)
+            if action_id in owners:
+                db_api.cluster_lock_renew([cluster_id], self._expiry()[1])
+                self.clusters[cluster_id] = set([action_id])
+                return True
+            return False
+
+        LOG.error(_LE('Cluster is already locked by action %(old)s, '
+                      'action %(new)s failed grabbing the lock'),
+                  {'old': str(owners), 'new': action_id})
+        return False
+
+    def cluster_lock_release(self, cluster_id, action_id, scope):
+        res = db_api.cluster_lock_release(cluster_id, action_id, scope)
+        holders = self.clusters.get(cluster_id, set())
+        holders.discard(action_id)
+        if not holders:
+            self.clusters.pop(cluster_id, None)
+        self._notify(cluster_id)
+        return res
+
+    def node_lock_acquire(self, context, node_id, action_id, engine=None,
+                          forced=False):
+        retries = cfg.CONF.lock_retry_times
+        while True:
+            now, expiry = self._expiry()
+            owner, stolen = db_api.node_lock_acquire_lease(
+                node_id, action_id, expiry, now)
+            if action_id == owner:
+                if stolen:
+                    self._fail_stolen(context, [stolen])
+                self.nodes[node_id] = action_id
+                return True
+
+            if retries <= 0:
+                break
+            retries -= 1
+            self._wait(node_id)
+
+        if forced:
+            owner = db_api.node_lock_steal(node_id, action_id)
+            if action_id == owner:
+                db_api.node_lock_renew([node_id], self._expiry()[1])
+                self.nodes[node_id] = action_id
+                return True
+            return False
+
+        LOG.error(_LE('Node is already locked by action %(old)s, '
+                      'action %(new)s failed grabbing the lock'),
+                  {'old': owner, 'new': action_id})
+        return False
+
+    def node_lock_release(self, node_id, action_id):
+        res = db_api.node_lock_release(node_id, action_id)
+        if self.nodes.get(node_id) == action_id:
+            self.nodes.pop(node_id)
+        self._notify(node_id)
+        return res
+
+    def renew(self):
+        """Renew the leases of all locks held by this engine."""
+        expiry = self._expiry()[1]
+        if self.clusters:
+            db_api.cluster_lock_renew(list(self.clusters), expiry)
+        if self.nodes:
+            db_api.node_lock_renew(list(self.nodes), expiry)
+
+
+BACKENDS = {
+    'db': DBLockBackend,
+    'lease': LeaseLockBackend,
+}
+
+_backend = None
+
+
+def get_backend():
+    """Get the lock backend configured for this engine."""
+    global _backend
+    if _backend is None:
+        _backend = BACKENDS[cfg.CONF.lock_backend]()
+    return _backend
+
+
 def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
                          scope=CLUSTER_SCOPE, forced=False):
     """Try to lock the specified cluster.
@@ -61,50 +328,8 @@ def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
                    if any.
     :returns: True if lock is acquired, or False otherwise.
     """
-
-    # Step 1: try lock the cluster - if the returned owner_id is the
-    #         action id, it was a success
-    owners = db_api.cluster_lock_acquire(cluster_id, action_id, scope)
-    if action_id in owners:
-        return True
-
-    # Step 2: retry using global configuration options
-    retries = cfg.CONF.lock_retry_times
-    retry_interval = cfg.CONF.lock_retry_interval
-
-    while retries > 0:
-        scheduler.sleep(retry_interval)
-        LOG.debug('Acquire lock for cluster %s again' % cluster_id)
-        owners = db_api.cluster_lock_acquire(cluster_id, action_id, scope)
-        if action_id in owners:
-            return True
-        retries = retries - 1
-
-    # Step 3: Last resort is 'forced locking', only needed when retry failed
-    if forced:
-        owners = db_api.cluster_lock_steal(cluster_id, action_id)
-        return action_id in owners
-
-    # Will reach here only because scope == CLUSTER_SCOPE
-    action = db_api.action_get(context, owners[0])
-    if (action and action.owner and action.owner != engine and
-            is_engine_dead(context, action.owner)):
-        LOG.info(_LI('The cluster %(c)s is locked by dead action %(a)s, '
-                     'try to steal the lock.'), {
-            'c': cluster_id,
-            'a': owners[0]
-        })
-        reason = _('Engine died when executing this action.')
-        db_api.action_mark_failed(context, action.id, time.time(),
-                                  reason=reason)
-        owners = db_api.cluster_lock_steal(cluster_id, action_id)
-        return action_id in owners
-
-    LOG.error(_LE('Cluster is already locked by action %(old)s, '
-                  'action %(new)s failed grabbing the lock'),
-              {'old': str(owners), 'new': action_id})
-
-    return False
+    return get_backend().cluster_lock_acquire(context, cluster_id, action_id,
+                                              engine, scope, forced)
 
 
 def cluster_lock_release(cluster_id, action_id, scope):
@@ -114,7 +339,7 @@ def cluster_lock_release(cluster_id, action_id, scope):
     :param action_id: ID of the action that attempts to release the node.
     :param scope: The scope of the lock to be released.
     """
-    return db_api.cluster_lock_release(cluster_id, action_id, scope)
+    return get_backend().cluster_lock_release(cluster_id, action_id, scope)
 
 
 def node_lock_acquire(context, node_id, action_id, engine=None,
@@ -129,49 +354,8 @@ def node_lock_acquire(context, node_id, action_id, engine=None,
                    if any.
     :returns: True if lock is acquired, or False otherwise.
     """
-    # Step 1: try lock the node - if the returned owner_id is the
-    #         action id, it was a success
-    owner = db_api.node_lock_acquire(node_id, action_id)
-    if action_id == owner:
-        return True
-
-    # Step 2: retry using global configuration options
-    retries = cfg.CONF.lock_retry_times
-    retry_interval = cfg.CONF.lock_retry_interval
-
-    while retries > 0:
-        scheduler.sleep(retry_interval)
-        LOG.debug('Acquire lock for node %s again' % node_id)
-        owner = db_api.node_lock_acquire(node_id, action_id)
-        if action_id == owner:
-            return True
-        retries = retries - 1
-
-    # Step 3: Last resort is 'forced locking', only needed when retry failed
-    if forced:
-        owner = db_api.node_lock_steal(node_id, action_id)
-        return action_id == owner
-
-    # if this node lock by dead engine
-    action = db_api.action_get(context, owner)
-    if (action and action.owner and action.owner != engine and
-            is_engine_dead(context, action.owner)):
-        LOG.info(_LI('The node %(n)s is locked by dead action %(a)s, '
-                     'try to steal the lock.'), {
-            'n': node_id,
-            'a': owner
-        })
-        reason = _('Engine died when executing this action.')
-        db_api.action_mark_failed(context, action.id, time.time(),
-                                  reason=reason)
-        db_api.node_lock_steal(node_id, action_id)
-        return True
-
-    LOG.error(_LE('Node is already locked by action %(old)s, '
-                  'action %(new)s failed grabbing the lock'),
-              {'old': owner, 'new': action_id})
-
-    return False
+    return get_backend().node_lock_acquire(context, node_id, action_id,
+                                           engine, forced)
 
 
 def node_lock_release(node_id, action_id):
@@ -180,4 +364,9 @@ def node_lock_release(node_id, action_id):
     :param node_id: ID of the node to be released.
     :param action_id: ID of the action that attempts to release the node.
     """
-    return db_api.node_lock_release(node_id, action_id)
+    return get_backend().node_lock_release(node_id, action_id)
+
+
+def renew_leases():
+    """Renew the leases of the locks held by this engine, if any."""
+    get_backend().renew()
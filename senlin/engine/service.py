@@ -10,12 +10,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import copy
 import datetime
 import functools
 import uuid
 
-from docker import Client
 from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging
@@ -35,15 +35,18 @@ from senlin.common import scaleutils as su
 from senlin.common import schema
 from senlin.common import utils
 from senlin.db import api as db_api
+from senlin.drivers import docker_v1
 from senlin.engine.actions import base as action_mod
 from senlin.engine import cluster as cluster_mod
 from senlin.engine import cluster_policy
 from senlin.engine import dispatcher
 from senlin.engine import environment
+from senlin.engine import event as event_mod
 from senlin.engine import health_manager
 from senlin.engine import node as node_mod
 from senlin.engine import receiver as receiver_mod
 from senlin.engine import scheduler
+from senlin.engine import senlin_lock
 from senlin.policies import base as policy_base
 from senlin.profiles import base as profile_base
 
@@ -124,6 +127,9 @@ class EngineService(service.Service):
         self.service_manage_cleanup()
         self.TG.add_timer(cfg.CONF.periodic_interval,
                           self.service_manage_report)
+        if cfg.CONF.event_retention_interval > 0:
+            self.TG.add_timer(cfg.CONF.event_retention_interval,
+                              self.event_retention)
         super(EngineService, self).start()
 
     def _stop_rpc_server(self):
@@ -148,6 +154,9 @@ class EngineService(service.Service):
         LOG.info(_LI("Stopping health manager for engine %s"), self.engine_id)
         self.health_mgr.stop()
 
+        # Store the events still buffered in this engine
+        event_mod.flush()
+
         self.TG.stop()
         super(EngineService, self).stop()
 
@@ -166,6 +175,14 @@ class EngineService(service.Service):
             LOG.error(_LE('Service %(service_id)s update failed: %(error)s'),
                       {'service_id': self.engine_id, 'error': ex})
 
+        # Lock leases, if any, are renewed along with the engine heartbeat
+        try:
+            senlin_lock.renew_leases()
+        except Exception as ex:
+            LOG.error(_LE('Service %(service_id)s failed renewing lock '
+                          'leases: %(error)s'),
+                      {'service_id': self.engine_id, 'error': ex})
+
     def service_manage_cleanup(self):
         ctx = senlin_context.get_admin_context()
         last_updated_window = (2 * cfg.CONF.periodic_interval)
@@ -180,6 +197,39 @@ class EngineService(service.Service):
                 LOG.info(_LI('Service %s was aborted'), svc['id'])
                 db_api.service_delete(ctx, svc['id'])
 
+    def _is_retention_leader(self, ctx):
+        '''Check whether this engine is elected to run event retention.
+
+        The oldest engine that has reported its status recently is elected,
+        so that the retention task is run by a single engine at a time.
+        '''
+        time_line = timeutils.utcnow() - datetime.timedelta(
+            seconds=2 * cfg.CONF.periodic_interval)
+        svcs = [svc for svc in db_api.service_get_all(ctx)
+                if svc.updated_at >= time_line]
+        if not svcs:
+            return False
+        leader = min(svcs, key=lambda svc: (svc.created_at, svc.id))
+        return leader.id == self.engine_id
+
+    def event_retention(self):
+        '''Delete the events beyond the retention policies.'''
+        ctx = senlin_context.get_admin_context()
+        try:
+            if not self._is_retention_leader(ctx):
+                return
+            result = event_mod.purge(ctx)
+        except Exception as ex:
+            LOG.error(_LE('Service %(service_id)s failed purging events: '
+                          '%(error)s'),
+                      {'service_id': self.engine_id, 'error': ex})
+            return
+
+        LOG.info(_LI('Event retention purged %(age)s expired events, '
+                     '%(cluster)s events of clusters and %(project)s events '
+                     'of projects over limit.'), result)
+        return result
+
     @request_context
     def credential_create(self, context, cred, attrs=None):
         """Create the credential based on the context.
@@ -1356,7 +1406,7 @@ class EngineService(service.Service):
 
     @request_context
     def node_list(self, context, cluster_id=None, filters=None, sort=None,
-                  limit=None, marker=None, project_safe=True):
+                  limit=None, marker=None, project_safe=True, summary=False):
         """List node records matching the specified criteria.
 
         :param context: An instance of the request context.
@@ -1372,6 +1422,9 @@ class EngineService(service.Service):
                        list starts.
         :param project_safe: A boolean indicating whether nodes from all
                              projects will be returned.
+        :param summary: A boolean indicating whether only the summaries of
+                        the nodes are returned, leaving out their data and
+                        metadata.
         :return: A list of `Node` object representations.
         """
         limit = utils.parse_int_param('limit', limit)
@@ -1384,6 +1437,14 @@ class EngineService(service.Service):
         if cluster_id:
             db_cluster = self.cluster_find(context, cluster_id)
             cluster_id = db_cluster.id
+        if summary:
+            rows = db_api.node_get_all(context, cluster_id=cluster_id,
+                                       limit=limit, marker=marker, sort=sort,
+                                       filters=filters,
+                                       project_safe=project_safe,
+                                       columns=consts.NODE_SUMMARY_KEYS)
+            return self._node_summaries(context, rows)
+
         nodes = node_mod.Node.load_all(context, cluster_id=cluster_id,
                                        limit=limit, marker=marker, sort=sort,
                                        filters=filters,
@@ -1391,6 +1452,18 @@ class EngineService(service.Service):
 
         return [node.to_dict() for node in nodes]
 
+    def _node_summaries(self, context, rows):
+        nodes = [row._asdict() for row in rows]
+        profile_ids = list(set(node['profile_id'] for node in nodes))
+        profiles = db_api.profile_get_all(context, filters={'id': profile_ids},
+                                          project_safe=False)
+        names = dict((profile.id, profile.name) for profile in profiles)
+        for node in nodes:
+            for key in ('init_at', 'created_at', 'updated_at'):
+                node[key] = utils.format_time(node[key])
+            node['profile_name'] = names.get(node['profile_id'], 'Unknown')
+        return nodes
+
     @request_context
     def node_create(self, context, name, profile_id, cluster_id=None,
                     role=None, metadata=None, host=None, container_name=None):
@@ -1849,7 +1922,7 @@ class EngineService(service.Service):
 
     @request_context
     def action_list(self, context, filters=None, limit=None, marker=None,
-                    sort=None, project_safe=True):
+                    sort=None, project_safe=True, summary=False):
         """List action records matching the specified criteria.
 
         :param context: An instance of the request context.
@@ -1863,6 +1936,9 @@ class EngineService(service.Service):
                      sorting direction) separated by commas.
         :param project_safe: A boolean indicating whether actions from all
                              projects will be returned.
+        :param summary: A boolean indicating whether only the summaries of
+                        the actions are returned, leaving out their inputs,
+                        outputs and data.
         :return: A list of `Action` object representations.
         """
         limit = utils.parse_int_param('limit', limit)
@@ -1870,6 +1946,13 @@ class EngineService(service.Service):
         project_safe = utils.parse_bool_param('project_safe', project_safe)
         if not project_safe and not context.is_admin:
             raise exception.Forbidden()
+        if summary:
+            rows = db_api.action_get_all(context, filters=filters,
+                                         limit=limit, marker=marker,
+                                         sort=sort, project_safe=project_safe,
+                                         columns=consts.ACTION_SUMMARY_KEYS)
+            return self._action_summaries(context, rows)
+
         results = action_mod.Action.load_all(context, filters=filters,
                                              limit=limit, marker=marker,
                                              sort=sort,
@@ -1877,6 +1960,24 @@ class EngineService(service.Service):
 
         return [a.to_dict() for a in results]
 
+    def _action_summaries(self, context, rows):
+        actions = collections.OrderedDict()
+        for row in rows:
+            action = row._asdict()
+            for key in ('created_at', 'updated_at'):
+                action[key] = utils.format_time(action[key])
+            action['depends_on'] = []
+            action['depended_by'] = []
+            actions[action['id']] = action
+
+        deps = db_api.dependency_get_all(context, list(actions.keys()))
+        for depended, dependent in deps:
+            if dependent in actions:
+                actions[dependent]['depends_on'].append(depended)
+            if depended in actions:
+                actions[depended]['depended_by'].append(dependent)
+        return list(actions.values())
+
     @request_context
     def action_create(self, context, name, cluster, action, inputs=None):
         """Create an action with given details.
@@ -2155,7 +2256,7 @@ class EngineService(service.Service):
 
     @request_context
     def event_list(self, context, filters=None, limit=None, marker=None,
-                   sort=None, project_safe=True):
+                   sort=None, project_safe=True, summary=False):
         """List event records matching the specified criteria.
 
         :param context: An instance of the request context.
@@ -2169,6 +2270,8 @@ class EngineService(service.Service):
                      sorting direction) separated by commas.
         :param project_safe: A boolean indicating whether events from all
                              projects will be returned.
+        :param summary: A boolean indicating whether only the summaries of
+                        the events are returned, leaving out their metadata.
         :return: A list of `Event` object representations.
         """
         limit = utils.parse_int_param('limit', limit)
@@ -2183,6 +2286,17 @@ class EngineService(service.Service):
             if value is not None:
                 filters[consts.EVENT_LEVEL] = value
 
+        if summary:
+            rows = db_api.event_get_all(context, filters=filters,
+                                        limit=limit, marker=marker,
+                                        sort=sort, project_safe=project_safe,
+                                        columns=consts.EVENT_SUMMARY_KEYS)
+            results = [row._asdict() for row in rows]
+            for event in results:
+                ts = event['timestamp'].replace(microsecond=0).isoformat()
+                event['timestamp'] = ts
+            return results
+
         all_events = db_api.event_get_all(context, filters=filters,
                                           limit=limit, marker=marker,
                                           sort=sort, project_safe=project_safe)
@@ -2204,25 +2318,18 @@ class EngineService(service.Service):
         return db_event.as_dict()
 
     def get_host_ip(self, context, host):
-        if host:
-            db_node = self.node_find(context, host)
-            physical_id = db_node.physical_id
-            if not physical_id:
-                return
-            node = node_mod.Node.load(context, node_id=db_node.id)
-            details = node.get_details(context)
-            for output in details.outputs:
-                if output['output_key'] == 'floating_ip':
-                    server_ip = output['output_value']
-        return server_ip
+        if not host:
+            return None
+        db_node = self.node_find(context, host)
+        node = node_mod.Node.load(context, node=db_node)
+        return node.get_host_ip(context)
 
     @request_context
     def container_list(self, context, limit, host):
         server_ip = self.get_host_ip(context, host)
         if server_ip:
-            url = 'tcp://' + server_ip + ':2375'
-            docker_cli = Client(base_url=url)
-            containers = docker_cli.containers(all=True)
-            for j in range(len(containers)):
-                containers[j]['Server'] = server_ip
-                return containers
+            docker_cli = docker_v1.DockerClient({'host_ip': server_ip})
+            containers = docker_cli.list_containers()
+            for container in containers:
+                container['Server'] = server_ip
+            return containers
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_config import cfg
 from oslo_context import context as oslo_context
 from oslo_utils import reflection
 from oslo_utils import timeutils
@@ -28,6 +29,20 @@ CHECK_RESULTS = (
     'OK', 'ERROR',
 )
 
+# Policy objects reused across loads, see _get_cache()
+_cache = None
+
+
+def _get_cache():
+    '''Get the policy object cache, or None if it is disabled.'''
+    global _cache
+    if _cache is None:
+        size = cfg.CONF.object_cache_size
+        if size <= 0:
+            return None
+        _cache = utils.ObjectCache(size)
+    return _cache
+
 
 class Policy(object):
     '''Base class for policies.'''
@@ -124,6 +139,19 @@ class Policy(object):
 
         return cls(record.name, record.spec, **kwargs)
 
+    @classmethod
+    def _load_record(cls, record):
+        '''Get a policy object for a DB record, reusing a cached one.
+
+        The objects are cached by policy ID and checked against the update
+        time of the record. The caller always gets an object of its own.
+        '''
+        cache = _get_cache()
+        if cache is None:
+            return cls._from_db_record(record)
+        return cache.get(record.id, record.updated_at,
+                         lambda: cls._from_db_record(record))
+
     @classmethod
     def load(cls, context, policy_id=None, db_policy=None, project_safe=True):
         """Retrieve and reconstruct a policy object from DB.
@@ -142,7 +170,7 @@ class Policy(object):
             if db_policy is None:
                 raise exception.PolicyNotFound(policy=policy_id)
 
-        return cls._from_db_record(db_policy)
+        return cls._load_record(db_policy)
 
     @classmethod
     def load_all(cls, context, limit=None, marker=None, sort=None,
@@ -154,11 +182,14 @@ class Policy(object):
                                         project_safe=project_safe)
 
         for record in records:
-            yield cls._from_db_record(record)
+            yield cls._load_record(record)
 
     @classmethod
     def delete(cls, context, policy_id):
         db_api.policy_delete(context, policy_id)
+        cache = _get_cache()
+        if cache is not None:
+            cache.evict(policy_id)
 
     def store(self, context):
         '''Store the policy object into database table.'''
@@ -178,6 +209,9 @@ class Policy(object):
             self.updated_at = timestamp
             values['updated_at'] = timestamp
             db_api.policy_update(context, self.id, values)
+            cache = _get_cache()
+            if cache is not None:
+                cache.evict(self.id)
         else:
             self.created_at = timestamp
             values['created_at'] = timestamp
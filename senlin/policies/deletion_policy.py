@@ -204,17 +204,20 @@ class DeletionPolicy(base.Policy):
             self._update_action(action, victims)
             return
 
-        if count > len(cluster.nodes):
-            count = len(cluster.nodes)
+        # Only the properties used for selection are needed, they are
+        # fetched in one query instead of loading the nodes and profiles
+        nodes = db_api.node_get_all_for_selection(action.context, cluster.id)
+        if count > len(nodes):
+            count = len(nodes)
 
         if self.criteria == self.RANDOM:
-            victims = scaleutils.nodes_by_random(cluster.nodes, count)
+            victims = scaleutils.nodes_by_random(nodes, count)
         elif self.criteria == self.OLDEST_PROFILE_FIRST:
-            victims = scaleutils.nodes_by_profile_age(cluster.nodes, count)
+            victims = scaleutils.nodes_by_profile_age(nodes, count)
         elif self.criteria == self.OLDEST_FIRST:
-            victims = scaleutils.nodes_by_age(cluster.nodes, count, True)
+            victims = scaleutils.nodes_by_age(nodes, count, True)
         else:
-            victims = scaleutils.nodes_by_age(cluster.nodes, count, False)
+            victims = scaleutils.nodes_by_age(nodes, count, False)
 
         self._update_action(action, victims)
         return
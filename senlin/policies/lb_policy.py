@@ -296,19 +296,19 @@ class LoadBalancingPolicy(base.Policy):
         port = self.pool_spec.get(self.POOL_PROTOCOL_PORT)
         subnet = self.pool_spec.get(self.POOL_SUBNET)
 
-        for node in nodes:
-            member_id = lb_driver.member_add(node, data['loadbalancer'],
-                                             data['pool'], port, subnet)
-            if member_id is None:
-                # When failed in adding member, remove all lb resources that
-                # were created and return the failure reason.
-                # TODO(anyone): May need to "roll-back" changes caused by any
-                # successful member_add() calls.
-                lb_driver.lb_delete(**data)
-                return False, 'Failed in adding node into lb pool'
+        members = lb_driver.members_add(nodes, data['loadbalancer'],
+                                        data['pool'], port, subnet)
+        if None in members.values():
+            # When failed in adding member, remove all lb resources that
+            # were created and return the failure reason.
+            # TODO(anyone): May need to "roll-back" changes caused by any
+            # successful member additions.
+            lb_driver.lb_delete(**data)
+            return False, 'Failed in adding node into lb pool'
 
-            node.data.update({'lb_member': member_id})
-            node.store(oslo_context.get_current())
+        for node in nodes:
+            node.update_data(oslo_context.get_current(),
+                             {'lb_member': members[node.id]})
 
         cluster_data_lb = cluster.data.get('loadbalancers', {})
         cluster_data_lb[self.id] = {'vip_address': data.pop('vip_address')}
@@ -346,8 +346,8 @@ class LoadBalancingPolicy(base.Policy):
                                        cluster_id=cluster.id)
         for node in nodes:
             if 'lb_member' in node.data:
-                node.data.pop('lb_member')
-                node.store(oslo_context.get_current())
+                node.update_data(oslo_context.get_current(),
+                                 removed=['lb_member'])
 
         lb_data = cluster.data.get('loadbalancers', {})
         if lb_data and isinstance(lb_data, dict):
@@ -387,8 +387,8 @@ class LoadBalancingPolicy(base.Policy):
         if candidates is None:
             if count == 0:
                 return []
-            nodes = db_api.node_get_all_by_cluster(action.context,
-                                                   cluster_id=cluster_id)
+            nodes = db_api.node_get_all_for_selection(action.context,
+                                                      cluster_id)
             if count > len(nodes):
                 count = len(nodes)
             candidates = scaleutils.nodes_by_random(nodes, count)
@@ -427,20 +427,20 @@ class LoadBalancingPolicy(base.Policy):
         pool_id = policy_data['pool']
 
         # Remove nodes that will be deleted from lb pool
-        for node_id in candidates:
-            node = node_mod.Node.load(action.context, node_id=node_id)
+        member_ids = []
+        for node in node_mod.Node.load_many(action.context, candidates):
             member_id = node.data.get('lb_member', None)
             if member_id is None:
                 LOG.warning(_LW('Node %(n)s not found in lb pool %(p)s.'),
-                            {'n': node_id, 'p': pool_id})
+                            {'n': node.id, 'p': pool_id})
                 continue
+            member_ids.append(member_id)
 
-            res = lb_driver.member_remove(lb_id, pool_id, member_id)
-            if res is not True:
-                action.data['status'] = base.CHECK_ERROR
-                action.data['reason'] = _('Failed in removing deleted '
-                                          'node(s) from lb pool.')
-                return
+        res = lb_driver.members_remove(lb_id, pool_id, member_ids)
+        if res is not True:
+            action.data['status'] = base.CHECK_ERROR
+            action.data['reason'] = _('Failed in removing deleted '
+                                      'node(s) from lb pool.')
 
         return
 
@@ -475,23 +475,24 @@ class LoadBalancingPolicy(base.Policy):
         subnet = self.pool_spec.get(self.POOL_SUBNET)
 
         # Add new nodes to lb pool
-        for node_id in nodes_added:
-            node = node_mod.Node.load(action.context, node_id=node_id)
+        nodes = []
+        for node in node_mod.Node.load_many(action.context, nodes_added):
             member_id = node.data.get('lb_member', None)
             if member_id:
                 LOG.warning(_LW('Node %(n)s already in lb pool %(p)s.'),
-                            {'n': node_id, 'p': pool_id})
+                            {'n': node.id, 'p': pool_id})
                 continue
+            nodes.append(node)
 
-            member_id = lb_driver.member_add(node, lb_id, pool_id, port,
-                                             subnet)
+        members = lb_driver.members_add(nodes, lb_id, pool_id, port, subnet)
+        for node in nodes:
+            member_id = members[node.id]
             if member_id is None:
                 action.data['status'] = base.CHECK_ERROR
                 action.data['reason'] = _('Failed in adding new node(s) '
                                           'into lb pool.')
-                return
+                continue
 
-            node.data.update({'lb_member': member_id})
-            node.store(action.context)
+            node.update_data(action.context, {'lb_member': member_id})
 
         return
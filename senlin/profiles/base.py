@@ -12,6 +12,7 @@
 
 import copy
 
+from oslo_config import cfg
 from oslo_context import context as oslo_context
 from oslo_log import log as logging
 from oslo_utils import timeutils
@@ -28,6 +29,20 @@ from senlin.engine import environment
 
 LOG = logging.getLogger(__name__)
 
+# Profile objects reused across loads, see _get_cache()
+_cache = None
+
+
+def _get_cache():
+    '''Get the profile object cache, or None if it is disabled.'''
+    global _cache
+    if _cache is None:
+        size = cfg.CONF.object_cache_size
+        if size <= 0:
+            return None
+        _cache = utils.ObjectCache(size)
+    return _cache
+
 
 class Profile(object):
     '''Base class for profiles.'''
@@ -130,6 +145,20 @@ class Profile(object):
 
         return cls(record.name, record.spec, **kwargs)
 
+    @classmethod
+    def _load_record(cls, record):
+        '''Get a profile object for a DB record, reusing a cached one.
+
+        Parsing the spec of a profile is not free, so the objects are kept
+        in a cache keyed by profile ID and checked against the update time
+        of the record. The caller always gets an object of its own.
+        '''
+        cache = _get_cache()
+        if cache is None:
+            return cls.from_db_record(record)
+        return cache.get(record.id, record.updated_at,
+                         lambda: cls.from_db_record(record))
+
     @classmethod
     def load(cls, ctx, profile=None, profile_id=None, project_safe=True):
         '''Retrieve a profile object from database.'''
@@ -139,7 +168,7 @@ class Profile(object):
             if profile is None:
                 raise exception.ProfileNotFound(profile=profile_id)
 
-        return cls.from_db_record(profile)
+        return cls._load_record(profile)
 
     @classmethod
     def load_all(cls, ctx, limit=None, marker=None, sort=None, filters=None,
@@ -151,11 +180,14 @@ class Profile(object):
                                          project_safe=project_safe)
 
         for record in records:
-            yield cls.from_db_record(record)
+            yield cls._load_record(record)
 
     @classmethod
     def delete(cls, ctx, profile_id):
         db_api.profile_delete(ctx, profile_id)
+        cache = _get_cache()
+        if cache is not None:
+            cache.evict(profile_id)
 
     def store(self, ctx):
         '''Store the profile into database and return its ID.'''
@@ -176,6 +208,9 @@ class Profile(object):
             self.updated_at = timestamp
             values['updated_at'] = timestamp
             db_api.profile_update(ctx, self.id, values)
+            cache = _get_cache()
+            if cache is not None:
+                cache.evict(self.id)
         else:
             self.created_at = timestamp
             values['created_at'] = timestamp
@@ -194,6 +229,12 @@ class Profile(object):
         profile = cls.load(ctx, profile_id=obj.profile_id)
         return profile.do_check(obj)
 
+    @classmethod
+    def check_objects(cls, ctx, objs):
+        '''Check the health of a batch of objects sharing the same profile.'''
+        profile = cls.load(ctx, profile_id=objs[0].profile_id)
+        return profile.do_check_batch(objs)
+
     @classmethod
     def delete_object(cls, ctx, obj):
         profile = cls.load(ctx, profile_id=obj.profile_id)
@@ -291,6 +332,29 @@ class Profile(object):
         '''For subclass to override.'''
         return NotImplemented
 
+    def do_check_batch(self, objs):
+        '''Check objects one by one, for subclass to override.
+
+        Subclasses are expected to get the states of all the objects from
+        the backend with as few requests as possible.
+
+        :param objs: A list of objects to check.
+        :returns: A dict mapping the ID of each object to a boolean telling
+                  whether the object is healthy. Objects whose health cannot
+                  be determined are left out.
+        '''
+        results = {}
+        for obj in objs:
+            try:
+                res = self.do_check(obj)
+            except exception.InternalError as ex:
+                LOG.error(_LE('Failed in checking object %(obj)s: %(ex)s'),
+                          {'obj': obj.id, 'ex': six.text_type(ex)})
+                continue
+            if res is not NotImplemented:
+                results[obj.id] = bool(res)
+        return results
+
     def do_get_details(self, obj):
         '''For subclass to override.'''
         return NotImplemented
@@ -10,15 +10,34 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import base64
-import copy
+import collections
 
+from eventlet import semaphore
+from oslo_config import cfg
+from oslo_log import log as logging
+import six
+
+from senlin.common import exception
 from senlin.common.i18n import _
+from senlin.common.i18n import _LE
 from senlin.common import schema
-from senlin.common import utils
 from senlin.profiles import base
 from senlin.drivers import docker_v1
 
+LOG = logging.getLogger(__name__)
+
+# Semaphores limiting the concurrent container operations on each host,
+# keyed by the IP of the host
+_host_semaphores = {}
+
+
+def _host_semaphore(host_ip):
+    sem = _host_semaphores.get(host_ip, None)
+    if sem is None:
+        sem = semaphore.Semaphore(cfg.CONF.max_container_ops_per_host)
+        _host_semaphores[host_ip] = sem
+    return sem
+
 
 class ContainerProfile(base.Profile):
 
@@ -43,30 +62,58 @@ class ContainerProfile(base.Profile):
         ),
     }
 
-    def __init__(self, type_name, name, **kwargs):
-        super(ContainerProfile, self).__init__(type_name, name, **kwargs)
-
-        self._dockerclient = None
-
     def docker(self, obj):
-        if self._dockerclient is not None:
-            return self._dockerclient
-        params = obj.metadata
-        self._dockerclient = docker_v1.DockerClient(params)
-        return self._dockerclient
+        '''Get the docker client for the host of the given object.
+
+        The API clients are shared through the pool of the driver, which
+        checks and evicts them, so the driver is not kept by the profile.
+        '''
+        return docker_v1.DockerClient(obj.metadata)
 
     def do_create(self, obj):
         image = self.properties[self.IMAGE]
+        container_name = obj.metadata.get('container_name', None)
         docker_driver = self.docker(obj)
-        container_name = docker_driver.container_name
-        container = self.docker(obj).create_container(image,
-                                                      container_name)
+        with _host_semaphore(obj.metadata.get('host_ip', None)):
+            container = docker_driver.create_container(image, container_name)
+            docker_driver.start_container(container['Id'])
         return container['Id']
 
     def do_delete(self, obj):
-        docker_driver = self.docker(obj)
-        container_id = docker_driver.container_id
-        if container_id:
-            res = self.docker(obj).delete_container(container_id)
-            return res
-        return True
+        container_id = obj.metadata.get('container_id', None)
+        if not container_id:
+            return True
+
+        try:
+            with _host_semaphore(obj.metadata.get('host_ip', None)):
+                return self.docker(obj).delete_container(container_id)
+        except exception.ResourceDeletionFailure as ex:
+            LOG.error(_LE('Failed in deleting container: %s'),
+                      six.text_type(ex))
+            return False
+
+    def do_check(self, obj):
+        return self.do_check_batch([obj]).get(obj.id, False)
+
+    def do_check_batch(self, objs):
+        '''Check containers with one container listing per host.'''
+        hosts = collections.OrderedDict()
+        for obj in objs:
+            hosts.setdefault(obj.metadata.get('host_ip', None), []).append(obj)
+
+        results = {}
+        for host_objs in hosts.values():
+            try:
+                containers = self.docker(host_objs[0]).list_containers()
+            except Exception as ex:
+                LOG.error(_LE('Failed in listing containers: %s'),
+                          six.text_type(ex))
+                continue
+
+            running = set(c['Id'] for c in containers
+                          if c.get('State') == 'running' or
+                          c.get('Status', '').startswith('Up'))
+            for obj in host_objs:
+                results[obj.id] = obj.physical_id in running
+
+        return results
@@ -363,8 +363,30 @@ class ServerProfile(base.Profile):
         self.nova(obj).wait_for_server(server.id)
         self.server_id = server.id
 
+        zone = kwargs.get('availability_zone', None)
+        if zone is None:
+            zone = self._get_zone(obj, server.id)
+        if zone:
+            # Record the zone so that the zone distribution of a cluster is
+            # known without querying the servers. The placement dict may be
+            # shared with other nodes, so it is copied.
+            placement = dict(obj.data.get('placement', None) or {})
+            placement['zone'] = zone
+            obj.data['placement'] = placement
+
         return server.id
 
+    def _get_zone(self, obj, server_id):
+        '''Get the availability zone a server was scheduled to.'''
+        try:
+            server = self.nova(obj).server_get(server_id)
+        except exception.InternalError as ex:
+            LOG.error('Error: %s' % six.text_type(ex))
+            return None
+        if server is None:
+            return None
+        return server.to_dict().get('OS-EXT-AZ:availability_zone', None)
+
     def do_delete(self, obj):
         self.server_id = obj.physical_id
 
@@ -612,6 +634,27 @@ class ServerProfile(base.Profile):
 
         return True
 
+    def do_check_batch(self, objs):
+        '''Check servers with one server listing per user and project.'''
+        groups = {}
+        for obj in objs:
+            groups.setdefault((obj.user, obj.project), []).append(obj)
+
+        results = {}
+        for (user, project), group in groups.items():
+            try:
+                params = self._build_conn_params(user, project)
+                nc = driver_base.SenlinDriver().compute(params)
+                status = dict((s.id, s.status) for s in nc.server_list())
+            except Exception as ex:
+                LOG.error('Error: %s' % six.text_type(ex))
+                continue
+
+            for obj in group:
+                results[obj.id] = status.get(obj.physical_id) == 'ACTIVE'
+
+        return results
+
     def do_get_details(self, obj):
         known_keys = {
             'OS-DCF:diskConfig',
@@ -211,12 +211,13 @@ class EngineClient(object):
                                         identity=identity))
 
     def node_list(self, ctxt, cluster_id=None, limit=None, marker=None,
-                  sort=None, filters=None, project_safe=True):
+                  sort=None, filters=None, project_safe=True, summary=False):
         return self.call(ctxt,
                          self.make_msg('node_list', cluster_id=cluster_id,
                                        limit=limit, marker=marker, sort=sort,
                                        filters=filters,
-                                       project_safe=project_safe))
+                                       project_safe=project_safe,
+                                       summary=summary))
 
     def node_create(self, ctxt, name, cluster_id, profile_id, role, metadata,
                     host, container_name):
@@ -257,11 +258,12 @@ class EngineClient(object):
                                              params=params))
 
     def action_list(self, ctxt, filters=None, limit=None, marker=None,
-                    sort=None, project_safe=True):
+                    sort=None, project_safe=True, summary=False):
         return self.call(ctxt,
                          self.make_msg('action_list', filters=filters,
                                        limit=limit, marker=marker,
-                                       sort=sort, project_safe=project_safe))
+                                       sort=sort, project_safe=project_safe,
+                                       summary=summary))
 
     def cluster_policy_list(self, ctxt, cluster_id, filters=None, sort=None):
         return self.call(ctxt, self.make_msg('cluster_policy_list',
@@ -330,11 +332,12 @@ class EngineClient(object):
                                        params=params))
 
     def event_list(self, ctxt, filters=None, limit=None, marker=None,
-                   sort=None, project_safe=True):
+                   sort=None, project_safe=True, summary=False):
         return self.call(ctxt,
                          self.make_msg('event_list', filters=filters,
                                        limit=limit, marker=marker,
-                                       sort=sort, project_safe=project_safe))
+                                       sort=sort, project_safe=project_safe,
+                                       summary=summary))
 
     def event_get(self, ctxt, identity):
         return self.call(ctxt,
@@ -36,3 +36,9 @@ class LoadBalancerDriver(base.DriverBase):
 
     def member_remove(self, lb_id, pool_id, member_id):
         return True
+
+    def members_add(self, nodes, lb_id, pool_id, port, subnet):
+        return dict((node.id, self.member_id) for node in nodes)
+
+    def members_remove(self, lb_id, pool_id, member_ids):
+        return True
@@ -84,6 +84,7 @@ class ActionControllerTest(shared.ControllerTest, base.SenlinTestCase):
             'marker': 'fake marker',
             'sort': 'fake sorting option',
             'global_project': True,
+            'summary': True,
         }
         req = self._get('/actions', params=params)
         mock_call.return_value = []
@@ -93,11 +94,12 @@ class ActionControllerTest(shared.ControllerTest, base.SenlinTestCase):
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[1][1]
 
-        self.assertEqual(5, len(engine_args))
+        self.assertEqual(6, len(engine_args))
         self.assertIn('limit', engine_args)
         self.assertIn('marker', engine_args)
         self.assertIn('sort', engine_args)
         self.assertIn('project_safe', engine_args)
+        self.assertTrue(engine_args['summary'])
 
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_action_index_whitelists_invalid_params(self, mock_call,
@@ -76,6 +76,7 @@ class EventControllerTest(shared.ControllerTest, base.SenlinTestCase):
             'marker': 'fake marker',
             'sort': 'fake sorting options',
             'global_project': False,
+            'summary': True,
         }
         req = self._get('/events', params=params)
 
@@ -87,11 +88,12 @@ class EventControllerTest(shared.ControllerTest, base.SenlinTestCase):
         rpc_call_args, w = mock_call.call_args
         engine_args = rpc_call_args[1][1]
 
-        self.assertEqual(5, len(engine_args))
+        self.assertEqual(6, len(engine_args))
         self.assertIn('limit', engine_args)
         self.assertIn('marker', engine_args)
         self.assertIn('sort', engine_args)
         self.assertIn('project_safe', engine_args)
+        self.assertTrue(engine_args['summary'])
 
     def test_event_index_whitelists_invalid_params(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'index', True)
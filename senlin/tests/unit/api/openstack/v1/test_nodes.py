@@ -114,6 +114,7 @@ class NodeControllerTest(shared.ControllerTest, base.SenlinTestCase):
             'marker': 'fake marker',
             'sort': 'fake sorting string',
             'global_project': False,
+            'summary': True,
         }
         req = self._get('/nodes', params=params)
         mock_call.return_value = []
@@ -123,13 +124,37 @@ class NodeControllerTest(shared.ControllerTest, base.SenlinTestCase):
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[1][1]
 
-        self.assertEqual(6, len(engine_args))
+        self.assertEqual(7, len(engine_args))
         self.assertIn('cluster_id', engine_args)
         self.assertIn('limit', engine_args)
         self.assertIn('marker', engine_args)
         self.assertIn('sort', engine_args)
         self.assertIn('filters', engine_args)
         self.assertIn('project_safe', engine_args)
+        self.assertTrue(engine_args['summary'])
+
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_node_index_summary(self, mock_call, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/nodes', params={'summary': 'False'})
+
+        self.controller.index(req)
+
+        call_args, w = mock_call.call_args
+        call_args = call_args[1][1]
+        self.assertFalse(call_args['summary'])
+
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_node_index_show_details_not_allowed(self, mock_call,
+                                                 mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/nodes', params={'show_details': 'True'})
+
+        ex = self.assertRaises(exc.HTTPBadRequest,
+                               self.controller.index, req)
+
+        self.assertEqual('Invalid parameter show_details', str(ex))
+        self.assertEqual(0, mock_call.call_count)
 
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_node_index_whitelists_invalid_params(self, mock_call,
@@ -30,6 +30,9 @@ TEST_DEFAULT_LOGLEVELS = {'migrate': logging.WARN,
 _LOG_FORMAT = "%(levelname)8s [%(name)s] %(message)s"
 _TRUE_VALUES = ('True', 'true', '1', 'yes')
 
+cfg.CONF.import_opt('event_sink', 'senlin.common.config')
+cfg.CONF.import_opt('object_cache_size', 'senlin.common.config')
+
 
 class FakeLogMixin(object):
     def setup_logging(self):
@@ -71,6 +74,10 @@ class SenlinTestCase(testscenarios.WithScenarios,
 
         self.addCleanup(enable_sleep)
         self.addCleanup(cfg.CONF.reset)
+        # Store events synchronously so that tests can check them at once
+        cfg.CONF.set_override('event_sink', 'database', enforce_type=True)
+        # Many tests load fake records sharing IDs, don't reuse the objects
+        cfg.CONF.set_override('object_cache_size', 0, enforce_type=True)
 
         messaging.setup("fake://", optional=True)
         self.addCleanup(messaging.cleanup)
@@ -10,8 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import time
 
+from oslo_utils import timeutils as tu
 import six
 
 from senlin.common import consts
@@ -55,6 +57,37 @@ class DBAPIActionTest(base.SenlinTestCase):
         self.assertEqual(self.ctx.domain, action.domain)
         self.assertIsNone(action.outputs)
 
+    def test_action_create_default_priority(self):
+        action = _create_action(self.ctx)
+
+        self.assertEqual(consts.ACTION_DEFAULT_PRIORITY, action.priority)
+
+    def test_action_create_batch(self):
+        data = parser.simple_parse(shared.sample_action)
+        values = []
+        for action_id in shared.UUIDs:
+            value = dict(data, id=action_id, user=self.ctx.user,
+                         project=self.ctx.project, domain=self.ctx.domain)
+            values.append(value)
+
+        db_api.action_create_batch(self.ctx, values)
+
+        for action_id in shared.UUIDs:
+            action = db_api.action_get(self.ctx, action_id)
+            self.assertEqual(data['name'], action.name)
+            self.assertEqual(10, action.inputs['max_size'])
+
+    def test_action_mark_ready(self):
+        actions = [_create_action(self.ctx) for i in range(3)]
+
+        db_api.action_mark_ready(self.ctx, [a.id for a in actions[:2]])
+
+        for action in actions[:2]:
+            action = db_api.action_get(self.ctx, action.id)
+            self.assertEqual(consts.ACTION_READY, action.status)
+        action = db_api.action_get(self.ctx, actions[2].id)
+        self.assertEqual(consts.ACTION_INIT, action.status)
+
     def test_action_update(self):
         action = _create_action(self.ctx)
         values = {
@@ -122,6 +155,88 @@ class DBAPIActionTest(base.SenlinTestCase):
         self.assertEqual(consts.ACTION_RUNNING, action.status)
         self.assertEqual(timestamp, action.start_time)
 
+    def test_action_acquire_ready(self):
+        specs = [
+            {'name': 'A01', 'status': 'INIT'},
+            {'name': 'A02', 'status': 'READY', 'owner': 'worker1'},
+            {'name': 'A03', 'status': 'READY'},
+            {'name': 'A04', 'status': 'READY'},
+            {'name': 'A05', 'status': 'READY'},
+        ]
+
+        for spec in specs:
+            _create_action(self.ctx, **spec)
+
+        timestamp = time.time()
+        actions = db_api.action_acquire_ready(self.ctx, 'worker2', timestamp,
+                                              limit=2)
+        self.assertEqual(2, len(actions))
+        for action in actions:
+            self.assertIn(action.name, ['A03', 'A04', 'A05'])
+            self.assertEqual('worker2', action.owner)
+            self.assertEqual(consts.ACTION_RUNNING, action.status)
+            self.assertEqual(timestamp, action.start_time)
+
+        actions = db_api.action_acquire_ready(self.ctx, 'worker3', timestamp,
+                                              limit=2)
+        self.assertEqual(1, len(actions))
+        self.assertEqual('worker3', actions[0].owner)
+
+        actions = db_api.action_acquire_ready(self.ctx, 'worker3', timestamp,
+                                              limit=2)
+        self.assertEqual([], actions)
+
+    def test_action_acquire_ready_by_priority(self):
+        now = tu.utcnow()
+        specs = [
+            {'name': 'A01', 'status': 'READY', 'priority': 80,
+             'created_at': now - datetime.timedelta(seconds=30)},
+            {'name': 'A02', 'status': 'READY', 'priority': 10,
+             'created_at': now},
+            {'name': 'A03', 'status': 'READY', 'priority': 10,
+             'created_at': now - datetime.timedelta(seconds=10)},
+        ]
+
+        for spec in specs:
+            _create_action(self.ctx, **spec)
+
+        timestamp = time.time()
+        actions = db_api.action_acquire_ready(self.ctx, 'worker1', timestamp,
+                                              limit=2)
+        self.assertEqual(['A03', 'A02'], [a.name for a in actions])
+
+        action = db_api.action_acquire_1st_ready(self.ctx, 'worker1',
+                                                 timestamp)
+        self.assertEqual('A01', action.name)
+
+    def test_action_age_ready(self):
+        now = tu.utcnow()
+        old = now - datetime.timedelta(seconds=100)
+        specs = [
+            {'name': 'A01', 'status': 'READY', 'priority': 80,
+             'created_at': old},
+            {'name': 'A02', 'status': 'READY', 'priority': 80,
+             'created_at': now},
+            {'name': 'A03', 'status': 'READY', 'priority': 0,
+             'created_at': old},
+            {'name': 'A04', 'status': 'READY', 'priority': 80,
+             'created_at': old, 'owner': 'worker1'},
+            {'name': 'A05', 'status': 'RUNNING', 'priority': 80,
+             'created_at': old},
+        ]
+        ids = [_create_action(self.ctx, **spec).id for spec in specs]
+
+        older_than = now - datetime.timedelta(seconds=60)
+        res = db_api.action_age_ready(self.ctx, older_than)
+
+        self.assertEqual(1, res)
+        priorities = [db_api.action_get(self.ctx, i).priority for i in ids]
+        self.assertEqual([79, 80, 0, 80, 80], priorities)
+
+        # The aged action is not aged again in the same period
+        res = db_api.action_age_ready(self.ctx, older_than)
+        self.assertEqual(0, res)
+
     def test_action_get_all_by_owner(self):
         specs = [
             {'name': 'A01', 'owner': 'work1'},
@@ -154,6 +269,21 @@ class DBAPIActionTest(base.SenlinTestCase):
         for spec in specs:
             self.assertIn(spec['name'], names)
 
+    def test_action_get_all_with_columns(self):
+        for name in ['A01', 'A02']:
+            _create_action(self.ctx, name=name, target='cluster_001')
+
+        actions = db_api.action_get_all(self.ctx, sort='name',
+                                        columns=['id', 'name'])
+        self.assertEqual(['A01', 'A02'], [a.name for a in actions])
+        self.assertEqual(['id', 'name'],
+                         sorted(actions[0]._asdict().keys()))
+
+        actions = db_api.action_get_all(self.ctx, sort='name',
+                                        marker=actions[0].id,
+                                        columns=['name'])
+        self.assertEqual(['A02'], [a.name for a in actions])
+
     def test_action_check_status(self):
         specs = [
             {'name': 'A01', 'target': 'cluster_001'},
@@ -266,12 +396,28 @@ class DBAPIActionTest(base.SenlinTestCase):
     def test_dependency_add_dependent_list(self):
         self._check_dependency_add_dependent_list()
 
+    def test_dependency_get_all(self):
+        id_of = self._check_dependency_add_depended_list()
+
+        res = db_api.dependency_get_all(self.ctx, [id_of['A02']])
+        self.assertEqual([(id_of['A02'], id_of['A01'])], res)
+
+        res = db_api.dependency_get_all(self.ctx, [id_of['A01']])
+        self.assertEqual(3, len(res))
+        for aid in [id_of['A02'], id_of['A03'], id_of['A04']]:
+            self.assertIn((aid, id_of['A01']), res)
+
+        self.assertEqual([], db_api.dependency_get_all(self.ctx, []))
+
     def test_action_mark_succeeded(self):
         timestamp = time.time()
         id_of = self._check_dependency_add_dependent_list()
 
-        db_api.action_mark_succeeded(self.ctx, id_of['A01'], timestamp)
+        res = db_api.action_mark_succeeded(self.ctx, id_of['A01'], timestamp)
 
+        # all dependents have no more depended actions
+        self.assertEqual({id_of['A02']: None, id_of['A03']: None,
+                          id_of['A04']: None}, res)
         res = db_api.dependency_get_depended(self.ctx, id_of['A01'])
         self.assertEqual(0, len(res))
 
@@ -283,6 +429,18 @@ class DBAPIActionTest(base.SenlinTestCase):
             res = db_api.dependency_get_dependents(self.ctx, aid)
             self.assertEqual(0, len(res))
 
+    def test_action_mark_succeeded_with_other_depended(self):
+        timestamp = time.time()
+        id_of = self._check_dependency_add_depended_list()
+        db_api.action_update(self.ctx, id_of['A01'], {'owner': 'ENGINE'})
+
+        res = db_api.action_mark_succeeded(self.ctx, id_of['A02'], timestamp)
+        self.assertEqual({}, res)
+        res = db_api.action_mark_succeeded(self.ctx, id_of['A03'], timestamp)
+        self.assertEqual({}, res)
+        res = db_api.action_mark_succeeded(self.ctx, id_of['A04'], timestamp)
+        self.assertEqual({id_of['A01']: 'ENGINE'}, res)
+
     def _prepare_action_mark_failed_cancel(self):
         specs = [
             {'name': 'A01', 'status': 'INIT', 'target': 'cluster_001'},
@@ -345,7 +503,10 @@ class DBAPIActionTest(base.SenlinTestCase):
     def test_action_mark_failed(self):
         timestamp = time.time()
         id_of = self._prepare_action_mark_failed_cancel()
-        db_api.action_mark_failed(self.ctx, id_of['A01'], timestamp)
+        res = db_api.action_mark_failed(self.ctx, id_of['A01'], timestamp)
+
+        self.assertEqual({id_of['A05']: None, id_of['A06']: None,
+                          id_of['A07']: None}, res)
 
         for aid in [id_of['A05'], id_of['A06'], id_of['A07']]:
             action = db_api.action_get(self.ctx, aid)
@@ -358,7 +519,10 @@ class DBAPIActionTest(base.SenlinTestCase):
     def test_action_mark_cancelled(self):
         timestamp = time.time()
         id_of = self._prepare_action_mark_failed_cancel()
-        db_api.action_mark_cancelled(self.ctx, id_of['A01'], timestamp)
+        res = db_api.action_mark_cancelled(self.ctx, id_of['A01'], timestamp)
+
+        self.assertEqual({id_of['A05']: None, id_of['A06']: None,
+                          id_of['A07']: None}, res)
 
         for aid in [id_of['A05'], id_of['A06'], id_of['A07']]:
             action = db_api.action_get(self.ctx, aid)
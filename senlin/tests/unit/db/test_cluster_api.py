@@ -308,6 +308,15 @@ class DBAPIClusterTest(base.SenlinTestCase):
         res = db_api.cluster_get(self.ctx, cluster_id)
         self.assertEqual(3, res.next_index)
 
+    def test_cluster_next_index_range(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        res = db_api.cluster_next_index(self.ctx, cluster.id, 5)
+        self.assertEqual(1, res)
+        res = db_api.cluster_get(self.ctx, cluster.id)
+        self.assertEqual(6, res.next_index)
+        res = db_api.cluster_next_index(self.ctx, cluster.id)
+        self.assertEqual(6, res)
+
     def test_cluster_count_all(self):
         clusters = [shared.create_cluster(self.ctx, self.profile)
                     for i in range(3)]
@@ -140,6 +140,21 @@ class DBAPIClusterPolicyTest(base.SenlinTestCase):
         self.assertEqual(1, len(bindings))
         self.assertEqual(timestamp, bindings[0].last_op)
 
+    def test_policy_last_op_update(self):
+        for pid in ['policy1', 'policy2', 'policy3']:
+            self.create_policy(id=pid)
+            db_api.cluster_policy_attach(self.ctx, self.cluster.id, pid, {})
+
+        timestamp = tu.utcnow()
+        db_api.cluster_policy_last_op_update(self.ctx, self.cluster.id,
+                                             ['policy1', 'policy2'],
+                                             timestamp)
+
+        bindings = db_api.cluster_policy_get_all(self.ctx, self.cluster.id)
+        last_ops = dict((b.policy_id, b.last_op) for b in bindings)
+        self.assertEqual({'policy1': timestamp, 'policy2': timestamp,
+                          'policy3': None}, last_ops)
+
     def test_policy_get_all_with_empty_filters(self):
         for pid in ['policy1', 'policy2']:
             self.create_policy(id=pid)
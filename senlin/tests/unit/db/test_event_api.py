@@ -10,8 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import logging
 
+from oslo_config import cfg
 from oslo_utils import reflection
 from oslo_utils import timeutils as tu
 
@@ -86,6 +88,25 @@ class DBAPIEventTest(base.SenlinTestCase):
         self.assertEqual(self.ctx.user, ret_event.user)
         self.assertEqual(self.ctx.project, ret_event.project)
 
+    def test_event_create_batch(self):
+        values = [{
+            'id': 'EVENT-%s' % i,
+            'timestamp': tu.utcnow(),
+            'level': logging.INFO,
+            'status_reason': 'reason-%s' % i,
+            'user': self.ctx.user,
+            'project': self.ctx.project,
+            'meta_data': {'index': i},
+        } for i in range(3)]
+
+        db_api.event_create_batch(self.ctx, values)
+
+        for i in range(3):
+            ret_event = db_api.event_get(self.ctx, 'EVENT-%s' % i)
+            self.assertIsNotNone(ret_event)
+            self.assertEqual('reason-%s' % i, ret_event.status_reason)
+            self.assertEqual({'index': i}, ret_event.meta_data)
+
     def test_event_get_diff_project(self):
         event = self.create_event(self.ctx)
         new_ctx = utils.dummy_context(project='a-different-project')
@@ -147,6 +168,16 @@ class DBAPIEventTest(base.SenlinTestCase):
         self.assertIn(cluster2.id, cluster_ids)
         self.assertIn(cluster2.name, obj_names)
 
+    def test_event_get_all_with_columns(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        self.create_event(self.ctx, entity=cluster1)
+
+        events = db_api.event_get_all(self.ctx, columns=['id', 'obj_id'])
+        self.assertEqual(1, len(events))
+        self.assertEqual(cluster1.id, events[0].obj_id)
+        self.assertEqual(['id', 'obj_id'],
+                         sorted(events[0]._asdict().keys()))
+
     def test_event_get_all_with_limit(self):
         cluster1 = shared.create_cluster(self.ctx, self.profile)
 
@@ -474,3 +505,92 @@ class DBAPIEventTest(base.SenlinTestCase):
                                                  limit=1, marker=marker)
         self.assertEqual(1, len(events))
         self.assertEqual(expected, events[0].id)
+
+    def _create_events(self, cluster, count, project=None):
+        ctx = utils.dummy_context(project=project) if project else self.ctx
+        start = tu.utcnow() - datetime.timedelta(days=count)
+        return [self.create_event(ctx, entity=cluster,
+                                  timestamp=start + datetime.timedelta(days=i))
+                for i in range(count)]
+
+    def test_event_prune(self):
+        cfg.CONF.set_override('max_events_per_cluster', 3, enforce_type=True)
+        cfg.CONF.set_override('event_purge_batch_size', 2, enforce_type=True)
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        events = self._create_events(cluster1, 4)
+
+        res = db_api.event_prune(self.ctx, cluster1.id)
+
+        self.assertEqual(2, res)
+        self.assertIsNone(db_api.event_get(self.ctx, events[0].id))
+        self.assertIsNone(db_api.event_get(self.ctx, events[1].id))
+        self.assertEqual(2, db_api.event_count_by_cluster(self.ctx,
+                                                          cluster1.id))
+
+    def test_event_purge(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        cluster2 = shared.create_cluster(self.ctx, self.profile)
+        events1 = self._create_events(cluster1, 5)
+        events2 = self._create_events(cluster2, 5)
+        older_than = events1[3].timestamp
+
+        # bounded by limit, oldest first
+        res = db_api.event_purge(self.ctx, older_than, 2,
+                                 cluster_id=cluster1.id)
+        self.assertEqual(2, res)
+        self.assertIsNone(db_api.event_get(self.ctx, events1[0].id))
+        self.assertIsNone(db_api.event_get(self.ctx, events1[1].id))
+        self.assertIsNotNone(db_api.event_get(self.ctx, events1[2].id))
+
+        res = db_api.event_purge(self.ctx, older_than, 2,
+                                 cluster_id=cluster1.id)
+        self.assertEqual(1, res)
+        self.assertEqual(2, db_api.event_count_by_cluster(self.ctx,
+                                                          cluster1.id))
+        self.assertEqual(5, db_api.event_count_by_cluster(self.ctx,
+                                                          cluster2.id))
+
+        res = db_api.event_purge(self.ctx, older_than, 10)
+        self.assertEqual(3, res)
+        self.assertIsNotNone(db_api.event_get(self.ctx, events2[3].id))
+
+    def test_event_purge_by_project(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        self._create_events(cluster1, 2)
+        self._create_events(cluster1, 3, project='project-2')
+
+        res = db_api.event_purge(self.ctx, tu.utcnow(), 10,
+                                 project='project-2')
+
+        self.assertEqual(3, res)
+        self.assertEqual(2, db_api.event_count_by_cluster(self.ctx,
+                                                          cluster1.id))
+
+    def test_event_count_over_limit(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        cluster2 = shared.create_cluster(self.ctx, self.profile)
+        self._create_events(cluster1, 3)
+        self._create_events(cluster2, 2, project='project-2')
+
+        res = db_api.event_count_over_limit(self.ctx, 'cluster_id', 2)
+        self.assertEqual([(cluster1.id, 3)], res)
+
+        res = db_api.event_count_over_limit(self.ctx, 'project', 1)
+        self.assertEqual(sorted([(self.ctx.project, 3), ('project-2', 2)]),
+                         sorted(res))
+
+    def test_event_timestamp_cutoff(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        events = self._create_events(cluster1, 4)
+
+        res = db_api.event_timestamp_cutoff(self.ctx, 3,
+                                            cluster_id=cluster1.id)
+        self.assertEqual(events[1].timestamp, res)
+
+        res = db_api.event_timestamp_cutoff(self.ctx, 1,
+                                            project=self.ctx.project)
+        self.assertEqual(events[3].timestamp, res)
+
+        res = db_api.event_timestamp_cutoff(self.ctx, 5,
+                                            cluster_id=cluster1.id)
+        self.assertIsNone(res)
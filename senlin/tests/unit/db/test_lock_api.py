@@ -10,6 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
+from oslo_utils import timeutils as tu
+
 from senlin.db.sqlalchemy import api as db_api
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
@@ -219,3 +223,81 @@ class DBAPILockTest(base.SenlinTestCase):
 
         observed = db_api.node_lock_release(self.node.id, UUID2)
         self.assertTrue(observed)
+
+    def test_cluster_lock_acquire_lease(self):
+        now = tu.utcnow()
+        expiry = now + datetime.timedelta(seconds=60)
+
+        owners, stolen = db_api.cluster_lock_acquire_lease(
+            self.cluster.id, UUID1, -1, expiry, now)
+        self.assertEqual([UUID1], owners)
+        self.assertEqual([], stolen)
+
+        # Lease not expired yet
+        owners, stolen = db_api.cluster_lock_acquire_lease(
+            self.cluster.id, UUID2, -1, expiry, now)
+        self.assertEqual([UUID1], owners)
+        self.assertEqual([], stolen)
+
+        # Lease expired, the lock is taken over
+        later = expiry + datetime.timedelta(seconds=1)
+        owners, stolen = db_api.cluster_lock_acquire_lease(
+            self.cluster.id, UUID2, 1, later, later)
+        self.assertEqual([UUID2], owners)
+        self.assertEqual([UUID1], stolen)
+
+        owners, stolen = db_api.cluster_lock_acquire_lease(
+            self.cluster.id, UUID3, 1, later, later)
+        self.assertEqual([UUID2, UUID3], owners)
+        self.assertEqual([], stolen)
+
+    def test_cluster_lock_renew(self):
+        now = tu.utcnow()
+        expiry = now + datetime.timedelta(seconds=60)
+        db_api.cluster_lock_acquire_lease(self.cluster.id, UUID1, -1,
+                                          expiry, now)
+
+        later = expiry + datetime.timedelta(seconds=1)
+        res = db_api.cluster_lock_renew(
+            [self.cluster.id], later + datetime.timedelta(seconds=60))
+        self.assertEqual(1, res)
+
+        owners, stolen = db_api.cluster_lock_acquire_lease(
+            self.cluster.id, UUID2, -1, later, later)
+        self.assertEqual([UUID1], owners)
+        self.assertEqual([], stolen)
+
+    def test_node_lock_acquire_lease(self):
+        now = tu.utcnow()
+        expiry = now + datetime.timedelta(seconds=60)
+
+        owner, stolen = db_api.node_lock_acquire_lease(self.node.id, UUID1,
+                                                       expiry, now)
+        self.assertEqual(UUID1, owner)
+        self.assertIsNone(stolen)
+
+        owner, stolen = db_api.node_lock_acquire_lease(self.node.id, UUID2,
+                                                       expiry, now)
+        self.assertEqual(UUID1, owner)
+        self.assertIsNone(stolen)
+
+        later = expiry + datetime.timedelta(seconds=1)
+        owner, stolen = db_api.node_lock_acquire_lease(self.node.id, UUID2,
+                                                       later, later)
+        self.assertEqual(UUID2, owner)
+        self.assertEqual(UUID1, stolen)
+
+    def test_node_lock_renew(self):
+        now = tu.utcnow()
+        expiry = now + datetime.timedelta(seconds=60)
+        db_api.node_lock_acquire_lease(self.node.id, UUID1, expiry, now)
+
+        later = expiry + datetime.timedelta(seconds=1)
+        res = db_api.node_lock_renew([self.node.id],
+                                     later + datetime.timedelta(seconds=60))
+        self.assertEqual(1, res)
+
+        owner, stolen = db_api.node_lock_acquire_lease(self.node.id, UUID2,
+                                                       later, later)
+        self.assertEqual(UUID1, owner)
+        self.assertIsNone(stolen)
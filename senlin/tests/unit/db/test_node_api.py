@@ -15,10 +15,13 @@ from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils as tu
 import six
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects import postgresql
 
 from senlin.common import consts
 from senlin.common import exception
 from senlin.db.sqlalchemy import api as db_api
+from senlin.db.sqlalchemy import models
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 from senlin.tests.unit.db import shared
@@ -57,6 +60,28 @@ class DBAPINodeTest(base.SenlinTestCase):
         nodes = db_api.node_get_all_by_cluster(self.ctx, self.cluster.id)
         self.assertEqual(1, len(nodes))
 
+    def test_node_create_batch(self):
+        values = [{
+            'id': node_id,
+            'name': 'node-%s' % index,
+            'cluster_id': self.cluster.id,
+            'profile_id': self.profile.id,
+            'user': self.ctx.user,
+            'project': self.ctx.project,
+            'index': index,
+            'status': 'INIT',
+            'data': {'placement': {'zone': 'AZ1'}},
+        } for index, node_id in enumerate([UUID1, UUID2, UUID3])]
+
+        db_api.node_create_batch(self.ctx, values)
+
+        nodes = db_api.node_get_all_by_cluster(self.ctx, self.cluster.id)
+        self.assertEqual(3, len(nodes))
+        node = db_api.node_get(self.ctx, UUID2)
+        self.assertEqual('node-1', node.name)
+        self.assertEqual(1, node.index)
+        self.assertEqual({'placement': {'zone': 'AZ1'}}, node.data)
+
     def test_node_get(self):
         res = shared.create_node(self.ctx, self.cluster, self.profile)
         node = db_api.node_get(self.ctx, res.id)
@@ -85,6 +110,30 @@ class DBAPINodeTest(base.SenlinTestCase):
         node = db_api.node_get(admin_ctx, res.id, project_safe=True)
         self.assertIsNotNone(node)
 
+    def test_node_get_many(self):
+        node1 = shared.create_node(self.ctx, self.cluster, self.profile)
+        node2 = shared.create_node(self.ctx, self.cluster, self.profile)
+        shared.create_node(self.ctx, self.cluster, self.profile)
+
+        nodes = db_api.node_get_many(self.ctx, [node1.id, node2.id, UUID2])
+        self.assertEqual(sorted([node1.id, node2.id]),
+                         sorted([n.id for n in nodes]))
+
+        self.assertEqual([], db_api.node_get_many(self.ctx, []))
+
+    def test_node_get_many_diff_project(self):
+        node = shared.create_node(self.ctx, self.cluster, self.profile)
+
+        ctx_new = utils.dummy_context(project='a_different_project')
+        self.assertEqual([], db_api.node_get_many(ctx_new, [node.id]))
+        nodes = db_api.node_get_many(ctx_new, [node.id], project_safe=False)
+        self.assertEqual([node.id], [n.id for n in nodes])
+
+        admin_ctx = utils.dummy_context(project='a_different_project',
+                                        is_admin=True)
+        nodes = db_api.node_get_many(admin_ctx, [node.id])
+        self.assertEqual([node.id], [n.id for n in nodes])
+
     def test_node_get_by_name(self):
         shared.create_node(self.ctx, self.cluster, self.profile)
         node = db_api.node_get_by_name(self.ctx, 'test_node_name')
@@ -201,6 +250,24 @@ class DBAPINodeTest(base.SenlinTestCase):
         nodes = db_api.node_get_all(self.ctx, limit=1, marker='node1')
         self.assertEqual(1, len(nodes))
 
+    def test_node_get_all_with_columns(self):
+        node_ids = ['node1', 'node2', 'node3']
+        for v in node_ids:
+            shared.create_node(self.ctx, self.cluster, self.profile,
+                               id=v, init_at=tu.utcnow())
+
+        nodes = db_api.node_get_all(self.ctx, columns=['id', 'name'])
+        self.assertEqual(node_ids, [n.id for n in nodes])
+        self.assertEqual(['id', 'name'], sorted(nodes[0]._asdict().keys()))
+
+        nodes = db_api.node_get_all(self.ctx, limit=1, marker='node1',
+                                    columns=['id'])
+        self.assertEqual(['node2'], [n.id for n in nodes])
+
+        nodes = db_api.node_get_all(self.ctx, sort='init_at:desc',
+                                    marker='node2', columns=['id'])
+        self.assertEqual(['node1'], [n.id for n in nodes])
+
     @mock.patch.object(sa_utils, 'paginate_query')
     def test_node_get_all_used_sort_keys(self, mock_paginate):
         node_ids = ['node1', 'node2', 'node3']
@@ -394,6 +461,34 @@ class DBAPINodeTest(base.SenlinTestCase):
                                            project_safe=True)
         self.assertEqual(2, res)
 
+    def test_node_get_all_for_selection(self):
+        node1 = shared.create_node(self.ctx, self.cluster, self.profile,
+                                   status='ERROR')
+        node2 = shared.create_node(self.ctx, self.cluster, self.profile)
+        other = shared.create_cluster(self.ctx, self.profile)
+        shared.create_node(self.ctx, other, self.profile)
+
+        res = db_api.node_get_all_for_selection(self.ctx, self.cluster.id)
+
+        self.assertEqual(2, len(res))
+        rows = dict((r.id, r) for r in res)
+        self.assertEqual('ERROR', rows[node1.id].status)
+        self.assertEqual(node1.created_at, rows[node1.id].created_at)
+        self.assertEqual(node2.status, rows[node2.id].status)
+        self.assertEqual(self.profile.created_at,
+                         rows[node2.id].profile_created_at)
+
+    def test_node_get_all_for_selection_diff_project(self):
+        ctx_new = utils.dummy_context(project='a_different_project')
+        shared.create_node(self.ctx, self.cluster, self.profile)
+
+        res = db_api.node_get_all_for_selection(ctx_new, self.cluster.id)
+        self.assertEqual([], res)
+
+        res = db_api.node_get_all_for_selection(ctx_new, self.cluster.id,
+                                                project_safe=False)
+        self.assertEqual(1, len(res))
+
     def test_node_update(self):
         node = shared.create_node(self.ctx, self.cluster, self.profile)
         new_attributes = {
@@ -416,6 +511,46 @@ class DBAPINodeTest(base.SenlinTestCase):
         self.assertEqual('The node (BogusId) could not be found.',
                          six.text_type(ex))
 
+    def test_node_data_update(self):
+        node = shared.create_node(self.ctx, self.cluster, self.profile,
+                                  data={'key1': 'value1', 'lb_member': 'M1'})
+
+        db_api.node_data_update(self.ctx, node.id,
+                                values={'lb_member': 'M2'},
+                                removed=['key1', 'missing'])
+
+        node = db_api.node_get(self.ctx, node.id)
+        self.assertEqual({'lb_member': 'M2'}, node.data)
+
+    def test_node_data_update_not_found(self):
+        ex = self.assertRaises(exception.NodeNotFound,
+                               db_api.node_data_update,
+                               self.ctx, 'BogusId', values={'k': 'v'})
+        self.assertEqual('The node (BogusId) could not be found.',
+                         six.text_type(ex))
+
+    def _compile_json_update(self, dialect):
+        expr = db_api._json_update_expr(dialect, models.Node.data,
+                                        {'lb_member': 'M2'}, ['host_ip'])
+        return six.text_type(expr.compile(
+            dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+    def test_json_update_expr_mysql(self):
+        sql = self._compile_json_update(mysql.dialect())
+
+        self.assertIn('JSON_REMOVE(JSON_SET(coalesce(node.data, '
+                      'JSON_OBJECT()), ', sql)
+        self.assertIn("'$.\"lb_member\"', JSON_EXTRACT('\"M2\"', '$')",
+                      sql)
+        self.assertIn("'$.\"host_ip\"'", sql)
+
+    def test_json_update_expr_postgresql(self):
+        sql = self._compile_json_update(postgresql.dialect())
+
+        self.assertIn("coalesce(node.data, CAST('{}' AS JSONB))", sql)
+        self.assertIn("|| CAST('{\"lb_member\": \"M2\"}' AS JSONB)", sql)
+        self.assertIn("- 'host_ip'", sql)
+
     def test_node_update_cluster_status_updated(self):
         cluster = db_api.cluster_get(self.ctx, self.cluster.id)
         self.assertEqual('INIT', cluster.status)
@@ -58,6 +58,43 @@ class DBAPIRegistryTest(base.SenlinTestCase):
         self.assertEqual('ENGINE_ID', registries[0].engine_id)
         self.assertEqual('ENGINE_ID', registries[1].engine_id)
 
+    def test_registry_claim_clusters(self):
+        for i in range(3):
+            self._create_registry(cluster_id='cluster-%s' % i,
+                                  check_type='NODE_STATUS_POLLING',
+                                  interval=60,
+                                  params={},
+                                  engine_id='SERVICE_ID')
+
+        registries = db_api.registry_claim(
+            self.ctx, engine_id='ENGINE_ID',
+            cluster_ids=['cluster-0', 'cluster-2'])
+
+        self.assertEqual(['cluster-0', 'cluster-2'],
+                         sorted(r.cluster_id for r in registries))
+        owners = dict((r.cluster_id, r.engine_id)
+                      for r in db_api.registry_get_all(self.ctx))
+        self.assertEqual({'cluster-0': 'ENGINE_ID',
+                          'cluster-1': 'SERVICE_ID',
+                          'cluster-2': 'ENGINE_ID'}, owners)
+
+        self.assertEqual([], db_api.registry_claim(self.ctx, 'ENGINE_ID',
+                                                   cluster_ids=[]))
+
+    def test_registry_get_all(self):
+        self.assertEqual([], db_api.registry_get_all(self.ctx))
+        self._create_registry('CLUSTER_ID',
+                              check_type='NODE_STATUS_POLLING',
+                              interval=60,
+                              params={},
+                              engine_id='ENGINE_ID')
+
+        registries = db_api.registry_get_all(self.ctx)
+
+        self.assertEqual(1, len(registries))
+        self.assertEqual('CLUSTER_ID', registries[0].cluster_id)
+        self.assertEqual('ENGINE_ID', registries[0].engine_id)
+
     def test_registry_delete(self):
         registry = self._create_registry('CLUSTER_ID',
                                          check_type='NODE_STATUS_POLLING',
@@ -11,7 +11,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 from sqlalchemy.dialects.mysql import base as mysql_base
+from sqlalchemy.dialects.postgresql import base as pg_base
 from sqlalchemy.dialects.sqlite import base as sqlite_base
 from sqlalchemy import types
 import testtools
@@ -19,6 +22,54 @@ import testtools
 from senlin.db.sqlalchemy import types as db_types
 
 
+class NativeJSONTest(testtools.TestCase):
+
+    def test_native_json(self):
+        dialect = mysql_base.MySQLDialect()
+        self.assertFalse(db_types.native_json(dialect))
+        dialect.server_version_info = (5, 6, 30)
+        self.assertFalse(db_types.native_json(dialect))
+        dialect.server_version_info = (5, 7, 8)
+        self.assertTrue(db_types.native_json(dialect))
+        dialect.server_version_info = (5, 5, 5, 10, 1, 9, 'MariaDB')
+        self.assertFalse(db_types.native_json(dialect))
+
+        dialect = pg_base.PGDialect()
+        dialect.server_version_info = (9, 4, 5)
+        self.assertFalse(db_types.native_json(dialect))
+        dialect.server_version_info = (9, 5, 1)
+        self.assertTrue(db_types.native_json(dialect))
+
+        dialect = sqlite_base.SQLiteDialect()
+        dialect.server_version_info = (3, 8, 2)
+        self.assertFalse(db_types.native_json(dialect))
+
+    def test_load_dialect_impl_native(self):
+        sqltype = db_types.Dict()
+        dialect = mysql_base.MySQLDialect()
+        dialect.server_version_info = (5, 7, 8)
+        impl = sqltype.load_dialect_impl(dialect)
+        self.assertIsInstance(impl, db_types.MySQLJSON)
+
+        dialect = pg_base.PGDialect()
+        dialect.server_version_info = (9, 5, 1)
+        impl = sqltype.load_dialect_impl(dialect)
+        self.assertIsInstance(impl, db_types.PostgreSQLJSONB)
+        self.assertIsNone(impl.bind_processor(dialect))
+        self.assertIsNone(impl.result_processor(dialect, None))
+
+    def test_loads(self):
+        self.assertEqual({'foo': 'bar'}, db_types.loads(b'{"foo": "bar"}'))
+        # Values already decoded by the database driver
+        value = {'foo': 'bar'}
+        self.assertIs(value, db_types.loads(value))
+
+    def test_dumps_non_primitive(self):
+        value = {'when': datetime.datetime(2016, 1, 2, 3, 4, 5)}
+        self.assertEqual('{"when": "2016-01-02T03:04:05.000000"}',
+                         db_types.dumps(value))
+
+
 class DictTest(testtools.TestCase):
 
     def setUp(self):
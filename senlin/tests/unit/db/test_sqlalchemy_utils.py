@@ -11,7 +11,10 @@
 # under the License.
 
 import mock
+import six
+from sqlalchemy import orm
 
+from senlin.db.sqlalchemy import models
 from senlin.db.sqlalchemy import utils
 from senlin.tests.unit.common import base
 
@@ -91,3 +94,46 @@ class SortParamTest(base.SenlinTestCase):
         self.assertEqual(3, len(dirs))
         self.assertEqual(['foo', 'bar', 'id'], keys)
         self.assertEqual(['asc', 'asc', 'asc'], dirs)
+
+
+class PaginateQueryTest(base.SenlinTestCase):
+
+    def _compile(self, query):
+        return six.text_type(query.statement.compile(
+            compile_kwargs={'literal_binds': True}))
+
+    def test_without_marker(self):
+        query = orm.Query(models.Node.id)
+
+        query = utils.paginate_query(query, models.Node, 10,
+                                     ['name', 'id'])
+
+        sql = self._compile(query)
+        self.assertNotIn('WHERE', sql)
+        self.assertIn('ORDER BY node.name ASC, node.id ASC', sql)
+        self.assertIn('LIMIT 10', sql)
+
+    def test_with_marker(self):
+        query = orm.Query(models.Node.id)
+        marker = mock.Mock(name='n1', id='N1')
+
+        query = utils.paginate_query(query, models.Node, None,
+                                     ['name', 'id'], marker=marker,
+                                     sort_dirs=['desc', 'asc'])
+
+        sql = self._compile(query)
+        self.assertIn("node.name < 'n1'", sql)
+        self.assertIn("node.name = 'n1' AND node.id > 'N1'", sql)
+        self.assertIn("node.name <= 'n1'", sql)
+        self.assertIn('ORDER BY node.name DESC, node.id ASC', sql)
+        self.assertNotIn('LIMIT', sql)
+
+    def test_with_marker_null_leading_key(self):
+        query = orm.Query(models.Node.id)
+        marker = mock.Mock(name=None, id='N1')
+
+        query = utils.paginate_query(query, models.Node, 1,
+                                     ['name', 'id'], marker=marker)
+
+        sql = self._compile(query)
+        self.assertNotIn('node.name >=', sql)
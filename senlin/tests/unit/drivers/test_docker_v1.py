@@ -0,0 +1,231 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo_config import cfg
+
+from senlin.common import exception
+from senlin.drivers import docker_v1
+from senlin.tests.unit.common import base
+
+
+class TestDockerClient(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestDockerClient, self).setUp()
+        self.mock_client = self.patchobject(docker_v1, 'Client')
+        self.client = self.mock_client.return_value
+        self.patchobject(docker_v1, '_pool', None)
+        self.sot = docker_v1.DockerClient({'host_ip': '10.0.0.1'})
+
+    def test_init(self):
+        self.mock_client.assert_called_once_with(
+            base_url='tcp://10.0.0.1:2375')
+        self.assertEqual(self.client, self.sot.dockerclient)
+
+    def test_init_shared_client(self):
+        sot = docker_v1.DockerClient({'host_ip': '10.0.0.1'})
+
+        self.assertEqual(self.sot.dockerclient, sot.dockerclient)
+        self.assertEqual(1, self.mock_client.call_count)
+
+    def test_list_containers(self):
+        res = self.sot.list_containers()
+        self.assertEqual(self.client.containers.return_value, res)
+        self.client.containers.assert_called_once_with(all=True)
+
+    def test_create_container(self):
+        res = self.sot.create_container('IMAGE', 'NAME')
+        self.assertEqual(self.client.create_container.return_value, res)
+        self.client.create_container.assert_called_once_with(image='IMAGE',
+                                                             name='NAME')
+
+    def test_start_container(self):
+        self.sot.start_container('CONTAINER')
+        self.client.start.assert_called_once_with('CONTAINER')
+
+    def test_delete_container(self):
+        self.assertTrue(self.sot.delete_container('CONTAINER'))
+        self.client.remove_container.assert_called_once_with('CONTAINER',
+                                                             force=True)
+
+    def test_delete_container_not_found(self):
+        self.client.remove_container.side_effect = (
+            docker_v1.docker_errors.NotFound('Not found', mock.Mock()))
+        self.assertTrue(self.sot.delete_container('CONTAINER'))
+
+    def test_delete_container_failed(self):
+        self.client.remove_container.side_effect = Exception('Boom')
+        ex = self.assertRaises(exception.ResourceDeletionFailure,
+                               self.sot.delete_container, 'CONTAINER')
+        self.assertEqual('Failed in deleting CONTAINER.', str(ex))
+        # Not a connection error, the client is kept
+        self.assertIn(self.sot.url, docker_v1.get_pool().clients)
+
+    def test_delete_container_connection_error(self):
+        self.client.remove_container.side_effect = (
+            docker_v1.requests_exceptions.ConnectionError('Boom'))
+        self.assertRaises(exception.ResourceDeletionFailure,
+                          self.sot.delete_container, 'CONTAINER')
+
+        self.assertNotIn(self.sot.url, docker_v1.get_pool().clients)
+        self.client.close.assert_called_once_with()
+
+    def test_connection_error_discards_client(self):
+        self.client.containers.side_effect = (
+            docker_v1.requests_exceptions.ConnectionError('Boom'))
+        self.assertRaises(docker_v1.requests_exceptions.ConnectionError,
+                          self.sot.list_containers)
+
+        self.assertNotIn(self.sot.url, docker_v1.get_pool().clients)
+        self.client.close.assert_called_once_with()
+
+
+class TestClientPool(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestClientPool, self).setUp()
+        self.mock_client = self.patchobject(docker_v1, 'Client',
+                                            side_effect=self._new_client)
+        self.mock_clock = self.patchobject(docker_v1, 'wallclock',
+                                           return_value=1000)
+        self.pool = docker_v1.ClientPool(2, 600, 60)
+
+    def _new_client(self, base_url):
+        return mock.Mock(base_url=base_url)
+
+    def test_get_reuse(self):
+        c1 = self.pool.get('URL1')
+        c2 = self.pool.get('URL1')
+
+        self.assertEqual(c1, c2)
+        self.mock_client.assert_called_once_with(base_url='URL1')
+        self.assertEqual(0, c1.ping.call_count)
+
+    def test_get_evict_lru(self):
+        c1 = self.pool.get('URL1')
+        c2 = self.pool.get('URL2')
+        self.pool.get('URL1')
+        self.pool.get('URL3')
+
+        self.assertEqual(['URL1', 'URL3'], list(self.pool.clients))
+        self.assertEqual(0, c1.close.call_count)
+        # The evicted client may still be in use
+        self.assertEqual(0, c2.close.call_count)
+        self.assertEqual(3, self.mock_client.call_count)
+
+    def test_get_purge_idle(self):
+        c1 = self.pool.get('URL1')
+        self.mock_clock.return_value = 1500
+        c2 = self.pool.get('URL2')
+        self.mock_clock.return_value = 1700
+
+        self.pool.get('URL2')
+
+        self.assertEqual(['URL2'], list(self.pool.clients))
+        c1.close.assert_called_once_with()
+        self.assertEqual(0, c2.close.call_count)
+
+    def test_get_health_check(self):
+        c1 = self.pool.get('URL1')
+        self.mock_clock.return_value = 1100
+
+        res = self.pool.get('URL1')
+
+        self.assertEqual(c1, res)
+        c1.ping.assert_called_once_with()
+        self.assertEqual((c1, 1100), self.pool.clients['URL1'])
+
+    def test_get_health_check_failed(self):
+        c1 = self.pool.get('URL1')
+        c1.ping.side_effect = Exception('Boom')
+        self.mock_clock.return_value = 1100
+
+        res = self.pool.get('URL1')
+
+        self.assertNotEqual(c1, res)
+        c1.close.assert_called_once_with()
+        self.assertEqual(2, self.mock_client.call_count)
+
+    def test_get_health_check_failed_replaced(self):
+        c1 = self.pool.get('URL1')
+        c2 = mock.Mock()
+        c3 = mock.Mock()
+
+        def ping():
+            # Another greenthread replaces the client while pinging
+            self.pool.clients['URL1'] = (c2, 1100)
+            raise Exception('Boom')
+
+        c1.ping.side_effect = ping
+        self.mock_client.side_effect = None
+        self.mock_client.return_value = c3
+        self.mock_clock.return_value = 1100
+
+        res = self.pool.get('URL1')
+
+        self.assertEqual(c2, res)
+        self.assertEqual((c2, 1100), self.pool.clients['URL1'])
+        self.assertEqual(0, c2.close.call_count)
+        # The client created meanwhile lost the race
+        c3.close.assert_called_once_with()
+
+    def test_get_concurrent_create(self):
+        c1 = mock.Mock()
+        c2 = mock.Mock()
+
+        def new_client(base_url):
+            # Another greenthread pools a client for the same endpoint
+            self.pool.clients[base_url] = (c1, 1000)
+            return c2
+
+        self.mock_client.side_effect = new_client
+
+        res = self.pool.get('URL1')
+
+        self.assertEqual(c1, res)
+        self.assertEqual((c1, 1000), self.pool.clients['URL1'])
+        c2.close.assert_called_once_with()
+        self.assertEqual(0, c1.close.call_count)
+
+    def test_discard(self):
+        c1 = self.pool.get('URL1')
+
+        self.pool.discard('URL1')
+        self.pool.discard('URL2')
+
+        self.assertEqual({}, self.pool.clients)
+        c1.close.assert_called_once_with()
+
+    def test_discard_replaced_client(self):
+        c1 = self.pool.get('URL1')
+        self.pool.discard('URL1', c1)
+        c2 = self.pool.get('URL1')
+
+        # The failed client was already replaced, keep the new one
+        self.pool.discard('URL1', c1)
+
+        self.assertEqual((c2, 1000), self.pool.clients['URL1'])
+        c1.close.assert_called_once_with()
+        self.assertEqual(0, c2.close.call_count)
+
+    def test_get_pool(self):
+        self.patchobject(docker_v1, '_pool', None)
+        cfg.CONF.set_override('client_pool_size', 8, group='docker',
+                              enforce_type=True)
+
+        pool = docker_v1.get_pool()
+
+        self.assertEqual(8, pool.max_size)
+        self.assertEqual(cfg.CONF.docker.client_idle_timeout,
+                         pool.idle_timeout)
+        self.assertEqual(pool, docker_v1.get_pool())
@@ -536,3 +536,130 @@ class TestNeutronLBaaSDriver(base.SenlinTestCase):
         res = self.lb_driver.member_remove(lb_id, pool_id, member_id)
         self.assertIsNone(res)
         self.lb_driver._wait_for_lb_ready.assert_called_once_with(lb_id)
+
+    def _member_nodes(self):
+        nodes = []
+        for i in range(3):
+            node = mock.Mock(id='NODE%s_ID' % i)
+            node.get_details.return_value = {
+                'addresses': {'network1': ['ipaddr_%s' % i]}
+            }
+            nodes.append(node)
+        subnet_obj = mock.Mock(id='SUBNET_ID', network_id='NETWORK_ID')
+        network_obj = mock.Mock()
+        network_obj.name = 'network1'
+        self.nc.subnet_get.return_value = subnet_obj
+        self.nc.network_get.return_value = network_obj
+        self.lb_driver._wait_for_lb_ready = mock.Mock(return_value=True)
+        return nodes
+
+    @mock.patch.object(oslo_context, 'get_current')
+    def test_members_add(self, mock_get_current):
+        nodes = self._member_nodes()
+        self.nc.pool_member_create.side_effect = [
+            mock.Mock(id='MEMBER%s_ID' % i) for i in range(3)]
+
+        res = self.lb_driver.members_add(nodes, 'LB_ID', 'POOL_ID', '80',
+                                         'subnet1')
+
+        self.assertEqual({'NODE0_ID': 'MEMBER0_ID', 'NODE1_ID': 'MEMBER1_ID',
+                          'NODE2_ID': 'MEMBER2_ID'}, res)
+        self.nc.subnet_get.assert_called_once_with('subnet1')
+        self.nc.network_get.assert_called_once_with('NETWORK_ID')
+        self.nc.pool_member_create.assert_has_calls([
+            mock.call('POOL_ID', 'ipaddr_%s' % i, '80', 'SUBNET_ID')
+            for i in range(3)])
+        self.lb_driver._wait_for_lb_ready.assert_called_once_with('LB_ID')
+
+    @mock.patch.object(oslo_context, 'get_current')
+    def test_members_add_retry_when_busy(self, mock_get_current):
+        nodes = self._member_nodes()[:2]
+        busy = exception.InternalError(code=409, message='PENDING_UPDATE')
+        self.nc.pool_member_create.side_effect = [
+            mock.Mock(id='MEMBER0_ID'), busy, mock.Mock(id='MEMBER1_ID')]
+
+        res = self.lb_driver.members_add(nodes, 'LB_ID', 'POOL_ID', '80',
+                                         'subnet1')
+
+        self.assertEqual({'NODE0_ID': 'MEMBER0_ID', 'NODE1_ID': 'MEMBER1_ID'},
+                         res)
+        self.assertEqual(3, self.nc.pool_member_create.call_count)
+        self.assertEqual(2, self.lb_driver._wait_for_lb_ready.call_count)
+
+    @mock.patch.object(oslo_context, 'get_current')
+    def test_members_add_partial_failure(self, mock_get_current):
+        nodes = self._member_nodes()
+        nodes[1].get_details.return_value = {'addresses': {'network2': []}}
+        self.nc.pool_member_create.side_effect = [
+            mock.Mock(id='MEMBER0_ID'),
+            exception.InternalError(code=500, message='Boom'),
+            exception.InternalError(code=500, message='Boom')]
+
+        res = self.lb_driver.members_add(nodes, 'LB_ID', 'POOL_ID', '80',
+                                         'subnet1')
+
+        self.assertEqual({'NODE0_ID': 'MEMBER0_ID', 'NODE1_ID': None,
+                          'NODE2_ID': None}, res)
+
+    def test_members_add_subnet_not_found(self):
+        nodes = self._member_nodes()
+        self.nc.subnet_get.side_effect = exception.InternalError(
+            code=404, message="Can't find subnet1")
+
+        res = self.lb_driver.members_add(nodes, 'LB_ID', 'POOL_ID', '80',
+                                         'subnet1')
+
+        self.assertEqual({'NODE0_ID': None, 'NODE1_ID': None,
+                          'NODE2_ID': None}, res)
+        self.assertEqual(0, self.nc.pool_member_create.call_count)
+
+    @mock.patch.object(oslo_context, 'get_current')
+    def test_members_add_lb_not_ready(self, mock_get_current):
+        nodes = self._member_nodes()[:1]
+        self.nc.pool_member_create.return_value = mock.Mock(id='MEMBER_ID')
+        self.lb_driver._wait_for_lb_ready.return_value = False
+
+        res = self.lb_driver.members_add(nodes, 'LB_ID', 'POOL_ID', '80',
+                                         'subnet1')
+
+        self.assertEqual({'NODE0_ID': None}, res)
+
+    def test_members_remove(self):
+        self.lb_driver._wait_for_lb_ready = mock.Mock(return_value=True)
+
+        res = self.lb_driver.members_remove('LB_ID', 'POOL_ID',
+                                            ['MEMBER1_ID', 'MEMBER2_ID'])
+
+        self.assertTrue(res)
+        self.nc.pool_member_delete.assert_has_calls([
+            mock.call('POOL_ID', 'MEMBER1_ID'),
+            mock.call('POOL_ID', 'MEMBER2_ID')])
+        self.lb_driver._wait_for_lb_ready.assert_called_once_with('LB_ID')
+
+    def test_members_remove_empty(self):
+        self.lb_driver._wait_for_lb_ready = mock.Mock(return_value=True)
+
+        self.assertTrue(self.lb_driver.members_remove('LB_ID', 'POOL_ID',
+                                                      []))
+        self.assertEqual(0, self.lb_driver._wait_for_lb_ready.call_count)
+
+    def test_members_remove_failed(self):
+        self.lb_driver._wait_for_lb_ready = mock.Mock(return_value=True)
+        self.nc.pool_member_delete.side_effect = [
+            exception.InternalError(code=500, message='Boom'),
+            exception.InternalError(code=500, message='Boom'),
+            None]
+
+        res = self.lb_driver.members_remove('LB_ID', 'POOL_ID',
+                                            ['MEMBER1_ID', 'MEMBER2_ID'])
+
+        self.assertFalse(res)
+        self.assertEqual(3, self.nc.pool_member_delete.call_count)
+
+    def test_members_remove_lb_not_ready(self):
+        self.lb_driver._wait_for_lb_ready = mock.Mock(return_value=False)
+
+        res = self.lb_driver.members_remove('LB_ID', 'POOL_ID',
+                                            ['MEMBER1_ID'])
+
+        self.assertFalse(res)
@@ -15,6 +15,7 @@ import types
 import mock
 from openstack import connection
 from openstack import profile
+from oslo_config import cfg
 from oslo_serialization import jsonutils
 from requests import exceptions as req_exc
 import six
@@ -28,6 +29,7 @@ class OpenStackSDKTest(base.SenlinTestCase):
 
     def setUp(self):
         super(OpenStackSDKTest, self).setUp()
+        self.patchobject(sdk, '_cache', None)
 
     def test_parse_exception_http_exception_with_details(self):
         details = jsonutils.dumps({
@@ -224,6 +226,76 @@ class OpenStackSDKTest(base.SenlinTestCase):
         self.assertEqual(123, ex.code)
         self.assertEqual('BOOM', ex.message)
 
+    @mock.patch.object(profile, 'Profile')
+    @mock.patch.object(connection, 'Connection')
+    def test_create_connection_default_region(self, mock_conn, mock_profile):
+        cfg.CONF.set_override('default_region_name', 'REGION_TWO',
+                              enforce_type=True)
+        x_profile = mock_profile.return_value
+
+        sdk.create_connection({'user_id': '123', 'password': 'abc'})
+
+        x_profile.set_region.assert_called_once_with(x_profile.ALL,
+                                                     'REGION_TWO')
+        mock_conn.assert_called_once_with(profile=x_profile,
+                                          user_agent=sdk.USER_AGENT,
+                                          auth_plugin='password',
+                                          user_id='123', password='abc')
+
+    @mock.patch.object(profile, 'Profile')
+    @mock.patch.object(connection, 'Connection')
+    def test_create_connection_cached(self, mock_conn, mock_profile):
+        mock_conn.side_effect = lambda **kwargs: mock.Mock()
+        params = {'auth_url': 'URL', 'trust_id': 'TRUST', 'password': 'abc'}
+
+        conn1 = sdk.create_connection(params)
+        conn2 = sdk.create_connection(dict(params))
+        conn3 = sdk.create_connection(dict(params, trust_id='OTHER'))
+        conn4 = sdk.create_connection(dict(params, region_name='R2'))
+
+        self.assertEqual(conn1, conn2)
+        self.assertNotEqual(conn1, conn3)
+        self.assertNotEqual(conn1, conn4)
+        self.assertEqual(3, mock_conn.call_count)
+        # the parameters given are not changed
+        self.assertEqual({'auth_url': 'URL', 'trust_id': 'TRUST',
+                          'password': 'abc'}, params)
+
+    @mock.patch.object(profile, 'Profile')
+    @mock.patch.object(connection, 'Connection')
+    def test_create_connection_cache_disabled(self, mock_conn, mock_profile):
+        cfg.CONF.set_override('sdk_connection_cache_size', 0,
+                              enforce_type=True)
+
+        sdk.create_connection({'token': 'TOKEN'})
+        sdk.create_connection({'token': 'TOKEN'})
+
+        self.assertEqual(2, mock_conn.call_count)
+        self.assertIsNone(sdk._cache)
+
+    def test_connection_cache_lru(self):
+        cache = sdk.ConnectionCache(2)
+        factory = mock.Mock(side_effect=lambda params: params['user_id'])
+
+        cache.get({'user_id': 'U1'}, factory)
+        cache.get({'user_id': 'U2'}, factory)
+        cache.get({'user_id': 'U1'}, factory)
+        cache.get({'user_id': 'U3'}, factory)
+        res = cache.get({'user_id': 'U2'}, factory)
+
+        self.assertEqual('U2', res)
+        self.assertEqual(4, factory.call_count)
+        self.assertEqual(['U3', 'U2'], list(cache.connections.values()))
+
+    def test_connection_cache_key(self):
+        key = sdk.ConnectionCache.key({'user_id': 'U1', 'password': 'abc'})
+
+        self.assertEqual(key, sdk.ConnectionCache.key({'password': 'abc',
+                                                       'user_id': 'U1'}))
+        self.assertNotEqual(key, sdk.ConnectionCache.key(
+            {'user_id': 'U1', 'password': 'xyz'}))
+        self.assertNotIn('abc', key)
+
     @mock.patch.object(sdk, 'create_connection')
     def test_authenticate(self, mock_conn):
         x_conn = mock_conn.return_value
@@ -14,13 +14,16 @@ import copy
 
 import mock
 from oslo_config import cfg
+from oslo_utils import timeutils
 import six
 
+from senlin.common import consts
 from senlin.common import exception
 from senlin.db.sqlalchemy import api as db_api
 from senlin.engine.actions import base as action_base
 from senlin.engine import cluster as cluster_mod
 from senlin.engine import cluster_policy as cp_mod
+from senlin.engine import dispatcher
 from senlin.engine import environment
 from senlin.engine import event as EVENT
 from senlin.engine import node as node_mod
@@ -42,6 +45,7 @@ class ActionBaseTest(base.SenlinTestCase):
         super(ActionBaseTest, self).setUp()
 
         self.ctx = utils.dummy_context()
+        self.patchobject(cp_mod, '_bindings', {})
         self.action_values = {
             'name': 'FAKE_NAME',
             'cause': 'FAKE_CAUSE',
@@ -50,6 +54,7 @@ class ActionBaseTest(base.SenlinTestCase):
             'start_time': 0,
             'end_time': 0,
             'timeout': 120,
+            'priority': 25,
             'status': 'FAKE_STATUS',
             'status_reason': 'FAKE_STATUS_REASON',
             'inputs': {'param': 'value'},
@@ -71,6 +76,8 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertIsNone(obj.start_time)
         self.assertIsNone(obj.end_time)
         self.assertEqual(cfg.CONF.default_action_timeout, obj.timeout)
+        self.assertEqual(consts.ACTION_PRIORITIES.get(
+            action, consts.ACTION_DEFAULT_PRIORITY), obj.priority)
         self.assertEqual('INIT', obj.status)
         self.assertEqual('', obj.status_reason)
         self.assertEqual({}, obj.inputs)
@@ -86,6 +93,16 @@ class ActionBaseTest(base.SenlinTestCase):
             obj = action_base.Action('OBJID', action, self.ctx)
             self._verify_new_action(obj, 'OBJID', action)
 
+    def test_action_new_priority(self):
+        obj = action_base.Action('OBJID', 'NODE_RECOVER', self.ctx)
+        self.assertEqual(10, obj.priority)
+
+        obj = action_base.Action('OBJID', 'CLUSTER_UPDATE', self.ctx)
+        self.assertEqual(80, obj.priority)
+
+        obj = action_base.Action('OBJID', 'WHAT_EVER', self.ctx)
+        self.assertEqual(consts.ACTION_DEFAULT_PRIORITY, obj.priority)
+
     def test_action_init_with_values(self):
         values = copy.deepcopy(self.action_values)
         values['id'] = 'FAKE_ID'
@@ -106,6 +123,7 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertEqual(0, obj.start_time)
         self.assertEqual(0, obj.end_time)
         self.assertEqual(120, obj.timeout)
+        self.assertEqual(25, obj.priority)
         self.assertEqual('FAKE_STATUS', obj.status)
         self.assertEqual('FAKE_STATUS_REASON', obj.status_reason)
         self.assertEqual({'param': 'value'}, obj.inputs)
@@ -167,6 +185,7 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertEqual(obj.start_time, action_obj.start_time)
         self.assertEqual(obj.end_time, action_obj.end_time)
         self.assertEqual(obj.timeout, action_obj.timeout)
+        self.assertEqual(obj.priority, action_obj.priority)
         self.assertEqual(obj.status, action_obj.status)
         self.assertEqual(obj.status_reason, action_obj.status_reason)
         self.assertEqual(obj.inputs, action_obj.inputs)
@@ -268,6 +287,31 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertEqual('FAKE_ID', result)
         mock_store.assert_called_once_with(self.ctx)
 
+    def test_action_create_batch(self):
+        result = action_base.Action.create_batch(
+            self.ctx, ['NODE_ID_1', 'NODE_ID_2'], 'NODE_CREATE',
+            cause=action_base.CAUSE_DERIVED)
+
+        self.assertEqual(2, len(result))
+        for action_id, node_id in zip(result, ['NODE_ID_1', 'NODE_ID_2']):
+            record = db_api.action_get(self.ctx, action_id)
+            self.assertEqual('NODE_CREATE', record.action)
+            self.assertEqual(node_id, record.target)
+            self.assertEqual('node_create_%s' % node_id[:8], record.name)
+            self.assertEqual(action_base.CAUSE_DERIVED, record.cause)
+            self.assertEqual(action_base.Action.INIT, record.status)
+            self.assertIsNotNone(record.created_at)
+
+    @mock.patch.object(db_api, 'action_create_batch')
+    def test_action_create_batch_single_call(self, mock_create):
+        result = action_base.Action.create_batch(
+            self.ctx, ['NODE_ID_1', 'NODE_ID_2', 'NODE_ID_3'], 'NODE_CHECK')
+
+        self.assertEqual(3, len(result))
+        mock_create.assert_called_once_with(self.ctx, mock.ANY)
+        values = mock_create.call_args[0][1]
+        self.assertEqual(result, [v['id'] for v in values])
+
     def test_action_delete(self):
         result = action_base.Action.delete(self.ctx, 'non-existent')
         self.assertIsNone(result)
@@ -384,6 +428,9 @@ class ActionBaseTest(base.SenlinTestCase):
     @mock.patch.object(db_api, 'action_abandon')
     def test_set_status(self, mock_abandon, mark_cancel, mark_fail,
                         mark_succeed):
+        mark_succeed.return_value = {}
+        mark_fail.return_value = {}
+        mark_cancel.return_value = {}
         action = action_base.Action('OBJID', 'OBJECT_ACTION', self.ctx)
         action.id = 'FAKE_ID'
 
@@ -419,6 +466,17 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertEqual('BUSY', action.status_reason)
         mock_abandon.assert_called_once_with(action.context, 'FAKE_ID')
 
+    @mock.patch.object(dispatcher, 'wake_dependents')
+    @mock.patch.object(db_api, 'action_mark_succeeded')
+    def test_set_status_wake_dependents(self, mark_succeed, mock_wake):
+        mark_succeed.return_value = {'PARENT_ID': 'ENGINE_ID'}
+        action = action_base.Action('OBJID', 'OBJECT_ACTION', self.ctx)
+        action.id = 'FAKE_ID'
+
+        action.set_status(action.RES_OK, 'FAKE_REASON')
+
+        mock_wake.assert_called_once_with({'PARENT_ID': 'ENGINE_ID'})
+
     @mock.patch.object(db_api, 'action_check_status')
     def test_get_status(self, mock_get):
         mock_get.return_value = 'FAKE_STATUS'
@@ -587,6 +645,7 @@ class ActionPolicyCheckTest(base.SenlinTestCase):
         super(ActionPolicyCheckTest, self).setUp()
 
         self.ctx = utils.dummy_context()
+        self.patchobject(cp_mod, '_bindings', {})
         environment.global_env().register_policy('DummyPolicy',
                                                  fakes.TestPolicy)
 
@@ -780,6 +839,71 @@ class ActionPolicyCheckTest(base.SenlinTestCase):
         calls = [mock.call(action.context, policy1.id)]
         mock_load.assert_has_calls(calls)
 
+    @mock.patch.object(db_api, 'cluster_policy_last_op_update')
+    @mock.patch.object(cp_mod.ClusterPolicy, 'load_all')
+    @mock.patch.object(policy_mod.Policy, 'load')
+    def test_policy_check_cached(self, mock_load, mock_load_all,
+                                 mock_last_op):
+        cluster_id = 'FAKE_CLUSTER_ID'
+        policy1 = mock.Mock(id='FAKE_POLICY_ID_1', cooldown=0)
+        policy1.TARGET = [('AFTER', 'OBJECT_ACTION')]
+        policy2 = mock.Mock(id='FAKE_POLICY_ID_2', cooldown=0)
+        policy2.TARGET = [('AFTER', 'OBJECT_ACTION')]
+        pb1 = self._create_cp_binding(cluster_id, policy1.id)
+        pb2 = self._create_cp_binding(cluster_id, policy2.id)
+        mock_load_all.return_value = [pb1, pb2]
+        mock_load.side_effect = [policy1, policy2]
+
+        for i in range(2):
+            action = action_base.Action(cluster_id, 'OBJECT_ACTION',
+                                        self.ctx)
+            action.policy_check(cluster_id, 'AFTER')
+            self.assertEqual(policy_mod.CHECK_OK, action.data['status'])
+
+        # bindings and policies are loaded only once
+        self.assertEqual(1, mock_load_all.call_count)
+        self.assertEqual(2, mock_load.call_count)
+        self.assertEqual(2, policy1.post_op.call_count)
+        self.assertEqual(2, policy2.post_op.call_count)
+        # last_op of all bindings is recorded with one update per action
+        self.assertEqual(2, mock_last_op.call_count)
+        mock_last_op.assert_called_with(
+            action.context, cluster_id,
+            ['FAKE_POLICY_ID_1', 'FAKE_POLICY_ID_2'], pb1.last_op)
+        self.assertEqual(pb1.last_op, pb2.last_op)
+
+    @mock.patch.object(db_api, 'cluster_policy_get')
+    def test_cooldown_inprogress_cached(self, mock_get):
+        pb = self._create_cp_binding('FAKE_CLUSTER_ID', 'FAKE_POLICY_ID')
+        pb.last_op = timeutils.utcnow()
+        action = action_base.Action('FAKE_CLUSTER_ID', 'OBJECT_ACTION',
+                                    self.ctx)
+
+        self.assertTrue(action._cooldown_inprogress(pb, 60))
+        self.assertEqual(0, mock_get.call_count)
+
+    @mock.patch.object(db_api, 'cluster_policy_get')
+    def test_cooldown_inprogress_refreshed(self, mock_get):
+        pb = self._create_cp_binding('FAKE_CLUSTER_ID', 'FAKE_POLICY_ID')
+        last_op = timeutils.utcnow()
+        mock_get.return_value = mock.Mock(last_op=last_op)
+        action = action_base.Action('FAKE_CLUSTER_ID', 'OBJECT_ACTION',
+                                    self.ctx)
+
+        self.assertTrue(action._cooldown_inprogress(pb, 60))
+        mock_get.assert_called_once_with(action.context, 'FAKE_CLUSTER_ID',
+                                         'FAKE_POLICY_ID')
+        self.assertEqual(last_op, pb.last_op)
+
+    @mock.patch.object(db_api, 'cluster_policy_get')
+    def test_cooldown_inprogress_expired(self, mock_get):
+        pb = self._create_cp_binding('FAKE_CLUSTER_ID', 'FAKE_POLICY_ID')
+        mock_get.return_value = mock.Mock(last_op=None)
+        action = action_base.Action('FAKE_CLUSTER_ID', 'OBJECT_ACTION',
+                                    self.ctx)
+
+        self.assertFalse(action._cooldown_inprogress(pb, 60))
+
 
 class ActionProcTest(base.SenlinTestCase):
 
@@ -12,7 +12,6 @@
 
 import mock
 
-from senlin.common import exception
 from senlin.common.i18n import _
 from senlin.common import scaleutils
 from senlin.db.sqlalchemy import api as db_api
@@ -22,7 +21,6 @@ from senlin.engine import cluster as cluster_mod
 from senlin.engine import dispatcher
 from senlin.engine import event as EVENT
 from senlin.engine import node as node_mod
-from senlin.engine import scheduler
 from senlin.engine import senlin_lock
 from senlin.policies import base as policy_base
 from senlin.tests.unit.common import base
@@ -86,8 +84,11 @@ class ClusterActionWaitTest(base.SenlinTestCase):
         self.ctx = utils.dummy_context()
 
     @mock.patch.object(cluster_mod.Cluster, 'load')
-    @mock.patch.object(scheduler, 'reschedule')
-    def test_wait_dependents(self, mock_reschedule, mock_load):
+    @mock.patch.object(dispatcher, 'unregister_waiter')
+    @mock.patch.object(dispatcher, 'register_waiter')
+    @mock.patch.object(dispatcher, 'wait_for_wakeup')
+    def test_wait_dependents(self, mock_wait, mock_register, mock_unregister,
+                             mock_load):
         action = ca.ClusterAction('ID', 'ACTION', self.ctx)
         action.id = 'FAKE_ID'
         self.patchobject(action, 'get_status', side_effect=self.statuses)
@@ -97,7 +98,10 @@ class ClusterActionWaitTest(base.SenlinTestCase):
         res_code, res_msg = action._wait_for_dependents()
         self.assertEqual(self.code, res_code)
         self.assertEqual(self.message, res_msg)
-        self.assertEqual(self.rescheduled_times, mock_reschedule.call_count)
+        self.assertEqual(self.rescheduled_times, mock_wait.call_count)
+        mock_wait.assert_called_with('FAKE_ID', 10)
+        mock_register.assert_called_once_with('FAKE_ID')
+        mock_unregister.assert_called_once_with('FAKE_ID')
 
 
 @mock.patch.object(cluster_mod.Cluster, 'load')
@@ -107,16 +111,16 @@ class ClusterActionTest(base.SenlinTestCase):
         super(ClusterActionTest, self).setUp()
         self.ctx = utils.dummy_context()
 
-    @mock.patch.object(db_api, 'action_update')
-    @mock.patch.object(base_action.Action, 'create')
+    @mock.patch.object(db_api, 'action_mark_ready')
+    @mock.patch.object(base_action.Action, 'create_batch')
     @mock.patch.object(db_api, 'cluster_next_index')
     @mock.patch.object(node_mod, 'Node')
     @mock.patch.object(db_api, 'dependency_add')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test__create_nodes_single(self, mock_wait, mock_start, mock_dep,
                                   mock_node, mock_index, mock_action,
-                                  mock_update, mock_load):
+                                  mock_ready, mock_load):
         # prepare mocks
         cluster = mock.Mock()
         cluster.id = 'CLUSTER_ID'
@@ -124,10 +128,12 @@ class ClusterActionTest(base.SenlinTestCase):
         cluster.user = 'FAKE_USER'
         cluster.project = 'FAKE_PROJECT'
         cluster.domain = 'FAKE_DOMAIN'
+        cluster.rt = {'profile': 'PROFILE'}
         mock_index.return_value = 123
         node = mock.Mock()
-        node.id = 'NODE_ID'
         mock_node.return_value = node
+        mock_store = mock_node.store_batch
+        mock_store.return_value = ['NODE_ID']
 
         mock_load.return_value = cluster
         # cluster action is real
@@ -136,7 +142,7 @@ class ClusterActionTest(base.SenlinTestCase):
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
 
         # node_action is faked
-        mock_action.return_value = 'NODE_ACTION_ID'
+        mock_action.return_value = ['NODE_ACTION_ID']
 
         # do it
         res_code, res_msg = action._create_nodes(1)
@@ -144,28 +150,27 @@ class ClusterActionTest(base.SenlinTestCase):
         # assertions
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        mock_index.assert_called_once_with(action.context, 'CLUSTER_ID')
+        mock_index.assert_called_once_with(action.context, 'CLUSTER_ID', 1)
         mock_node.assert_called_once_with('node-CLUSTER_-123',
                                           'FAKE_PROFILE',
                                           'CLUSTER_ID',
-                                          context=action.context,
                                           user='FAKE_USER',
                                           project='FAKE_PROJECT',
                                           domain='FAKE_DOMAIN',
                                           index=123, metadata={})
-        node.store.assert_called_once_with(action.context)
-        mock_action.assert_called_once_with(action.context, 'NODE_ID',
+        self.assertEqual({'profile': 'PROFILE'}, node.rt)
+        mock_store.assert_called_once_with(action.context, [node])
+        mock_action.assert_called_once_with(action.context, ['NODE_ID'],
                                             'NODE_CREATE',
-                                            name='node_create_NODE_ID',
                                             cause='Derived Action')
         mock_dep.assert_called_once_with(action.context, ['NODE_ACTION_ID'],
                                          'CLUSTER_ACTION_ID')
-        mock_update.assert_called_once_with(
-            action.context, 'NODE_ACTION_ID',
-            {'status': base_action.Action.READY})
-        mock_start.assert_called_once_with(action_id='NODE_ACTION_ID')
+        mock_ready.assert_called_once_with(action.context, ['NODE_ACTION_ID'])
+        mock_start.assert_called_once_with(action_ids=['NODE_ACTION_ID'],
+                                           cluster_id='CLUSTER_ID')
         mock_wait.assert_called_once_with()
         self.assertEqual({'nodes_added': ['NODE_ID']}, action.outputs)
+        cluster.add_node.assert_called_once_with(node)
 
     @mock.patch.object(db_api, 'cluster_get')
     def test_create_nodes_zero(self, mock_get, mock_load):
@@ -180,26 +185,132 @@ class ClusterActionTest(base.SenlinTestCase):
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('', res_msg)
 
-    @mock.patch.object(db_api, 'action_update')
-    @mock.patch.object(base_action.Action, 'create')
+    @mock.patch.object(node_mod.Node, 'load_many')
+    def test__get_host_ips(self, mock_many, mock_load):
+        host = '0df0931b-e251-4f2e-8719-4ebfda3627ba'
+        node = mock.Mock(id=host)
+        node.get_host_ip.return_value = '1.2.3.4'
+        mock_many.return_value = [node]
+        action = ca.ClusterAction('CLUSTER_ID', 'CLUSTER_ACTION', self.ctx)
+
+        res = action._get_host_ips(self.ctx, [host, host])
+
+        self.assertEqual({host: '1.2.3.4'}, res)
+        mock_many.assert_called_once_with(self.ctx, [host],
+                                          project_safe=True)
+        node.get_host_ip.assert_called_once_with(self.ctx)
+
+    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
+    @mock.patch.object(db_api, 'node_get_by_short_id')
+    @mock.patch.object(db_api, 'node_get_by_name')
+    def test__get_host_ips_short_id(self, mock_name, mock_short, mock_many,
+                                    mock_node, mock_load):
+        db_node = mock.Mock()
+        mock_name.return_value = None
+        mock_short.return_value = db_node
+        mock_many.return_value = []
+        action = ca.ClusterAction('CLUSTER_ID', 'CLUSTER_ACTION', self.ctx)
+
+        res = action._get_host_ips(self.ctx, ['0df0931b'])
+
+        self.assertEqual(
+            {'0df0931b': mock_node.return_value.get_host_ip.return_value},
+            res)
+        mock_many.assert_called_once_with(self.ctx, [], project_safe=True)
+        mock_name.assert_called_once_with(self.ctx, '0df0931b',
+                                          project_safe=True)
+        mock_short.assert_called_once_with(self.ctx, '0df0931b',
+                                           project_safe=True)
+        mock_node.assert_called_once_with(self.ctx, node=db_node)
+
+    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
+    @mock.patch.object(db_api, 'node_get_by_short_id')
+    @mock.patch.object(db_api, 'node_get_by_name')
+    def test__get_host_ips_uuid_as_name(self, mock_name, mock_short,
+                                        mock_many, mock_node, mock_load):
+        host = '0df0931b-e251-4f2e-8719-4ebfda3627ba'
+        db_node = mock.Mock()
+        mock_name.return_value = db_node
+        mock_many.return_value = []
+        action = ca.ClusterAction('CLUSTER_ID', 'CLUSTER_ACTION', self.ctx)
+
+        res = action._get_host_ips(self.ctx, [host])
+
+        self.assertEqual(
+            {host: mock_node.return_value.get_host_ip.return_value}, res)
+        mock_name.assert_called_once_with(self.ctx, host, project_safe=True)
+        self.assertEqual(0, mock_short.call_count)
+        mock_node.assert_called_once_with(self.ctx, node=db_node)
+
+    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
+    @mock.patch.object(db_api, 'node_get_by_short_id')
+    @mock.patch.object(db_api, 'node_get_by_name')
+    def test__get_host_ips_not_found(self, mock_name, mock_short, mock_many,
+                                     mock_node, mock_load):
+        mock_name.return_value = None
+        mock_short.return_value = None
+        mock_many.return_value = []
+        action = ca.ClusterAction('CLUSTER_ID', 'CLUSTER_ACTION', self.ctx)
+
+        self.assertEqual({'HOST': None},
+                         action._get_host_ips(self.ctx, ['HOST']))
+        self.assertEqual(0, mock_node.call_count)
+
+    @mock.patch.object(db_api, 'action_mark_ready')
+    @mock.patch.object(base_action.Action, 'create_batch')
     @mock.patch.object(db_api, 'cluster_next_index')
     @mock.patch.object(node_mod, 'Node')
     @mock.patch.object(db_api, 'dependency_add')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
+    @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
+    @mock.patch.object(ca.ClusterAction, '_get_host_ips')
+    def test__create_nodes_same_host(self, mock_ip, mock_wait, mock_start,
+                                     mock_dep, mock_node, mock_index,
+                                     mock_action, mock_ready, mock_load):
+        cluster = mock.Mock(id='CLUSTER_ID', profile_id='FAKE_PROFILE',
+                            user='FAKE_USER', project='FAKE_PROJECT',
+                            domain='FAKE_DOMAIN', metadata={})
+        cluster.rt = {'profile': 'PROFILE'}
+        mock_load.return_value = cluster
+        mock_index.return_value = 1
+        mock_node.store_batch.return_value = ['NODE_1', 'NODE_2']
+        mock_action.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
+        mock_ip.return_value = {'HOST': '1.2.3.4'}
+        action = ca.ClusterAction(cluster.id, 'CLUSTER_ACTION', self.ctx)
+        action.id = 'CLUSTER_ACTION_ID'
+        mock_wait.return_value = (action.RES_OK, 'All dependents completed')
+
+        res_code, res_msg = action._create_nodes(2, ['HOST', 'HOST'])
+
+        self.assertEqual(action.RES_OK, res_code)
+        mock_ip.assert_called_once_with(action.context, ['HOST', 'HOST'])
+        metadata = {'host_ip': '1.2.3.4', 'host_node': 'HOST'}
+        for call in mock_node.call_args_list:
+            self.assertEqual(metadata, call[1]['metadata'])
+        self.assertEqual(2, mock_node.call_count)
+
+    @mock.patch.object(db_api, 'action_mark_ready')
+    @mock.patch.object(base_action.Action, 'create_batch')
+    @mock.patch.object(db_api, 'cluster_next_index')
+    @mock.patch.object(node_mod, 'Node')
+    @mock.patch.object(db_api, 'dependency_add')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test__create_nodes_multiple(self, mock_wait, mock_start, mock_dep,
                                     mock_node, mock_index, mock_action,
-                                    mock_update, mock_load):
+                                    mock_ready, mock_load):
         cluster = mock.Mock()
         cluster.id = '01234567-123434'
+        cluster.rt = {'profile': 'PROFILE'}
         node1 = mock.Mock()
-        node1.id = '01234567-abcdef'
-        node1.data = {'placement': {'region': 'regionOne'}}
         node2 = mock.Mock()
-        node2.id = 'abcdefab-123456'
-        node2.data = {'placement': {'region': 'regionTwo'}}
         mock_node.side_effect = [node1, node2]
-        mock_index.side_effect = [123, 124]
+        mock_store = mock_node.store_batch
+        mock_store.return_value = ['01234567-abcdef', 'abcdefab-123456']
+        mock_index.return_value = 123
 
         mock_load.return_value = cluster
         # cluster action is real
@@ -217,7 +328,7 @@ class ClusterActionTest(base.SenlinTestCase):
         mock_wait.return_value = (action.RES_OK, 'All dependents completed')
 
         # node_action is faked
-        mock_action.side_effect = ['NODE_ACTION_1', 'NODE_ACTION_2']
+        mock_action.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
 
         # do it
         res_code, res_msg = action._create_nodes(2)
@@ -225,31 +336,32 @@ class ClusterActionTest(base.SenlinTestCase):
         # assertions
         self.assertEqual(action.RES_OK, res_code)
         self.assertEqual('All dependents completed', res_msg)
-        self.assertEqual(2, mock_index.call_count)
+        mock_index.assert_called_once_with(action.context, cluster.id, 2)
         self.assertEqual(2, mock_node.call_count)
-        node1.store.assert_called_once_with(action.context)
-        node2.store.assert_called_once_with(action.context)
-        self.assertEqual(2, mock_action.call_count)
-        self.assertEqual(1, mock_dep.call_count)
-
-        update_calls = [
-            mock.call(action.context, 'NODE_ACTION_1', {'status': 'READY'}),
-            mock.call(action.context, 'NODE_ACTION_2', {'status': 'READY'})
-        ]
-        mock_update.assert_has_calls(update_calls)
-        self.assertEqual(2, mock_start.call_count)
+        mock_store.assert_called_once_with(action.context, [node1, node2])
+        mock_action.assert_called_once_with(
+            action.context, ['01234567-abcdef', 'abcdefab-123456'],
+            'NODE_CREATE', cause='Derived Action')
+        mock_dep.assert_called_once_with(
+            action.context, ['NODE_ACTION_1', 'NODE_ACTION_2'],
+            'CLUSTER_ACTION_ID')
+        mock_ready.assert_called_once_with(
+            action.context, ['NODE_ACTION_1', 'NODE_ACTION_2'])
+        mock_start.assert_called_once_with(
+            action_ids=['NODE_ACTION_1', 'NODE_ACTION_2'],
+            cluster_id=cluster.id)
         mock_wait.assert_called_once_with()
-        self.assertEqual({'nodes_added': [node1.id, node2.id]}, action.outputs)
-        self.assertEqual({'region': 'regionOne'}, node1.data['placement'])
-        self.assertEqual({'region': 'regionTwo'}, node2.data['placement'])
+        self.assertEqual({'nodes_added': ['01234567-abcdef',
+                                          'abcdefab-123456']},
+                         action.outputs)
         mock_node_calls = [
             mock.call('node-01234567-123', mock.ANY, '01234567-123434',
                       user=mock.ANY, project=mock.ANY, domain=mock.ANY,
-                      index=123, context=mock.ANY, metadata={},
+                      index=123, metadata={},
                       data={'placement': {'region': 'regionOne'}}),
             mock.call('node-01234567-124', mock.ANY, '01234567-123434',
                       user=mock.ANY, project=mock.ANY, domain=mock.ANY,
-                      index=124, context=mock.ANY, metadata={},
+                      index=124, metadata={},
                       data={'placement': {'region': 'regionTwo'}})
         ]
 
@@ -257,27 +369,24 @@ class ClusterActionTest(base.SenlinTestCase):
         cluster.add_node.assert_has_calls([
             mock.call(node1), mock.call(node2)])
 
-    @mock.patch.object(db_api, 'action_update')
-    @mock.patch.object(db_api, 'cluster_get')
+    @mock.patch.object(db_api, 'action_mark_ready')
+    @mock.patch.object(base_action.Action, 'create_batch')
+    @mock.patch.object(db_api, 'cluster_next_index')
     @mock.patch.object(node_mod, 'Node')
     @mock.patch.object(db_api, 'dependency_add')
-    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'start_actions')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
     def test__create_nodes_multiple_failed_wait(self, mock_wait, mock_start,
-                                                mock_dep, mock_node, mock_get,
-                                                mock_update, mock_load):
+                                                mock_dep, mock_node,
+                                                mock_index, mock_action,
+                                                mock_ready, mock_load):
         cluster = mock.Mock()
         cluster.id = '01234567-123434'
-        db_cluster = mock.Mock()
-        db_cluster.next_index = 1
-        mock_get.return_value = db_cluster
-        node1 = mock.Mock()
-        node1.id = '01234567-abcdef'
-        node1.data = {}
-        node2 = mock.Mock()
-        node2.id = 'abcdefab-123456'
-        node2.data = {}
-        mock_node.side_effect = [node1, node2]
+        cluster.rt = {'profile': 'PROFILE'}
+        mock_index.return_value = 1
+        mock_store = mock_node.store_batch
+        mock_store.return_value = ['NODE_1', 'NODE_2']
+        mock_action.return_value = ['NODE_ACTION_1', 'NODE_ACTION_2']
 
         mock_load.return_value = cluster
         # cluster action is real
@@ -294,18 +403,13 @@ class ClusterActionTest(base.SenlinTestCase):
         }
         mock_wait.return_value = (action.RES_ERROR, 'Waiting timed out')
 
-        # node_action is faked
-        n_action_1 = mock.Mock()
-        n_action_2 = mock.Mock()
-        self.patchobject(base_action, 'Action',
-                         side_effect=[n_action_1, n_action_2])
-
         # do it
         res_code, res_msg = action._create_nodes(2)
 
         # assertions
         self.assertEqual(action.RES_ERROR, res_code)
         self.assertEqual('Failed in creating nodes.', res_msg)
+        self.assertEqual(0, cluster.add_node.call_count)
 
     def test_do_create_success(self, mock_load):
         cluster = mock.Mock()
@@ -417,6 +521,7 @@ class ClusterActionTest(base.SenlinTestCase):
         mock_update.assert_has_calls(update_calls)
 
         self.assertEqual(2, mock_start.call_count)
+        cluster.invalidate.assert_called_once_with('nodes')
         cluster.set_status.assert_called_once_with(
             action.context, 'ACTIVE', 'Cluster update completed.',
             profile_id='FAKE_PROFILE')
@@ -753,7 +858,7 @@ class ClusterActionTest(base.SenlinTestCase):
 
     @mock.patch.object(db_api, 'action_update')
     @mock.patch.object(base_action.Action, 'create')
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     @mock.patch.object(db_api, 'dependency_add')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
@@ -775,7 +880,7 @@ class ClusterActionTest(base.SenlinTestCase):
         node.id = 'NODE_1'
         node.cluster_id = None
         node.status = node.ACTIVE
-        mock_load_node.return_value = node
+        mock_load_node.return_value = [node]
         mock_action.return_value = 'NODE_ACTION_ID'
         mock_wait.return_value = (action.RES_OK, 'Good to go!')
 
@@ -787,7 +892,7 @@ class ClusterActionTest(base.SenlinTestCase):
         self.assertEqual('Completed adding nodes.', res_msg)
         self.assertEqual({'nodes_added': ['NODE_1']}, action.outputs)
 
-        mock_load_node.assert_called_once_with(action.context, 'NODE_1')
+        mock_load_node.assert_called_once_with(action.context, ['NODE_1'])
         mock_action.assert_called_once_with(
             action.context, 'NODE_1', 'NODE_JOIN',
             name='node_join_NODE_1', cause='Derived Action',
@@ -804,7 +909,7 @@ class ClusterActionTest(base.SenlinTestCase):
 
     @mock.patch.object(db_api, 'action_update')
     @mock.patch.object(base_action.Action, 'create')
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     @mock.patch.object(db_api, 'dependency_add')
     @mock.patch.object(dispatcher, 'start_action')
     @mock.patch.object(ca.ClusterAction, '_wait_for_dependents')
@@ -829,7 +934,7 @@ class ClusterActionTest(base.SenlinTestCase):
         node2.id = 'NODE_2'
         node2.cluster_id = None
         node2.status = node2.ACTIVE
-        mock_load_node.side_effect = [node1, node2]
+        mock_load_node.return_value = [node1, node2]
         mock_action.side_effect = ['NODE_ACTION_1', 'NODE_ACTION_2']
         mock_wait.return_value = (action.RES_OK, 'Good to go!')
 
@@ -841,9 +946,8 @@ class ClusterActionTest(base.SenlinTestCase):
         self.assertEqual('Completed adding nodes.', res_msg)
         self.assertEqual({'nodes_added': ['NODE_1', 'NODE_2']}, action.outputs)
 
-        mock_load_node.assert_has_calls([
-            mock.call(action.context, 'NODE_1'),
-            mock.call(action.context, 'NODE_2')])
+        mock_load_node.assert_called_once_with(action.context,
+                                               ['NODE_1', 'NODE_2'])
         mock_action.assert_has_calls([
             mock.call(action.context, 'NODE_1', 'NODE_JOIN',
                       name='node_join_NODE_1', cause='Derived Action',
@@ -870,11 +974,11 @@ class ClusterActionTest(base.SenlinTestCase):
         cluster.add_node.assert_has_calls([
             mock.call(node1), mock.call(node2)])
 
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     def test_do_add_nodes_node_not_found(self, mock_load_node, mock_load):
         action = ca.ClusterAction('ID', 'CLUSTER_ACTION', self.ctx)
         action.inputs = {'nodes': ['NODE_1']}
-        mock_load_node.side_effect = exception.NodeNotFound(node='NODE_1')
+        mock_load_node.return_value = []
 
         # do it
         res_code, res_msg = action.do_add_nodes()
@@ -883,7 +987,7 @@ class ClusterActionTest(base.SenlinTestCase):
         self.assertEqual(action.RES_ERROR, res_code)
         self.assertEqual("Node [NODE_1] is not found.", res_msg)
 
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     def test_do_add_nodes_node_already_member(self, mock_load_node, mock_load):
         cluster = mock.Mock()
         cluster.id = 'FAKE_CLUSTER'
@@ -893,9 +997,9 @@ class ClusterActionTest(base.SenlinTestCase):
         action.inputs = {'nodes': ['NODE_1']}
         action.data = {}
 
-        node = mock.Mock()
+        node = mock.Mock(id='NODE_1')
         node.cluster_id = 'FAKE_CLUSTER'
-        mock_load_node.return_value = node
+        mock_load_node.return_value = [node]
 
         # do it
         res_code, res_msg = action.do_add_nodes()
@@ -906,7 +1010,7 @@ class ClusterActionTest(base.SenlinTestCase):
                          "[FAKE_CLUSTER].", res_msg)
         self.assertEqual({}, action.data)
 
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     def test_do_add_nodes_node_in_other_cluster(self, mock_load_node,
                                                 mock_load):
         cluster = mock.Mock()
@@ -917,9 +1021,9 @@ class ClusterActionTest(base.SenlinTestCase):
         action.inputs = {'nodes': ['NODE_1']}
         action.data = {}
 
-        node = mock.Mock()
+        node = mock.Mock(id='NODE_1')
         node.cluster_id = 'ANOTHER_CLUSTER'
-        mock_load_node.return_value = node
+        mock_load_node.return_value = [node]
 
         # do it
         res_code, res_msg = action.do_add_nodes()
@@ -929,7 +1033,7 @@ class ClusterActionTest(base.SenlinTestCase):
         self.assertEqual("Node [NODE_1] is already owned by cluster "
                          "[ANOTHER_CLUSTER].", res_msg)
 
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     def test_do_add_nodes_node_not_active(self, mock_load_node, mock_load):
         action = ca.ClusterAction('ID', 'CLUSTER_ACTION', self.ctx)
         action.inputs = {'nodes': ['NODE_1']}
@@ -937,10 +1041,10 @@ class ClusterActionTest(base.SenlinTestCase):
 
         cluster = mock.Mock()
         cluster.id = 'FAKE_CLUSTER'
-        node = mock.Mock()
+        node = mock.Mock(id='NODE_1')
         node.cluster_id = None
         node.status = node.ERROR
-        mock_load_node.return_value = node
+        mock_load_node.return_value = [node]
 
         # do it
         res_code, res_msg = action.do_add_nodes()
@@ -981,7 +1085,7 @@ class ClusterActionTest(base.SenlinTestCase):
         self.assertEqual({}, action.data)
 
     @mock.patch.object(ca.ClusterAction, '_wait_before_deletion')
-    @mock.patch.object(db_api, 'node_get')
+    @mock.patch.object(db_api, 'node_get_many')
     @mock.patch.object(ca.ClusterAction, '_delete_nodes')
     def test_do_del_nodes(self, mock_delete, mock_get, mock_wait, mock_load):
         cluster = mock.Mock()
@@ -999,7 +1103,7 @@ class ClusterActionTest(base.SenlinTestCase):
         node2 = mock.Mock()
         node2.id = 'NODE_2'
         node2.cluster_id = 'FAKE_CLUSTER'
-        mock_get.side_effect = [node1, node2]
+        mock_get.return_value = [node1, node2]
         mock_delete.return_value = (action.RES_OK, 'Good to go!')
 
         # do it
@@ -1011,9 +1115,9 @@ class ClusterActionTest(base.SenlinTestCase):
         self.assertEqual({'deletion': {'destroy_after_deletion': False}},
                          action.data)
 
-        mock_get.assert_has_calls([
-            mock.call(action.context, 'NODE_1', project_safe=True),
-            mock.call(action.context, 'NODE_2', project_safe=True)])
+        mock_get.assert_called_once_with(action.context,
+                                         ['NODE_1', 'NODE_2'],
+                                         project_safe=True)
         mock_delete.assert_called_once_with(['NODE_1', 'NODE_2'])
 
         # deletion policy is attached to the action
@@ -1025,19 +1129,19 @@ class ClusterActionTest(base.SenlinTestCase):
                 'candidates': ['NODE_1', 'NODE_2']
             }
         }
-        mock_get.side_effect = [node1, node2]
+        mock_get.return_value = [node1, node2]
         mock_delete.return_value = (action.RES_OK, 'Good to go!')
         res_code, res_msg = action.do_del_nodes()
         self.assertTrue(action.data['deletion']['destroy_after_deletion'])
         mock_wait.assert_called_once_with(2)
 
-    @mock.patch.object(db_api, 'node_get')
+    @mock.patch.object(db_api, 'node_get_many')
     def test_do_del_nodes_node_not_found(self, mock_get, mock_load):
         cluster = mock.Mock()
         mock_load.return_value = cluster
         action = ca.ClusterAction('ID', 'CLUSTER_ACTION', self.ctx)
         action.inputs = {'candidates': ['NODE_1']}
-        mock_get.side_effect = exception.NodeNotFound(node='NODE_1')
+        mock_get.return_value = []
 
         # do it
         res_code, res_msg = action.do_del_nodes()
@@ -1048,7 +1152,7 @@ class ClusterActionTest(base.SenlinTestCase):
         self.assertEqual({'deletion': {'destroy_after_deletion': False}},
                          action.data)
 
-    @mock.patch.object(db_api, 'node_get')
+    @mock.patch.object(db_api, 'node_get_many')
     def test_do_del_nodes_node_not_member(self, mock_get, mock_load):
         cluster = mock.Mock()
         cluster.id = 'FAKE_CLUSTER'
@@ -1059,7 +1163,7 @@ class ClusterActionTest(base.SenlinTestCase):
         node1.cluster_id = None
         node2 = mock.Mock()
         node2.cluster_id = 'ANOTHER_CLUSTER'
-        mock_get.side_effect = [node1, node2]
+        mock_get.return_value = [node1, node2]
 
         # do it
         res_code, res_msg = action.do_del_nodes()
@@ -1070,7 +1174,7 @@ class ClusterActionTest(base.SenlinTestCase):
         self.assertEqual({'deletion': {'destroy_after_deletion': False}},
                          action.data)
 
-    @mock.patch.object(db_api, 'node_get')
+    @mock.patch.object(db_api, 'node_get_many')
     @mock.patch.object(ca.ClusterAction, '_delete_nodes')
     def test_do_del_nodes_failed_delete(self, mock_delete, mock_get,
                                         mock_load):
@@ -1080,9 +1184,9 @@ class ClusterActionTest(base.SenlinTestCase):
         action = ca.ClusterAction(cluster.id, 'CLUSTER_ACTION', self.ctx)
         action.inputs = {'candidates': ['NODE_1']}
         action.data = {}
-        node1 = mock.Mock()
+        node1 = mock.Mock(id='NODE_1')
         node1.cluster_id = 'FAKE_CLUSTER'
-        mock_get.side_effect = [node1]
+        mock_get.return_value = [node1]
         mock_delete.return_value = (action.RES_ERROR, 'Things went bad.')
 
         # do it
@@ -1142,6 +1246,7 @@ class ClusterActionTest(base.SenlinTestCase):
             mock.call(action_id='NODE_ACTION_2'),
         ])
         mock_wait.assert_called_once_with()
+        cluster.invalidate.assert_called_once_with('nodes')
         cluster.set_status.assert_called_once_with(
             action.context, 'old status', 'old reason')
 
@@ -1262,6 +1367,7 @@ class ClusterActionTest(base.SenlinTestCase):
                                             {'status': 'READY'})
         mock_start.assert_called_once_with(action_id='NODE_RECOVER_ID')
         mock_wait.assert_called_once_with()
+        cluster.invalidate.assert_called_once_with('nodes')
         cluster.set_status.assert_called_once_with(
             action.context, cluster.ACTIVE, 'Everything is Okay')
 
@@ -10,11 +10,15 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import datetime
+
 import mock
 from oslo_messaging.rpc import dispatcher as rpc
 from oslo_utils import uuidutils
 import six
 
+from senlin.common import consts
 from senlin.common import exception as exc
 from senlin.db import api as db_api
 from senlin.engine.actions import base as action_base
@@ -127,6 +131,30 @@ class ActionTest(base.SenlinTestCase):
                                           marker='M', sort='status',
                                           project_safe=True)
 
+    @mock.patch.object(db_api, 'dependency_get_all')
+    @mock.patch.object(db_api, 'action_get_all')
+    def test_action_list_summary(self, mock_get, mock_deps):
+        Row = collections.namedtuple('Row', ['id', 'name', 'created_at',
+                                             'updated_at'])
+        created = datetime.datetime(2016, 1, 2, 3, 4, 5, 678)
+        mock_get.return_value = [Row('A1', 'a1', created, None),
+                                 Row('A2', 'a2', created, created)]
+        mock_deps.return_value = [('A1', 'A2'), ('A0', 'A1'), ('A2', 'A3')]
+
+        result = self.eng.action_list(self.ctx, limit=2, summary=True)
+
+        self.assertEqual([
+            {'id': 'A1', 'name': 'a1', 'depends_on': ['A0'],
+             'depended_by': ['A2'], 'created_at': '2016-01-02T03:04:05',
+             'updated_at': None},
+            {'id': 'A2', 'name': 'a2', 'depends_on': ['A1'],
+             'depended_by': ['A3'], 'created_at': '2016-01-02T03:04:05',
+             'updated_at': '2016-01-02T03:04:05'}], result)
+        mock_get.assert_called_once_with(
+            self.ctx, filters=None, limit=2, marker=None, sort=None,
+            project_safe=True, columns=consts.ACTION_SUMMARY_KEYS)
+        mock_deps.assert_called_once_with(self.ctx, ['A1', 'A2'])
+
     def test_action_list_with_bad_params(self):
         ex = self.assertRaises(rpc.ExpectedException,
                                self.eng.action_list,
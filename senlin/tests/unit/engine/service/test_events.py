@@ -10,12 +10,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import datetime
+
 import mock
 
 from oslo_messaging.rpc import dispatcher as rpc
 from oslo_utils import uuidutils
 import six
 
+from senlin.common import consts
 from senlin.common import exception as exc
 from senlin.db.sqlalchemy import api as db_api
 from senlin.engine import service
@@ -113,6 +117,22 @@ class EventTest(base.SenlinTestCase):
                                           limit=123, marker='MMM',
                                           project_safe=True)
 
+    @mock.patch.object(db_api, 'event_get_all')
+    def test_event_list_summary(self, mock_load):
+        Row = collections.namedtuple('Row', ['id', 'timestamp'])
+        ts = datetime.datetime(2016, 1, 2, 3, 4, 5, 678)
+        mock_load.return_value = [Row('E1', ts)]
+
+        result = self.eng.event_list(self.ctx, sort='timestamp',
+                                     summary=True)
+
+        self.assertEqual([{'id': 'E1', 'timestamp': '2016-01-02T03:04:05'}],
+                         result)
+        mock_load.assert_called_once_with(
+            self.ctx, filters=None, sort='timestamp', limit=None,
+            marker=None, project_safe=True,
+            columns=consts.EVENT_SUMMARY_KEYS)
+
     def test_event_list_bad_limit(self):
         ex = self.assertRaises(rpc.ExpectedException,
                                self.eng.event_list,
@@ -10,6 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import datetime
+
 import mock
 from oslo_config import cfg
 from oslo_messaging.rpc import dispatcher as rpc
@@ -154,6 +157,36 @@ class NodeTest(base.SenlinTestCase):
                                           limit=123, marker='MMM',
                                           project_safe=True)
 
+    @mock.patch.object(db_api, 'profile_get_all')
+    @mock.patch.object(db_api, 'node_get_all')
+    def test_node_list_summary(self, mock_get, mock_profiles):
+        Row = collections.namedtuple('Row', ['id', 'profile_id', 'init_at',
+                                             'created_at', 'updated_at'])
+        ts = datetime.datetime(2016, 1, 2, 3, 4, 5, 678)
+        mock_get.return_value = [Row('N1', 'P1', ts, ts, None),
+                                 Row('N2', 'P2', ts, None, None)]
+        mock_profiles.return_value = [mock.Mock(id='P1')]
+        mock_profiles.return_value[0].name = 'PROFILE_1'
+
+        result = self.eng.node_list(self.ctx, sort='name', limit=10,
+                                    marker='MMM', summary=True)
+
+        self.assertEqual([
+            {'id': 'N1', 'profile_id': 'P1', 'profile_name': 'PROFILE_1',
+             'init_at': '2016-01-02T03:04:05', 'updated_at': None,
+             'created_at': '2016-01-02T03:04:05'},
+            {'id': 'N2', 'profile_id': 'P2', 'profile_name': 'Unknown',
+             'init_at': '2016-01-02T03:04:05', 'updated_at': None,
+             'created_at': None}], result)
+        mock_get.assert_called_once_with(
+            self.ctx, cluster_id=None, filters=None, sort='name', limit=10,
+            marker='MMM', project_safe=True,
+            columns=consts.NODE_SUMMARY_KEYS)
+        self.assertEqual(1, mock_profiles.call_count)
+        args, kwargs = mock_profiles.call_args
+        self.assertEqual(['P1', 'P2'], sorted(kwargs['filters']['id']))
+        self.assertFalse(kwargs['project_safe'])
+
     def test_node_list_bad_limit(self):
         ex = self.assertRaises(rpc.ExpectedException,
                                self.eng.node_list,
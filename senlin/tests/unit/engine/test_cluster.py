@@ -18,6 +18,7 @@ from senlin.common import exception
 from senlin.db.sqlalchemy import api as db_api
 from senlin.engine import cluster as clusterm
 from senlin.engine import cluster_policy as cp_mod
+from senlin.engine import dispatcher
 from senlin.engine import node as node_mod
 from senlin.policies import base as policy_base
 from senlin.profiles import base as profile_base
@@ -95,6 +96,11 @@ class TestCluster(base.SenlinTestCase):
 
         cluster._load_runtime_data(self.context)
 
+        # nothing is loaded before being accessed
+        self.assertEqual(0, mock_pb.call_count)
+        self.assertEqual(0, mock_profile.call_count)
+        self.assertEqual(0, mock_nodes.call_count)
+
         rt = cluster.rt
         self.assertEqual(x_profile, rt['profile'])
         self.assertEqual([x_node_1, x_node_2], rt['nodes'])
@@ -109,6 +115,52 @@ class TestCluster(base.SenlinTestCase):
         mock_nodes.assert_called_once_with(self.context,
                                            cluster_id='FAKE_CLUSTER')
 
+        # loaded only once
+        self.assertEqual([x_node_1, x_node_2], cluster.nodes)
+        self.assertEqual(1, mock_nodes.call_count)
+
+    @mock.patch.object(db_api, 'cluster_policy_get_all')
+    @mock.patch.object(profile_base.Profile, 'load')
+    @mock.patch.object(node_mod.Node, 'load_all')
+    def test_invalidate(self, mock_nodes, mock_profile, mock_pb):
+        mock_nodes.side_effect = [['NODE1'], ['NODE1', 'NODE2']]
+        mock_profile.side_effect = ['PROFILE1', 'PROFILE2']
+        mock_pb.return_value = []
+        cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID',
+                                   id='FAKE_CLUSTER', context=self.context)
+        self.assertEqual(['NODE1'], cluster.nodes)
+        self.assertEqual('PROFILE1', cluster.rt['profile'])
+
+        cluster.invalidate('nodes')
+
+        self.assertEqual(['NODE1', 'NODE2'], cluster.nodes)
+        self.assertEqual('PROFILE1', cluster.rt['profile'])
+
+        cluster.invalidate()
+
+        self.assertEqual('PROFILE2', cluster.rt['profile'])
+        self.assertEqual([], cluster.policies)
+        self.assertEqual(2, mock_nodes.call_count)
+
+    def test_invalidate_no_context(self):
+        cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID')
+        cluster.rt['nodes'] = ['NODE1']
+
+        cluster.invalidate()
+
+        self.assertEqual(['NODE1'], cluster.nodes)
+
+    @mock.patch.object(node_mod.Node, 'load_all')
+    def test_add_remove_node_not_loaded(self, mock_nodes):
+        cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID',
+                                   id='FAKE_CLUSTER', context=self.context)
+        node = mock.Mock(id='NODE1')
+
+        cluster.add_node(node)
+        cluster.remove_node('NODE1')
+
+        self.assertEqual(0, mock_nodes.call_count)
+
     def test__load_runtime_data_id_is_none(self):
         cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID')
 
@@ -176,6 +228,8 @@ class TestCluster(base.SenlinTestCase):
 
         new_id = cluster.store(self.context)
         self.assertEqual(cluster_id, new_id)
+        # runtime data is not reloaded on update
+        mock_load.assert_called_once_with(self.context)
 
         result = db_api.cluster_get(self.context, cluster_id)
         self.assertIsNotNone(result)
@@ -505,9 +559,10 @@ class TestCluster(base.SenlinTestCase):
         self.assertIsNone(res)
         self.assertEqual([], cluster.nodes)
 
+    @mock.patch.object(dispatcher, 'invalidate_bindings')
     @mock.patch.object(policy_base.Policy, 'load')
     @mock.patch.object(cp_mod, 'ClusterPolicy')
-    def test_attach_policy(self, mock_cp, mock_load):
+    def test_attach_policy(self, mock_cp, mock_load, mock_invalidate):
         cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID')
         cluster.id = 'FAKE_CLUSTER'
 
@@ -528,6 +583,7 @@ class TestCluster(base.SenlinTestCase):
                                         priority=10,
                                         enabled=True, data=None)
         binding.store.assert_called_once_with(self.context)
+        mock_invalidate.assert_called_once_with('FAKE_CLUSTER')
         self.assertIn(policy, cluster.policies)
 
     @mock.patch.object(policy_base.Policy, 'load')
@@ -626,9 +682,10 @@ class TestCluster(base.SenlinTestCase):
         policy.attach.assert_called_once_with(cluster)
         mock_load.assert_called_once_with(self.context, 'FAKE_1')
 
+    @mock.patch.object(dispatcher, 'invalidate_bindings')
     @mock.patch.object(db_api, 'cluster_policy_detach')
     @mock.patch.object(policy_base.Policy, 'load')
-    def test_detach_policy(self, mock_load, mock_detach):
+    def test_detach_policy(self, mock_load, mock_detach, mock_invalidate):
         cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID')
         cluster.id = 'FAKE_CLUSTER'
 
@@ -648,6 +705,7 @@ class TestCluster(base.SenlinTestCase):
         mock_load.assert_called_once_with(self.context, 'FAKE_POLICY')
         mock_detach.assert_called_once_with(self.context, 'FAKE_CLUSTER',
                                             'FAKE_POLICY')
+        mock_invalidate.assert_called_once_with('FAKE_CLUSTER')
         self.assertEqual([], cluster.rt['policies'])
 
     def test_detach_policy_not_attached(self):
@@ -675,8 +733,9 @@ class TestCluster(base.SenlinTestCase):
         mock_load.assert_called_once_with(self.context, 'FAKE_POLICY')
         policy.detach.assert_called_once_with(cluster)
 
+    @mock.patch.object(dispatcher, 'invalidate_bindings')
     @mock.patch.object(db_api, 'cluster_policy_update')
-    def test_update_policy(self, mock_update):
+    def test_update_policy(self, mock_update, mock_invalidate):
         cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID')
         cluster.id = 'FAKE_CLUSTER'
 
@@ -692,6 +751,7 @@ class TestCluster(base.SenlinTestCase):
         self.assertEqual('Policy updated.', reason)
         mock_update.assert_called_once_with(
             self.context, 'FAKE_CLUSTER', 'FAKE_POLICY', {'enabled': False})
+        mock_invalidate.assert_called_once_with('FAKE_CLUSTER')
 
     def test_update_policy_not_attached(self):
         cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID')
@@ -767,12 +827,13 @@ class TestCluster(base.SenlinTestCase):
         result = cluster.get_zone_distribution(self.context,
                                                ['AZ1', 'AZ2', 'AZ3'])
 
+        # Nodes without a zone recorded are not counted
         self.assertEqual(3, len(result))
-        self.assertEqual(1, result['AZ1'])
+        self.assertEqual(0, result['AZ1'])
         self.assertEqual(1, result['AZ2'])
         self.assertEqual(0, result['AZ3'])
 
-        node1.get_details.assert_called_once_with(self.context)
+        self.assertEqual(0, node1.get_details.call_count)
 
     def test_nodes_by_region(self):
         cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID')
@@ -817,3 +878,45 @@ class TestCluster(base.SenlinTestCase):
 
         result = cluster.nodes_by_region('AZ3')
         self.assertEqual(0, len(result))
+
+    def test_placement_index_maintained(self):
+        cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID')
+        node1 = mock.Mock(id='N1', data={
+            'placement': {'region_name': 'R1', 'zone': 'AZ1'}})
+        cluster.add_node(node1)
+
+        # The index is built on first use
+        self.assertEqual({'R1': 1, 'R2': 0},
+                         cluster.get_region_distribution(['R1', 'R2']))
+        self.assertIn('placement', cluster.rt)
+
+        node2 = mock.Mock(id='N2', data={
+            'placement': {'region_name': 'R2', 'zone': 'AZ1'}})
+        cluster.add_node(node2)
+        self.assertEqual({'R1': 1, 'R2': 1},
+                         cluster.get_region_distribution(['R1', 'R2']))
+        self.assertEqual([node1, node2], cluster.nodes_by_zone('AZ1'))
+
+        cluster.remove_node('N1')
+        self.assertEqual({'R1': 0, 'R2': 1},
+                         cluster.get_region_distribution(['R1', 'R2']))
+        self.assertEqual([node2], cluster.nodes_by_zone('AZ1'))
+        self.assertEqual([], cluster.nodes_by_region('R1'))
+
+    @mock.patch.object(node_mod.Node, 'load_all')
+    def test_placement_index_invalidated(self, mock_load):
+        cluster = clusterm.Cluster('test-cluster', 0, 'PROFILE_ID',
+                                   id='CLUSTER_ID', context=self.context)
+        node1 = mock.Mock(id='N1', data={'placement': {'zone': 'AZ1'}})
+        node2 = mock.Mock(id='N2', data={'placement': {'zone': 'AZ2'}})
+        mock_load.return_value = [node1]
+
+        self.assertEqual({'AZ1': 1, 'AZ2': 0},
+                         cluster.get_zone_distribution(self.context,
+                                                       ['AZ1', 'AZ2']))
+
+        mock_load.return_value = [node1, node2]
+        cluster.invalidate('nodes')
+        self.assertEqual({'AZ1': 1, 'AZ2': 1},
+                         cluster.get_zone_distribution(self.context,
+                                                       ['AZ1', 'AZ2']))
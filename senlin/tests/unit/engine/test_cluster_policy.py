@@ -11,12 +11,15 @@
 # under the License.
 
 from datetime import timedelta
+import mock
+from oslo_config import cfg
 from oslo_utils import timeutils
 import six
 
 from senlin.common import exception
 from senlin.db.sqlalchemy import api as db_api
 from senlin.engine import cluster_policy as cpm
+from senlin.policies import base as policy_base
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -186,3 +189,94 @@ class TestClusterPolicy(base.SenlinTestCase):
         self.assertTrue(cp.cooldown_inprogress(60))
         cp.last_op -= timedelta(hours=1)
         self.assertFalse(cp.cooldown_inprogress(60))
+
+
+@mock.patch.object(policy_base.Policy, 'load')
+@mock.patch.object(cpm.ClusterPolicy, 'load_all')
+class TestBindingCache(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestBindingCache, self).setUp()
+        self.context = utils.dummy_context()
+        self.patchobject(cpm, '_bindings', {})
+        self.mock_now = self.patchobject(timeutils, 'utcnow_ts',
+                                         return_value=1000)
+        self.pb = cpm.ClusterPolicy('CLUSTER', 'POLICY', enabled=True)
+
+    def test_get_bindings(self, mock_load_all, mock_load):
+        mock_load_all.return_value = [self.pb]
+
+        res1 = cpm.get_bindings(self.context, 'CLUSTER')
+        res2 = cpm.get_bindings(self.context, 'CLUSTER')
+
+        self.assertEqual([(self.pb, mock_load.return_value)], res1)
+        self.assertEqual(res1, res2)
+        mock_load_all.assert_called_once_with(self.context, 'CLUSTER',
+                                              sort='priority',
+                                              filters={'enabled': True})
+        mock_load.assert_called_once_with(self.context, 'POLICY')
+
+    def test_get_bindings_expired(self, mock_load_all, mock_load):
+        mock_load_all.return_value = [self.pb]
+        cpm.get_bindings(self.context, 'CLUSTER')
+        cpm.get_bindings(self.context, 'OTHER')
+        self.mock_now.return_value = 1000 + cfg.CONF.policy_binding_cache_ttl
+
+        cpm.get_bindings(self.context, 'CLUSTER')
+
+        self.assertEqual(3, mock_load_all.call_count)
+        # expired entries of other clusters are purged as well
+        self.assertEqual(['CLUSTER'], list(cpm._bindings))
+
+    def test_get_bindings_disabled(self, mock_load_all, mock_load):
+        cfg.CONF.set_override('policy_binding_cache_ttl', 0,
+                              enforce_type=True)
+        mock_load_all.return_value = [self.pb]
+
+        cpm.get_bindings(self.context, 'CLUSTER')
+        cpm.get_bindings(self.context, 'CLUSTER')
+
+        self.assertEqual(2, mock_load_all.call_count)
+        self.assertEqual({}, cpm._bindings)
+
+    def test_invalidate_bindings(self, mock_load_all, mock_load):
+        mock_load_all.return_value = [self.pb]
+        cpm.get_bindings(self.context, 'CLUSTER')
+
+        cpm.invalidate_bindings('CLUSTER')
+        cpm.get_bindings(self.context, 'CLUSTER')
+
+        self.assertEqual(2, mock_load_all.call_count)
+
+    def test_invalidate_bindings_while_loading(self, mock_load_all,
+                                               mock_load):
+        def invalidate(*args, **kwargs):
+            cpm.invalidate_bindings('CLUSTER')
+            return [self.pb]
+
+        mock_load_all.side_effect = invalidate
+
+        res = cpm.get_bindings(self.context, 'CLUSTER')
+
+        # bindings loaded before the invalidation are not cached
+        self.assertEqual([(self.pb, mock_load.return_value)], res)
+        self.assertEqual({}, cpm._bindings)
+
+    @mock.patch.object(db_api, 'cluster_policy_last_op_update')
+    def test_record_last_op(self, mock_update, mock_load_all, mock_load):
+        pb2 = cpm.ClusterPolicy('CLUSTER', 'POLICY2', enabled=True)
+
+        cpm.record_last_op(self.context, 'CLUSTER', [self.pb, pb2])
+
+        self.assertIsNotNone(self.pb.last_op)
+        self.assertEqual(self.pb.last_op, pb2.last_op)
+        mock_update.assert_called_once_with(self.context, 'CLUSTER',
+                                            ['POLICY', 'POLICY2'],
+                                            self.pb.last_op)
+
+    @mock.patch.object(db_api, 'cluster_policy_last_op_update')
+    def test_record_last_op_no_bindings(self, mock_update, mock_load_all,
+                                        mock_load):
+        cpm.record_last_op(self.context, 'CLUSTER', [])
+
+        self.assertEqual(0, mock_update.call_count)
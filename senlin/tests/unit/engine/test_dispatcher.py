@@ -16,6 +16,7 @@ import oslo_messaging
 
 from senlin.common import consts
 from senlin.common import messaging
+from senlin.engine import cluster_policy as cp_mod
 from senlin.engine import dispatcher
 from senlin.engine import scheduler
 from senlin.engine import service
@@ -69,11 +70,26 @@ class TestDispatcher(base.SenlinTestCase):
         disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
         disp.start_action(self.context, action_id='FOO')
 
-        mock_start.assert_called_once_with('1234', 'FOO')
+        mock_start.assert_called_once_with('1234', 'FOO', None)
         mock_start.reset_mock()
 
         disp.start_action(self.context)
-        mock_start.assert_called_once_with('1234', None)
+        mock_start.assert_called_once_with('1234', None, None)
+        mock_start.reset_mock()
+
+        disp.start_action(self.context, action_id='FOO', cluster_id='C1')
+        mock_start.assert_called_once_with('1234', 'FOO', 'C1')
+
+    @mock.patch.object(scheduler.ThreadGroupManager, 'start_actions')
+    def test_start_actions(self, mock_start):
+        disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
+        disp.start_actions(self.context, action_ids=['FOO', 'BAR'])
+
+        mock_start.assert_called_once_with('1234', ['FOO', 'BAR'], None)
+        mock_start.reset_mock()
+
+        disp.start_actions(self.context, action_ids=['FOO'], cluster_id='C1')
+        mock_start.assert_called_once_with('1234', ['FOO'], 'C1')
 
     @mock.patch.object(scheduler.ThreadGroupManager, 'cancel_action')
     def test_cancel_action(self, mock_cancel):
@@ -96,6 +112,20 @@ class TestDispatcher(base.SenlinTestCase):
 
         mock_resume.assert_called_once_with('FOO')
 
+    @mock.patch.object(dispatcher, 'wake_waiter')
+    def test_wake_action(self, mock_wake):
+        disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
+        disp.wake_action(self.context, action_id='FOO')
+
+        mock_wake.assert_called_once_with('FOO')
+
+    @mock.patch.object(cp_mod, 'invalidate_bindings')
+    def test_invalidate_bindings(self, mock_invalidate):
+        disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
+        disp.invalidate_bindings(self.context, cluster_id='FOO')
+
+        mock_invalidate.assert_called_once_with('FOO')
+
     @mock.patch.object(scheduler.ThreadGroupManager, 'stop')
     def test_stop(self, mock_stop):
         disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
@@ -164,3 +194,112 @@ class TestDispatcher(base.SenlinTestCase):
 
         mock_notify.assert_called_once_with(dispatcher.START_ACTION,
                                             'FAKE_ENGINE')
+
+    @mock.patch.object(dispatcher, 'notify')
+    def test_start_actions_function(self, mock_notify):
+        dispatcher.start_actions(action_ids=['FOO', 'BAR'])
+
+        mock_notify.assert_called_once_with(dispatcher.START_ACTIONS, None,
+                                            action_ids=['FOO', 'BAR'])
+
+    @mock.patch.object(cp_mod, 'invalidate_bindings')
+    @mock.patch.object(context, 'get_current')
+    @mock.patch.object(messaging, 'get_rpc_client')
+    def test_invalidate_bindings_function(self, mock_rpc, mock_get_current,
+                                          mock_invalidate):
+        fake_ctx = mock.Mock()
+        mock_get_current.return_value = fake_ctx
+        mock_client = mock_rpc.return_value
+
+        dispatcher.invalidate_bindings('CLUSTER')
+
+        mock_invalidate.assert_called_once_with('CLUSTER')
+        mock_client.prepare.assert_called_once_with(
+            version=consts.RPC_API_VERSION,
+            topic=consts.ENGINE_DISPATCHER_TOPIC,
+            fanout=True)
+        mock_context = mock_client.prepare.return_value
+        mock_context.cast.assert_called_once_with(
+            fake_ctx, dispatcher.INVALIDATE_BINDINGS, cluster_id='CLUSTER')
+
+    @mock.patch.object(cp_mod, 'invalidate_bindings')
+    @mock.patch.object(messaging, 'get_rpc_client')
+    def test_invalidate_bindings_function_rpc_failure(self, mock_rpc,
+                                                      mock_invalidate):
+        mock_context = mock_rpc.return_value.prepare.return_value
+        mock_context.cast.side_effect = oslo_messaging.MessagingException
+
+        # failures are tolerated as the cached bindings expire
+        dispatcher.invalidate_bindings('CLUSTER')
+
+        mock_invalidate.assert_called_once_with('CLUSTER')
+
+
+class TestWaiters(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestWaiters, self).setUp()
+        self.addCleanup(dispatcher.unregister_waiter, 'FOO')
+
+    def test_wait_for_wakeup_not_registered(self):
+        self.assertFalse(dispatcher.wait_for_wakeup('FOO', 0))
+
+    def test_wait_for_wakeup_timeout(self):
+        dispatcher.register_waiter('FOO')
+        self.assertFalse(dispatcher.wait_for_wakeup('FOO', 0))
+
+    def test_wake_waiter(self):
+        dispatcher.register_waiter('FOO')
+
+        self.assertTrue(dispatcher.wake_waiter('FOO'))
+        self.assertTrue(dispatcher.wait_for_wakeup('FOO', 0))
+        self.assertFalse(dispatcher.wait_for_wakeup('FOO', 0))
+
+    def test_wake_waiter_not_registered(self):
+        self.assertFalse(dispatcher.wake_waiter('FOO'))
+
+    def test_unregister_waiter(self):
+        dispatcher.register_waiter('FOO')
+        dispatcher.unregister_waiter('FOO')
+
+        self.assertFalse(dispatcher.wake_waiter('FOO'))
+
+    def test_is_waiting(self):
+        self.assertFalse(dispatcher.is_waiting('FOO'))
+
+        dispatcher.register_waiter('FOO')
+        self.assertTrue(dispatcher.is_waiting('FOO'))
+
+        dispatcher.unregister_waiter('FOO')
+        self.assertFalse(dispatcher.is_waiting('FOO'))
+
+    @mock.patch.object(context, 'get_current')
+    @mock.patch.object(messaging, 'get_rpc_client')
+    def test_wake_dependents(self, mock_rpc, mock_get_current):
+        fake_ctx = mock.Mock()
+        mock_get_current.return_value = fake_ctx
+        mock_client = mock_rpc.return_value
+        dispatcher.register_waiter('FOO')
+
+        dispatcher.wake_dependents({'FOO': 'ENGINE1', 'BAR': 'ENGINE2',
+                                    'BAZ': None})
+
+        self.assertTrue(dispatcher.wait_for_wakeup('FOO', 0))
+        mock_client.prepare.assert_called_once_with(
+            version=consts.RPC_API_VERSION,
+            topic=consts.ENGINE_DISPATCHER_TOPIC,
+            server='ENGINE2')
+        mock_context = mock_client.prepare.return_value
+        mock_context.cast.assert_called_once_with(
+            fake_ctx, dispatcher.WAKE_ACTION, action_id='BAR')
+
+    @mock.patch.object(messaging, 'get_rpc_client')
+    def test_wake_dependents_rpc_failure(self, mock_rpc):
+        mock_context = mock_rpc.return_value.prepare.return_value
+        mock_context.cast.side_effect = oslo_messaging.MessagingException
+
+        # failures are tolerated as the waiter checks DB periodically
+        dispatcher.wake_dependents({'BAR': 'ENGINE2'})
+
+        mock_context.cast.assert_called_once_with(
+            mock.ANY, dispatcher.WAKE_ACTION, action_id='BAR')
@@ -21,6 +21,8 @@ from senlin.common import consts
 from senlin.common import context
 from senlin.common import messaging as rpc_messaging
 from senlin.db import api as db_api
+from senlin.engine import event
+from senlin.engine import senlin_lock
 from senlin.engine import service
 from senlin.tests.unit.common import base
 
@@ -78,7 +80,9 @@ class EngineBasicTest(base.SenlinTestCase):
         self.assertEqual(self.fake_rpc_server, self.eng._rpc_server)
         self.fake_rpc_server.start.assert_called_once_with()
 
-    def test_engine_stop(self, mock_msg_cls, mock_hm_cls, mock_disp_cls):
+    @mock.patch.object(event, 'flush')
+    def test_engine_stop(self, mock_flush, mock_msg_cls, mock_hm_cls,
+                         mock_disp_cls):
         mock_disp = mock_disp_cls.return_value
         mock_hm = mock_hm_cls.return_value
         self.eng.start()
@@ -90,6 +94,7 @@ class EngineBasicTest(base.SenlinTestCase):
 
         mock_disp.stop.assert_called_once_with()
         mock_hm.stop.assert_called_once_with()
+        mock_flush.assert_called_once_with()
 
     def test_engine_stop_with_exception(self, mock_msg_cls, mock_hm_cls,
                                         mock_disp_cls):
@@ -143,6 +148,19 @@ class EngineStatusTest(base.SenlinTestCase):
         expect_str = 'Service %s update failed' % self.eng.engine_id
         self.assertIn(expect_str, self.LOG.output)
 
+    @mock.patch.object(senlin_lock, 'renew_leases')
+    @mock.patch.object(db_api, 'service_update')
+    def test_service_manage_report_renew_leases(self, mock_update,
+                                                mock_renew):
+        self.eng.service_manage_report()
+        mock_renew.assert_called_once_with()
+
+        mock_renew.side_effect = [Exception]
+        self.eng.service_manage_report()
+        expect_str = ('Service %s failed renewing lock leases' %
+                      self.eng.engine_id)
+        self.assertIn(expect_str, self.LOG.output)
+
     @mock.patch.object(db_api, 'service_get_all')
     @mock.patch.object(db_api, 'service_delete')
     def test_service_manage_report_cleanup(self, mock_delete, mock_get_all):
@@ -152,3 +170,56 @@ class EngineStatusTest(base.SenlinTestCase):
                                       'updated_at': ages_a_go}]
         self.eng.service_manage_cleanup()
         mock_delete.assert_called_once_with(mock.ANY, 'foo')
+
+    @mock.patch.object(event, 'purge')
+    @mock.patch.object(db_api, 'service_get_all')
+    def test_event_retention(self, mock_get_all, mock_purge):
+        self.eng.engine_id = 'ENGINE2'
+        now = timeutils.utcnow()
+        ages_a_go = now - datetime.timedelta(
+            seconds=3 * cfg.CONF.periodic_interval)
+        mock_get_all.return_value = [
+            mock.Mock(id='ENGINE1', created_at=ages_a_go,
+                      updated_at=ages_a_go),
+            mock.Mock(id='ENGINE2', created_at=now, updated_at=now),
+            mock.Mock(id='ENGINE3', created_at=now, updated_at=now),
+        ]
+        mock_purge.return_value = {'age': 1, 'cluster': 2, 'project': 3}
+
+        res = self.eng.event_retention()
+
+        self.assertEqual({'age': 1, 'cluster': 2, 'project': 3}, res)
+        mock_purge.assert_called_once_with(mock.ANY)
+        self.assertIn('Event retention purged 1 expired events',
+                      self.LOG.output)
+
+    @mock.patch.object(event, 'purge')
+    @mock.patch.object(db_api, 'service_get_all')
+    def test_event_retention_not_leader(self, mock_get_all, mock_purge):
+        self.eng.engine_id = 'ENGINE2'
+        now = timeutils.utcnow()
+        mock_get_all.return_value = [
+            mock.Mock(id='ENGINE1', created_at=now, updated_at=now),
+            mock.Mock(id='ENGINE2', created_at=now, updated_at=now),
+        ]
+
+        res = self.eng.event_retention()
+
+        self.assertIsNone(res)
+        self.assertEqual(0, mock_purge.call_count)
+
+    @mock.patch.object(event, 'purge')
+    @mock.patch.object(db_api, 'service_get_all')
+    def test_event_retention_error(self, mock_get_all, mock_purge):
+        self.eng.engine_id = 'ENGINE1'
+        now = timeutils.utcnow()
+        mock_get_all.return_value = [
+            mock.Mock(id='ENGINE1', created_at=now, updated_at=now),
+        ]
+        mock_purge.side_effect = Exception('boom')
+
+        res = self.eng.event_retention()
+
+        self.assertIsNone(res)
+        self.assertIn('Service ENGINE1 failed purging events: boom',
+                      self.LOG.output)
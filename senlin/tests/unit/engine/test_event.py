@@ -10,10 +10,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import logging
 
+import eventlet
 import mock
+from oslo_config import cfg
 from oslo_utils import timeutils
+from oslo_utils import uuidutils
 
 from senlin.db.sqlalchemy import api as db_api
 from senlin.engine import cluster as cluster_mod
@@ -207,3 +211,194 @@ class TestEvent(base.SenlinTestCase):
         self.assertEqual(event.obj_name, result.obj_name)
         self.assertEqual(event.cluster_id, result.cluster_id)
         self.assertEqual(event.metadata, result.meta_data)
+
+
+class TestEventSink(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestEventSink, self).setUp()
+        self.context = utils.dummy_context()
+        self.patchobject(EVENT, '_sinks', {})
+        self.mock_spawn = self.patchobject(eventlet, 'spawn')
+
+    def _values(self, reason):
+        return {
+            'id': uuidutils.generate_uuid(),
+            'level': logging.INFO,
+            'timestamp': timeutils.utcnow(),
+            'obj_id': 'FAKE-CLUSTER-ID',
+            'obj_type': 'CLUSTER',
+            'obj_name': 'fake-cluster',
+            'cluster_id': 'FAKE-CLUSTER-ID',
+            'user': self.context.user,
+            'project': self.context.project,
+            'action': 'fake-action',
+            'status': 'ACTIVE',
+            'status_reason': reason,
+            'meta_data': {},
+        }
+
+    def test_get_sink(self):
+        sink = EVENT.get_sink()
+        self.assertIsInstance(sink, EVENT.DBEventSink)
+        self.assertIs(sink, EVENT.get_sink())
+
+        cfg.CONF.set_override('event_sink', 'buffered', enforce_type=True)
+        sink = EVENT.get_sink()
+        self.assertIsInstance(sink, EVENT.BufferedEventSink)
+        self.assertIs(sink, EVENT.get_sink())
+
+    def test_event_store_buffered(self):
+        cfg.CONF.set_override('event_sink', 'buffered', enforce_type=True)
+        event = EVENT.Event(timeutils.utcnow(), logging.INFO,
+                            action='fake-action', status='ACTIVE',
+                            obj_id='FAKE-CLUSTER-ID',
+                            cluster_id='FAKE-CLUSTER-ID')
+
+        event_id = event.store(self.context)
+
+        self.assertEqual(event_id, event.id)
+        self.assertIsNone(db_api.event_get(self.context, event_id))
+        self.mock_spawn.assert_called_once_with(EVENT.get_sink()._run)
+
+        EVENT.flush()
+
+        result = db_api.event_get(self.context, event_id)
+        self.assertEqual('fake-action', result.action)
+
+    def test_buffered_collect(self):
+        cfg.CONF.set_override('event_batch_size', 2, enforce_type=True)
+        sink = EVENT.BufferedEventSink()
+        for i in range(3):
+            sink.write(self.context, self._values('reason-%s' % i))
+
+        sink._collect()
+
+        self.assertEqual(['reason-0', 'reason-1'],
+                         [e['status_reason'] for e in sink.pending])
+        self.assertEqual(1, sink.queue.qsize())
+
+    def test_buffered_collect_timeout(self):
+        cfg.CONF.set_override('event_flush_interval', 0, enforce_type=True)
+        sink = EVENT.BufferedEventSink()
+        sink.write(self.context, self._values('reason-0'))
+
+        sink._collect()
+
+        self.assertEqual(1, len(sink.pending))
+        self.assertEqual(0, sink.queue.qsize())
+
+    @mock.patch.object(EVENT.db_api, 'event_create_batch')
+    def test_buffered_flush(self, mock_batch):
+        cfg.CONF.set_override('event_batch_size', 2, enforce_type=True)
+        sink = EVENT.BufferedEventSink()
+        events = [self._values('reason-%s' % i) for i in range(3)]
+        sink.pending = events[:1]
+        for values in events[1:]:
+            sink.write(self.context, values)
+
+        sink.flush()
+
+        self.assertEqual([], sink.pending)
+        self.assertEqual(0, sink.queue.qsize())
+        self.assertEqual([mock.call(mock.ANY, events[:2]),
+                          mock.call(mock.ANY, events[2:])],
+                         mock_batch.call_args_list)
+
+    @mock.patch.object(EVENT.db_api, 'event_create')
+    @mock.patch.object(EVENT.db_api, 'event_create_batch')
+    def test_buffered_flush_fallback(self, mock_batch, mock_create):
+        mock_batch.side_effect = Exception('boom')
+        mock_create.side_effect = [Exception('bad'), mock.Mock()]
+        sink = EVENT.BufferedEventSink()
+        events = [self._values('reason-%s' % i) for i in range(2)]
+        for values in events:
+            sink.write(self.context, values)
+
+        sink.flush()
+
+        mock_batch.assert_called_once_with(mock.ANY, events)
+        self.assertEqual([mock.call(mock.ANY, events[0]),
+                          mock.call(mock.ANY, events[1])],
+                         mock_create.call_args_list)
+
+    def test_buffered_write_drop(self):
+        cfg.CONF.set_override('event_queue_size', 1, enforce_type=True)
+        cfg.CONF.set_override('event_queue_overflow', 'drop',
+                              enforce_type=True)
+        sink = EVENT.BufferedEventSink()
+
+        sink.write(self.context, self._values('reason-0'))
+        sink.write(self.context, self._values('reason-1'))
+
+        self.assertEqual(1, sink.queue.qsize())
+        self.assertEqual(1, sink.dropped)
+
+        sink.flush()
+
+        self.assertEqual(0, sink.dropped)
+
+
+class TestEventPurge(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestEventPurge, self).setUp()
+        self.context = utils.dummy_context()
+        self.patchobject(eventlet, 'sleep')
+        cfg.CONF.set_override('event_purge_batch_size', 2, enforce_type=True)
+
+    @mock.patch.object(EVENT.db_api, 'event_purge')
+    def test_purge_age(self, mock_purge):
+        cfg.CONF.set_override('max_event_age', 7, enforce_type=True)
+        cfg.CONF.set_override('max_events_per_cluster', 0, enforce_type=True)
+        mock_purge.side_effect = [2, 2, 1]
+        now = timeutils.utcnow()
+        self.patchobject(timeutils, 'utcnow', return_value=now)
+
+        res = EVENT.purge(self.context)
+
+        self.assertEqual({'age': 5, 'cluster': 0, 'project': 0}, res)
+        older_than = now - datetime.timedelta(days=7)
+        call = mock.call(self.context, older_than, 2, cluster_id=None,
+                         project=None)
+        self.assertEqual([call] * 3, mock_purge.call_args_list)
+
+    @mock.patch.object(EVENT.db_api, 'event_purge')
+    @mock.patch.object(EVENT.db_api, 'event_timestamp_cutoff')
+    @mock.patch.object(EVENT.db_api, 'event_count_over_limit')
+    def test_purge_over_limit(self, mock_count, mock_cutoff, mock_purge):
+        cfg.CONF.set_override('max_events_per_cluster', 10,
+                              enforce_type=True)
+        cfg.CONF.set_override('max_events_per_project', 100,
+                              enforce_type=True)
+        mock_count.side_effect = [[('CLUSTER1', 12), ('CLUSTER2', 11)],
+                                  [('PROJECT1', 101)]]
+        mock_cutoff.side_effect = ['TS1', None, 'TS3']
+        mock_purge.side_effect = [1, 1]
+
+        res = EVENT.purge(self.context)
+
+        self.assertEqual({'age': 0, 'cluster': 1, 'project': 1}, res)
+        mock_count.assert_has_calls([
+            mock.call(self.context, 'cluster_id', 10),
+            mock.call(self.context, 'project', 100)])
+        mock_cutoff.assert_has_calls([
+            mock.call(self.context, 10, cluster_id='CLUSTER1'),
+            mock.call(self.context, 10, cluster_id='CLUSTER2'),
+            mock.call(self.context, 100, project='PROJECT1')])
+        mock_purge.assert_has_calls([
+            mock.call(self.context, 'TS1', 2, cluster_id='CLUSTER1',
+                      project=None),
+            mock.call(self.context, 'TS3', 2, cluster_id=None,
+                      project='PROJECT1')])
+
+    @mock.patch.object(EVENT.db_api, 'event_count_over_limit')
+    @mock.patch.object(EVENT.db_api, 'event_purge')
+    def test_purge_disabled(self, mock_purge, mock_count):
+        cfg.CONF.set_override('max_events_per_cluster', 0, enforce_type=True)
+
+        res = EVENT.purge(self.context)
+
+        self.assertEqual({'age': 0, 'cluster': 0, 'project': 0}, res)
+        self.assertEqual(0, mock_purge.call_count)
+        self.assertEqual(0, mock_count.call_count)
@@ -17,13 +17,22 @@ Health Manager is responsible for monitoring the health of the clusters and
 take corresponding actions to recover the clusters based on the pre-defined
 health policies.
 '''
+import datetime
+
 import mock
+from oslo_config import cfg
+import oslo_messaging
+from oslo_utils import timeutils
 
 from senlin.common import consts
+from senlin.common import exception
 from senlin.common import messaging as rpc_messaging
 from senlin.db.sqlalchemy import api as db_api
+from senlin.engine.actions import base as action_mod
+from senlin.engine import dispatcher
 from senlin.engine import health_manager
-from senlin.rpc import client as rpc_client
+from senlin.engine import node as node_mod
+from senlin.profiles import base as profile_base
 from senlin.tests.unit.common import base
 
 
@@ -47,27 +56,145 @@ class TestHealthManager(base.SenlinTestCase):
         self.assertEqual(60, self.hm.periodic_interval_max)
         self.assertEqual(0, len(self.hm.rt['registries']))
 
-    @mock.patch.object(db_api, 'registry_claim')
-    def test__load_runtime_registry(self, mock_reg_claim):
-        mock_reg_claim.return_value = [
-            mock.Mock(engine_id='ENGINE_ID'),
-            mock.Mock(engine_id='ENGINE_ID')
-        ]
+    def _node(self, node_id, profile_id='PROFILE', status='ACTIVE',
+              physical_id='PHY'):
+        return mock.Mock(id=node_id, profile_id=profile_id, status=status,
+                         physical_id=physical_id, ACTIVE='ACTIVE')
+
+    @mock.patch.object(profile_base.Profile, 'check_objects')
+    @mock.patch.object(node_mod.Node, 'load_all')
+    def test_poll_cluster(self, mock_load, mock_check):
+        nodes = [self._node('N1'), self._node('N2'),
+                 self._node('N3', profile_id='PROFILE2'),
+                 self._node('N4', status='ERROR'),
+                 self._node('N5', status='CREATING'),
+                 self._node('N6', physical_id=None)]
+        mock_load.return_value = nodes
+        results = {
+            'PROFILE': {'N1': True, 'N2': False},
+            'PROFILE2': {},
+        }
+        mock_check.side_effect = lambda ctx, objs: results[objs[0].profile_id]
+
+        res = self.hm._poll_cluster('CLUSTER_ID')
+
+        self.assertEqual(['N2'], res)
+        mock_load.assert_called_once_with(self.hm.ctx, cluster_id='CLUSTER_ID',
+                                          project_safe=False)
+        mock_check.assert_has_calls([
+            mock.call(self.hm.ctx, [nodes[0], nodes[1]]),
+            mock.call(self.hm.ctx, [nodes[2]]),
+        ], any_order=True)
+
+    @mock.patch.object(profile_base.Profile, 'check_objects')
+    @mock.patch.object(node_mod.Node, 'load_all')
+    def test_poll_cluster_check_failed(self, mock_load, mock_check):
+        mock_load.return_value = [self._node('N1')]
+        mock_check.side_effect = exception.ProfileNotFound(profile='PROFILE')
+
+        self.assertEqual([], self.hm._poll_cluster('CLUSTER_ID'))
+
+    def _schedule(self, interval=50, healthy_checks=0, base=50):
+        schedule = {'base_interval': base, 'interval': interval,
+                    'healthy_checks': healthy_checks, 'next_check': None}
+        self.hm.rt['registries'] = [{'cluster_id': 'CLUSTER_ID',
+                                     'schedule': schedule}]
+        return schedule
+
+    @mock.patch.object(dispatcher, 'start_actions')
+    @mock.patch.object(db_api, 'action_mark_ready')
+    @mock.patch.object(action_mod.Action, 'create_batch')
+    def test_periodic_check(self, mock_create, mock_ready, mock_start):
+        self.patchobject(self.hm, '_poll_cluster', return_value=['N1', 'N2'])
+        mock_create.return_value = ['A1', 'A2']
+        cfg.CONF.set_override('health_check_jitter', 0, enforce_type=True)
+        schedule = self._schedule(interval=200, healthy_checks=3)
+
+        res = self.hm._periodic_check(cluster_id='CLUSTER_ID')
+
+        self.hm._poll_cluster.assert_called_once_with('CLUSTER_ID')
+        mock_create.assert_called_once_with(self.hm.ctx, ['N1', 'N2'],
+                                            consts.NODE_CHECK,
+                                            cause=action_mod.CAUSE_RPC)
+        mock_ready.assert_called_once_with(self.hm.ctx, ['A1', 'A2'])
+        mock_start.assert_called_once_with(action_ids=['A1', 'A2'])
+        # The interval is reset after a failure
+        self.assertEqual(50, res)
+        self.assertEqual(50, schedule['interval'])
+        self.assertEqual(0, schedule['healthy_checks'])
+        self.assertIsNotNone(schedule['next_check'])
+
+    @mock.patch.object(action_mod.Action, 'create_batch')
+    def test_periodic_check_all_healthy(self, mock_create):
+        self.patchobject(self.hm, '_poll_cluster', return_value=[])
+        schedule = self._schedule()
+
+        res = self.hm._periodic_check(cluster_id='CLUSTER_ID')
+
+        self.assertEqual(0, mock_create.call_count)
+        self.assertTrue(45 <= res <= 55)
+        self.assertEqual(1, schedule['healthy_checks'])
+
+    def test_periodic_check_backoff(self):
+        self.patchobject(self.hm, '_poll_cluster', return_value=[])
+        cfg.CONF.set_override('health_check_jitter', 0, enforce_type=True)
+        cfg.CONF.set_override('health_check_backoff_after', 2,
+                              enforce_type=True)
+        schedule = self._schedule()
+
+        delays = [self.hm._periodic_check(cluster_id='CLUSTER_ID')
+                  for i in range(8)]
+
+        self.assertEqual([50, 100, 100, 200, 200, 200, 200, 200], delays)
+        self.assertEqual(200, schedule['interval'])
+
+    def test_periodic_check_backoff_disabled(self):
+        self.patchobject(self.hm, '_poll_cluster', return_value=[])
+        cfg.CONF.set_override('health_check_jitter', 0, enforce_type=True)
+        cfg.CONF.set_override('health_check_backoff_after', 0,
+                              enforce_type=True)
+        self._schedule()
 
-        self.hm._load_runtime_registry()
-        self.assertEqual(2, len(self.hm.registries))
+        delays = [self.hm._periodic_check(cluster_id='CLUSTER_ID')
+                  for i in range(3)]
 
-    @mock.patch.object(rpc_client.EngineClient, 'cluster_check')
-    def test_periodic_check(self, mock_check):
-        self.hm._periodic_check(cluster_id='CLUSTER_ID')
-        mock_check.assert_called_once_with(self.hm.ctx, 'CLUSTER_ID')
+        self.assertEqual([50, 50, 50], delays)
+
+    def test_periodic_check_failed(self):
+        self.patchobject(self.hm, '_poll_cluster',
+                         side_effect=exception.InternalError(message='BOOM'))
+        cfg.CONF.set_override('health_check_jitter', 0, enforce_type=True)
+        schedule = self._schedule(interval=100, healthy_checks=9)
+
+        self.assertEqual(100, self.hm._periodic_check(cluster_id='CLUSTER_ID'))
+        self.assertEqual(9, schedule['healthy_checks'])
+
+    def test_periodic_check_unregistered(self):
+        self.patchobject(self.hm, '_poll_cluster', return_value=[])
+
+        self.assertEqual(60, self.hm._periodic_check(cluster_id='CLUSTER_ID'))
+
+    def test_get_schedule(self):
+        schedule = self._schedule(interval=100, healthy_checks=2)
+        schedule['next_check'] = datetime.datetime(2016, 5, 1, 10, 20, 30)
+        self.hm.rt['registries'].append({'cluster_id': 'OTHER',
+                                         'schedule': None})
+
+        res = self.hm.get_schedule(self.hm.ctx)
+
+        self.assertEqual([{'cluster_id': 'CLUSTER_ID',
+                           'base_interval': 50,
+                           'interval': 100,
+                           'healthy_checks': 2,
+                           'next_check': '2016-05-01T10:20:30'}], res)
 
     @mock.patch.object(db_api, 'registry_create')
     def test_register_cluster(self, mock_reg_create):
         ctx = mock.Mock()
         matched_type = 'NODE_STATUS_POLLING'
+        mock_reg_create.return_value = self._registry('CLUSTER_ID')
         timer = mock.Mock()
-        mock_add_tm = self.patchobject(self.hm.TG, 'add_timer',
+        mock_add_tm = self.patchobject(self.hm.TG, 'add_dynamic_timer',
                                        return_value=timer)
         mock_check = self.patchobject(self.hm, '_periodic_check',
                                       return_value=mock.Mock())
@@ -83,8 +210,16 @@ class TestHealthManager(base.SenlinTestCase):
                                                 engine_id='ENGINE_ID',
                                                 interval=50,
                                                 params={})
-        mock_add_tm.assert_called_with(50, mock_check, None, 'CLUSTER_ID')
+        mock_add_tm.assert_called_once_with(mock_check, mock.ANY, None,
+                                            'CLUSTER_ID')
+        # The first check is delayed by a phase offset within the interval
+        delay = mock_add_tm.call_args[0][1]
+        self.assertTrue(0 <= delay < 50)
         self.assertEqual(1, len(self.hm.registries))
+        schedule = self.hm.registries[0]['schedule']
+        self.assertEqual(50, schedule['base_interval'])
+        self.assertEqual(50, schedule['interval'])
+        self.assertEqual(0, schedule['healthy_checks'])
 
     @mock.patch.object(db_api, 'registry_delete')
     def test_unregister_cluster(self, mock_reg_delete):
@@ -105,34 +240,170 @@ class TestHealthManager(base.SenlinTestCase):
         self.assertEqual(0, len(self.hm.registries))
         mock_reg_delete.assert_called_once_with(ctx, 'CLUSTER_ID')
 
-    @mock.patch.object(db_api, 'registry_claim')
     @mock.patch('oslo_messaging.Target')
-    def test_start(self, mock_target, mock_reg_claim):
-        tg = mock.Mock()
-        self.hm.TG = tg
+    def test_start(self, mock_target):
         target = mock.Mock()
         mock_target.return_value = target
-        registry = {
-            'cluster_id': 'CLUSTER_ID',
-            'check_type': 'NODE_STATUS_POLLING',
-            'interval': 50,
-            'params': {},
-        }
         rpc_server = mock.Mock()
         mock_st = self.patchobject(rpc_messaging, 'get_rpc_server',
                                    return_value=rpc_server)
-        self.patchobject(self.hm, '_load_runtime_registry',
-                         return_value=mock.Mock)
-        self.hm.rt['registries'] = [registry]
-        timer = mock.Mock()
-        mock_add_tm = self.patchobject(self.hm.TG, 'add_timer',
-                                       return_value=timer)
-        mock_check = self.patchobject(self.hm, '_periodic_check',
-                                      return_value=mock.Mock())
+        mock_add_tm = self.patchobject(self.hm.TG, 'add_timer')
+
         self.hm.start()
+
         mock_target.assert_called_once_with(server='ENGINE_ID',
                                             topic='engine-health-mgr',
                                             version='1.0')
         mock_st.assert_called_once_with(target, self.hm)
         rpc_server.start.assert_called_once_with()
-        mock_add_tm.assert_called_with(50, mock_check, None, 'CLUSTER_ID')
+        mock_add_tm.assert_has_calls([
+            mock.call(60, self.hm._idle_task),
+            mock.call(60, self.hm._rebalance),
+        ])
+
+    def _registry(self, cluster_id, engine_id='ENGINE_ID', interval=50):
+        return mock.Mock(cluster_id=cluster_id, engine_id=engine_id,
+                         check_type=consts.NODE_STATUS_POLLING,
+                         interval=interval, params={})
+
+    def _clusters_on(self, ring, engine_id):
+        return [cluster_id
+                for cluster_id in ('CLUSTER-%s' % i for i in range(100))
+                if ring.get(cluster_id) == engine_id]
+
+    @mock.patch.object(db_api, 'service_get_all')
+    def test_live_engines(self, mock_get):
+        now = timeutils.utcnow()
+        mock_get.return_value = [
+            mock.Mock(id='E1', updated_at=now),
+            mock.Mock(id='E2', updated_at=now - datetime.timedelta(
+                seconds=121)),
+        ]
+
+        self.assertEqual(set(['E1', 'ENGINE_ID']), self.hm._live_engines())
+
+    @mock.patch.object(db_api, 'registry_claim')
+    @mock.patch.object(db_api, 'registry_get_all')
+    def test_rebalance(self, mock_get, mock_claim):
+        engines = set(['ENGINE_ID', 'OTHER'])
+        self.patchobject(self.hm, '_live_engines', return_value=engines)
+        ring = health_manager.HashRing(engines)
+        mine, orphan = self._clusters_on(ring, 'ENGINE_ID')[:2]
+        theirs = self._clusters_on(ring, 'OTHER')[0]
+        mock_get.return_value = [
+            self._registry(mine),
+            self._registry(theirs, engine_id='OTHER'),
+        ]
+        # An orphan of a dead engine mapped to this engine
+        mock_get.return_value.append(self._registry(orphan, 'DEAD'))
+        mock_add_tm = self.patchobject(self.hm.TG, 'add_dynamic_timer')
+
+        self.hm.rebalance()
+
+        mock_claim.assert_called_once_with(self.hm.ctx, engine_id='ENGINE_ID',
+                                           cluster_ids=[orphan])
+        self.assertEqual(set([mine, orphan]),
+                         set(r['cluster_id'] for r in self.hm.registries))
+        self.assertEqual(2, mock_add_tm.call_count)
+
+        # Nothing changes on the next run
+        mock_claim.reset_mock()
+        self.hm.rebalance()
+        self.assertEqual(0, mock_claim.call_count)
+        self.assertEqual(2, mock_add_tm.call_count)
+
+    @mock.patch.object(db_api, 'registry_claim')
+    @mock.patch.object(db_api, 'registry_get_all')
+    def test_rebalance_hand_off(self, mock_get, mock_claim):
+        engines = set(['ENGINE_ID', 'NEW'])
+        self.patchobject(self.hm, '_live_engines', return_value=engines)
+        ring = health_manager.HashRing(engines)
+        cluster_id = self._clusters_on(ring, 'NEW')[0]
+        timer = mock.Mock()
+        self.hm.rt['registries'] = [{'cluster_id': cluster_id,
+                                     'timer': timer}]
+        mock_done = self.patchobject(self.hm.TG, 'timer_done')
+
+        # Not claimed by the new owner yet, keep checking
+        mock_get.return_value = [self._registry(cluster_id)]
+        self.hm.rebalance()
+        self.assertEqual(1, len(self.hm.registries))
+        self.assertEqual(0, timer.stop.call_count)
+
+        # Claimed by the new owner
+        mock_get.return_value = [self._registry(cluster_id, 'NEW')]
+        self.hm.rebalance()
+        self.assertEqual([], self.hm.registries)
+        timer.stop.assert_called_once_with()
+        mock_done.assert_called_once_with(timer)
+        self.assertEqual(0, mock_claim.call_count)
+
+    @mock.patch.object(db_api, 'registry_get_all')
+    def test_rebalance_deleted(self, mock_get):
+        self.patchobject(self.hm, '_live_engines',
+                         return_value=set(['ENGINE_ID']))
+        self.hm.rt['registries'] = [{'cluster_id': 'CLUSTER_ID',
+                                     'timer': None}]
+        mock_get.return_value = []
+
+        self.hm.rebalance()
+
+        self.assertEqual([], self.hm.registries)
+
+    def test_rebalance_failed(self):
+        self.patchobject(self.hm, 'rebalance',
+                         side_effect=exception.InternalError(message='BOOM'))
+
+        self.assertIsNone(self.hm._rebalance())
+
+
+class TestGetSchedule(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestGetSchedule, self).setUp()
+        self.client = mock.Mock()
+        self.call_context = self.client.prepare.return_value
+        self.patchobject(rpc_messaging, 'get_rpc_client',
+                         return_value=self.client)
+
+    def test_get_schedule(self):
+        self.call_context.call.return_value = [{'cluster_id': 'CLUSTER_ID'}]
+
+        res = health_manager.get_schedule('ENGINE_ID')
+
+        self.assertEqual([{'cluster_id': 'CLUSTER_ID'}], res)
+        self.client.prepare.assert_called_once_with(
+            version=consts.RPC_API_VERSION,
+            timeout=cfg.CONF.engine_life_check_timeout,
+            topic=consts.ENGINE_HEALTH_MGR_TOPIC,
+            server='ENGINE_ID')
+        self.call_context.call.assert_called_once_with(mock.ANY,
+                                                       'get_schedule')
+
+    def test_get_schedule_timeout(self):
+        self.call_context.call.side_effect = oslo_messaging.MessagingTimeout
+
+        self.assertIsNone(health_manager.get_schedule('ENGINE_ID'))
+
+
+class TestHashRing(base.SenlinTestCase):
+
+    def test_get_empty(self):
+        self.assertIsNone(health_manager.HashRing([]).get('KEY'))
+
+    def test_get_balanced_and_stable(self):
+        keys = ['cluster-%s' % i for i in range(1000)]
+        ring = health_manager.HashRing(['E1', 'E2', 'E3'])
+        before = dict((k, ring.get(k)) for k in keys)
+
+        for engine in ('E1', 'E2', 'E3'):
+            count = list(before.values()).count(engine)
+            self.assertTrue(200 < count < 470, count)
+
+        # Only the keys of the engine removed move
+        ring = health_manager.HashRing(['E1', 'E3'])
+        for k in keys:
+            if before[k] != 'E2':
+                self.assertEqual(before[k], ring.get(k))
+            else:
+                self.assertIn(ring.get(k), ('E1', 'E3'))
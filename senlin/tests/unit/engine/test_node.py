@@ -13,6 +13,7 @@
 import mock
 import six
 
+from oslo_config import cfg
 from oslo_utils import timeutils
 
 from senlin.common import exception
@@ -128,6 +129,23 @@ class TestNode(base.SenlinTestCase):
         self.assertEqual({}, node_info.meta_data)
         self.assertEqual({}, node_info.data)
 
+    def test_node_store_batch(self):
+        nodes = [nodem.Node('node%s' % i, self.profile.id, self.cluster.id,
+                            index=i, user=self.context.user,
+                            project=self.context.project)
+                 for i in range(3)]
+
+        res = nodem.Node.store_batch(self.context, nodes)
+
+        self.assertEqual([n.id for n in nodes], res)
+        for i, node in enumerate(nodes):
+            self.assertIsNotNone(node.init_at)
+            node_info = db_api.node_get(self.context, node.id)
+            self.assertEqual('node%s' % i, node_info.name)
+            self.assertEqual(i, node_info.index)
+            self.assertEqual(self.cluster.id, node_info.cluster_id)
+            self.assertEqual('INIT', node_info.status)
+
     def test_node_store_update(self):
         node = nodem.Node('node1', self.profile.id, None)
         node_id = node.store(self.context)
@@ -195,6 +213,45 @@ class TestNode(base.SenlinTestCase):
         self.assertEqual(node1.id, nodes[0].id)
         self.assertEqual(node2.id, nodes[1].id)
 
+    @mock.patch.object(profiles_base.Profile, 'load')
+    def test_node_load_all_shares_profiles(self, mock_profile):
+        self._create_node('NODE1')
+        self._create_node('NODE2')
+
+        nodes = nodem.Node.load_all(self.context)
+
+        self.assertEqual(2, len(nodes))
+        mock_profile.assert_called_once_with(self.context,
+                                             profile_id=self.profile.id,
+                                             project_safe=False)
+        self.assertIs(nodes[0].rt['profile'], nodes[1].rt['profile'])
+
+    @mock.patch.object(profiles_base.Profile, 'load')
+    def test_node_load_many(self, mock_profile):
+        self._create_node('NODE1')
+        self._create_node('NODE2')
+        self._create_node('NODE3')
+
+        nodes = nodem.Node.load_many(self.context,
+                                     ['NODE3', 'BOGUS', 'NODE1'])
+
+        self.assertEqual(['NODE3', 'NODE1'], [n.id for n in nodes])
+        self.assertEqual(1, mock_profile.call_count)
+        self.assertIs(nodes[0].rt['profile'], nodes[1].rt['profile'])
+
+    @mock.patch.object(profiles_base.Profile, 'load')
+    def test_node_load_many_profile_not_found(self, mock_profile):
+        mock_profile.side_effect = exception.ProfileNotFound(profile='P')
+        self._create_node('NODE1')
+        self._create_node('NODE2')
+
+        nodes = nodem.Node.load_many(self.context, ['NODE1', 'NODE2'])
+
+        self.assertEqual(2, len(nodes))
+        self.assertIsNone(nodes[0].rt['profile'])
+        self.assertIsNone(nodes[1].rt['profile'])
+        self.assertEqual(1, mock_profile.call_count)
+
     def test_node_to_dict(self):
         node = self._create_node('NODE1')
         self.assertIsNotNone(node.id)
@@ -316,6 +373,111 @@ class TestNode(base.SenlinTestCase):
         mock_details.assert_called_once_with(self.context, node)
         self.assertEqual({'foo': 'bar'}, res)
 
+    def _host_details(self, address):
+        outputs = [{'output_key': 'private_ip', 'output_value': '10.0.0.2'}]
+        if address:
+            outputs.append({'output_key': 'floating_ip',
+                            'output_value': address})
+        return mock.Mock(outputs=outputs)
+
+    def test_node_update_data(self):
+        node = nodem.Node('node1', self.profile.id, '', self.context,
+                          data={'foo': 'bar', 'lb_member': 'M1'})
+        node.store(self.context)
+
+        node.update_data(self.context, {'lb_member': 'M2', 'k': [1]},
+                         removed=['foo', 'missing'])
+
+        expected = {'lb_member': 'M2', 'k': [1]}
+        self.assertEqual(expected, node.data)
+        node_db = db_api.node_get(self.context, node.id)
+        self.assertEqual(expected, node_db.data)
+
+    @mock.patch.object(timeutils, 'utcnow_ts')
+    @mock.patch.object(nodem.Node, 'get_details')
+    def test_node_get_host_ip(self, mock_details, mock_now):
+        mock_details.return_value = self._host_details('1.2.3.4')
+        mock_now.return_value = 1000
+        node = nodem.Node('node1', self.profile.id, '', self.context,
+                          physical_id='FAKE_ID')
+        node.store(self.context)
+
+        res = node.get_host_ip(self.context)
+
+        self.assertEqual('1.2.3.4', res)
+        mock_details.assert_called_once_with(self.context)
+        expected = {'host_ip': {'address': '1.2.3.4', 'cached_at': 1000}}
+        self.assertEqual(expected, node.data)
+        node_db = db_api.node_get(self.context, node.id)
+        self.assertEqual(expected, node_db.data)
+
+    @mock.patch.object(timeutils, 'utcnow_ts')
+    @mock.patch.object(nodem.Node, 'get_details')
+    def test_node_get_host_ip_cached(self, mock_details, mock_now):
+        mock_now.return_value = 1000
+        data = {'host_ip': {'address': '1.2.3.4', 'cached_at': 900}}
+        node = nodem.Node('node1', self.profile.id, '', physical_id='FAKE_ID',
+                          data=data)
+
+        res = node.get_host_ip(self.context)
+
+        self.assertEqual('1.2.3.4', res)
+        self.assertEqual(0, mock_details.call_count)
+
+    @mock.patch.object(db_api, 'node_data_update')
+    @mock.patch.object(timeutils, 'utcnow_ts')
+    @mock.patch.object(nodem.Node, 'get_details')
+    def test_node_get_host_ip_expired(self, mock_details, mock_now,
+                                      mock_update):
+        cfg.CONF.set_override('host_ip_cache_ttl', 60, enforce_type=True)
+        mock_details.return_value = self._host_details('5.6.7.8')
+        mock_now.return_value = 1000
+        data = {'host_ip': {'address': '1.2.3.4', 'cached_at': 900}}
+        node = nodem.Node('node1', self.profile.id, '', id='NODE_ID',
+                          physical_id='FAKE_ID', data=data)
+
+        res = node.get_host_ip(self.context)
+
+        self.assertEqual('5.6.7.8', res)
+        expected = {'host_ip': {'address': '5.6.7.8', 'cached_at': 1000}}
+        self.assertEqual(expected, node.data)
+        mock_update.assert_called_once_with(self.context, 'NODE_ID',
+                                            values=expected, removed=[])
+
+    @mock.patch.object(db_api, 'node_data_update')
+    @mock.patch.object(nodem.Node, 'get_details')
+    def test_node_get_host_ip_cache_disabled(self, mock_details,
+                                             mock_update):
+        cfg.CONF.set_override('host_ip_cache_ttl', 0, enforce_type=True)
+        mock_details.return_value = self._host_details('1.2.3.4')
+        data = {'host_ip': {'address': '5.6.7.8',
+                            'cached_at': timeutils.utcnow_ts()}}
+        node = nodem.Node('node1', self.profile.id, '', id='NODE_ID',
+                          physical_id='FAKE_ID', data=data)
+
+        res = node.get_host_ip(self.context)
+
+        self.assertEqual('1.2.3.4', res)
+        self.assertEqual(0, mock_update.call_count)
+
+    @mock.patch.object(db_api, 'node_data_update')
+    @mock.patch.object(nodem.Node, 'get_details')
+    def test_node_get_host_ip_no_address(self, mock_details, mock_update):
+        mock_details.return_value = self._host_details(None)
+        node = nodem.Node('node1', self.profile.id, '', id='NODE_ID',
+                          physical_id='FAKE_ID')
+
+        self.assertIsNone(node.get_host_ip(self.context))
+        self.assertEqual({}, node.data)
+        self.assertEqual(0, mock_update.call_count)
+
+    @mock.patch.object(nodem.Node, 'get_details')
+    def test_node_get_host_ip_not_created(self, mock_details):
+        node = nodem.Node('node1', self.profile.id, '')
+
+        self.assertIsNone(node.get_host_ip(self.context))
+        self.assertEqual(0, mock_details.call_count)
+
     def test_node_handle_exception(self):
         ex = exception.ResourceStatusError(resource_id='FAKE_ID',
                                            status='FAKE_STATUS',
@@ -447,8 +609,10 @@ class TestNode(base.SenlinTestCase):
                           self.context)
         new_profile = self._create_profile('NEW_PROFILE_ID')
         node.physical_id = 'fake_id'
+        node.data = {'host_ip': {'address': '1.2.3.4', 'cached_at': 0}}
         res = node.do_update(self.context, {'new_profile_id': new_profile.id})
         self.assertTrue(res)
+        self.assertEqual({}, node.data)
         mock_update.assert_called_once_with(self.context, node,
                                             new_profile.id)
         self.assertEqual('NEW_PROFILE_ID', node.profile_id)
@@ -607,11 +771,13 @@ class TestNode(base.SenlinTestCase):
     def test_node_recover_new_object(self, mock_recover, mock_status):
         node = nodem.Node('node1', self.profile.id, '')
         node.physical_id = 'fake_id'
+        node.data = {'host_ip': {'address': '1.2.3.4', 'cached_at': 0}}
         mock_recover.return_value = 'new_physical_id'
 
         res = node.do_recover(self.context)
 
         self.assertTrue(res)
+        self.assertEqual({}, node.data)
         mock_recover.assert_called_once_with(self.context, node)
         self.assertEqual('node1', node.name)
         self.assertEqual('new_physical_id', node.physical_id)
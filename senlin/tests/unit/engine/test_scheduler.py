@@ -10,13 +10,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
 import eventlet
 import mock
 from oslo_config import cfg
 from oslo_service import threadgroup
+from oslo_utils import timeutils
 
 from senlin.db import api as db_api
 from senlin.engine.actions import base as actionm
+from senlin.engine import dispatcher
 from senlin.engine import scheduler
 from senlin.tests.unit.common import base
 
@@ -66,13 +70,54 @@ class SchedulerTest(base.SenlinTestCase):
     def test_create(self):
         tgm = scheduler.ThreadGroupManager()
         self.assertEqual({}, tgm.workers)
+        self.assertEqual(cfg.CONF.max_concurrent_actions, tgm.max_workers)
+        self.mock_tg.assert_called_once_with(
+            thread_pool_size=(scheduler.MAX_THREADS_PER_WORKER *
+                              cfg.CONF.max_concurrent_actions + 10))
 
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
         tgm = scheduler.ThreadGroupManager()
-        mock_group.add_timer.assert_called_once_with(
-            cfg.CONF.periodic_interval,
-            tgm._service_task)
+        mock_group.add_timer.assert_has_calls([
+            mock.call(cfg.CONF.periodic_interval, tgm._service_task),
+            mock.call(cfg.CONF.action_aging_interval, tgm._age_actions),
+            mock.call(scheduler.QUEUE_CHECK_INTERVAL,
+                      tgm._check_ready_queues)])
+
+    def test_create_aging_disabled(self):
+        cfg.CONF.set_override('action_aging_interval', 0, enforce_type=True)
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+
+        mock_group.add_timer.assert_has_calls([
+            mock.call(cfg.CONF.periodic_interval, tgm._service_task),
+            mock.call(scheduler.QUEUE_CHECK_INTERVAL,
+                      tgm._check_ready_queues)])
+        self.assertEqual(2, mock_group.add_timer.call_count)
+
+    @mock.patch.object(db_api, 'action_age_ready')
+    def test_age_actions(self, mock_age):
+        now = timeutils.utcnow()
+        self.patchobject(timeutils, 'utcnow', return_value=now)
+        tgm = scheduler.ThreadGroupManager()
+
+        tgm._age_actions()
+
+        mock_age.assert_called_once_with(
+            tgm.db_session,
+            now - datetime.timedelta(seconds=cfg.CONF.action_aging_interval))
+
+    @mock.patch.object(db_api, 'action_age_ready')
+    def test_age_actions_failed(self, mock_age):
+        mock_age.side_effect = Exception('boom')
+        tgm = scheduler.ThreadGroupManager()
+
+        # Failures are logged rather than killing the timer
+        tgm._age_actions()
+
+        self.assertEqual(1, mock_age.call_count)
 
     def test_start(self):
         def f():
@@ -103,23 +148,46 @@ class SchedulerTest(base.SenlinTestCase):
         self.assertEqual(mock_thread, tgm.workers['0123'])
         mock_thread.link.assert_called_once_with(mock.ANY, '0123')
 
-    @mock.patch.object(db_api, 'action_acquire_1st_ready')
+    @mock.patch.object(db_api, 'action_acquire_ready')
     def test_start_action_no_action_id(self, mock_acquire_action):
         mock_action = mock.Mock()
         mock_action.id = '0123'
-        mock_acquire_action.return_value = mock_action
+        mock_acquire_action.return_value = [mock_action]
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
 
         tgm = scheduler.ThreadGroupManager()
+        tgm.workers = {'RUNNING': mock.Mock()}
         tgm.start_action('4567')
 
+        mock_acquire_action.assert_called_once_with(
+            tgm.db_session, '4567', mock.ANY,
+            limit=cfg.CONF.max_concurrent_actions - 1)
         mock_group.add_thread.assert_called_once_with(actionm.ActionProc,
                                                       tgm.db_session, '0123')
         mock_thread = mock_group.add_thread.return_value
         self.assertEqual(mock_thread, tgm.workers['0123'])
         mock_thread.link.assert_called_once_with(mock.ANY, '0123')
 
+    @mock.patch.object(db_api, 'action_acquire_ready')
+    def test_start_action_no_action_id_multiple(self, mock_acquire_action):
+        mock_acquire_action.return_value = [mock.Mock(id='0123'),
+                                            mock.Mock(id='4567')]
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.max_workers = 2
+        th = tgm.start_action('WORKER')
+
+        mock_acquire_action.assert_called_once_with(tgm.db_session, 'WORKER',
+                                                    mock.ANY, limit=2)
+        mock_group.add_thread.assert_has_calls([
+            mock.call(actionm.ActionProc, tgm.db_session, '0123'),
+            mock.call(actionm.ActionProc, tgm.db_session, '4567')])
+        self.assertEqual(mock_group.add_thread.return_value, th)
+        self.assertEqual(2, len(tgm.workers))
+
     @mock.patch.object(db_api, 'action_acquire')
     def test_start_action_failed_locking_action(self, mock_acquire_action):
         mock_acquire_action.return_value = None
@@ -130,9 +198,9 @@ class SchedulerTest(base.SenlinTestCase):
         res = tgm.start_action('4567')
         self.assertIsNone(res)
 
-    @mock.patch.object(db_api, 'action_acquire_1st_ready')
+    @mock.patch.object(db_api, 'action_acquire_ready')
     def test_start_action_no_action_ready(self, mock_acquire_action):
-        mock_acquire_action.return_value = None
+        mock_acquire_action.return_value = []
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
 
@@ -140,6 +208,194 @@ class SchedulerTest(base.SenlinTestCase):
         res = tgm.start_action('4567')
         self.assertIsNone(res)
 
+    @mock.patch.object(scheduler.ThreadGroupManager, 'start_action')
+    def test_start_actions(self, mock_start):
+        mock_start.side_effect = ['THREAD1', None, 'THREAD3']
+
+        tgm = scheduler.ThreadGroupManager()
+        res = tgm.start_actions('4567', ['A1', 'A2', 'A3'])
+
+        self.assertEqual(['THREAD1', 'THREAD3'], res)
+        mock_start.assert_has_calls([mock.call('4567', 'A1', None),
+                                     mock.call('4567', 'A2', None),
+                                     mock.call('4567', 'A3', None)])
+
+    @mock.patch.object(db_api, 'action_acquire')
+    def test_start_action_saturated(self, mock_acquire):
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.max_workers = 1
+        tgm.workers = {'RUNNING': mock.Mock()}
+        res = tgm.start_action('4567', 'A1', 'CLUSTER')
+
+        self.assertIsNone(res)
+        self.assertEqual(0, mock_acquire.call_count)
+        self.assertEqual(0, mock_group.add_thread.call_count)
+        self.assertEqual(['A1'], list(tgm.ready_queues['CLUSTER']))
+
+    @mock.patch.object(db_api, 'action_acquire_ready')
+    def test_start_action_saturated_refuse_claim(self, mock_acquire):
+        tgm = scheduler.ThreadGroupManager()
+        tgm.max_workers = 1
+        tgm.workers = {'RUNNING': mock.Mock()}
+        res = tgm.start_action('4567')
+
+        self.assertIsNone(res)
+        self.assertEqual(0, mock_acquire.call_count)
+        self.assertTrue(tgm.refused)
+
+    @mock.patch.object(db_api, 'action_acquire')
+    def test_start_action_parents_waiting(self, mock_acquire):
+        mock_acquire.return_value = mock.Mock(id='CHILD')
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+        for parent in ('P1', 'P2'):
+            dispatcher.register_waiter(parent)
+            self.addCleanup(dispatcher.unregister_waiter, parent)
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.max_workers = 2
+        tgm.workers = {'P1': mock.Mock(), 'P2': mock.Mock()}
+        res = tgm.start_action('4567', 'CHILD', 'CLUSTER')
+
+        # Parents waiting for their children don't hold the workers
+        self.assertIsNotNone(res)
+        mock_acquire.assert_called_once_with(tgm.db_session, 'CHILD',
+                                             '4567', mock.ANY)
+        self.assertEqual({}, tgm.ready_queues)
+        self.assertIn('CHILD', tgm.workers)
+
+    @mock.patch.object(db_api, 'action_acquire')
+    def test_check_ready_queues_parents_waiting(self, mock_acquire):
+        mock_acquire.side_effect = [mock.Mock(id='C1'), mock.Mock(id='C2')]
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.max_workers = 2
+        tgm.workers = {'P1': mock.Mock(), 'P2': mock.Mock()}
+        tgm.start_actions('4567', ['C1', 'C2'], 'CLUSTER')
+
+        # Saturated by the parents, which haven't started waiting yet
+        self.assertEqual(0, mock_acquire.call_count)
+        self.assertEqual(['C1', 'C2'], list(tgm.ready_queues['CLUSTER']))
+
+        # The parents start waiting without any thread exiting
+        for parent in ('P1', 'P2'):
+            dispatcher.register_waiter(parent)
+            self.addCleanup(dispatcher.unregister_waiter, parent)
+        tgm._check_ready_queues()
+
+        self.assertEqual({}, tgm.ready_queues)
+        self.assertEqual(set(['P1', 'P2', 'C1', 'C2']), set(tgm.workers))
+        self.assertEqual(2, mock_acquire.call_count)
+
+    @mock.patch.object(db_api, 'action_acquire_ready')
+    @mock.patch.object(db_api, 'action_acquire')
+    def test_start_action_pool_full_of_waiting(self, mock_acquire,
+                                               mock_ready):
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+        parents = ['P1', 'P2', 'P3', 'P4']
+        for parent in parents:
+            dispatcher.register_waiter(parent)
+            self.addCleanup(dispatcher.unregister_waiter, parent)
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.max_workers = 2
+        tgm.workers = dict((p, mock.Mock()) for p in parents)
+        res = tgm.start_action('4567', 'CHILD', 'CLUSTER')
+
+        # No thread left for the child, it is queued without being locked
+        self.assertIsNone(res)
+        self.assertEqual(0, mock_acquire.call_count)
+        self.assertEqual(['CHILD'], list(tgm.ready_queues['CLUSTER']))
+
+        # Nor are ready actions claimed
+        self.assertIsNone(tgm.start_action('4567'))
+        self.assertEqual(0, mock_ready.call_count)
+        self.assertTrue(tgm.refused)
+
+        tgm._check_ready_queues()
+        self.assertEqual(0, mock_acquire.call_count)
+        self.assertEqual(0, mock_group.add_thread.call_count)
+
+        # A parent finishing frees a thread for the child
+        mock_acquire.return_value = mock.Mock(id='CHILD')
+        tgm.workers.pop('P1')
+        tgm._check_ready_queues()
+
+        mock_acquire.assert_called_once_with(tgm.db_session, 'CHILD',
+                                             '4567', mock.ANY)
+        self.assertIn('CHILD', tgm.workers)
+        self.assertEqual({}, tgm.ready_queues)
+
+    @mock.patch.object(scheduler.ThreadGroupManager, '_schedule_next')
+    def test_check_ready_queues_nothing_queued(self, mock_schedule):
+        tgm = scheduler.ThreadGroupManager()
+        tgm._check_ready_queues()
+        tgm.worker_id = '4567'
+        tgm._check_ready_queues()
+
+        self.assertEqual(0, mock_schedule.call_count)
+
+        tgm._enqueue('A1', 'CLUSTER')
+        tgm._check_ready_queues()
+        mock_schedule.assert_called_once_with('4567')
+
+    def test_dequeue_round_robin(self):
+        tgm = scheduler.ThreadGroupManager()
+        tgm._enqueue('A1', 'C1')
+        tgm._enqueue('A2', 'C1')
+        tgm._enqueue('A3', 'C1')
+        tgm._enqueue('B1', 'C2')
+        tgm._enqueue('S1')
+
+        res = [tgm._dequeue() for i in range(6)]
+
+        self.assertEqual(['A1', 'B1', 'S1', 'A2', 'A3', None], res)
+        self.assertEqual({}, tgm.ready_queues)
+
+    @mock.patch.object(db_api, 'action_acquire_ready')
+    @mock.patch.object(db_api, 'action_acquire')
+    def test_release_schedule_next(self, mock_acquire, mock_ready):
+        mock_acquire.side_effect = [mock.Mock(id='A1'), None,
+                                    mock.Mock(id='A3')]
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.max_workers = 1
+        tgm.start_action('4567', 'A1')
+        tgm.start_action('4567', 'A2', 'CLUSTER')
+        tgm.start_action('4567', 'A3', 'CLUSTER')
+        tgm.start_action('4567')
+        self.assertTrue(tgm.refused)
+
+        # Finish action A1, A2 has been claimed by other engines
+        mock_thread = mock_group.add_thread.return_value
+        release = mock_thread.link.call_args[0][0]
+        release(mock_thread, 'A1')
+
+        self.assertEqual(['A3'], list(tgm.workers.keys()))
+        mock_acquire.assert_has_calls([
+            mock.call(tgm.db_session, 'A1', '4567', mock.ANY),
+            mock.call(tgm.db_session, 'A2', '4567', mock.ANY),
+            mock.call(tgm.db_session, 'A3', '4567', mock.ANY)])
+        self.assertEqual({}, tgm.ready_queues)
+        # Still saturated, so nothing claimed from database
+        self.assertEqual(0, mock_ready.call_count)
+        self.assertTrue(tgm.refused)
+
+        # Finish action A3, claim the ready actions previously refused
+        mock_ready.return_value = []
+        release(mock_thread, 'A3')
+        mock_ready.assert_called_once_with(tgm.db_session, '4567', mock.ANY,
+                                           limit=1)
+        self.assertFalse(tgm.refused)
+
     def test_cancel_action(self):
         mock_action = mock.Mock()
         mock_load = self.patchobject(actionm.Action, 'load',
@@ -177,9 +433,9 @@ class SchedulerTest(base.SenlinTestCase):
         tgm = scheduler.ThreadGroupManager()
         tgm.add_timer(10, f)
 
-        # The first element is the '_service_task'
-        self.assertEqual(2, len(self.fake_tg.threads))
-        self.assertEqual(f, self.fake_tg.threads[1])
+        # The first elements are the '_service_task' and '_age_actions'
+        self.assertEqual(3, len(self.fake_tg.threads))
+        self.assertEqual(f, self.fake_tg.threads[2])
 
     def test_stop_timer(self):
         mock_group = mock.Mock()
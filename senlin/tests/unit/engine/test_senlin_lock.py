@@ -295,3 +295,199 @@ class SenlinLockEnginCheckTest(base.SenlinTestCase):
             updated_at=datetime.datetime.utcnow())
         self.assertFalse(lockm.is_engine_dead(self.ctx, 'fake_engine_id'))
         mock_service.assert_called_once_with(self.ctx, 'fake_engine_id')
+
+
+class LockBackendTest(base.SenlinTestCase):
+
+    def test_get_backend(self):
+        self.patchobject(lockm, '_backend', None)
+        backend = lockm.get_backend()
+        self.assertIsInstance(backend, lockm.DBLockBackend)
+        self.assertNotIsInstance(backend, lockm.LeaseLockBackend)
+        self.assertIs(backend, lockm.get_backend())
+
+    def test_get_backend_lease(self):
+        self.patchobject(lockm, '_backend', None)
+        cfg.CONF.set_override('lock_backend', 'lease', enforce_type=True)
+        self.assertIsInstance(lockm.get_backend(), lockm.LeaseLockBackend)
+
+    def test_renew_leases(self):
+        backend = mock.Mock()
+        self.patchobject(lockm, '_backend', backend)
+        lockm.renew_leases()
+        backend.renew.assert_called_once_with()
+
+
+class LeaseLockBackendTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(LeaseLockBackendTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.backend = lockm.LeaseLockBackend()
+        self.mock_wait = self.patchobject(self.backend, '_wait')
+
+    @mock.patch.object(db_api, 'cluster_lock_acquire_lease')
+    def test_cluster_lock_acquire(self, mock_acquire):
+        mock_acquire.return_value = (['ACTION_XYZ'], [])
+
+        res = self.backend.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
+                                                'ACTION_XYZ')
+
+        self.assertTrue(res)
+        mock_acquire.assert_called_once_with('CLUSTER_A', 'ACTION_XYZ',
+                                             lockm.CLUSTER_SCOPE, mock.ANY,
+                                             mock.ANY)
+        self.assertEqual({'CLUSTER_A': set(['ACTION_XYZ'])},
+                         self.backend.clusters)
+        self.assertEqual(0, self.mock_wait.call_count)
+
+    @mock.patch.object(db_api, 'action_mark_failed')
+    @mock.patch.object(db_api, 'cluster_lock_acquire_lease')
+    def test_cluster_lock_acquire_expired(self, mock_acquire, mock_fail):
+        mock_acquire.return_value = (['ACTION_XYZ'], ['ACTION_ABC'])
+
+        res = self.backend.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
+                                                'ACTION_XYZ')
+
+        self.assertTrue(res)
+        mock_fail.assert_called_once_with(
+            self.ctx, 'ACTION_ABC', mock.ANY,
+            reason='Lock lease expired when executing this action.')
+
+    @mock.patch.object(db_api, 'service_get')
+    @mock.patch.object(db_api, 'cluster_lock_acquire_lease')
+    def test_cluster_lock_acquire_with_retry(self, mock_acquire,
+                                             mock_service):
+        mock_acquire.side_effect = [(['ACTION_ABC'], []),
+                                    (['ACTION_ABC'], []),
+                                    (['ACTION_XYZ'], [])]
+
+        res = self.backend.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
+                                                'ACTION_XYZ')
+
+        self.assertTrue(res)
+        self.assertEqual(3, mock_acquire.call_count)
+        self.mock_wait.assert_has_calls([mock.call('CLUSTER_A')] * 2)
+        # No liveness check of other engines
+        self.assertEqual(0, mock_service.call_count)
+
+    @mock.patch.object(db_api, 'cluster_lock_acquire_lease')
+    def test_cluster_lock_acquire_max_retries(self, mock_acquire):
+        mock_acquire.return_value = (['ACTION_ABC'], [])
+
+        res = self.backend.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
+                                                'ACTION_XYZ')
+
+        self.assertFalse(res)
+        self.assertEqual(cfg.CONF.lock_retry_times + 1,
+                         mock_acquire.call_count)
+        self.assertEqual(cfg.CONF.lock_retry_times, self.mock_wait.call_count)
+        self.assertEqual({}, self.backend.clusters)
+
+    @mock.patch.object(db_api, 'cluster_lock_renew')
+    @mock.patch.object(db_api, 'cluster_lock_steal')
+    @mock.patch.object(db_api, 'cluster_lock_acquire_lease')
+    def test_cluster_lock_acquire_forced(self, mock_acquire, mock_steal,
+                                         mock_renew):
+        mock_acquire.return_value = (['ACTION_ABC'], [])
+        mock_steal.return_value = ['ACTION_XYZ']
+
+        res = self.backend.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
+                                                'ACTION_XYZ', forced=True)
+
+        self.assertTrue(res)
+        mock_steal.assert_called_once_with('CLUSTER_A', 'ACTION_XYZ')
+        mock_renew.assert_called_once_with(['CLUSTER_A'], mock.ANY)
+        self.assertEqual({'CLUSTER_A': set(['ACTION_XYZ'])},
+                         self.backend.clusters)
+
+    @mock.patch.object(db_api, 'cluster_lock_release')
+    def test_cluster_lock_release(self, mock_release):
+        self.backend.clusters = {'CLUSTER_A': set(['ACTION_1', 'ACTION_2'])}
+        mock_notify = self.patchobject(self.backend, '_notify')
+
+        res = self.backend.cluster_lock_release('CLUSTER_A', 'ACTION_1',
+                                                lockm.NODE_SCOPE)
+
+        self.assertEqual(mock_release.return_value, res)
+        mock_release.assert_called_once_with('CLUSTER_A', 'ACTION_1',
+                                             lockm.NODE_SCOPE)
+        mock_notify.assert_called_once_with('CLUSTER_A')
+        self.assertEqual({'CLUSTER_A': set(['ACTION_2'])},
+                         self.backend.clusters)
+
+        self.backend.cluster_lock_release('CLUSTER_A', 'ACTION_2',
+                                          lockm.NODE_SCOPE)
+        self.assertEqual({}, self.backend.clusters)
+
+    @mock.patch.object(db_api, 'node_lock_acquire_lease')
+    def test_node_lock_acquire(self, mock_acquire):
+        mock_acquire.return_value = ('ACTION_XYZ', None)
+
+        res = self.backend.node_lock_acquire(self.ctx, 'NODE_A', 'ACTION_XYZ')
+
+        self.assertTrue(res)
+        mock_acquire.assert_called_once_with('NODE_A', 'ACTION_XYZ',
+                                             mock.ANY, mock.ANY)
+        self.assertEqual({'NODE_A': 'ACTION_XYZ'}, self.backend.nodes)
+
+    @mock.patch.object(db_api, 'action_mark_failed')
+    @mock.patch.object(db_api, 'node_lock_acquire_lease')
+    def test_node_lock_acquire_expired(self, mock_acquire, mock_fail):
+        mock_acquire.return_value = ('ACTION_XYZ', 'ACTION_ABC')
+
+        res = self.backend.node_lock_acquire(self.ctx, 'NODE_A', 'ACTION_XYZ')
+
+        self.assertTrue(res)
+        mock_fail.assert_called_once_with(
+            self.ctx, 'ACTION_ABC', mock.ANY,
+            reason='Lock lease expired when executing this action.')
+
+    @mock.patch.object(db_api, 'node_lock_acquire_lease')
+    def test_node_lock_acquire_max_retries(self, mock_acquire):
+        mock_acquire.return_value = ('ACTION_ABC', None)
+
+        res = self.backend.node_lock_acquire(self.ctx, 'NODE_A', 'ACTION_XYZ')
+
+        self.assertFalse(res)
+        self.mock_wait.assert_has_calls(
+            [mock.call('NODE_A')] * cfg.CONF.lock_retry_times)
+        self.assertEqual({}, self.backend.nodes)
+
+    @mock.patch.object(db_api, 'node_lock_release')
+    def test_node_lock_release(self, mock_release):
+        self.backend.nodes = {'NODE_A': 'ACTION_XYZ'}
+        mock_notify = self.patchobject(self.backend, '_notify')
+
+        res = self.backend.node_lock_release('NODE_A', 'ACTION_XYZ')
+
+        self.assertEqual(mock_release.return_value, res)
+        mock_notify.assert_called_once_with('NODE_A')
+        self.assertEqual({}, self.backend.nodes)
+
+    @mock.patch.object(db_api, 'node_lock_renew')
+    @mock.patch.object(db_api, 'cluster_lock_renew')
+    def test_renew(self, mock_cluster, mock_node):
+        self.backend.renew()
+        self.assertEqual(0, mock_cluster.call_count)
+        self.assertEqual(0, mock_node.call_count)
+
+        self.backend.clusters = {'CLUSTER_A': set(['ACTION_1'])}
+        self.backend.nodes = {'NODE_A': 'ACTION_2'}
+        self.backend.renew()
+        mock_cluster.assert_called_once_with(['CLUSTER_A'], mock.ANY)
+        mock_node.assert_called_once_with(['NODE_A'], mock.ANY)
+
+    def test_wait_notify(self):
+        backend = lockm.LeaseLockBackend()
+        cfg.CONF.set_override('lock_retry_interval', 0, enforce_type=True)
+
+        # Times out without notification
+        backend._wait('CLUSTER_A')
+        self.assertEqual({}, backend.waiters)
+
+        waiter = mock.Mock()
+        backend.waiters = {'CLUSTER_A': [waiter]}
+        backend._notify('CLUSTER_A')
+        backend._notify('CLUSTER_B')
+        waiter.put_nowait.assert_called_once_with(True)
@@ -26,6 +26,8 @@ class TestDeletionPolicy(base.SenlinTestCase):
     def setUp(self):
         super(TestDeletionPolicy, self).setUp()
         self.context = utils.dummy_context()
+        self.mock_rows = self.patchobject(db_api, 'node_get_all_for_selection',
+                                          return_value=[])
         self.spec = {
             'type': 'senlin.policy.deletion',
             'version': '1.0',
@@ -318,7 +320,9 @@ class TestDeletionPolicy(base.SenlinTestCase):
         action.inputs = {}
         action.data = {'deletion': {'count': 2}}
 
-        cluster = mock.Mock(nodes=['a', 'b', 'c'])
+        cluster = mock.Mock(id='FAKE_ID')
+        nodes = ['a', 'b', 'c']
+        self.mock_rows.return_value = nodes
         mock_load.return_value = cluster
         mock_select.return_value = ['NODE1', 'NODE2']
 
@@ -328,7 +332,8 @@ class TestDeletionPolicy(base.SenlinTestCase):
         mock_update.assert_called_once_with(action, ['NODE1', 'NODE2'])
         mock_load.assert_called_once_with(action.context,
                                           cluster=None, cluster_id='FAKE_ID')
-        mock_select.assert_called_once_with(cluster.nodes, 2, True)
+        mock_select.assert_called_once_with(nodes, 2, True)
+        self.mock_rows.assert_called_once_with(action.context, 'FAKE_ID')
 
     @mock.patch.object(dp.DeletionPolicy, '_update_action')
     @mock.patch.object(dp.DeletionPolicy, '_victims_by_regions')
@@ -401,7 +406,9 @@ class TestDeletionPolicy(base.SenlinTestCase):
         action.data = {}
         action.inputs = {'count': 2}
 
-        cluster = mock.Mock(nodes=[mock.Mock()])
+        cluster = mock.Mock(id='FAKE_ID')
+        nodes = [mock.Mock()]
+        self.mock_rows.return_value = nodes
         mock_load.return_value = cluster
         mock_select.return_value = ['NODE_ID']
 
@@ -413,7 +420,8 @@ class TestDeletionPolicy(base.SenlinTestCase):
         mock_update.assert_called_once_with(action, ['NODE_ID'])
         # the following was invoked with 1 because the input count is
         # greater than the cluster size
-        mock_select.assert_called_once_with(cluster.nodes, 1, True)
+        mock_select.assert_called_once_with(nodes, 1, True)
+        self.mock_rows.assert_called_once_with(action.context, 'FAKE_ID')
 
     @mock.patch.object(dp.DeletionPolicy, '_update_action')
     @mock.patch.object(su, 'nodes_by_age')
@@ -426,7 +434,9 @@ class TestDeletionPolicy(base.SenlinTestCase):
         action.data = {}
         action.inputs = {}
 
-        cluster = mock.Mock(nodes=[mock.Mock()])
+        cluster = mock.Mock(id='FAKE_ID')
+        nodes = [mock.Mock()]
+        self.mock_rows.return_value = nodes
         mock_load.return_value = cluster
         mock_select.return_value = ['NODE_ID']
 
@@ -438,7 +448,8 @@ class TestDeletionPolicy(base.SenlinTestCase):
         mock_update.assert_called_once_with(action, ['NODE_ID'])
         # the following was invoked with 1 because the input count is
         # not specified so 1 becomes the default
-        mock_select.assert_called_once_with(cluster.nodes, 1, True)
+        mock_select.assert_called_once_with(nodes, 1, True)
+        self.mock_rows.assert_called_once_with(action.context, 'FAKE_ID')
 
     @mock.patch.object(dp.DeletionPolicy, '_update_action')
     @mock.patch.object(su, 'parse_resize_params')
@@ -521,7 +532,9 @@ class TestDeletionPolicy(base.SenlinTestCase):
         mock_get.return_value = db_cluster
         mock_parse.side_effect = fake_parse
 
-        cluster = mock.Mock(nodes=[mock.Mock(), mock.Mock()])
+        cluster = mock.Mock(id='FAKE_ID')
+        nodes = [mock.Mock(), mock.Mock()]
+        self.mock_rows.return_value = nodes
         mock_load.return_value = cluster
 
         mock_select.return_value = ['NID']
@@ -550,7 +563,9 @@ class TestDeletionPolicy(base.SenlinTestCase):
         action.inputs = {}
         action.data = {'deletion': {'count': 2}}
 
-        cluster = mock.Mock(nodes=['a', 'b', 'c'])
+        cluster = mock.Mock(id='FAKE_ID')
+        nodes = ['a', 'b', 'c']
+        self.mock_rows.return_value = nodes
         mock_select.return_value = ['NODE1', 'NODE2']
         mock_load.return_value = cluster
 
@@ -560,7 +575,8 @@ class TestDeletionPolicy(base.SenlinTestCase):
 
         mock_load.assert_called_once_with(action.context,
                                           cluster=None, cluster_id='FAKE_ID')
-        mock_select.assert_called_once_with(cluster.nodes, 2)
+        mock_select.assert_called_once_with(nodes, 2)
+        self.mock_rows.assert_called_once_with(action.context, 'FAKE_ID')
         mock_update.assert_called_once_with(action, ['NODE1', 'NODE2'])
 
     @mock.patch.object(dp.DeletionPolicy, '_update_action')
@@ -575,7 +591,9 @@ class TestDeletionPolicy(base.SenlinTestCase):
 
         mock_select.return_value = ['NODE1', 'NODE2']
 
-        cluster = mock.Mock(nodes=['a', 'b', 'c'])
+        cluster = mock.Mock(id='FAKE_ID')
+        nodes = ['a', 'b', 'c']
+        self.mock_rows.return_value = nodes
         mock_load.return_value = cluster
 
         self.spec['properties']['criteria'] = 'OLDEST_PROFILE_FIRST'
@@ -584,7 +602,8 @@ class TestDeletionPolicy(base.SenlinTestCase):
 
         mock_load.assert_called_once_with(action.context,
                                           cluster=None, cluster_id='FAKE_ID')
-        mock_select.assert_called_once_with(cluster.nodes, 2)
+        mock_select.assert_called_once_with(nodes, 2)
+        self.mock_rows.assert_called_once_with(action.context, 'FAKE_ID')
         mock_update.assert_called_once_with(action, ['NODE1', 'NODE2'])
 
     @mock.patch.object(dp.DeletionPolicy, '_update_action')
@@ -596,7 +615,9 @@ class TestDeletionPolicy(base.SenlinTestCase):
         action.inputs = {}
         action.data = {'deletion': {'count': 2}}
 
-        cluster = mock.Mock(nodes=['a', 'b', 'c'])
+        cluster = mock.Mock(id='FAKE_ID')
+        nodes = ['a', 'b', 'c']
+        self.mock_rows.return_value = nodes
         mock_select.return_value = ['NODE1', 'NODE2']
         mock_load.return_value = cluster
 
@@ -606,5 +627,6 @@ class TestDeletionPolicy(base.SenlinTestCase):
 
         mock_load.assert_called_once_with(action.context,
                                           cluster=None, cluster_id='FAKE_ID')
-        mock_select.assert_called_once_with(cluster.nodes, 2, True)
+        mock_select.assert_called_once_with(nodes, 2, True)
+        self.mock_rows.assert_called_once_with(action.context, 'FAKE_ID')
         mock_update.assert_called_once_with(action, ['NODE1', 'NODE2'])
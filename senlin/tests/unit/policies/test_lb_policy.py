@@ -138,8 +138,8 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
         cluster = mock.Mock()
         cluster.data = {}
         cluster.id = 'CLUSTER_ID'
-        node1 = mock.Mock()
-        node2 = mock.Mock()
+        node1 = mock.Mock(id='NODE1_ID')
+        node2 = mock.Mock(id='NODE2_ID')
         m_attach.return_value = (True, None)
         m_load.return_value = [node1, node2]
         m_build.return_value = 'policy_data'
@@ -153,7 +153,10 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
         policy.id = 'FAKE_ID'
 
         self.lb_driver.lb_create.return_value = (True, data)
-        self.lb_driver.member_add.side_effect = ['MEMBER1_ID', 'MEMBER2_ID']
+        self.lb_driver.members_add.return_value = {
+            'NODE1_ID': 'MEMBER1_ID',
+            'NODE2_ID': 'MEMBER2_ID',
+        }
         res, data = policy.attach(cluster)
         self.assertTrue(res)
         self.assertEqual('policy_data', data)
@@ -161,15 +164,12 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
                                                          policy.pool_spec,
                                                          policy.hm_spec)
         m_load.assert_called_once_with(mock.ANY, cluster_id=cluster.id)
-        member_add_calls = [
-            mock.call(node1, 'LB_ID', 'POOL_ID', 80, 'test-subnet'),
-            mock.call(node2, 'LB_ID', 'POOL_ID', 80, 'test-subnet')
-        ]
-        self.lb_driver.member_add.assert_has_calls(member_add_calls)
-        node1.data.update.assert_called_once_with({'lb_member': 'MEMBER1_ID'})
-        node2.data.update.assert_called_once_with({'lb_member': 'MEMBER2_ID'})
-        node1.store.assert_called_once_with(mock.ANY)
-        node2.store.assert_called_once_with(mock.ANY)
+        self.lb_driver.members_add.assert_called_once_with(
+            [node1, node2], 'LB_ID', 'POOL_ID', 80, 'test-subnet')
+        node1.update_data.assert_called_once_with(
+            mock.ANY, {'lb_member': 'MEMBER1_ID'})
+        node2.update_data.assert_called_once_with(
+            mock.ANY, {'lb_member': 'MEMBER2_ID'})
         expected = {
             policy.id: {'vip_address': '192.168.1.100'}
         }
@@ -216,9 +216,10 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
 
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
 
-        # lb_driver.member_add return None
+        # lb_driver.members_add failed in adding a node
         self.lb_driver.lb_create.return_value = (True, lb_data)
-        self.lb_driver.member_add.return_value = None
+        self.lb_driver.members_add.return_value = {'node1': 'MEMBER1_ID',
+                                                   'node2': None}
         res = policy.attach(cluster)
         self.assertEqual((False, 'Failed in adding node into lb pool'), res)
         self.lb_driver.lb_delete.assert_called_once_with(**lb_data)
@@ -233,7 +234,7 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
         res = policy._get_delete_candidates('CLUSTERID', action)
         self.assertEqual(['node1', 'node2'], res)
 
-    @mock.patch.object(db_api, 'node_get_all_by_cluster')
+    @mock.patch.object(db_api, 'node_get_all_for_selection')
     @mock.patch.object(scaleutils, 'nodes_by_random')
     def test_get_delete_candidates_no_deletion_data_scale_in(self,
                                                              m_nodes_random,
@@ -248,13 +249,12 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
 
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         res = policy._get_delete_candidates('CLUSTERID', action)
-        m_node_get.assert_called_once_with(action.context,
-                                           cluster_id='CLUSTERID')
+        m_node_get.assert_called_once_with(action.context, 'CLUSTERID')
         m_nodes_random.assert_called_once_with(['node1', 'node2', 'node3'], 1)
 
         self.assertEqual(['node1', 'node3'], res)
 
-    @mock.patch.object(db_api, 'node_get_all_by_cluster')
+    @mock.patch.object(db_api, 'node_get_all_for_selection')
     @mock.patch.object(db_api, 'cluster_get')
     @mock.patch.object(scaleutils, 'parse_resize_params')
     @mock.patch.object(scaleutils, 'nodes_by_random')
@@ -280,13 +280,12 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
         m_cluster_get.assert_called_once_with(action.context,
                                               'CLUSTERID')
         m_parse_param.assert_called_once_with(action, 'cluster1')
-        m_node_get.assert_called_once_with(action.context,
-                                           cluster_id='CLUSTERID')
+        m_node_get.assert_called_once_with(action.context, 'CLUSTERID')
         m_nodes_random.assert_called_once_with(['node1', 'node2', 'node3'], 2)
 
         self.assertEqual(['node1', 'node3'], res)
 
-    @mock.patch.object(db_api, 'node_get_all_by_cluster')
+    @mock.patch.object(db_api, 'node_get_all_for_selection')
     @mock.patch.object(scaleutils, 'nodes_by_random')
     def test_get_delete_candidates_deletion_no_candidates(self,
                                                           m_nodes_random,
@@ -299,8 +298,7 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
 
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         res = policy._get_delete_candidates('CLUSTERID', action)
-        m_node_get.assert_called_once_with(action.context,
-                                           cluster_id='CLUSTERID')
+        m_node_get.assert_called_once_with(action.context, 'CLUSTERID')
         m_nodes_random.assert_called_once_with(['node1', 'node2', 'node3'], 1)
 
         self.assertEqual(['node2'], res)
@@ -318,7 +316,7 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
         res = policy._get_delete_candidates('CLUSTERID', action)
         self.assertEqual([], res)
 
-    @mock.patch.object(db_api, 'node_get_all_by_cluster')
+    @mock.patch.object(db_api, 'node_get_all_for_selection')
     @mock.patch.object(scaleutils, 'nodes_by_random')
     def test_get_delete_candidates_deletion_count_over_size(self,
                                                             m_nodes_random,
@@ -330,8 +328,7 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
 
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         policy._get_delete_candidates('CLUSTERID', action)
-        m_node_get.assert_called_once_with(action.context,
-                                           cluster_id='CLUSTERID')
+        m_node_get.assert_called_once_with(action.context, 'CLUSTERID')
         m_nodes_random.assert_called_once_with(['node1', 'node2', 'node3'], 3)
 
     def test_get_delete_candidates_deletion_with_candidates(self):
@@ -457,15 +454,15 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         res = policy.post_op('FAKE_ID', action)
         self.assertIsNone(res)
 
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     @mock.patch.object(db_api, 'cluster_get')
     def test_post_op_add_nodes(self, m_cluster_get, m_node_load, m_extract,
                                m_load, m_conn):
         cid = 'CLUSTER_ID'
         cluster = mock.Mock()
         m_cluster_get.return_value = cluster
-        node1 = mock.Mock()
-        node2 = mock.Mock()
+        node1 = mock.Mock(id='NODE1_ID')
+        node2 = mock.Mock(id='NODE2_ID')
         node1.data = {}
         node2.data = {}
         action = mock.Mock()
@@ -486,8 +483,11 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
             }
         }
         cp.data = cp_data
-        self.lb_driver.member_add.side_effect = ['MEMBER1_ID', 'MEMBER2_ID']
-        m_node_load.side_effect = [node1, node2]
+        self.lb_driver.members_add.return_value = {
+            'NODE1_ID': 'MEMBER1_ID',
+            'NODE2_ID': 'MEMBER2_ID',
+        }
+        m_node_load.return_value = [node1, node2]
         m_load.return_value = cp
         m_extract.return_value = policy_data
 
@@ -498,28 +498,22 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         m_conn.assert_called_once_with(cluster)
         m_load.assert_called_once_with('action_context', cid, policy.id)
         m_extract.assert_called_once_with(cp_data)
-        calls_node_load = [
-            mock.call('action_context', node_id='NODE1_ID'),
-            mock.call('action_context', node_id='NODE2_ID')
-        ]
-        m_node_load.assert_has_calls(calls_node_load)
-        calls_member_add = [
-            mock.call(node1, 'LB_ID', 'POOL_ID', 80, 'test-subnet'),
-            mock.call(node2, 'LB_ID', 'POOL_ID', 80, 'test-subnet'),
-        ]
-        self.lb_driver.member_add.assert_has_calls(calls_member_add)
-        node1.store.assert_called_once_with('action_context')
-        node2.store.assert_called_once_with('action_context')
-        self.assertEqual({'lb_member': 'MEMBER1_ID'}, node1.data)
-        self.assertEqual({'lb_member': 'MEMBER2_ID'}, node2.data)
-
-    @mock.patch.object(node_mod.Node, 'load')
+        m_node_load.assert_called_once_with('action_context',
+                                            ['NODE1_ID', 'NODE2_ID'])
+        self.lb_driver.members_add.assert_called_once_with(
+            [node1, node2], 'LB_ID', 'POOL_ID', 80, 'test-subnet')
+        node1.update_data.assert_called_once_with(
+            'action_context', {'lb_member': 'MEMBER1_ID'})
+        node2.update_data.assert_called_once_with(
+            'action_context', {'lb_member': 'MEMBER2_ID'})
+
+    @mock.patch.object(node_mod.Node, 'load_many')
     @mock.patch.object(db_api, 'cluster_get')
     def test_post_op_add_nodes_in_pool(self, m_cluster_get, m_node_load,
                                        m_extract, m_load, m_conn):
         cluster_id = 'CLUSTER_ID'
-        node1 = mock.Mock()
-        node2 = mock.Mock()
+        node1 = mock.Mock(id='NODE1_ID')
+        node2 = mock.Mock(id='NODE2_ID')
         node1.data = {'lb_member': 'MEMBER1_ID'}
         node2.data = {}
         action = mock.Mock()
@@ -532,30 +526,35 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
             'pool': 'POOL_ID',
             'healthmonitor': 'HM_ID'
         }
-        self.lb_driver.member_add.side_effect = ['MEMBER2_ID']
-        m_node_load.side_effect = [node1, node2]
+        self.lb_driver.members_add.return_value = {'NODE2_ID': 'MEMBER2_ID'}
+        m_node_load.return_value = [node1, node2]
         m_extract.return_value = policy_data
 
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         res = policy.post_op(cluster_id, action)
         self.assertIsNone(res)
-        self.lb_driver.member_add.assert_called_once_with(
-            node2, 'LB_ID', 'POOL_ID', 80, 'test-subnet')
+        self.lb_driver.members_add.assert_called_once_with(
+            [node2], 'LB_ID', 'POOL_ID', 80, 'test-subnet')
+        node2.update_data.assert_called_once_with(
+            'action_context', {'lb_member': 'MEMBER2_ID'})
 
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     @mock.patch.object(db_api, 'cluster_get')
     def test_post_op_add_nodes_failed(self, m_cluster_get, m_node_load,
                                       m_extract, m_load, m_conn):
         cluster_id = 'CLUSTER_ID'
-        node1 = mock.Mock()
+        node1 = mock.Mock(id='NODE1_ID')
         node1.data = {}
+        node2 = mock.Mock(id='NODE2_ID')
+        node2.data = {}
         action = mock.Mock()
         action.data = {}
-        action.data = {'creation': {'nodes': ['NODE1_ID']}}
+        action.data = {'creation': {'nodes': ['NODE1_ID', 'NODE2_ID']}}
         action.context = 'action_context'
         action.action = consts.CLUSTER_RESIZE
-        self.lb_driver.member_add.return_value = None
-        m_node_load.side_effect = [node1]
+        self.lb_driver.members_add.return_value = {'NODE1_ID': None,
+                                                   'NODE2_ID': 'MEMBER2_ID'}
+        m_node_load.return_value = [node1, node2]
         m_extract.return_value = {
             'loadbalancer': 'LB_ID',
             'listener': 'LISTENER_ID',
@@ -570,10 +569,14 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         self.assertEqual(policy_base.CHECK_ERROR, action.data['status'])
         self.assertEqual('Failed in adding new node(s) into lb pool.',
                          action.data['reason'])
-        self.lb_driver.member_add.assert_called_once_with(
-            node1, 'LB_ID', 'POOL_ID', 80, 'test-subnet')
-
-    @mock.patch.object(node_mod.Node, 'load')
+        self.lb_driver.members_add.assert_called_once_with(
+            [node1, node2], 'LB_ID', 'POOL_ID', 80, 'test-subnet')
+        # nodes added successfully are still recorded
+        self.assertEqual(0, node1.update_data.call_count)
+        node2.update_data.assert_called_once_with(
+            'action_context', {'lb_member': 'MEMBER2_ID'})
+
+    @mock.patch.object(node_mod.Node, 'load_many')
     @mock.patch.object(db_api, 'cluster_get')
     def test_pre_op_del_nodes_ok(self, m_cluster_get, m_node_load, m_extract,
                                  m_load, m_conn):
@@ -608,8 +611,8 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
             }
         }
         cp.data = cp_data
-        self.lb_driver.member_remove.return_value = True
-        m_node_load.side_effect = [node1, node2]
+        self.lb_driver.members_remove.return_value = True
+        m_node_load.return_value = [node1, node2]
         m_load.return_value = cp
         m_extract.return_value = policy_data
 
@@ -622,22 +625,16 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         m_conn.assert_called_once_with(cluster)
         m_load.assert_called_once_with('action_context', cluster_id, policy.id)
         m_extract.assert_called_once_with(cp_data)
-        calls_node_load = [
-            mock.call(mock.ANY, node_id='NODE1_ID'),
-            mock.call(mock.ANY, node_id='NODE2_ID')
-        ]
-        m_node_load.assert_has_calls(calls_node_load)
-        calls_member_del = [
-            mock.call('LB_ID', 'POOL_ID', 'MEMBER1_ID'),
-            mock.call('LB_ID', 'POOL_ID', 'MEMBER2_ID')
-        ]
-        self.lb_driver.member_remove.assert_has_calls(calls_member_del)
+        m_node_load.assert_called_once_with(mock.ANY,
+                                            ['NODE1_ID', 'NODE2_ID'])
+        self.lb_driver.members_remove.assert_called_once_with(
+            'LB_ID', 'POOL_ID', ['MEMBER1_ID', 'MEMBER2_ID'])
 
         expected_data = {'deletion': {'candidates': ['NODE1_ID', 'NODE2_ID'],
                                       'count': 2}}
         self.assertEqual(expected_data, action.data)
 
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     @mock.patch.object(db_api, 'cluster_get')
     def test_pre_op_del_nodes_not_in_pool(self, m_cluster_get, m_node_load,
                                           m_extract, m_load, m_conn):
@@ -650,8 +647,8 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         action.data = {'deletion': {'candidates': ['NODE1_ID', 'NODE2_ID']}}
         action.context = 'action_context'
         action.action = consts.CLUSTER_RESIZE
-        self.lb_driver.member_remove.return_value = True
-        m_node_load.side_effect = [node1, node2]
+        self.lb_driver.members_remove.return_value = True
+        m_node_load.return_value = [node1, node2]
         m_extract.return_value = {
             'loadbalancer': 'LB_ID',
             'listener': 'LISTENER_ID',
@@ -662,10 +659,10 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         res = policy.pre_op(cluster_id, action)
         self.assertIsNone(res)
-        self.lb_driver.member_remove.assert_called_once_with(
-            'LB_ID', 'POOL_ID', 'MEMBER2_ID')
+        self.lb_driver.members_remove.assert_called_once_with(
+            'LB_ID', 'POOL_ID', ['MEMBER2_ID'])
 
-    @mock.patch.object(node_mod.Node, 'load')
+    @mock.patch.object(node_mod.Node, 'load_many')
     @mock.patch.object(db_api, 'cluster_get')
     def test_pre_op_del_nodes_failed(self, m_cluster_get, m_node_load,
                                      m_extract, m_load, m_conn):
@@ -677,8 +674,8 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         action.data = {'deletion': {'candidates': ['NODE1_ID']}}
         action.context = 'action_context'
         action.action = consts.CLUSTER_RESIZE
-        self.lb_driver.member_remove.return_value = False
-        m_node_load.side_effect = [node1]
+        self.lb_driver.members_remove.return_value = False
+        m_node_load.return_value = [node1]
         m_extract.return_value = {
             'loadbalancer': 'LB_ID',
             'listener': 'LISTENER_ID',
@@ -694,5 +691,5 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         self.assertEqual(policy_base.CHECK_ERROR, action.data['status'])
         self.assertEqual('Failed in removing deleted node(s) from lb pool.',
                          action.data['reason'])
-        self.lb_driver.member_remove.assert_called_once_with(
-            'LB_ID', 'POOL_ID', 'MEMBER1_ID')
+        self.lb_driver.members_remove.assert_called_once_with(
+            'LB_ID', 'POOL_ID', ['MEMBER1_ID'])
@@ -11,7 +11,9 @@
 # under the License.
 
 import mock
+from oslo_config import cfg
 from oslo_context import context as oslo_ctx
+from oslo_utils import timeutils
 import six
 
 from senlin.common import consts
@@ -162,6 +164,58 @@ class TestPolicyBase(base.SenlinTestCase):
         self.assertEqual('The policy (None) could not be found.',
                          six.text_type(ex))
 
+    def _enable_cache(self):
+        cfg.CONF.set_override('object_cache_size', 10, enforce_type=True)
+        self.patchobject(policy_base, '_cache', None)
+
+    def test_load_cached(self):
+        self._enable_cache()
+        policy = self._create_db_policy(data={'foo': 'bar'})
+
+        with mock.patch.object(
+                policy_base.Policy, '_from_db_record',
+                wraps=policy_base.Policy._from_db_record) as mock_from:
+            res1 = policy_base.Policy.load(self.ctx, policy.id)
+            res2 = policy_base.Policy.load(self.ctx, policy.id)
+
+        self.assertEqual(1, mock_from.call_count)
+        self.assertIsNot(res1, res2)
+        res1.data['foo'] = 'new'
+        self.assertEqual({'foo': 'bar'}, res2.data)
+
+    def test_load_cached_evicted_by_store(self):
+        self._enable_cache()
+        db_policy = self._create_db_policy()
+        policy = policy_base.Policy.load(self.ctx, db_policy.id)
+
+        policy.name = 'new-name'
+        policy.store(self.ctx)
+
+        res = policy_base.Policy.load(self.ctx, db_policy.id)
+        self.assertEqual('new-name', res.name)
+
+    def test_load_cached_record_updated(self):
+        self._enable_cache()
+        policy = self._create_db_policy()
+        policy_base.Policy.load(self.ctx, policy.id)
+
+        # an update made by another engine
+        db_api.policy_update(self.ctx, policy.id,
+                             {'name': 'new-name',
+                              'updated_at': timeutils.utcnow()})
+
+        res = policy_base.Policy.load(self.ctx, policy.id)
+        self.assertEqual('new-name', res.name)
+
+    def test_delete_evicts_cached(self):
+        self._enable_cache()
+        policy = self._create_db_policy()
+        policy_base.Policy.load(self.ctx, policy.id)
+
+        policy_base.Policy.delete(self.ctx, policy.id)
+
+        self.assertNotIn(policy.id, policy_base._get_cache().entries)
+
     def test_load_all(self):
         result = policy_base.Policy.load_all(self.ctx)
         self.assertEqual([], list(result))
@@ -0,0 +1,148 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo_config import cfg
+
+from senlin.common import exception
+from senlin.drivers import docker_v1
+from senlin.profiles.docker import container
+from senlin.tests.unit.common import base
+
+
+class TestContainerProfile(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestContainerProfile, self).setUp()
+
+        self.spec = {
+            'type': 'docker.container',
+            'version': '1.0',
+            'properties': {
+                'image': 'FAKE_IMAGE',
+                'name': 'FAKE_NAME',
+            }
+        }
+        self.profile = container.ContainerProfile('t', self.spec)
+        self.mock_client = self.patchobject(docker_v1, 'DockerClient')
+
+    def _obj(self, obj_id, host_ip, **metadata):
+        metadata['host_ip'] = host_ip
+        return mock.Mock(id=obj_id, metadata=metadata)
+
+    def test_docker(self):
+        obj1 = self._obj('N1', '10.0.0.1')
+        obj2 = self._obj('N2', '10.0.0.2')
+
+        self.assertEqual(self.mock_client.return_value,
+                         self.profile.docker(obj1))
+        self.assertEqual(self.mock_client.return_value,
+                         self.profile.docker(obj2))
+        # Clients are reused through the pool of the driver
+        self.mock_client.assert_has_calls([mock.call(obj1.metadata),
+                                           mock.call(obj2.metadata)])
+
+    def test_do_create(self):
+        client = self.mock_client.return_value
+        client.create_container.return_value = {'Id': 'CONTAINER_ID'}
+        obj = self._obj('N1', '10.0.0.1', container_name='C1')
+
+        res = self.profile.do_create(obj)
+
+        self.assertEqual('CONTAINER_ID', res)
+        client.create_container.assert_called_once_with('FAKE_IMAGE', 'C1')
+        client.start_container.assert_called_once_with('CONTAINER_ID')
+
+    def test_do_delete(self):
+        client = self.mock_client.return_value
+        obj = self._obj('N1', '10.0.0.1', container_id='CONTAINER_ID')
+
+        res = self.profile.do_delete(obj)
+
+        self.assertEqual(client.delete_container.return_value, res)
+        client.delete_container.assert_called_once_with('CONTAINER_ID')
+
+    def test_do_delete_no_container(self):
+        obj = self._obj('N1', '10.0.0.1')
+
+        self.assertTrue(self.profile.do_delete(obj))
+        self.assertEqual(0, self.mock_client.call_count)
+
+    def test_do_delete_failed(self):
+        client = self.mock_client.return_value
+        client.delete_container.side_effect = (
+            exception.ResourceDeletionFailure(resource='CONTAINER_ID'))
+        obj = self._obj('N1', '10.0.0.1', container_id='CONTAINER_ID')
+
+        self.assertFalse(self.profile.do_delete(obj))
+
+    def test_host_semaphore(self):
+        self.addCleanup(container._host_semaphores.clear)
+        cfg.CONF.set_override('max_container_ops_per_host', 2,
+                              enforce_type=True)
+
+        sem = container._host_semaphore('10.0.0.1')
+
+        self.assertIs(sem, container._host_semaphore('10.0.0.1'))
+        self.assertIsNot(sem, container._host_semaphore('10.0.0.2'))
+        self.assertTrue(sem.acquire(blocking=False))
+        self.assertTrue(sem.acquire(blocking=False))
+        self.assertFalse(sem.acquire(blocking=False))
+
+    def test_do_create_host_limited(self):
+        sem = mock.MagicMock()
+        mock_sem = self.patchobject(container, '_host_semaphore',
+                                    return_value=sem)
+        client = self.mock_client.return_value
+        client.create_container.return_value = {'Id': 'CONTAINER_ID'}
+        obj = self._obj('N1', '10.0.0.1')
+
+        self.profile.do_create(obj)
+
+        mock_sem.assert_called_once_with('10.0.0.1')
+        self.assertEqual(1, sem.__enter__.call_count)
+        self.assertEqual(1, sem.__exit__.call_count)
+
+    def test_do_check_batch(self):
+        clients = {'10.0.0.1': mock.Mock(), '10.0.0.2': mock.Mock()}
+        self.mock_client.side_effect = lambda p: clients[p['host_ip']]
+        clients['10.0.0.1'].list_containers.return_value = [
+            {'Id': 'C1', 'State': 'running'},
+            {'Id': 'C2', 'State': 'exited'},
+            {'Id': 'C3', 'Status': 'Up 2 hours'},
+        ]
+        clients['10.0.0.2'].list_containers.side_effect = Exception('Boom')
+        objs = [self._obj('N1', '10.0.0.1'), self._obj('N2', '10.0.0.1'),
+                self._obj('N3', '10.0.0.1'), self._obj('N4', '10.0.0.1'),
+                self._obj('N5', '10.0.0.2')]
+        for obj, physical_id in zip(objs, ['C1', 'C2', 'C3', 'C4', 'C5']):
+            obj.physical_id = physical_id
+
+        res = self.profile.do_check_batch(objs)
+
+        self.assertEqual({'N1': True, 'N2': False, 'N3': True, 'N4': False},
+                         res)
+        # One listing per host
+        clients['10.0.0.1'].list_containers.assert_called_once_with()
+        clients['10.0.0.2'].list_containers.assert_called_once_with()
+
+    def test_do_check(self):
+        client = self.mock_client.return_value
+        client.list_containers.return_value = [
+            {'Id': 'C1', 'State': 'running'}]
+        obj = self._obj('N1', '10.0.0.1')
+        obj.physical_id = 'C1'
+
+        self.assertTrue(self.profile.do_check(obj))
+
+        client.list_containers.side_effect = Exception('Boom')
+        self.assertFalse(self.profile.do_check(obj))
@@ -150,6 +150,50 @@ class TestNovaServerProfile(base.SenlinTestCase):
         nc.server_get.assert_called_with('FAKE_ID')
         self.assertTrue(res)
 
+    @mock.patch.object(driver_base, 'SenlinDriver')
+    def test_do_check_batch(self, mock_driver):
+        profile = server.ServerProfile('t', self.spec)
+        params = {'trust_id': 'TRUST_ID'}
+        self.patchobject(profile, '_build_conn_params', return_value=params)
+        nc = mock.Mock()
+        mock_driver.return_value.compute.return_value = nc
+        nc.server_list.return_value = [
+            mock.Mock(id='S1', status='ACTIVE'),
+            mock.Mock(id='S2', status='ERROR'),
+        ]
+        objs = [
+            mock.Mock(id='N1', physical_id='S1', user='U', project='P'),
+            mock.Mock(id='N2', physical_id='S2', user='U', project='P'),
+            mock.Mock(id='N3', physical_id='S3', user='U', project='P'),
+        ]
+
+        res = profile.do_check_batch(objs)
+
+        self.assertEqual({'N1': True, 'N2': False, 'N3': False}, res)
+        profile._build_conn_params.assert_called_once_with('U', 'P')
+        mock_driver.return_value.compute.assert_called_once_with(params)
+        nc.server_list.assert_called_once_with()
+
+    @mock.patch.object(driver_base, 'SenlinDriver')
+    def test_do_check_batch_list_failed(self, mock_driver):
+        profile = server.ServerProfile('t', self.spec)
+        self.patchobject(profile, '_build_conn_params', return_value={})
+        nc = mock.Mock()
+        mock_driver.return_value.compute.return_value = nc
+        nc.server_list.side_effect = [
+            exception.InternalError(message='BOOM'),
+            [mock.Mock(id='S2', status='ACTIVE')],
+        ]
+        objs = [
+            mock.Mock(id='N1', physical_id='S1', user='U1', project='P1'),
+            mock.Mock(id='N2', physical_id='S2', user='U2', project='P2'),
+        ]
+
+        res = profile.do_check_batch(objs)
+
+        self.assertEqual(2, nc.server_list.call_count)
+        self.assertEqual(1, len(res))
+
     def test_do_create(self):
         novaclient = mock.Mock()
         neutronclient = mock.Mock()
@@ -227,6 +271,55 @@ class TestNovaServerProfile(base.SenlinTestCase):
         novaclient.server_create.assert_called_once_with(**attrs)
         self.assertEqual(nova_server.id, server_id)
 
+    def test_do_create_records_zone(self):
+        novaclient = mock.Mock()
+        novaclient.server_create.return_value = mock.Mock(id='SERVER_ID')
+        server_obj = mock.Mock()
+        server_obj.to_dict.return_value = {
+            'OS-EXT-AZ:availability_zone': 'AZ2'}
+        novaclient.server_get.return_value = server_obj
+        profile = server.ServerProfile('t', self.spec)
+        profile._novaclient = novaclient
+        profile._neutronclient = mock.Mock()
+        placement = {'servergroup': 'SERVER_GROUP_1'}
+        obj = mock.Mock(cluster_id='FAKE_CLUSTER_ID',
+                        data={'placement': placement})
+
+        self.assertEqual('SERVER_ID', profile.do_create(obj))
+
+        novaclient.server_get.assert_called_once_with('SERVER_ID')
+        self.assertEqual({'servergroup': 'SERVER_GROUP_1', 'zone': 'AZ2'},
+                         obj.data['placement'])
+        # The placement shared with other nodes is not changed
+        self.assertEqual({'servergroup': 'SERVER_GROUP_1'}, placement)
+
+    def test_do_create_zone_placed(self):
+        novaclient = mock.Mock()
+        novaclient.server_create.return_value = mock.Mock(id='SERVER_ID')
+        profile = server.ServerProfile('t', self.spec)
+        profile._novaclient = novaclient
+        profile._neutronclient = mock.Mock()
+        obj = mock.Mock(cluster_id=None,
+                        data={'placement': {'zone': 'AZ1'}})
+
+        profile.do_create(obj)
+
+        self.assertEqual(0, novaclient.server_get.call_count)
+        self.assertEqual({'zone': 'AZ1'}, obj.data['placement'])
+
+    def test_do_create_zone_not_found(self):
+        novaclient = mock.Mock()
+        novaclient.server_create.return_value = mock.Mock(id='SERVER_ID')
+        novaclient.server_get.side_effect = exception.InternalError(
+            message='BOOM')
+        profile = server.ServerProfile('t', self.spec)
+        profile._novaclient = novaclient
+        profile._neutronclient = mock.Mock()
+        obj = mock.Mock(cluster_id=None, data={})
+
+        self.assertEqual('SERVER_ID', profile.do_create(obj))
+        self.assertEqual({}, obj.data)
+
     def test_do_create_port_and_fixedip_not_defined(self):
         novaclient = mock.Mock()
         neutronclient = mock.Mock()
@@ -14,7 +14,9 @@ import copy
 from types import GeneratorType
 
 import mock
+from oslo_config import cfg
 from oslo_context import context as oslo_ctx
+from oslo_utils import timeutils
 import six
 
 from senlin.common import context as senlin_ctx
@@ -197,6 +199,62 @@ class TestProfileBase(base.SenlinTestCase):
         mock_get.assert_called_once_with(self.ctx, 'FAKE_ID',
                                          project_safe=True)
 
+    def _enable_cache(self):
+        cfg.CONF.set_override('object_cache_size', 10, enforce_type=True)
+        self.patchobject(pb, '_cache', None)
+
+    def test_load_cached(self):
+        self._enable_cache()
+        obj = self._create_profile('test-profile-cache')
+        profile_id = obj.store(self.ctx)
+
+        with mock.patch.object(pb.Profile, 'from_db_record',
+                               wraps=pb.Profile.from_db_record) as mock_from:
+            res1 = pb.Profile.load(self.ctx, profile_id=profile_id)
+            res2 = pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        self.assertEqual(1, mock_from.call_count)
+        self.assertEqual(profile_id, res1.id)
+        self.assertEqual(profile_id, res2.id)
+        self.assertIsNot(res1, res2)
+        self.assertIsNot(res1.metadata, res2.metadata)
+
+    def test_load_cached_evicted_by_store(self):
+        self._enable_cache()
+        obj = self._create_profile('test-profile-cache')
+        profile_id = obj.store(self.ctx)
+        profile = pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        profile.name = 'new-name'
+        profile.store(self.ctx)
+
+        res = pb.Profile.load(self.ctx, profile_id=profile_id)
+        self.assertEqual('new-name', res.name)
+
+    def test_load_cached_record_updated(self):
+        self._enable_cache()
+        obj = self._create_profile('test-profile-cache')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        # an update made by another engine
+        db_api.profile_update(self.ctx, profile_id,
+                              {'name': 'new-name',
+                               'updated_at': timeutils.utcnow()})
+
+        res = pb.Profile.load(self.ctx, profile_id=profile_id)
+        self.assertEqual('new-name', res.name)
+
+    @mock.patch.object(db_api, 'profile_delete')
+    def test_delete_evicts_cached(self, mock_delete):
+        self._enable_cache()
+        cache = pb._get_cache()
+        cache.get('FAKE_ID', None, mock.Mock)
+
+        pb.Profile.delete(self.ctx, 'FAKE_ID')
+
+        self.assertNotIn('FAKE_ID', cache.entries)
+
     @mock.patch.object(db_api, 'profile_get_all')
     def test_load_all_empty(self, mock_get):
         mock_get.return_value = []
@@ -347,6 +405,30 @@ class TestProfileBase(base.SenlinTestCase):
         res_obj = profile.do_check.return_value
         self.assertEqual(res_obj, res)
 
+    @mock.patch.object(pb.Profile, 'load')
+    def test_check_objects(self, mock_load):
+        profile = mock.Mock()
+        mock_load.return_value = profile
+        objs = [mock.Mock(profile_id='FAKE_ID'), mock.Mock()]
+
+        res = pb.Profile.check_objects(self.ctx, objs)
+
+        mock_load.assert_called_once_with(self.ctx, profile_id='FAKE_ID')
+        profile.do_check_batch.assert_called_once_with(objs)
+        self.assertEqual(profile.do_check_batch.return_value, res)
+
+    def test_do_check_batch(self):
+        profile = self._create_profile('test-profile')
+        self.patchobject(profile, 'do_check', side_effect=[
+            True, False, NotImplemented,
+            exception.InternalError(message='BOOM')])
+        objs = [mock.Mock(id='N1'), mock.Mock(id='N2'), mock.Mock(id='N3'),
+                mock.Mock(id='N4')]
+
+        res = profile.do_check_batch(objs)
+
+        self.assertEqual({'N1': True, 'N2': False}, res)
+
     @mock.patch.object(pb.Profile, 'load')
     def test_delete_object(self, mock_load):
         profile = mock.Mock()
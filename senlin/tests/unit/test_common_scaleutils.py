@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+
 import mock
 
 from senlin.common import consts
@@ -285,6 +287,92 @@ class ScaleUtilsTest(base.SenlinTestCase):
         res = su.nodes_by_profile_age(nodes, 5)
         self.assertEqual(['N1', 'N2', 'N11', 'N12', 'N13'], res)
 
+    @mock.patch.object(su, 'filter_error_nodes')
+    def test_nodes_by_random_more_than_candidates(self, mock_filter):
+        good_nodes = [mock.Mock(id='N11'), mock.Mock(id='N12')]
+        mock_filter.return_value = (['N1'], good_nodes)
+
+        res = su.nodes_by_random(mock.Mock(), 5)
+
+        self.assertEqual('N1', res[0])
+        self.assertEqual(set(['N1', 'N11', 'N12']), set(res))
+        self.assertEqual(3, len(res))
+
+    def test_nodes_by_random_unique(self):
+        Row = collections.namedtuple('Row', ['id', 'status'])
+        nodes = [Row('N%s' % i, 'ACTIVE') for i in range(100)]
+
+        res = su.nodes_by_random(nodes, 50)
+
+        self.assertEqual(50, len(res))
+        self.assertEqual(50, len(set(res)))
+
+    def test_nodes_by_age_rows(self):
+        Row = collections.namedtuple('Row', ['id', 'status', 'created_at'])
+        nodes = [
+            Row('N11', 'ACTIVE', 110),
+            Row('N15', 'ACTIVE', 150),
+            Row('N12', 'ERROR', 120),
+            Row('N13', 'ACTIVE', 130),
+            Row('N14', 'ACTIVE', 100),
+        ]
+
+        res = su.nodes_by_age(nodes, 3, True)
+        self.assertEqual(['N12', 'N14', 'N11'], res)
+
+        res = su.nodes_by_age(nodes, 3, False)
+        self.assertEqual(['N12', 'N15', 'N13'], res)
+
+    def test_nodes_by_profile_age_rows(self):
+        Row = collections.namedtuple(
+            'Row', ['id', 'status', 'created_at', 'profile_created_at'])
+        nodes = [
+            Row('N11', 'ACTIVE', 100, 110),
+            Row('N15', 'ACTIVE', 100, 150),
+            Row('N12', 'ACTIVE', 100, 120),
+            Row('N13', 'ERROR', 100, 130),
+            Row('N14', 'ACTIVE', 100, 140),
+        ]
+
+        res = su.nodes_by_profile_age(nodes, 3)
+
+        self.assertEqual(['N13', 'N11', 'N12'], res)
+
+    def test_nodes_by_age_rows_none(self):
+        Row = collections.namedtuple('Row', ['id', 'status', 'created_at'])
+        nodes = [
+            Row('N11', 'ACTIVE', None),
+            Row('N15', 'ACTIVE', 150),
+            Row('N12', 'ACTIVE', None),
+            Row('N13', 'ACTIVE', 130),
+            Row('N14', 'ACTIVE', 100),
+        ]
+
+        res = su.nodes_by_age(nodes, 3, True)
+        self.assertEqual(['N14', 'N13', 'N15'], res)
+
+        res = su.nodes_by_age(nodes, 3, False)
+        self.assertEqual(['N15', 'N13', 'N14'], res)
+
+        res = su.nodes_by_age(nodes, 5, True)
+        self.assertEqual(set(['N11', 'N12']), set(res[3:]))
+
+        res = su.nodes_by_age(nodes, 5, False)
+        self.assertEqual(set(['N11', 'N12']), set(res[3:]))
+
+    def test_nodes_by_profile_age_rows_none(self):
+        Row = collections.namedtuple(
+            'Row', ['id', 'status', 'created_at', 'profile_created_at'])
+        nodes = [
+            Row('N11', 'ACTIVE', 100, None),
+            Row('N15', 'ACTIVE', 100, 150),
+            Row('N12', 'ACTIVE', 100, 120),
+        ]
+
+        res = su.nodes_by_profile_age(nodes, 3)
+
+        self.assertEqual(['N12', 'N15', 'N11'], res)
+
 
 class CheckSizeParamsTest(base.SenlinTestCase):
 
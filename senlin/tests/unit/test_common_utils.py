@@ -12,6 +12,7 @@
 
 import logging
 
+import mock
 import requests
 from requests import exceptions
 import six
@@ -252,3 +253,66 @@ class TestParseLevelValues(base.SenlinTestCase):
     def test_with_only_invalid_values(self):
         res = utils.parse_level_values(['warn'])
         self.assertIsNone(res)
+
+
+class FakeObject(object):
+    def __init__(self, name):
+        self.name = name
+        self.data = {'k': 'v'}
+        self.items = [1]
+
+
+class TestObjectCache(base.SenlinTestCase):
+
+    def test_get_creates_once(self):
+        cache = utils.ObjectCache(2)
+        factory = mock.Mock(side_effect=lambda: FakeObject('foo'))
+
+        obj1 = cache.get('ID1', 'T1', factory)
+        obj2 = cache.get('ID1', 'T1', factory)
+
+        factory.assert_called_once_with()
+        self.assertEqual('foo', obj1.name)
+        self.assertIsNot(obj1, obj2)
+
+    def test_get_returns_copies(self):
+        cache = utils.ObjectCache(2)
+        obj1 = cache.get('ID1', None, lambda: FakeObject('foo'))
+        obj1.name = 'bar'
+        obj1.data['k'] = 'new'
+        obj1.items.append(2)
+
+        obj2 = cache.get('ID1', None, lambda: FakeObject('baz'))
+
+        self.assertEqual('foo', obj2.name)
+        self.assertEqual({'k': 'v'}, obj2.data)
+        self.assertEqual([1], obj2.items)
+
+    def test_get_timestamp_changed(self):
+        cache = utils.ObjectCache(2)
+        cache.get('ID1', 'T1', lambda: FakeObject('foo'))
+
+        obj = cache.get('ID1', 'T2', lambda: FakeObject('bar'))
+
+        self.assertEqual('bar', obj.name)
+        self.assertEqual('T2', cache.entries['ID1'][0])
+
+    def test_get_evicts_least_recently_used(self):
+        cache = utils.ObjectCache(2)
+        cache.get('ID1', None, lambda: FakeObject('1'))
+        cache.get('ID2', None, lambda: FakeObject('2'))
+        cache.get('ID1', None, lambda: FakeObject('1'))
+
+        cache.get('ID3', None, lambda: FakeObject('3'))
+
+        self.assertEqual(['ID1', 'ID3'], list(cache.entries))
+
+    def test_evict(self):
+        cache = utils.ObjectCache(2)
+        cache.get('ID1', None, lambda: FakeObject('foo'))
+
+        cache.evict('ID1')
+        cache.evict('ID2')
+
+        obj = cache.get('ID1', None, lambda: FakeObject('bar'))
+        self.assertEqual('bar', obj.name)
@@ -296,6 +296,7 @@ class EngineRpcAPITestCase(base.SenlinTestCase):
             'sort': mock.ANY,
             'filters': mock.ANY,
             'project_safe': mock.ANY,
+            'summary': mock.ANY,
         }
         self._test_engine_api('node_list', 'call', **default_args)
 
@@ -350,6 +351,7 @@ class EngineRpcAPITestCase(base.SenlinTestCase):
             'marker': mock.ANY,
             'sort': mock.ANY,
             'project_safe': mock.ANY,
+            'summary': mock.ANY,
         }
         self._test_engine_api('action_list', 'call', **default_args)
 
@@ -487,6 +489,7 @@ class EngineRpcAPITestCase(base.SenlinTestCase):
             'marker': mock.ANY,
             'sort': mock.ANY,
             'project_safe': mock.ANY,
+            'summary': mock.ANY,
         }
         self._test_engine_api('event_list', 'call', **default_args)
 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Benchmark loading and storing clusters of different sizes.
+
+A cluster is created for each size with the given number of nodes, then
+the following operations are timed:
+
+- load: ``Cluster.load``, the runtime data is loaded only when accessed;
+- load all: ``Cluster.load`` followed by an access to the profile, the
+  nodes and the policies of the cluster, which is the cost every load used
+  to pay before the runtime data was loaded lazily;
+- store: ``Cluster.store`` on a loaded cluster;
+- set status: ``Cluster.set_status`` on a loaded cluster.
+
+For example::
+
+  python tools/benchmarks/cluster_runtime.py --sizes 10,1000,10000
+  python tools/benchmarks/cluster_runtime.py --url mysql+pymysql://u:p@h/db
+
+**Warning** The database is synced and rows are added to it, only point
+``--url`` to a scratch database.
+"""
+
+import argparse
+import time
+import uuid
+
+from oslo_config import cfg
+from oslo_db import options
+from oslo_utils import timeutils
+
+from senlin.common import context
+from senlin.db import api as db_api
+from senlin.engine import cluster as cluster_mod
+from senlin.engine import environment
+
+CHUNK = 10000
+
+PROFILE_SPEC = {
+    'type': 'os.nova.server',
+    'version': '1.0',
+    'properties': {
+        'flavor': 'm1.small',
+        'image': 'cirros',
+    },
+}
+
+
+def _uuid():
+    return str(uuid.uuid4())
+
+
+def create_cluster(ctx, profile_id, size):
+    '''Create a cluster with the given number of nodes.'''
+    cluster = db_api.cluster_create(ctx, {
+        'name': 'bench-%s' % size,
+        'profile_id': profile_id,
+        'user': 'bench',
+        'project': 'bench',
+        'desired_capacity': size,
+        'next_index': size + 1,
+        'status': 'ACTIVE',
+        'init_at': timeutils.utcnow(),
+    })
+
+    nodes = [{
+        'id': _uuid(),
+        'name': 'node-%s' % i,
+        'physical_id': _uuid(),
+        'cluster_id': cluster.id,
+        'profile_id': profile_id,
+        'user': 'bench',
+        'project': 'bench',
+        'index': i + 1,
+        'status': 'ACTIVE',
+        'init_at': timeutils.utcnow(),
+    } for i in range(size)]
+    for i in range(0, len(nodes), CHUNK):
+        db_api.node_create_batch(ctx, nodes[i:i + CHUNK])
+    return cluster.id
+
+
+def timeit(func, repeat):
+    begin = time.time()
+    for i in range(repeat):
+        func()
+    return (time.time() - begin) * 1000.0 / repeat
+
+
+def run(ctx, cluster_id, repeat):
+    def load():
+        cluster_mod.Cluster.load(ctx, cluster_id)
+
+    def load_all():
+        cluster = cluster_mod.Cluster.load(ctx, cluster_id)
+        cluster.rt['profile']
+        cluster.nodes
+        cluster.policies
+
+    cluster = cluster_mod.Cluster.load(ctx, cluster_id)
+
+    def store():
+        cluster.store(ctx)
+
+    def set_status():
+        cluster.set_status(ctx, cluster.ACTIVE, 'Benchmark')
+
+    return [timeit(func, repeat)
+            for func in (load, load_all, store, set_status)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark loading and storing senlin clusters.')
+    parser.add_argument('--url', default='sqlite://',
+                        help='Database URL, default to an in-memory SQLite.')
+    parser.add_argument('--sizes', default='10,1000,10000',
+                        help='Comma separated numbers of nodes per cluster.')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Number of times each operation is run.')
+    args = parser.parse_args()
+
+    options.set_defaults(cfg.CONF, connection=args.url)
+    cfg.CONF([], project='senlin', default_config_files=[])
+    db_api.db_sync(db_api.get_engine())
+    environment.initialize()
+
+    ctx = context.get_admin_context()
+    profile = db_api.profile_create(ctx, {
+        'name': 'bench-profile',
+        'type': 'os.nova.server-1.0',
+        'spec': PROFILE_SPEC,
+        'user': 'bench',
+        'project': 'bench',
+    })
+
+    print('%8s %12s %12s %12s %12s' % ('nodes', 'load ms', 'load all ms',
+                                       'store ms', 'status ms'))
+    for size in [int(s) for s in args.sizes.split(',')]:
+        cluster_id = create_cluster(ctx, profile.id, size)
+        results = run(ctx, cluster_id, args.repeat)
+        print('%8d %12.3f %12.3f %12.3f %12.3f' % tuple([size] + results))
+
+
+if __name__ == '__main__':
+    main()
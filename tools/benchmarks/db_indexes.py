@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Benchmark the hot action, dependency and event queries with and without
+the secondary indexes defined on the senlin models.
+
+The tables are created from the senlin models in the given database, filled
+with historic rows, and each query is timed and explained twice: once with
+the secondary indexes dropped and once with them in place. For example::
+
+  python tools/benchmarks/db_indexes.py --rows 1000000
+  python tools/benchmarks/db_indexes.py --url mysql+pymysql://u:p@h/scratch
+
+**Warning** The tables are dropped and re-created, only point ``--url`` to a
+scratch database.
+"""
+
+import argparse
+import datetime
+import random
+import time
+import uuid
+
+import sqlalchemy
+
+from senlin.db.sqlalchemy import models
+
+TABLES = ['action', 'dependency', 'event']
+
+# (description, SQL statement, name of the parameter sampled from the data)
+QUERIES = [
+    ('claim ready actions',
+     "SELECT id FROM action WHERE status = 'READY' AND owner IS NULL "
+     "ORDER BY priority, created_at LIMIT 10",
+     None),
+    ('actions by owner',
+     "SELECT id FROM action WHERE owner = :param",
+     'owner'),
+    ('dependents of action',
+     "SELECT dependent FROM dependency WHERE depended = :param",
+     'action_id'),
+    ('depended of action',
+     "SELECT depended FROM dependency WHERE dependent = :param",
+     'action_id'),
+    ('events to prune',
+     "SELECT id FROM event WHERE cluster_id = :param "
+     "ORDER BY timestamp LIMIT 100",
+     'cluster_id'),
+]
+
+CHUNK = 10000
+
+
+def _uuid():
+    return str(uuid.uuid4())
+
+
+def build_metadata(with_indexes):
+    '''Copy the senlin tables, optionally without the secondary indexes.'''
+    meta = sqlalchemy.MetaData()
+    for table in models.BASE.metadata.sorted_tables:
+        copy = table.tometadata(meta)
+        if not with_indexes and table.name in TABLES:
+            copy.indexes = set()
+    return meta
+
+
+def populate(engine, meta, rows, seed):
+    '''Fill the tables with mostly finished actions and their events.'''
+    rnd = random.Random(seed)
+    owners = [_uuid() for i in range(10)]
+    clusters = [_uuid() for i in range(max(rows // 1000, 1))]
+    start = datetime.datetime(2016, 1, 1)
+    action_ids = []
+
+    def insert(table, values):
+        for i in range(0, len(values), CHUNK):
+            engine.execute(meta.tables[table].insert(), values[i:i + CHUNK])
+
+    profile_id = _uuid()
+    insert('profile', [{'id': profile_id, 'user': 'user', 'project': 'p'}])
+    insert('cluster', [{'id': c, 'profile_id': profile_id, 'user': 'user',
+                        'project': 'p'} for c in clusters])
+
+    actions = []
+    for i in range(rows):
+        action_id = _uuid()
+        action_ids.append(action_id)
+        ready = rnd.random() < 0.0001
+        actions.append({
+            'id': action_id,
+            'name': 'action_%s' % i,
+            'action': 'NODE_CREATE',
+            'status': 'READY' if ready else 'SUCCEEDED',
+            'owner': None if ready else rnd.choice(owners),
+            'priority': rnd.choice([10, 30, 50, 80]),
+            'created_at': start + datetime.timedelta(seconds=i),
+        })
+    insert('action', actions)
+
+    dependencies = []
+    for i in range(rows // 2):
+        dependencies.append({
+            'id': _uuid(),
+            'depended': rnd.choice(action_ids),
+            'dependent': rnd.choice(action_ids),
+        })
+    insert('dependency', dependencies)
+
+    events = []
+    for i in range(rows):
+        events.append({
+            'id': _uuid(),
+            'timestamp': start + datetime.timedelta(seconds=i),
+            'cluster_id': rnd.choice(clusters),
+            'level': '20',
+        })
+    insert('event', events)
+
+    return {
+        'owner': owners,
+        'action_id': action_ids,
+        'cluster_id': clusters,
+    }
+
+
+def explain(engine, sql, param):
+    if engine.dialect.name == 'sqlite':
+        stmt = 'EXPLAIN QUERY PLAN ' + sql
+    else:
+        stmt = 'EXPLAIN ' + sql
+    rows = engine.execute(sqlalchemy.text(stmt), **param).fetchall()
+    return '; '.join(' '.join(str(c) for c in r) for r in rows)
+
+
+def run_queries(engine, samples, repeat, seed):
+    rnd = random.Random(seed)
+    results = []
+    for desc, sql, key in QUERIES:
+        params = [{'param': rnd.choice(samples[key])} if key else {}
+                  for i in range(repeat)]
+        stmt = sqlalchemy.text(sql)
+        begin = time.time()
+        for param in params:
+            engine.execute(stmt, **param).fetchall()
+        elapsed = (time.time() - begin) * 1000.0 / repeat
+        results.append((desc, elapsed, explain(engine, sql, params[0])))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark senlin queries with and without indexes.')
+    parser.add_argument('--url', default='sqlite://',
+                        help='Database URL, default to an in-memory SQLite.')
+    parser.add_argument('--rows', type=int, default=1000000,
+                        help='Number of historic action rows.')
+    parser.add_argument('--repeat', type=int, default=100,
+                        help='Number of times each query is run.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    engine = sqlalchemy.create_engine(args.url)
+    report = {}
+    for with_indexes in (False, True):
+        meta = build_metadata(with_indexes)
+        meta.drop_all(engine)
+        meta.create_all(engine)
+        try:
+            samples = populate(engine, meta, args.rows, args.seed)
+            report[with_indexes] = run_queries(engine, samples, args.repeat,
+                                               args.seed)
+        finally:
+            meta.drop_all(engine)
+
+    print('%-22s %12s %12s %9s' % ('query', 'no index ms', 'index ms',
+                                    'speedup'))
+    for before, after in zip(report[False], report[True]):
+        speedup = before[1] / after[1] if after[1] else float('inf')
+        print('%-22s %12.3f %12.3f %8.1fx' % (before[0], before[1],
+                                              after[1], speedup))
+    print('')
+    for before, after in zip(report[False], report[True]):
+        print('%s:' % before[0])
+        print('  without indexes: %s' % before[2])
+        print('  with indexes:    %s' % after[2])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Benchmark choosing victim nodes from clusters of different sizes.
+
+For each size, rows shaped like those returned by
+``node_get_all_for_selection`` are generated in memory, a few percent of
+them in ERROR status, then the following selections of ``--count`` nodes
+are timed:
+
+- random: ``scaleutils.nodes_by_random``;
+- oldest: ``scaleutils.nodes_by_age`` with old nodes first;
+- youngest: ``scaleutils.nodes_by_age`` with young nodes first;
+- profile: ``scaleutils.nodes_by_profile_age``;
+- sort: a full sort of the rows by creation time, which is what choosing
+  by age used to cost regardless of the number of victims.
+
+For example::
+
+  python tools/benchmarks/victim_selection.py --sizes 1000,10000,100000
+  python tools/benchmarks/victim_selection.py --count 100
+"""
+
+import argparse
+import collections
+import datetime
+import random
+import time
+
+from senlin.common import scaleutils
+
+Row = collections.namedtuple(
+    'Row', ['id', 'status', 'created_at', 'profile_created_at'])
+
+ERROR_RATIO = 0.02
+
+
+def create_rows(size):
+    '''Create rows for the given number of nodes.'''
+    base = datetime.datetime(2016, 1, 1)
+    profiles = [base + datetime.timedelta(days=i) for i in range(10)]
+    return [Row('node-%s' % i,
+                'ERROR' if random.random() < ERROR_RATIO else 'ACTIVE',
+                base + datetime.timedelta(seconds=random.randint(0, 10 ** 8)),
+                random.choice(profiles))
+            for i in range(size)]
+
+
+def timeit(func, repeat):
+    begin = time.time()
+    for i in range(repeat):
+        func()
+    return (time.time() - begin) * 1000.0 / repeat
+
+
+def run(rows, count, repeat):
+    def by_random():
+        scaleutils.nodes_by_random(rows, count)
+
+    def oldest():
+        scaleutils.nodes_by_age(rows, count, True)
+
+    def youngest():
+        scaleutils.nodes_by_age(rows, count, False)
+
+    def profile():
+        scaleutils.nodes_by_profile_age(rows, count)
+
+    def full_sort():
+        sorted(rows, key=lambda r: r.created_at)
+
+    return [timeit(func, repeat)
+            for func in (by_random, oldest, youngest, profile, full_sort)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark choosing victim nodes of senlin clusters.')
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='Comma separated numbers of nodes per cluster.')
+    parser.add_argument('--count', type=int, default=10,
+                        help='Number of victims chosen by each selection.')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Number of times each selection is run.')
+    args = parser.parse_args()
+
+    print('%8s %12s %12s %12s %12s %12s' % ('nodes', 'random ms',
+                                            'oldest ms', 'youngest ms',
+                                            'profile ms', 'sort ms'))
+    for size in [int(s) for s in args.sizes.split(',')]:
+        rows = create_rows(size)
+        results = run(rows, args.count, args.repeat)
+        print('%8d %12.3f %12.3f %12.3f %12.3f %12.3f' %
+              tuple([size] + results))
+
+
+if __name__ == '__main__':
+    main()